@@ -0,0 +1,192 @@
+"""
+ベンチマーク用のPDFを生成するモジュール
+乱数のシードを固定して生成するため、同じ種類・ページ数のPDFは何度生成しても同じ内容になります
+
+PDFの種類:
+    text: 文字だけのページ
+    vector: 線・曲線・塗りつぶしの図形を多数含むページ
+    scanned: ページ全体を覆うスキャン画像（JPEG）のページ
+    mixed: ページサイズと内容（文字・図形・画像）が混在するページ
+"""
+import io
+import os
+import random
+
+import fitz  # PyMuPDF
+from PIL import Image, ImageDraw, ImageFilter
+
+
+# 生成する内容を変更した場合は値を上げ、以前に生成したPDFを使わないようにする
+CORPUS_VERSION = 1
+
+KINDS = ["text", "vector", "scanned", "mixed"]
+
+# ページサイズ（ポイント）
+A4 = (595, 842)
+MIXED_PAGE_SIZES = [A4, (612, 792), (1191, 842), (960, 540)]  # A4、レター、A3横、16:9スライド
+
+# スキャン画像の解像度と、1ファイルで使い回す画像の数
+SCAN_DPI = 150
+SCAN_VARIANTS = 4
+
+_WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt "
+    "ut labore et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco "
+    "laboris nisi aliquip ex ea commodo consequat duis aute irure in reprehenderit voluptate"
+).split()
+
+
+def corpus_path(folder, kind, pages):
+    """生成するPDFのパスを返す"""
+    return os.path.join(folder, f"{kind}-{pages}-v{CORPUS_VERSION}.pdf")
+
+
+def _paragraphs(rng, count):
+    """ランダムな単語を並べた段落を返す"""
+    return "\n\n".join(
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(40, 90))).capitalize() + "."
+        for _ in range(count)
+    )
+
+
+def _draw_text(page, rng):
+    """見出しと本文の段落を書き込む"""
+    margin = 50
+    page.insert_text((margin, margin + 20), f"Section {rng.randint(1, 99)}", fontsize=20, fontname="hebo")
+    box = fitz.Rect(margin, margin + 40, page.rect.width - margin, page.rect.height - margin)
+    page.insert_textbox(box, _paragraphs(rng, 6), fontsize=10, fontname="helv")
+
+
+def _draw_vector(page, rng):
+    """図面やグラフのような、短い線・ベジェ曲線・塗りつぶした多角形を多数描く"""
+    width, height = page.rect.width, page.rect.height
+    
+    def point(near=None, spread=60):
+        if near is None:
+            return fitz.Point(rng.uniform(0, width), rng.uniform(0, height))
+        return near + (rng.uniform(-spread, spread), rng.uniform(-spread, spread))
+    
+    def color():
+        return (rng.random(), rng.random(), rng.random())
+    
+    shape = page.new_shape()
+    for _ in range(300):
+        start = point()
+        shape.draw_line(start, point(start))
+        shape.finish(color=color(), width=rng.uniform(0.2, 2))
+    for _ in range(100):
+        start = point()
+        shape.draw_bezier(start, point(start), point(start), point(start))
+        shape.finish(color=color(), width=rng.uniform(0.5, 3))
+    for i in range(60):
+        start = point()
+        shape.draw_polyline([point(start, 40) for _ in range(rng.randint(3, 6))])
+        # 一部の図形だけを半透明にする
+        opacity = rng.uniform(0.3, 0.8) if i % 4 == 0 else 1
+        shape.finish(color=color(), fill=color(), fill_opacity=opacity, closePath=True)
+    shape.commit()
+
+
+def _scan_image(rng, size):
+    """紙の地合いと文字の行を模したグレースケールのスキャン画像（JPEG）を作成する"""
+    width, height = size
+    # 低解像度のノイズを拡大して、紙のむらを作る
+    small = (max(1, width // 8), max(1, height // 8))
+    noise = bytes(230 + value % 26 for value in rng.randbytes(small[0] * small[1]))
+    image = Image.frombytes("L", small, noise).resize(size, Image.BILINEAR)
+    
+    draw = ImageDraw.Draw(image)
+    line_height = height // 60
+    for y in range(height // 12, height - height // 12, line_height):
+        x = width // 12
+        while x < width - width // 12:
+            word = rng.randint(width // 60, width // 12)
+            draw.rectangle([x, y, min(x + word, width - width // 12), y + line_height // 2], fill=rng.randint(20, 80))
+            x += word + width // 80
+    image = image.filter(ImageFilter.GaussianBlur(1))
+    
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=75)
+    return buffer.getvalue()
+
+
+def _scan_images(rng, page_size):
+    """1ファイルで使い回すスキャン画像を作成する"""
+    size = (round(page_size[0] * SCAN_DPI / 72), round(page_size[1] * SCAN_DPI / 72))
+    return [_scan_image(rng, size) for _ in range(SCAN_VARIANTS)]
+
+
+def _draw_scanned(page, rng, images, page_number):
+    """ページ全体にスキャン画像を配置する（ページごとに内容が変わるようページ番号を重ねる）"""
+    page.insert_image(page.rect, stream=images[page_number % len(images)])
+    page.insert_text((page.rect.width - 80, page.rect.height - 30), f"- {page_number + 1} -", fontsize=9)
+
+
+def generate_pdf(path, kind, pages, seed=0):
+    """
+    ベンチマーク用のPDFを生成する
+    
+    Args:
+        path (str): 保存先のパス
+        kind (str): PDFの種類（text, vector, scanned, mixed）
+        pages (int): ページ数
+        seed (int, optional): 乱数のシード
+    
+    Returns:
+        str: 保存したPDFのパス
+    """
+    if kind not in KINDS:
+        raise ValueError(f"未対応のPDFの種類です: {kind}")
+    
+    rng = random.Random(f"{kind}-{seed}")
+    document = fitz.open()
+    scan_images = {}
+    try:
+        for i in range(pages):
+            if kind == "mixed":
+                page_size = MIXED_PAGE_SIZES[i % len(MIXED_PAGE_SIZES)]
+                content = ["text", "vector", "scanned"][i % 3]
+            else:
+                page_size = A4
+                content = kind
+            
+            page = document.new_page(width=page_size[0], height=page_size[1])
+            if content == "text":
+                _draw_text(page, rng)
+            elif content == "vector":
+                _draw_vector(page, rng)
+            else:
+                if page_size not in scan_images:
+                    scan_images[page_size] = _scan_images(rng, page_size)
+                _draw_scanned(page, rng, scan_images[page_size], i)
+        
+        # 作成日時・文書IDを固定して、生成するたびに同じバイト列になるようにする
+        document.set_metadata({"producer": "pdf2pptx benchmark corpus", "creationDate": "", "modDate": ""})
+        document.save(path, garbage=3, deflate=True, no_new_id=True)
+    finally:
+        document.close()
+    return path
+
+
+def ensure_corpus(folder, cases):
+    """
+    ベンチマークに必要なPDFを生成する（生成済みのものはそのまま使う）
+    
+    Args:
+        folder (str): PDFを保存するフォルダ
+        cases (list): (PDFの種類, ページ数) のリスト
+    
+    Returns:
+        dict: (PDFの種類, ページ数) をキー、PDFのパスを値とする辞書
+    """
+    os.makedirs(folder, exist_ok=True)
+    paths = {}
+    for kind, pages in cases:
+        path = corpus_path(folder, kind, pages)
+        if not os.path.exists(path):
+            # 生成中に中断された不完全なファイルを使わないよう、一時ファイルに保存してから置き換える
+            temp_path = path + ".tmp"
+            generate_pdf(temp_path, kind, pages)
+            os.replace(temp_path, path)
+        paths[(kind, pages)] = path
+    return paths
@@ -0,0 +1,326 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+変換サーバー（src/pdf2pptx_server.py）の負荷試験を行うスクリプト
+複数のクライアントから同時にPDFを送って変換し、1秒あたりのリクエスト数と
+レイテンシーのパーセンタイル（p50・p90・p95・p99）を表示します
+
+    python benchmarks/load_test.py --spawn --workers 4 --concurrency 8 --requests 200
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --duration 30 --mode jobs
+"""
+import argparse
+import contextlib
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVER_SCRIPT = os.path.join(os.path.dirname(BENCHMARK_DIR), "src", "pdf2pptx_server.py")
+DEFAULT_CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+
+# 表示するパーセンタイル
+PERCENTILES = [50, 90, 95, 99]
+
+# 起動したサーバーの準備ができるまで待つ時間の上限（秒）
+SERVER_START_TIMEOUT = 60
+
+# リクエストの方法
+#   convert: POST /convert で変換してPPTXを受け取る（1リクエスト）
+#   jobs:    POST /jobs で登録し、進捗を最後まで受信してからPPTXを取得する（3リクエスト）
+MODES = ["convert", "jobs"]
+
+
+def percentile(values, pct):
+    """値のリストのパーセンタイルを返す（隣り合う値を線形補間する、空の場合はNone）"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies, errors, wall_seconds):
+    """
+    負荷試験の結果を集計する
+    
+    Args:
+        latencies (list): 成功したリクエストのレイテンシー（秒）
+        errors (list): 失敗したリクエストのエラーメッセージ
+        wall_seconds (float): 負荷をかけた時間（秒）
+    
+    Returns:
+        dict: リクエスト数・1秒あたりのリクエスト数・レイテンシーの統計（ミリ秒）
+    """
+    def ms(seconds):
+        return round(seconds * 1000, 1) if seconds is not None else None
+    
+    return {
+        "requests": len(latencies) + len(errors),
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "seconds": round(wall_seconds, 3),
+        "requests_per_second": round(len(latencies) / wall_seconds, 2) if wall_seconds > 0 else None,
+        "latency_ms": dict(
+            {f"p{pct}": ms(percentile(latencies, pct)) for pct in PERCENTILES},
+            mean=ms(sum(latencies) / len(latencies)) if latencies else None,
+            min=ms(min(latencies)) if latencies else None,
+            max=ms(max(latencies)) if latencies else None,
+        ),
+        # 同じエラーが続くことが多いため、種類ごとの件数にまとめる
+        "errors": {message: errors.count(message) for message in sorted(set(errors))},
+    }
+
+
+class LoadClient:
+    """1つの接続（Keep-Alive）でリクエストを送るクライアント（スレッドごとに作成する）"""
+    
+    def __init__(self, url, timeout=300):
+        """初期化メソッド"""
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self._connection = None
+    
+    def request(self, method, path, body=None):
+        """
+        リクエストを送り、レスポンスの本文を最後まで受信する
+        
+        Returns:
+            tuple: (ステータスコード, 本文)
+        """
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            headers = {"Content-Type": "application/pdf"} if body is not None else {}
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        return response.status, data
+    
+    def close(self):
+        """接続を閉じる"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def convert(self, data, query):
+        """POST /convert でPDFを変換してPPTXを受け取る"""
+        status, body = self.request("POST", f"/convert?{query}", data)
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        return body
+    
+    def convert_with_job(self, data, query):
+        """POST /jobs で登録し、進捗を最後まで受信してからPPTXを取得する"""
+        status, body = self.request("POST", f"/jobs?{query}", data)
+        if status != 202:
+            raise RuntimeError(f"HTTP {status}")
+        job_id = json.loads(body)["id"]
+        # 進捗の配信は最後に接続を閉じるため、結果の取得は新しい接続で行う
+        status, _ = self.request("GET", f"/jobs/{job_id}/events")
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        status, body = self.request("GET", f"/jobs/{job_id}/result")
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}")
+        self.request("DELETE", f"/jobs/{job_id}")
+        return body
+
+
+def run_load(url, data, concurrency, requests=None, duration=None, mode="convert", query=""):
+    """
+    concurrency個のクライアントから同時にリクエストを送り続ける
+    
+    Args:
+        url (str): サーバーのURL
+        data (bytes): 送るPDFファイルの内容
+        concurrency (int): 同時に送るクライアントの数
+        requests (int, optional): 送るリクエストの総数
+        duration (float, optional): リクエストを送り続ける時間（秒）。requestsとどちらかを指定する
+        mode (str, optional): リクエストの方法（convert, jobs）
+        query (str, optional): リクエストに付けるクエリ文字列（dpiなど）
+    
+    Returns:
+        tuple: (成功したリクエストのレイテンシーのリスト, エラーメッセージのリスト, 負荷をかけた時間)
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    issued = [0]
+    start = time.perf_counter()
+    deadline = start + duration if duration is not None else None
+    
+    def next_request():
+        """次のリクエストを送るかどうかを決める（総数または時間の上限に達したらFalse）"""
+        with lock:
+            if requests is not None and issued[0] >= requests:
+                return False
+            if deadline is not None and time.perf_counter() >= deadline:
+                return False
+            issued[0] += 1
+            return True
+    
+    def worker():
+        client = LoadClient(url)
+        send = client.convert if mode == "convert" else client.convert_with_job
+        try:
+            while next_request():
+                request_start = time.perf_counter()
+                try:
+                    send(data, query)
+                except Exception as e:
+                    with lock:
+                        errors.append(f"{type(e).__name__}: {e}")
+                    continue
+                latency = time.perf_counter() - request_start
+                with lock:
+                    latencies.append(latency)
+        finally:
+            client.close()
+    
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def _free_port():
+    """ローカルで空いているポートを返す"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url, timeout=SERVER_START_TIMEOUT):
+    """サーバーの /health が応答するまで待つ"""
+    client = LoadClient(url, timeout=5)
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            status, _ = client.request("GET", "/health")
+            if status == 200:
+                return
+        except OSError:
+            pass
+        finally:
+            client.close()
+        if time.perf_counter() >= deadline:
+            raise RuntimeError(f"{timeout}秒以内にサーバーが起動しませんでした")
+        time.sleep(0.2)
+
+
+@contextlib.contextmanager
+def spawn_server(workers=None):
+    """
+    変換サーバーを別のプロセスで起動し、準備ができたらURLを返すコンテキストマネージャ
+    
+    負荷試験のクライアントと同じプロセスで動かすと、GILの取り合いで結果が変わるため別のプロセスにします。
+    """
+    port = _free_port()
+    command = [sys.executable, SERVER_SCRIPT, "--port", str(port), "--quiet"]
+    if workers is not None:
+        command += ["--workers", str(workers)]
+    process = subprocess.Popen(command)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_ready(url)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def print_summary(summary):
+    """集計結果を表示する"""
+    latency = summary["latency_ms"]
+    print(f"\nリクエスト: {summary['requests']}（成功 {summary['succeeded']} / 失敗 {summary['failed']}）"
+          f" {summary['seconds']:.1f}秒")
+    if summary["requests_per_second"] is not None:
+        print(f"スループット: {summary['requests_per_second']:.2f} リクエスト/秒")
+    if summary["succeeded"]:
+        print("レイテンシー（ミリ秒）: " + ", ".join(
+            f"{key} {latency[key]:.1f}" for key in [f"p{pct}" for pct in PERCENTILES] + ["mean", "max"]
+        ))
+    for message, count in summary["errors"].items():
+        print(f"  エラー ×{count}: {message}")
+
+
+def main():
+    """負荷試験を実行して結果を表示する"""
+    parser = argparse.ArgumentParser(description="変換サーバーの負荷試験を行います")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", default=None, help="起動済みのサーバーのURL（例: http://127.0.0.1:8765）")
+    target.add_argument("--spawn", action="store_true", help="サーバーを起動してから負荷試験を行う")
+    parser.add_argument("--workers", type=int, default=None, help="--spawnで起動するサーバーのワーカープロセス数")
+    parser.add_argument("--pdf", default=None, help="送るPDFファイル（既定: ベンチマーク用に生成したPDF）")
+    parser.add_argument("--cases", default="text:5", help="--pdfがない場合に生成するPDF（種類:ページ数、既定: text:5）")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR, help="生成したPDFを保存するフォルダ")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="同時に送るクライアントの数（既定: 4）")
+    parser.add_argument("-n", "--requests", type=int, default=None, help="送るリクエストの総数（既定: 100）")
+    parser.add_argument("--duration", type=float, default=None, help="リクエストを送り続ける時間（秒）")
+    parser.add_argument("--warmup", type=int, default=None, help="集計の前に送るリクエストの数（既定: 同時接続数）")
+    parser.add_argument("--mode", choices=MODES, default="convert", help="リクエストの方法（既定: convert）")
+    parser.add_argument("--dpi", type=int, default=150, help="変換の解像度（既定: 150）")
+    parser.add_argument("--output", default=None, help="集計結果を保存するJSONファイル")
+    args = parser.parse_args()
+    if args.requests is None and args.duration is None:
+        args.requests = 100
+    
+    if args.pdf:
+        pdf_path = args.pdf
+    else:
+        sys.path.insert(0, BENCHMARK_DIR)
+        from corpus import ensure_corpus
+        from run_benchmarks import parse_cases
+        
+        case = parse_cases(args.cases)[0]
+        pdf_path = ensure_corpus(args.corpus_dir, [case])[case]
+    with open(pdf_path, "rb") as f:
+        data = f.read()
+    query = urlencode({"name": os.path.basename(pdf_path), "dpi": args.dpi})
+    
+    with contextlib.ExitStack() as stack:
+        url = args.url
+        if args.spawn:
+            print("サーバーを起動しています...", flush=True)
+            url = stack.enter_context(spawn_server(args.workers))
+        warmup = args.warmup if args.warmup is not None else args.concurrency
+        if warmup:
+            run_load(url, data, args.concurrency, requests=warmup, mode=args.mode, query=query)
+        print(f"負荷試験中: {url}（{args.mode}、同時接続 {args.concurrency}、"
+              f"{os.path.basename(pdf_path)} {len(data) / 1024:.0f}KB）", flush=True)
+        latencies, errors, wall = run_load(
+            url, data, args.concurrency, args.requests, args.duration, args.mode, query
+        )
+    
+    summary = summarize(latencies, errors, wall)
+    summary.update(mode=args.mode, concurrency=args.concurrency, pdf=os.path.basename(pdf_path), dpi=args.dpi)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
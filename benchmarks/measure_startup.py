@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+GUIアプリケーションの起動時間を計測するスクリプト
+GUIを --measure-startup 付きで複数回起動し、ウィンドウの最初の描画までの時間と
+変換エンジンの読み込みが終わるまでの時間の中央値を表示します
+結果は履歴ファイルに追記し、前回の計測結果と比較します
+"""
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUI_SCRIPT = os.path.join(ROOT_DIR, "src", "pdf2pptx_gui.py")
+DEFAULT_HISTORY = os.path.join(ROOT_DIR, "benchmarks", "startup_history.jsonl")
+
+# 表示する項目（GUIが書き出す計測結果のキー）と説明
+METRICS = [
+    ("import", "モジュールの読み込み"),
+    ("first_frame", "最初の描画まで"),
+    ("launch_to_first_frame", "プロセス起動から最初の描画まで"),
+    ("warmup", "変換エンジンの読み込み完了まで"),
+]
+
+
+def run_once(command, timeout):
+    """GUIを1回起動し、書き出された計測結果を返す"""
+    # --windowedでビルドした実行ファイルは標準出力を持たないため、計測結果はファイルで受け取る
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, "startup.jsonl")
+        env = dict(os.environ)
+        env["PDF2PPTX_STARTUP_LOG"] = log_path
+        env["PDF2PPTX_LAUNCH_TIME"] = repr(time.time())
+        process = subprocess.run(
+            command, capture_output=True, text=True, env=env, timeout=timeout, cwd=ROOT_DIR
+        )
+        if not os.path.exists(log_path):
+            raise RuntimeError(f"計測結果を取得できませんでした（終了コード {process.returncode}）:\n{process.stderr}")
+        with open(log_path, encoding="utf-8") as f:
+            return json.loads(f.readlines()[-1])
+
+
+def current_commit():
+    """現在のコミットのハッシュを返す（取得できない場合はNone）"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT_DIR
+        )
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def load_last_record(history_path, target):
+    """履歴ファイルから同じ対象の前回の計測結果を返す"""
+    if not os.path.exists(history_path):
+        return None
+    last = None
+    with open(history_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                if record.get("target") == target:
+                    last = record
+    return last
+
+
+def main():
+    """起動時間を計測して結果を表示する"""
+    parser = argparse.ArgumentParser(description="GUIアプリケーションの起動時間を計測します")
+    parser.add_argument("--runs", type=int, default=5, help="起動する回数（既定: 5）")
+    parser.add_argument("--exe", default=None, help="計測する実行ファイル（既定: ソースのGUIをPythonで起動）")
+    parser.add_argument("--history", default=DEFAULT_HISTORY, help="計測結果を追記する履歴ファイル")
+    parser.add_argument("--no-history", action="store_true", help="履歴ファイルに追記しない")
+    parser.add_argument("--timeout", type=float, default=120, help="1回の起動のタイムアウト（秒）")
+    args = parser.parse_args()
+    
+    if args.exe:
+        command = [os.path.abspath(args.exe), "--measure-startup"]
+        target = os.path.basename(args.exe)
+    else:
+        command = [sys.executable, GUI_SCRIPT, "--measure-startup"]
+        target = "source"
+    
+    samples = []
+    for i in range(args.runs):
+        samples.append(run_once(command, args.timeout))
+        print(f"{i + 1}/{args.runs}: {json.dumps(samples[-1])}")
+    
+    medians = {}
+    for key, _ in METRICS:
+        values = [sample[key] for sample in samples if key in sample]
+        if values:
+            medians[key] = round(statistics.median(values), 4)
+    
+    last = load_last_record(args.history, target)
+    print(f"\n起動時間（{target}、{args.runs}回の中央値）")
+    for key, label in METRICS:
+        if key not in medians:
+            continue
+        line = f"  {label}: {medians[key] * 1000:.0f} ms"
+        if last and key in last.get("median", {}):
+            line += f"（前回 {last['median'][key] * 1000:.0f} ms、{(medians[key] - last['median'][key]) * 1000:+.0f} ms）"
+        print(line)
+    
+    if not args.no_history:
+        record = {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": current_commit(),
+            "target": target,
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "runs": args.runs,
+            "median": medians,
+        }
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\n計測結果を {args.history} に追記しました")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
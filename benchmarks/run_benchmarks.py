@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+PDF変換のベンチマークを実行するスクリプト
+corpus.pyで生成したPDFをPDFConverterで変換し、ページ/秒・段階ごとの時間・
+ピーク時のメモリ使用量（RSS）・出力サイズを計測します
+保存済みのベースラインと比較し、許容範囲を超えて悪化した項目を回帰として報告します
+
+    python benchmarks/run_benchmarks.py                     # quickスイートを実行してベースラインと比較
+    python benchmarks/run_benchmarks.py --suite full        # 5000ページまでのPDFを含むスイート
+    python benchmarks/run_benchmarks.py --update-baseline   # 結果をベースラインとして保存
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(BENCHMARK_DIR), "src")
+DEFAULT_CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+# スイートごとのPDF（種類, ページ数）
+SUITES = {
+    "quick": [("text", 1), ("text", 50), ("vector", 20), ("scanned", 20), ("mixed", 40)],
+    "full": [
+        ("text", 1), ("text", 500), ("text", 5000), ("vector", 200), ("scanned", 200), ("mixed", 1000)
+    ],
+}
+
+# 変換の設定（PDFConverterの属性）
+CONFIGS = {
+    "default": {},
+    "in_memory": {"in_memory": True, "save_images": False},
+    "parallel": {"workers": 0},
+    "pipeline": {"pipeline": True, "save_images": False},
+}
+
+# 回帰とみなす変化の割合（ベースラインに対して、悪化する方向の変化）
+TOLERANCES = {
+    "pages_per_second": 0.10,  # 低下
+    "peak_rss_mb": 0.15,  # 増加
+    "output_bytes": 0.05,  # 増加
+}
+
+# 値が小さいほど良い項目
+LOWER_IS_BETTER = {"peak_rss_mb", "output_bytes"}
+
+def _peak_rss_mb(children=False):
+    """プロセス（childrenがTrueの場合は終了した子プロセスの最大）のピーク時のRSS（MB）を返す"""
+    try:
+        import resource
+    except ImportError:
+        # Windowsではresourceモジュールがないため、psutilがあれば使う
+        if children:
+            return None
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / (1024 * 1024), 1)
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrssはmacOSではバイト、それ以外ではKB
+    scale = 1 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss * scale / (1024 * 1024), 1)
+
+
+def _folder_size(path):
+    """フォルダ内のファイルの合計バイト数を返す"""
+    return sum(
+        os.path.getsize(os.path.join(folder, name))
+        for folder, _, files in os.walk(path) for name in files
+    )
+
+
+def run_case(pdf_path, config, dpi):
+    """
+    1つのPDFを変換して計測結果を返す（ベンチマークの子プロセスで実行される）
+    
+    Returns:
+        dict: 計測結果
+    """
+    sys.path.insert(0, SRC_DIR)
+    import fitz  # PyMuPDF
+    from pdf_converter import PDFConverter
+    
+    converter = PDFConverter()
+    converter.dpi = dpi
+    for name, value in CONFIGS[config].items():
+        setattr(converter, name, value)
+    
+    with fitz.open(pdf_path) as document:
+        pages = len(document)
+    
+    output_folder = tempfile.mkdtemp(prefix="pdf2pptx_bench_")
+    try:
+        base_rss = _peak_rss_mb()
+        start = time.perf_counter()
+        pptx_path, images_folder = converter.convert_pdf_to_pptx(pdf_path, output_folder)
+        seconds = time.perf_counter() - start
+        metrics = converter.metrics.to_dict()
+        return {
+            "pages": pages,
+            "seconds": round(seconds, 4),
+            "pages_per_second": round(pages / seconds, 3),
+            "stages": metrics["stages"],
+            # ページごとのレンダリング・エンコードの合計（並列処理ではワーカーの時間の合計）
+            "render_seconds": metrics["totals"]["render_seconds"],
+            "encode_seconds": metrics["totals"]["encode_seconds"],
+            "base_rss_mb": base_rss,
+            "peak_rss_mb": _peak_rss_mb(),
+            "peak_child_rss_mb": _peak_rss_mb(children=True),
+            "output_bytes": os.path.getsize(pptx_path),
+            "images_bytes": _folder_size(images_folder) if images_folder else 0,
+        }
+    finally:
+        shutil.rmtree(output_folder, ignore_errors=True)
+
+
+def run_case_in_subprocess(pdf_path, config, dpi):
+    """ピーク時のメモリ使用量を個別に計測するため、新しいプロセスで1つのPDFを変換する"""
+    process = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-case", pdf_path, "--config", config, "--dpi", str(dpi)],
+        capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{os.path.basename(pdf_path)}（{config}）の変換に失敗しました:\n{process.stderr}")
+    # ライブラリの警告などが標準出力に含まれる場合があるため、最後のJSONの行を使う
+    for line in reversed(process.stdout.splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    raise RuntimeError(f"{os.path.basename(pdf_path)}（{config}）の計測結果を取得できませんでした")
+
+
+def summarize(samples):
+    """繰り返し計測した結果を中央値にまとめる"""
+    result = dict(samples[0])
+    for key in ("seconds", "pages_per_second", "render_seconds", "encode_seconds", "base_rss_mb", "peak_rss_mb",
+                "peak_child_rss_mb"):
+        values = [sample[key] for sample in samples if sample.get(key) is not None]
+        result[key] = round(statistics.median(values), 4) if values else None
+    stages = {stage for sample in samples for stage in sample["stages"]}
+    result["stages"] = {
+        stage: round(statistics.median(sample["stages"].get(stage, 0.0) for sample in samples), 4)
+        for stage in sorted(stages)
+    }
+    result["repeat"] = len(samples)
+    return result
+
+
+def result_key(kind, pages, config, dpi):
+    """ベースラインで結果を識別するキーを返す"""
+    return f"{kind}-{pages}/{config}@{dpi}dpi"
+
+
+def compare_with_baseline(results, baseline, tolerances=None):
+    """
+    計測結果をベースラインと比較する
+    
+    Args:
+        results (dict): キーごとの計測結果
+        baseline (dict): キーごとのベースラインの計測結果
+        tolerances (dict, optional): 項目ごとの許容する変化の割合（既定: TOLERANCES）
+    
+    Returns:
+        list: 回帰した項目の (キー, 項目, ベースラインの値, 計測値, 変化の割合) のリスト
+    """
+    tolerances = tolerances or TOLERANCES
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        for metric, tolerance in tolerances.items():
+            before = baseline[key].get(metric)
+            after = result.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = change > tolerance if metric in LOWER_IS_BETTER else change < -tolerance
+            if worse:
+                regressions.append((key, metric, before, after, change))
+    return regressions
+
+
+def load_baseline(path):
+    """ベースラインを読み込む（ファイルがなければ空の辞書）"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path, results):
+    """計測結果をベースラインに保存する（同じキーの結果は置き換える）"""
+    baseline = load_baseline(path)
+    baseline.update(results)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"platform": sys.platform, "python": sys.version.split()[0], "results": baseline},
+            f, ensure_ascii=False, indent=2, sort_keys=True
+        )
+        f.write("\n")
+
+
+def parse_cases(text):
+    """--casesの指定（例: text:50,mixed:200）を (種類, ページ数) のリストにする"""
+    cases = []
+    for item in text.split(","):
+        kind, _, pages = item.strip().partition(":")
+        cases.append((kind, int(pages or 1)))
+    return cases
+
+
+def print_results(results):
+    """計測結果を表にして表示する"""
+    print(f"\n{'ケース':<36} {'秒':>8} {'ページ/秒':>10} {'RSS(MB)':>9} {'出力(MB)':>9}  段階ごとの秒数")
+    for key, result in results.items():
+        stages = ", ".join(f"{stage} {seconds:.2f}" for stage, seconds in result["stages"].items())
+        rss = result["peak_rss_mb"] if result["peak_rss_mb"] is not None else "-"
+        print(
+            f"{key:<36} {result['seconds']:>8.2f} {result['pages_per_second']:>10.1f} {rss:>9} "
+            f"{result['output_bytes'] / (1024 * 1024):>9.2f}  {stages}"
+        )
+
+
+def main():
+    """ベンチマークを実行して結果を表示する"""
+    parser = argparse.ArgumentParser(description="PDF変換のベンチマークを実行します")
+    parser.add_argument("--suite", choices=sorted(SUITES), default="quick", help="実行するスイート（既定: quick）")
+    parser.add_argument("--cases", default=None, help="スイートの代わりに実行するPDF（例: text:50,mixed:200）")
+    parser.add_argument(
+        "--config", action="append", choices=sorted(CONFIGS), default=None,
+        help="変換の設定（複数指定可、既定: default）"
+    )
+    parser.add_argument("--dpi", type=int, default=150, help="変換の解像度（既定: 150）")
+    parser.add_argument("--repeat", type=int, default=1, help="各ケースを計測する回数（中央値を使用、既定: 1）")
+    parser.add_argument("--corpus-dir", default=DEFAULT_CORPUS_DIR, help="生成したPDFを保存するフォルダ")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="ベースラインのファイル")
+    parser.add_argument("--update-baseline", action="store_true", help="計測結果をベースラインとして保存する")
+    parser.add_argument("--output", default=None, help="計測結果を保存するJSONファイル")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    configs = args.config or ["default"]
+    if args.run_case:
+        # 子プロセスとして1つのPDFを変換する
+        print(json.dumps(run_case(args.run_case, configs[0], args.dpi)))
+        return 0
+    
+    sys.path.insert(0, BENCHMARK_DIR)
+    from corpus import ensure_corpus
+    
+    cases = parse_cases(args.cases) if args.cases else SUITES[args.suite]
+    print(f"ベンチマーク用のPDFを準備しています（{args.corpus_dir}）...")
+    paths = ensure_corpus(args.corpus_dir, cases)
+    
+    results = {}
+    for kind, pages in cases:
+        for config in configs:
+            key = result_key(kind, pages, config, args.dpi)
+            print(f"計測中: {key}", flush=True)
+            samples = [
+                run_case_in_subprocess(paths[(kind, pages)], config, args.dpi) for _ in range(args.repeat)
+            ]
+            results[key] = summarize(samples)
+    
+    print_results(results)
+    
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": results}, f, ensure_ascii=False, indent=2)
+    
+    exit_code = 0
+    baseline = load_baseline(args.baseline)
+    if baseline:
+        regressions = compare_with_baseline(results, baseline)
+        compared = sum(1 for key in results if key in baseline)
+        print(f"\nベースラインとの比較（{compared}ケース）:")
+        for key, metric, before, after, change in regressions:
+            print(f"  回帰: {key} {metric}: {before} → {after}（{change:+.1%}）")
+        if regressions:
+            exit_code = 1
+        else:
+            print("  回帰はありません")
+    else:
+        print(f"\nベースラインがありません（--update-baselineで {args.baseline} に保存します）")
+    
+    if args.update_baseline:
+        save_baseline(args.baseline, results)
+        print(f"ベースラインを更新しました: {args.baseline}")
+        exit_code = 0
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,50 +3,191 @@
 """
 PDF to PPTX Converter用のビルドスクリプト
 PyInstallerを使用して実行ファイル化します
+
+ビルドの形式（--mode）:
+    onefile: 1つの実行ファイル。起動のたびにPythonの実行環境とライブラリを一時フォルダに展開する
+    onedir: 実行ファイルとライブラリを1つのフォルダに展開済みで配布する。展開がないため起動が速い
+    all: 両方をビルドして比較する
+ビルド後に、各形式の配布サイズと起動時間を表示します
 """
+import argparse
+import json
 import os
 import sys
 import subprocess
 import shutil
 import platform
+import statistics
+import time
 
-def main():
-    """メインビルド処理"""
-    print("PDF to PPTX Converterのビルドを開始します...")
-    
-    # ビルド設定
-    entry_point = os.path.join('src', 'pdf2pptx_gui.py')
-    app_name = "pdf2pptx_converter"
-    icon_file = os.path.join('resources', 'app_icon.ico') if os.path.exists(os.path.join('resources', 'app_icon.ico')) else None
-    
-    # OSによって実行ファイルの拡張子を変更
-    ext = '.exe' if platform.system() == 'Windows' else ''
-    
-    # PyInstallerのコマンド構築
+# 変換・GUIで使わないため実行ファイルに含めないモジュール
+EXCLUDED_MODULES = [
+    'xlsxwriter',  # python-pptxのグラフのデータ用（グラフは作成しない）
+    'numpy',  # Pillow・PyMuPDFの任意の依存（使用しない）
+    'pytest',
+    'IPython',
+    'matplotlib',
+    'pydoc_data',
+]
+
+# バイトコードの最適化レベル（1: assert文を除いてコンパイルする）
+OPTIMIZE_LEVEL = 1
+
+BUILD_MODES = ['onefile', 'onedir']
+
+# 起動時間の計測で、1回の起動を待つ最大の秒数
+STARTUP_TIMEOUT = 120
+
+def build_command(build_cli, mode, app_name, entry_point, icon_file=None, dist_path=None, work_path=None):
+    """PyInstallerのコマンドを作成する"""
     cmd = [
         'pyinstaller',
-        '--onefile',
+        '--' + mode,
         '--clean',
+        '--noconfirm',
         '--name=' + app_name,
-        '--windowed'  # GUIアプリケーションなのでコンソールを表示しない
+        '--optimize=' + str(OPTIMIZE_LEVEL)
     ]
+    if build_cli:
+        # コマンドライン版はコンソールに出力し、GUIのライブラリを含めない
+        cmd.extend(['--console', '--exclude-module=tkinter'])
+    else:
+        cmd.append('--windowed')  # GUIアプリケーションなのでコンソールを表示しない
+    cmd.extend('--exclude-module=' + module for module in EXCLUDED_MODULES)
+    
+    if dist_path:
+        cmd.append('--distpath=' + dist_path)
+    if work_path:
+        cmd.append('--workpath=' + work_path)
     
     # アイコンファイルが存在する場合は追加
     if icon_file:
         cmd.append('--icon=' + icon_file)
-      # エントリポイントを追加
+    # エントリポイントを追加
     cmd.append(entry_point)
+    return cmd
+
+def bundle_size(path):
+    """配布するファイル（onedirの場合はフォルダ全体）の合計バイト数とファイル数を返す"""
+    if os.path.isfile(path):
+        return os.path.getsize(path), 1
+    total = 0
+    count = 0
+    for folder, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(folder, name)
+            # onedirではライブラリの別名がシンボリックリンクになっているため、重複して数えない
+            if os.path.islink(file_path):
+                continue
+            total += os.path.getsize(file_path)
+            count += 1
+    return total, count
+
+def measure_startup(executable, build_cli, runs):
+    """
+    実行ファイルを繰り返し起動して、起動時間（秒）のリストを返す
     
-    # ビルド実行
-    print(f"実行コマンド: {' '.join(cmd)}")
-    try:
-        # capture_output=Falseでリアルタイムに出力を表示
-        result = subprocess.run(cmd, check=True, capture_output=False)
-        print(f"\nビルド成功！distフォルダに{app_name}{ext}が作成されました。")
-    except subprocess.CalledProcessError as e:
-        print(f"\nビルド中にエラーが発生しました: {e}")
-        return 1
+    GUIはプロセスの起動から最初の描画までの時間（--measure-startup）、
+    コマンドライン版は --help が終了するまでの時間を計測します。
+    1回目はビルド直後の最も遅い起動（コールドスタート）に近い値になります。
+    """
+    times = []
+    for _ in range(runs):
+        if build_cli:
+            start = time.perf_counter()
+            subprocess.run([executable, '--help'], check=True, capture_output=True, timeout=STARTUP_TIMEOUT)
+            times.append(time.perf_counter() - start)
+        else:
+            sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks'))
+            from measure_startup import run_once
+            record = run_once([executable, '--measure-startup'], STARTUP_TIMEOUT)
+            times.append(record.get('launch_to_first_frame', record['first_frame']))
+    return times
+
+def report(results):
+    """各形式の配布サイズと起動時間を表示する"""
+    print("\nビルド結果:")
+    print(f"  {'形式':<8} {'サイズ':>10} {'ファイル数':>8} {'初回起動':>10} {'起動(中央値)':>12}")
+    for result in results:
+        first = median = "-"
+        if result['startup']:
+            first = f"{result['startup'][0] * 1000:.0f} ms"
+            median = f"{statistics.median(result['startup']) * 1000:.0f} ms"
+        elif result['startup_error']:
+            first = "計測不可"
+        print(f"  {result['mode']:<8} {result['bytes'] / (1024 * 1024):>7.1f} MB {result['files']:>8} {first:>10} {median:>12}")
+        if result['startup_error']:
+            print(f"    起動時間を計測できませんでした: {result['startup_error']}")
+
+def main():
+    """メインビルド処理"""
+    parser = argparse.ArgumentParser(description="PyInstallerで実行ファイルをビルドします")
+    parser.add_argument('--cli', action='store_true', help="コマンドライン版（pdf2pptx）をビルドする")
+    parser.add_argument(
+        '--mode', choices=BUILD_MODES + ['all'], default='onefile',
+        help="ビルドの形式（onedirは起動が速い、allは両方をビルドして比較、既定: onefile）"
+    )
+    parser.add_argument('--runs', type=int, default=3, help="起動時間を計測する回数（0で計測しない、既定: 3）")
+    args = parser.parse_args()
+    
+    print("PDF to PPTX Converterのビルドを開始します...")
+    
+    # ビルド設定
+    if args.cli:
+        entry_point = os.path.join('src', 'pdf2pptx_cli.py')
+        app_name = "pdf2pptx"
+    else:
+        entry_point = os.path.join('src', 'pdf2pptx_gui.py')
+        app_name = "pdf2pptx_converter"
+    icon_file = os.path.join('resources', 'app_icon.ico') if os.path.exists(os.path.join('resources', 'app_icon.ico')) else None
+    
+    # OSによって実行ファイルの拡張子を変更
+    ext = '.exe' if platform.system() == 'Windows' else ''
+    
+    modes = BUILD_MODES if args.mode == 'all' else [args.mode]
+    results = []
+    for mode in modes:
+        # 両方をビルドする場合は、形式ごとに出力先を分ける
+        dist_path = os.path.join('dist', mode) if len(modes) > 1 else 'dist'
+        work_path = os.path.join('build', mode) if len(modes) > 1 else None
+        cmd = build_command(args.cli, mode, app_name, entry_point, icon_file, dist_path, work_path)
         
+        # ビルド実行
+        print(f"実行コマンド: {' '.join(cmd)}")
+        try:
+            # capture_output=Falseでリアルタイムに出力を表示
+            subprocess.run(cmd, check=True, capture_output=False)
+        except subprocess.CalledProcessError as e:
+            print(f"\nビルド中にエラーが発生しました: {e}")
+            return 1
+        
+        if mode == 'onefile':
+            bundle_path = os.path.join(dist_path, app_name + ext)
+            executable = bundle_path
+        else:
+            bundle_path = os.path.join(dist_path, app_name)
+            executable = os.path.join(bundle_path, app_name + ext)
+        print(f"\nビルド成功！{bundle_path}が作成されました。")
+        
+        size, files = bundle_size(bundle_path)
+        result = {
+            'mode': mode, 'path': bundle_path, 'bytes': size, 'files': files,
+            'startup': [], 'startup_error': None
+        }
+        if args.runs > 0:
+            try:
+                result['startup'] = measure_startup(os.path.abspath(executable), args.cli, args.runs)
+            except Exception as e:
+                # 画面のない環境などでは計測できない
+                result['startup_error'] = str(e).strip().splitlines()[-1] if str(e).strip() else type(e).__name__
+        results.append(result)
+    
+    report(results)
+    report_path = os.path.join('dist', 'build_report.json')
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({'app': app_name, 'platform': sys.platform, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"\nビルド結果を {report_path} に保存しました")
+    
     return 0
 
 if __name__ == "__main__":
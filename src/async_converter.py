@@ -0,0 +1,309 @@
+"""
+asyncioから使うPDF変換のAPI
+Webサーバーなどのイベントループから、同時に変換する数を制限しながらPDFをPPTXに変換します
+変換はプロセスプールのワーカープロセスで行い、進捗は非同期イテレータで受け取り、
+変換のタスクをキャンセルするとワーカーの変換もページの区切りで中断します
+
+    async with AsyncPDFConverter(max_concurrency=4) as converter:
+        job = converter.submit("input.pdf", "output")
+        async for event in job.progress():
+            print(event.status, event.message, event.progress)
+        result = await job
+"""
+import asyncio
+import collections
+import contextlib
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from cancellation import CancellationToken
+from pdf_converter import ConversionResult, PDFConverter
+
+
+# ワーカーから変換の最後の進捗が届くまで待つ時間の上限（秒）
+# ワーカープロセスが異常終了して進捗の終わりが届かない場合に使う
+PROGRESS_DRAIN_TIMEOUT = 1.0
+
+# 進捗の通知（PDFConverterのコールバックの引数）
+ProgressEvent = collections.namedtuple("ProgressEvent", ["status", "message", "progress"])
+
+# ワーカープロセスの進捗の送り先（_init_async_workerで設定する）
+_progress_queue = None
+
+
+def _init_async_worker(progress_queue):
+    """非同期APIのワーカープロセスの初期化"""
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _warm_up_worker():
+    """
+    ワーカープロセスで変換の準備をする（変換エンジンのライブラリを読み込み、空のPPTXとPDFを作成する）
+    
+    Returns:
+        int: ワーカープロセスのID
+    """
+    import fitz  # PyMuPDF
+    from pptx import Presentation
+    
+    Presentation()
+    fitz.open().close()
+    return os.getpid()
+
+
+def _convert_job_worker(converter, job_id, pdf_path, output_folder, cancel_token):
+    """
+    ワーカープロセスで1ファイルを変換する
+    
+    進捗は (job_id, status, message, progress) として送り、変換が終わると
+    (job_id, None, None, None) を送ります（同じプロセスからの送信は順序が保たれます）。
+    失敗した場合は例外をそのまま送出し、呼び出し側のawaitで同じ例外が送出されます。
+    """
+    def callback(status, message, progress=None):
+        _progress_queue.put((job_id, status, message, progress))
+    
+    start_time = time.perf_counter()
+    try:
+        pptx_path, images_folder = converter.convert_pdf_to_pptx(pdf_path, output_folder, callback, cancel_token)
+    finally:
+        _progress_queue.put((job_id, None, None, None))
+    return ConversionResult(
+        pdf_path, pptx_path, images_folder, elapsed=time.perf_counter() - start_time,
+        metrics=converter.metrics.to_dict()
+    )
+
+
+class ConversionJob:
+    """AsyncPDFConverter.submitで開始した1ファイルの変換
+    
+    awaitすると変換結果（ConversionResult）を返します。変換に失敗した場合は
+    PDFConverter.convert_pdf_to_pptxと同じ例外（FileNotFoundError・ValueError）を送出します。
+    awaitしているタスクやcancelでキャンセルすると、ワーカーの変換を中断して
+    一時フォルダなどを削除してからasyncio.CancelledErrorを送出します。
+    
+    Attributes:
+        pdf_path (str): 変換するPDFファイルのパス
+    """
+    
+    def __init__(self, pdf_path):
+        """初期化メソッド"""
+        self.pdf_path = pdf_path
+        self._events = asyncio.Queue()
+        self._drained = asyncio.Event()
+        self._task = None
+    
+    def __await__(self):
+        return self._task.__await__()
+    
+    def __aiter__(self):
+        return self.progress()
+    
+    async def progress(self):
+        """
+        進捗の通知（ProgressEvent）を順に返す非同期イテレータ
+        
+        変換が終わる（成功・失敗・キャンセル）と終了します。通知は一度だけ受け取れます。
+        """
+        while True:
+            event = await self._events.get()
+            if event is None:
+                return
+            yield event
+    
+    def cancel(self):
+        """変換をキャンセルする"""
+        return self._task.cancel()
+    
+    def done(self):
+        """変換が終わったかどうか"""
+        return self._task.done()
+
+
+class AsyncPDFConverter:
+    """asyncioのイベントループからPDFをPPTXに変換するクラス
+    
+    変換の設定はconverter（PDFConverter）から引き継ぎ、変換ごとに設定をコピーした
+    専用のPDFConverterを使うため、同時に変換してもインスタンスの状態（temp_folderなど）は共有されません。
+    同時に変換するファイル数はmax_concurrencyまでに制限し、それ以上は順番を待ちます。
+    ワーカープロセスとプロセス間の通信に使うプロセスは最初の変換で起動し、aclose（async withを抜けるとき）で終了します。
+    """
+    
+    def __init__(self, converter=None, max_concurrency=None):
+        """
+        初期化メソッド
+        
+        Args:
+            converter (PDFConverter, optional): 変換の設定。指定がなければ既定の設定
+            max_concurrency (int, optional): 同時に変換するファイル数（ワーカープロセス数）。指定がなければCPUコア数
+        """
+        self.converter = converter if converter is not None else PDFConverter()
+        self.max_concurrency = max(1, max_concurrency or os.cpu_count() or 1)
+        self._loop = None
+        self._semaphore = None
+        self._starting = None  # ワーカープロセスなどの起動（最初の変換で開始する）
+        self._executor = None
+        self._manager = None
+        self._progress_queue = None
+        self._drain_thread = None
+        self._jobs = {}  # ワーカーで変換中のジョブ（進捗の送り先）
+        self._job_ids = itertools.count()
+        self._tasks = set()
+        self._closed = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose(cancel=exc_type is not None)
+    
+    def submit(self, pdf_path, output_folder=None, converter=None):
+        """
+        PDFファイルの変換を開始する（実行中のイベントループから呼び出す）
+        
+        Args:
+            pdf_path (str): 変換するPDFファイルのパス
+            output_folder (str, optional): 出力先フォルダのパス。指定がなければPDFと同じ場所
+            converter (PDFConverter, optional): この変換だけに使う設定。指定がなければself.converterの設定
+        
+        Returns:
+            ConversionJob: 変換のジョブ（awaitで結果、progressで進捗を受け取る）
+        """
+        if self._closed:
+            raise RuntimeError("AsyncPDFConverterは既に終了しています")
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        elif self._loop is not loop:
+            raise RuntimeError("AsyncPDFConverterは最初に使ったイベントループでのみ使えます")
+        
+        job = ConversionJob(pdf_path)
+        converter = (converter if converter is not None else self.converter)._clone_for_batch()
+        job._task = loop.create_task(self._run(job, converter, output_folder))
+        self._tasks.add(job._task)
+        job._task.add_done_callback(self._tasks.discard)
+        return job
+    
+    async def convert(self, pdf_path, output_folder=None, converter=None):
+        """PDFファイルを変換して結果（ConversionResult）を返す（submitしてawaitするのと同じ）"""
+        return await self.submit(pdf_path, output_folder, converter)
+    
+    async def warm_up(self):
+        """
+        ワーカープロセスをすべて起動し、変換エンジンのライブラリを読み込んでおく
+        
+        最初の変換でプロセスの起動とライブラリの読み込みを待たないようにするために使います。
+        同時に作業を渡すことで、ProcessPoolExecutorにmax_concurrency個のプロセスを起動させます。
+        
+        Returns:
+            list: 準備したワーカープロセスのIDのリスト
+        """
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._start()
+        return await asyncio.gather(*[
+            self._loop.run_in_executor(self._executor, _warm_up_worker) for _ in range(self.max_concurrency)
+        ])
+    
+    async def aclose(self, cancel=False):
+        """
+        変換の終了を待ち、ワーカープロセスを終了する
+        
+        Args:
+            cancel (bool, optional): Trueの場合は、変換中・順番待ちの変換をキャンセルする
+        """
+        self._closed = True
+        tasks = list(self._tasks)
+        if cancel:
+            for task in tasks:
+                task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if self._starting is not None:
+            await self._starting
+            await self._loop.run_in_executor(None, self._shutdown)
+    
+    async def _run(self, job, converter, output_folder):
+        """順番を待ってワーカーで変換し、キャンセルされた場合はワーカーの変換を中断する"""
+        try:
+            async with self._semaphore:
+                await self._start()
+                # Managerのイベントはプロセス間で受け渡しできるため、作業ごとにワーカーへ渡せる
+                token = CancellationToken(await self._loop.run_in_executor(None, self._manager.Event))
+                job_id = next(self._job_ids)
+                self._jobs[job_id] = job
+                try:
+                    future = self._loop.run_in_executor(
+                        self._executor, _convert_job_worker, converter, job_id, job.pdf_path, output_folder, token
+                    )
+                    try:
+                        return await asyncio.shield(future)
+                    except asyncio.CancelledError:
+                        # ワーカーに中断を伝え、一時フォルダの削除などが終わるまで待つ
+                        await self._loop.run_in_executor(None, token.cancel)
+                        with contextlib.suppress(Exception):
+                            await future
+                        raise
+                finally:
+                    # ワーカーから送られた進捗をすべて受け取ってから終了する
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(job._drained.wait(), PROGRESS_DRAIN_TIMEOUT)
+                    self._jobs.pop(job_id, None)
+        finally:
+            job._events.put_nowait(None)
+    
+    async def _start(self):
+        """最初の変換でワーカープロセスと進捗を受け取るスレッドを起動する"""
+        if self._starting is None:
+            self._starting = self._loop.run_in_executor(None, self._start_pool)
+        # 起動を待つ変換がキャンセルされても、起動は最後まで行う
+        await asyncio.shield(self._starting)
+    
+    def _start_pool(self):
+        """プロセスプール・Manager・進捗を受け取るスレッドを起動する（イベントループ外で実行）"""
+        self._manager = multiprocessing.Manager()
+        self._progress_queue = multiprocessing.Queue()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_concurrency,
+            initializer=_init_async_worker,
+            initargs=(self._progress_queue,)
+        )
+        self._drain_thread = threading.Thread(target=self._drain_progress)
+        self._drain_thread.daemon = True
+        self._drain_thread.start()
+    
+    def _shutdown(self):
+        """ワーカープロセス・進捗を受け取るスレッド・Managerを終了する（イベントループ外で実行）"""
+        self._executor.shutdown(wait=True)
+        self._progress_queue.put(None)
+        self._drain_thread.join()
+        self._progress_queue.close()
+        self._manager.shutdown()
+    
+    def _drain_progress(self):
+        """ワーカーから届いた進捗をイベントループに渡す（専用のスレッドで実行）"""
+        while True:
+            item = self._progress_queue.get()
+            if item is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._dispatch, *item)
+            except RuntimeError:
+                # イベントループが既に終了している場合
+                return
+    
+    def _dispatch(self, job_id, status, message, progress):
+        """進捗をジョブに渡す（イベントループで実行）"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        if status is None:
+            job._drained.set()
+        else:
+            job._events.put_nowait(ProgressEvent(status, message, progress))
@@ -0,0 +1,55 @@
+"""
+変換のキャンセルを伝えるモジュール
+変換を実行するスレッドやワーカープロセスは、ページや処理の段階の区切りでトークンを確認し、
+キャンセルされていればConversionCancelledを送出して処理を中断します
+"""
+import multiprocessing
+
+
+class ConversionCancelled(Exception):
+    """変換がキャンセルされたことを表す例外"""
+    
+    def __init__(self, message="変換がキャンセルされました"):
+        super().__init__(message)
+
+
+class CancellationToken:
+    """変換のキャンセルを要求するためのトークン
+    
+    GUIのスレッドなど変換を実行していないスレッドからcancelを呼ぶと、
+    変換中のスレッドとワーカープロセスが次の区切りで処理を中断します。
+    プロセス間で共有できるmultiprocessing.Eventを使うため、ワーカープロセスには
+    プロセスの作成時（ProcessPoolExecutorのinitargsなど）に渡してください。
+    作成済みのプロセスプールに作業ごとに渡す場合は、multiprocessing.Manager().Event()のように
+    プロセス間で受け渡しできるイベントを指定します。
+    """
+    
+    def __init__(self, event=None):
+        """
+        初期化メソッド
+        
+        Args:
+            event (optional): キャンセルを伝えるイベント（set・is_setを持つもの）。
+                指定がなければmultiprocessing.Eventを作成する
+        """
+        self._event = event if event is not None else multiprocessing.Event()
+    
+    def cancel(self):
+        """キャンセルを要求する"""
+        self._event.set()
+    
+    @property
+    def cancelled(self):
+        """キャンセルが要求されたかどうか"""
+        return self._event.is_set()
+    
+    def raise_if_cancelled(self):
+        """キャンセルが要求されていればConversionCancelledを送出する"""
+        if self._event.is_set():
+            raise ConversionCancelled()
+
+
+def check_cancelled(token):
+    """トークン（Noneの場合はキャンセルなし）を確認し、キャンセルされていればConversionCancelledを送出する"""
+    if token is not None:
+        token.raise_if_cancelled()
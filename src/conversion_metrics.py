@@ -0,0 +1,222 @@
+"""
+変換の計測結果を集計するモジュール
+ページごとのレンダリング・エンコードの時間と画像のサイズ、変換全体の段階ごとの時間を記録し、
+Chromeのトレース形式（chrome://tracing や Perfetto で表示できるJSON）に書き出します
+"""
+import contextlib
+import json
+import os
+import time
+
+
+# 変換全体の段階の名前
+STAGE_OPEN = "open"  # PDFを開き、ページのキー・重複ページを求める
+STAGE_RENDER = "render"  # ページのレンダリングとエンコード（並行処理では完成を待つ時間）
+STAGE_SLIDES = "slides"  # スライドの追加
+STAGE_SAVE = "save"  # PPTXファイルの保存（prs.save）
+STAGE_COPY = "copy"  # 画像フォルダへの書き出し・コピー
+STAGE_DRAFT = "draft"  # 段階的な変換で、低解像度の下書きのPPTXを保存するまで
+
+# エンコード情報に加える、ページごとの計測値のキー
+PAGE_FIELDS = ("render_seconds", "encode_seconds", "bytes", "width", "height", "encoding", "cached", "tiled")
+
+# トレースでの変換全体の段階を表示する行
+_STAGE_THREAD = 0
+
+
+def add_page_timing(info, started, rendered, finished, byte_count, width, height, **fields):
+    """
+    レンダリング・エンコードの時間と画像のサイズをエンコード情報に加える
+    
+    時刻はtime.perf_counter()の値です。ワーカープロセスで計測した時刻も、
+    プロセス間で共通の単調増加する時計のため、メインプロセスの時刻と比較できます。
+    
+    Args:
+        info (dict): エンコード情報（Noneの場合は新しい辞書を作成する）
+        started (float): レンダリングを開始した時刻
+        rendered (float): レンダリングが終わり、エンコードを開始した時刻
+        finished (float): エンコードが終わった時刻
+        byte_count (int): エンコード済みの画像のバイト数
+        width (int): レンダリングした画像の幅（ピクセル）
+        height (int): レンダリングした画像の高さ（ピクセル）
+        **fields: そのほかに記録する値（cached, tiledなど）
+    
+    Returns:
+        dict: 計測値を加えたエンコード情報
+    """
+    info = dict(info) if info else {}
+    info.update({
+        "render_seconds": rendered - started,
+        "encode_seconds": finished - rendered,
+        "started": started,
+        "pid": os.getpid(),
+        "bytes": byte_count,
+        "width": width,
+        "height": height,
+    })
+    info.update(fields)
+    return info
+
+
+class ConversionMetrics:
+    """1回の変換の計測結果
+    
+    Attributes:
+        pdf_path (str): 変換したPDFファイルのパス
+        pages (dict): ページ番号（0から）をキー、ページごとの計測値の辞書を値とする辞書
+            （重複ページとして省略したページは含まれません）
+        stages (dict): 段階の名前をキー、合計の秒数を値とする辞書
+        total_seconds (float): 変換全体の秒数（finishを呼ぶまではNone）
+    """
+    
+    def __init__(self, pdf_path=None):
+        """
+        初期化メソッド
+        
+        Args:
+            pdf_path (str, optional): 変換するPDFファイルのパス
+        """
+        self.pdf_path = pdf_path
+        self.pages = {}
+        self.stages = {}
+        self.total_seconds = None
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._events = []
+    
+    @contextlib.contextmanager
+    def stage(self, name):
+        """withブロックの実行時間を段階の時間として記録する"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage(name, start, time.perf_counter())
+    
+    def add_stage(self, name, start, end):
+        """開始・終了の時刻（time.perf_counter()の値）を指定して段階の時間を記録する"""
+        self.stages[name] = self.stages.get(name, 0.0) + (end - start)
+        self._add_event(name, "stage", start, end - start, _STAGE_THREAD)
+    
+    def timed_iter(self, name, iterable):
+        """
+        要素を1つ取り出すのにかかる時間を段階の時間として記録しながら、要素を順に返す
+        
+        ジェネレータでレンダリングする場合に、レンダリング（並行処理では完成を待つ時間）を
+        スライドの追加などの呼び出し側の処理と分けて計測するために使います。
+        """
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                self.add_stage(name, start, time.perf_counter())
+                yield item
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+    
+    def record_page(self, page_index, info):
+        """1ページ分の計測値（add_page_timingで加えたエンコード情報）を記録する"""
+        if not info or "render_seconds" not in info:
+            return
+        self.pages[page_index] = {key: info[key] for key in PAGE_FIELDS if key in info}
+        
+        # ページの処理を、処理したプロセスの行に表示する
+        args = {"page": page_index + 1, "bytes": info["bytes"], "size": f"{info['width']}x{info['height']}"}
+        if info.get("encoding"):
+            args["encoding"] = info["encoding"]
+        started = info["started"]
+        self._add_event("render", "page", started, info["render_seconds"], info["pid"], args)
+        self._add_event(
+            "encode", "page", started + info["render_seconds"], info["encode_seconds"], info["pid"], args
+        )
+    
+    def finish(self):
+        """変換全体の時間を記録する"""
+        end = time.perf_counter()
+        self.total_seconds = end - self._origin
+        self._add_event("convert", "conversion", self._origin, self.total_seconds, _STAGE_THREAD,
+                        {"pdf": os.path.basename(self.pdf_path or "")})
+    
+    def _add_event(self, name, category, start, duration, thread, args=None):
+        """トレースのイベント（開始時刻と長さを持つ区間）を追加する"""
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round(duration * 1e6, 1),
+            "pid": self._pid,
+            "tid": thread,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+    
+    def totals(self):
+        """ページごとの計測値の合計を返す"""
+        return {
+            "pages": len(self.pages),
+            "render_seconds": round(sum(page["render_seconds"] for page in self.pages.values()), 4),
+            "encode_seconds": round(sum(page["encode_seconds"] for page in self.pages.values()), 4),
+            "image_bytes": sum(page["bytes"] for page in self.pages.values()),
+        }
+    
+    def to_dict(self):
+        """計測結果をJSONに変換できる辞書で返す（ページ番号は1から）"""
+        pages = []
+        for page_index in sorted(self.pages):
+            page = {"page": page_index + 1}
+            for key, value in self.pages[page_index].items():
+                page[key] = round(value, 6) if isinstance(value, float) else value
+            pages.append(page)
+        return {
+            "pdf_path": self.pdf_path,
+            "total_seconds": round(self.total_seconds, 4) if self.total_seconds is not None else None,
+            "stages": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "totals": self.totals(),
+            "pages": pages,
+        }
+    
+    def to_chrome_trace(self):
+        """Chromeのトレース形式の辞書を返す"""
+        threads = {_STAGE_THREAD} | {event["tid"] for event in self._events}
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": "pdf2pptx"}}
+        ]
+        for thread in sorted(threads):
+            if thread == _STAGE_THREAD:
+                label = "変換の段階"
+            elif thread == self._pid:
+                label = "ページ（メインプロセス）"
+            else:
+                label = f"ページ（ワーカー {thread}）"
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": thread,
+                             "args": {"name": label}})
+        return {
+            "traceEvents": metadata + sorted(self._events, key=lambda event: event["ts"]),
+            "displayTimeUnit": "ms",
+            "otherData": {"pdf_path": self.pdf_path, "stages": self.to_dict()["stages"]},
+        }
+    
+    def save_trace(self, path):
+        """Chromeのトレース形式のJSONファイルに書き出す"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+        return path
+    
+    def summary(self):
+        """計測結果の概要を1行の文字列で返す"""
+        labels = [
+            (STAGE_DRAFT, "下書き"), (STAGE_OPEN, "準備"), (STAGE_RENDER, "レンダリング"), (STAGE_SLIDES, "スライド追加"),
+            (STAGE_SAVE, "保存"), (STAGE_COPY, "画像の書き出し"),
+        ]
+        parts = [f"{label} {self.stages[name]:.2f}秒" for name, label in labels if name in self.stages]
+        if self.total_seconds is not None:
+            parts.insert(0, f"合計 {self.total_seconds:.2f}秒")
+        return "処理時間: " + "、".join(parts)
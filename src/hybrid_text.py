@@ -0,0 +1,147 @@
+"""
+PDFページの文字をPowerPointのテキストボックスとして配置するためのモジュール
+ハイブリッドモードで、文字以外を低解像度の背景画像にし、文字は編集可能なテキストとして残すために使用します
+"""
+import re
+from xml.sax.saxutils import escape, quoteattr
+
+import fitz  # PyMuPDF
+
+
+# 1ポイントあたりのEMU
+EMU_PER_POINT = 12700
+
+# PowerPointで指定できるフォントサイズの範囲（1/100ポイント単位）
+MIN_FONT_SIZE = 100
+MAX_FONT_SIZE = 400000
+
+# get_text("dict")のフォントフラグ
+FONT_FLAG_ITALIC = 2
+FONT_FLAG_BOLD = 16
+
+# 埋め込みフォントのサブセット接頭辞（例: "ABCDEF+"）
+_SUBSET_PREFIX_PATTERN = re.compile(r"^[A-Z]{6}\+")
+
+# フォント名の末尾のスタイル名（例: "-BoldMT", ",Italic"）
+_STYLE_SUFFIX_PATTERN = re.compile(
+    r"[-,](Bold|Italic|Oblique|Regular|Roman|Light|Medium|Semibold|SemiBold|Demi|Black|Heavy|Book)\w*$"
+)
+
+# XMLに含められない制御文字
+_INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_TEXT_BOX_XML = (
+    '<p:sp><p:nvSpPr><p:cNvPr id="{id}" name="TextBox {number}"/>'
+    '<p:cNvSpPr txBox="1"/><p:nvPr/></p:nvSpPr>'
+    '<p:spPr><a:xfrm><a:off x="{x}" y="{y}"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom><a:noFill/></p:spPr>'
+    '<p:txBody><a:bodyPr wrap="none" lIns="0" tIns="0" rIns="0" bIns="0" rtlCol="0">'
+    '<a:noAutofit/></a:bodyPr><a:lstStyle/><a:p>{runs}</a:p></p:txBody></p:sp>'
+)
+
+_TEXT_RUN_XML = (
+    '<a:r><a:rPr lang="ja-JP" sz="{size}" b="{bold}" i="{italic}" dirty="0">'
+    '<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+    '<a:latin typeface={font}/><a:ea typeface={font}/></a:rPr>'
+    '<a:t>{text}</a:t></a:r>'
+)
+
+
+def font_family(font_name):
+    """
+    PDFのフォント名からPowerPointで使うフォント名を求める
+    
+    サブセット接頭辞と、末尾のスタイル名（Bold, Italicなど）を取り除きます。
+    """
+    name = _STYLE_SUFFIX_PATTERN.sub("", _SUBSET_PREFIX_PATTERN.sub("", font_name))
+    return name or font_name
+
+
+def _font_size(points):
+    """フォントサイズ（ポイント）をPowerPointの単位（1/100ポイント）に変換する"""
+    return min(max(round(points * 100), MIN_FONT_SIZE), MAX_FONT_SIZE)
+
+
+def extract_text_lines(page):
+    """
+    ページから横書きの文字を行単位で取り出す
+    
+    縦書きや回転した行、透明な文字（OCRの検索用テキストなど）は対象外で、
+    背景画像にそのまま残ります。
+    
+    Args:
+        page (fitz.Page): 対象のページ
+    
+    Returns:
+        list: 行ごとの辞書のリスト
+            bbox（行の矩形）, spans（get_text("dict")のスパンのリスト）
+    """
+    lines = []
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", []):
+            if tuple(line["dir"]) != (1.0, 0.0):
+                continue
+            spans = [
+                span for span in line["spans"]
+                if span["text"].strip() and span.get("alpha", 255) > 0
+            ]
+            if spans:
+                lines.append({"bbox": fitz.Rect(line["bbox"]), "spans": spans})
+    return lines
+
+
+def remove_text(page, lines):
+    """
+    取り出した文字をページから削除する（図形・画像は残す）
+    
+    ページの内容が書き換わるため、元のPDFファイルには保存しないドキュメントで使用してください。
+    """
+    for line in lines:
+        for span in line["spans"]:
+            page.add_redact_annot(span["bbox"], fill=False)
+    if lines:
+        page.apply_redactions(
+            images=fitz.PDF_REDACT_IMAGE_NONE, graphics=fitz.PDF_REDACT_LINE_ART_NONE
+        )
+
+
+def text_shapes_xml(lines, page_rect, slide_width, slide_height, first_id=3):
+    """
+    行ごとのテキストボックスを表すスライドの図形XML（p:spの並び）を作成する
+    
+    Args:
+        lines (list): extract_text_linesの結果
+        page_rect (fitz.Rect): ページの矩形
+        slide_width (int): スライドの幅（EMU）
+        slide_height (int): スライドの高さ（EMU）
+        first_id (int, optional): 最初のテキストボックスに付ける図形ID
+    
+    Returns:
+        str: 図形XML（名前空間の接頭辞 p, a を使用）
+    """
+    scale_x = slide_width / page_rect.width
+    scale_y = slide_height / page_rect.height
+    shapes = []
+    for number, line in enumerate(lines, start=1):
+        bbox = line["bbox"] - (page_rect.x0, page_rect.y0, page_rect.x0, page_rect.y0)
+        runs = "".join(
+            _TEXT_RUN_XML.format(
+                size=_font_size(span["size"] * scale_y / EMU_PER_POINT),
+                bold=int(bool(span["flags"] & FONT_FLAG_BOLD)),
+                italic=int(bool(span["flags"] & FONT_FLAG_ITALIC)),
+                color=f"{span['color']:06X}",
+                font=quoteattr(font_family(span["font"])),
+                text=escape(_INVALID_XML_CHARS.sub("", span["text"]))
+            )
+            for span in line["spans"]
+        )
+        shapes.append(_TEXT_BOX_XML.format(
+            id=first_id + number - 1,
+            number=number,
+            x=round(bbox.x0 * scale_x),
+            y=round(bbox.y0 * scale_y),
+            cx=max(1, round(bbox.width * scale_x)),
+            cy=max(1, round(bbox.height * scale_y)),
+            runs=runs
+        ))
+    return "".join(shapes)
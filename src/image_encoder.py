@@ -0,0 +1,421 @@
+"""
+ページ画像の内容に応じてエンコード形式をページごとに選択するモジュール
+文字や図形が中心のページはPNG、写真を含むページはJPEGで保存し、画質とファイルサイズを両立します
+"""
+import io
+import math
+
+from PIL import Image, ImageChops
+import fitz  # PyMuPDF
+
+
+# エンコード形式
+ENCODING_JPEG = "jpeg"
+ENCODING_PNG = "png"
+ENCODING_PALETTE = "png8"  # 8ビットのPNG（グレースケールまたはパレット）
+
+# 形式の表示名
+ENCODING_LABELS = {
+    ENCODING_JPEG: "JPEG",
+    ENCODING_PNG: "PNG",
+    ENCODING_PALETTE: "8ビットPNG",
+}
+
+# 自動選択時のJPEGの既定の品質
+DEFAULT_JPEG_QUALITY = 85
+
+# 固定フォーマットのJPEGの品質（pix.tobytes("jpeg")の既定値と同じ）
+FIXED_JPEG_QUALITY = 95
+
+# 目標サイズに合わせる場合のJPEGの品質の下限
+MIN_JPEG_QUALITY = 50
+
+# 目標サイズに合わせる場合の縮小率（辺の長さの比）の下限
+MIN_SCALE = 0.25
+
+# サイズの見積もりに使う縮小画像のピクセル数
+PREVIEW_PIXELS = 512 * 512
+
+# 目標サイズに合わせるために実際にエンコードする回数の上限
+MAX_FIT_ATTEMPTS = 4
+
+# 上限に収まったサイズが上限に対してこの割合未満であれば、品質・縮小率を上げて探し直す
+REFINE_THRESHOLD = 0.9
+
+# 見積もりで目指すサイズの上限に対する割合（見積もりの誤差で上限を超えにくくする）
+FIT_MARGIN = 0.97
+
+# 8ビットPNGで表現できる最大の色数
+PALETTE_MAX_COLORS = 256
+
+# 内容の判定に使用する縮小画像の長辺（ピクセル）
+ANALYSIS_SIZE = 512
+
+# 隣のピクセルと同じ色のピクセルの割合がこの値以上であれば、文字・図形のページとみなす
+FLAT_RATIO_THRESHOLD = 0.75
+
+# PNGのカラータイプ（IHDRチャンク内の位置と、8ビットPNGを表す値）
+_PNG_COLOR_TYPE_OFFSET = 25
+_PNG_8BIT_COLOR_TYPES = (0, 3)  # グレースケール, パレット
+
+
+def detect_encoding(image_bytes):
+    """
+    エンコード済みの画像データから形式を判定する
+    
+    Returns:
+        str: ENCODING_JPEG, ENCODING_PNG, ENCODING_PALETTEのいずれか
+    
+    Raises:
+        ValueError: JPEG・PNG以外の画像データの場合
+    """
+    if image_bytes[:3] == b"\xff\xd8\xff":
+        return ENCODING_JPEG
+    if image_bytes[:8] == b"\x89PNG\r\n\x1a\n":
+        if image_bytes[_PNG_COLOR_TYPE_OFFSET] in _PNG_8BIT_COLOR_TYPES:
+            return ENCODING_PALETTE
+        return ENCODING_PNG
+    raise ValueError("サポートされていない画像形式です")
+
+
+def _encode_fixed(pix, image_format):
+    """固定の画像フォーマット（jpg, png）でエンコードする"""
+    if image_format.lower() == "jpg":
+        return pix.tobytes("jpeg")
+    return pix.tobytes(image_format.lower())
+
+
+class AdaptiveEncoder:
+    """ページ画像の内容からエンコード形式を選択するエンコーダー
+    
+    縮小した画像で色数と「隣のピクセルと同じ色の割合」を調べ、
+    次の順に形式を決めます。
+    
+    1. 色数が256色以下: 8ビットPNG（グレースケールまたはパレット、可逆）
+    2. 同じ色の領域が多い（文字・図形）: PNG（可逆）
+    3. それ以外（写真など）: 指定した品質のJPEG
+    
+    reference_formatを指定すると、同じページを固定フォーマットでエンコードした
+    場合のサイズも計測します（エンコードが1回増えるため、比較したい場合のみ使用）。
+    インスタンスはpickle可能で、ワーカープロセスにそのまま渡せます。
+    """
+    
+    def __init__(self, jpeg_quality=DEFAULT_JPEG_QUALITY, reference_format=None):
+        """
+        初期化メソッド
+        
+        Args:
+            jpeg_quality (int, optional): JPEGを選択した場合の品質（1〜100）
+            reference_format (str, optional): 削減量の比較に使う固定フォーマット（jpg, png）
+        """
+        self.jpeg_quality = jpeg_quality
+        self.reference_format = reference_format
+    
+    @property
+    def format_label(self):
+        """キャッシュキーなどに使うエンコード条件の文字列"""
+        return f"auto-q{self.jpeg_quality}"
+    
+    def choose_encoding(self, image):
+        """
+        画像の内容からエンコード形式を選択する
+        
+        Args:
+            image (PIL.Image.Image): RGBの画像
+        
+        Returns:
+            str: ENCODING_JPEG, ENCODING_PNG, ENCODING_PALETTEのいずれか
+        """
+        # 色を混ぜないよう、最近傍法で縮小して調べる
+        thumbnail = image.copy()
+        thumbnail.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE), Image.Resampling.NEAREST)
+        
+        # 縮小画像で256色を超えていれば、元の画像も超えている
+        if thumbnail.getcolors(PALETTE_MAX_COLORS) is not None:
+            if image.getcolors(PALETTE_MAX_COLORS) is not None:
+                return ENCODING_PALETTE
+        
+        # 右隣のピクセルと同じ色のピクセルの割合
+        difference = ImageChops.difference(thumbnail, ImageChops.offset(thumbnail, 1, 0))
+        flat_ratio = difference.convert("L").histogram()[0] / (thumbnail.width * thumbnail.height)
+        if flat_ratio >= FLAT_RATIO_THRESHOLD:
+            return ENCODING_PNG
+        return ENCODING_JPEG
+    
+    def encode(self, pix):
+        """
+        Pixmapを選択した形式でエンコードする
+        
+        Args:
+            pix (fitz.Pixmap): アルファチャンネルのないRGBのPixmap
+        
+        Returns:
+            tuple: (エンコード済みの画像データ, エンコード情報の辞書)
+                辞書のキーは encoding（選択した形式）, bytes（サイズ）,
+                reference_bytes（固定フォーマットでのサイズ、計測しない場合はNone）
+        """
+        if pix.alpha or pix.n != 3:
+            # 判定の対象外の画像は可逆のPNGにする
+            encoding = ENCODING_PNG
+            image_bytes = pix.tobytes("png")
+        else:
+            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+            encoding = self.choose_encoding(image)
+            image_bytes = self._encode_as(pix, image, encoding)
+        
+        reference_bytes = None
+        if self.reference_format:
+            reference_bytes = len(_encode_fixed(pix, self.reference_format))
+        
+        return image_bytes, {
+            "encoding": encoding,
+            "bytes": len(image_bytes),
+            "reference_bytes": reference_bytes,
+        }
+    
+    def describe(self, image_bytes):
+        """エンコード済みの画像データ（キャッシュから取得したものなど）のエンコード情報を返す"""
+        return {
+            "encoding": detect_encoding(image_bytes),
+            "bytes": len(image_bytes),
+            "reference_bytes": None,
+        }
+    
+    def _encode_as(self, pix, image, encoding):
+        """指定した形式でエンコードする"""
+        if encoding == ENCODING_JPEG:
+            return pix.tobytes("jpeg", jpg_quality=self.jpeg_quality)
+        if encoding == ENCODING_PNG:
+            return pix.tobytes("png")
+        
+        # 無彩色だけのページはグレースケールに変換（RGBの値がそのまま保たれる）
+        grayscale = fitz.Pixmap(fitz.csGRAY, pix)
+        if Image.frombytes("L", (pix.width, pix.height), grayscale.samples).convert("RGB") == image:
+            return grayscale.tobytes("png")
+        
+        # 256色以下の画像ではパレットが元の色そのものになる
+        stream = io.BytesIO()
+        image.convert("P", palette=Image.Palette.ADAPTIVE, colors=PALETTE_MAX_COLORS).save(stream, "PNG")
+        return stream.getvalue()
+
+
+def _scaled_pixmap(pix, scale):
+    """Pixmapを指定した比率で縮小する"""
+    if scale >= 1:
+        return pix
+    width = max(1, round(pix.width * scale))
+    height = max(1, round(pix.height * scale))
+    return fitz.Pixmap(pix, width, height, None)
+
+
+class BudgetEncoder(AdaptiveEncoder):
+    """1ページあたりのバイト数の上限（page_budget）に収まるようにエンコードするエンコーダー
+    
+    まずimage_formatの形式（autoの場合はAdaptiveEncoderの選択した形式）でエンコードし、
+    上限を超えた場合はJPEGの品質を下げ、品質の下限でも収まらなければ画像を縮小します。
+    
+    品質・縮小率は、縮小画像で求めた「品質ごとのサイズの比」と縮小率の2乗に
+    比例するサイズから見積もり、実際のエンコードは見積もりの確認と補正にだけ使います。
+    上限に収まるページは1回、収まらないページも通常2〜4回のエンコードで決まります。
+    """
+    
+    def __init__(self, page_budget, image_format="jpg", jpeg_quality=FIXED_JPEG_QUALITY,
+                 min_quality=MIN_JPEG_QUALITY, reference_format=None):
+        """
+        初期化メソッド
+        
+        Args:
+            page_budget (int): 1ページの画像のバイト数の上限
+            image_format (str, optional): 上限に収まる場合に使う画像フォーマット（jpg, png, auto）
+            jpeg_quality (int, optional): JPEGの品質の上限（1〜100）
+            min_quality (int, optional): JPEGの品質の下限（1〜100）
+            reference_format (str, optional): 削減量の比較に使う固定フォーマット（jpg, png）
+        """
+        super().__init__(jpeg_quality, reference_format)
+        self.page_budget = page_budget
+        self.image_format = image_format
+        self.min_quality = min(min_quality, jpeg_quality)
+    
+    @property
+    def format_label(self):
+        """キャッシュキーなどに使うエンコード条件の文字列"""
+        if self.image_format == "auto":
+            base = super().format_label
+        else:
+            base = self.image_format
+        return f"budget{self.page_budget}-q{self.min_quality}-{self.jpeg_quality}-{base}"
+    
+    def encode(self, pix):
+        """
+        Pixmapを上限に収まるようにエンコードする
+        
+        Returns:
+            tuple: (エンコード済みの画像データ, エンコード情報の辞書)
+                AdaptiveEncoder.encodeのキーに加え、quality（JPEGの品質、JPEG以外はNone）,
+                scale（縮小率）, budget（上限）を含みます
+        """
+        jpeg_bytes = None
+        if self.image_format == "auto":
+            image_bytes, info = super().encode(pix)
+            if info["encoding"] == ENCODING_JPEG:
+                jpeg_bytes = image_bytes
+        elif self.image_format == "png":
+            image_bytes = pix.tobytes("png")
+            info = {"encoding": ENCODING_PNG, "bytes": len(image_bytes), "reference_bytes": None}
+        else:
+            image_bytes = jpeg_bytes = pix.tobytes("jpeg", jpg_quality=self.jpeg_quality)
+            info = {"encoding": ENCODING_JPEG, "bytes": len(image_bytes), "reference_bytes": None}
+        
+        info["quality"] = self.jpeg_quality if info["encoding"] == ENCODING_JPEG else None
+        info["scale"] = 1.0
+        info["budget"] = self.page_budget
+        
+        if len(image_bytes) > self.page_budget:
+            if jpeg_bytes is None:
+                jpeg_bytes = pix.tobytes("jpeg", jpg_quality=self.jpeg_quality)
+            image_bytes, quality, scale = self._fit_jpeg(pix, len(jpeg_bytes))
+            info.update({
+                "encoding": ENCODING_JPEG,
+                "bytes": len(image_bytes),
+                "quality": quality,
+                "scale": scale,
+            })
+        
+        if self.reference_format and info["reference_bytes"] is None:
+            info["reference_bytes"] = len(_encode_fixed(pix, self.reference_format))
+        return image_bytes, info
+    
+    def describe(self, image_bytes):
+        """エンコード済みの画像データのエンコード情報を返す（品質・縮小率は不明のためNone）"""
+        info = super().describe(image_bytes)
+        info.update({"quality": None, "scale": None, "budget": self.page_budget})
+        return info
+    
+    def _fit_jpeg(self, pix, full_bytes):
+        """
+        上限に収まるJPEGの品質と縮小率を探す
+        
+        Args:
+            pix (fitz.Pixmap): 元のPixmap
+            full_bytes (int): 元のサイズ・品質の上限でエンコードしたJPEGのサイズ
+        
+        Returns:
+            tuple: (JPEGのデータ, 品質, 縮小率)
+                上限に収まらない場合は、品質・縮小率とも下限のJPEGを返します
+        """
+        preview = _scaled_pixmap(pix, math.sqrt(PREVIEW_PIXELS / (pix.width * pix.height)))
+        preview_bytes = {}
+        
+        def preview_size(quality):
+            """縮小画像を指定した品質でエンコードしたサイズ"""
+            if quality not in preview_bytes:
+                preview_bytes[quality] = len(preview.tobytes("jpeg", jpg_quality=quality))
+            return preview_bytes[quality]
+        
+        def estimate(quality, scale):
+            """品質・縮小率からサイズを見積もる"""
+            ratio = preview_size(quality) / preview_size(self.jpeg_quality)
+            return full_bytes * ratio * scale * scale * correction
+        
+        target = self.page_budget * FIT_MARGIN
+        correction = 1.0
+        best = None  # 上限に収まった中で最も大きいもの
+        smallest = None  # 上限を超えた中で最も小さいもの
+        tried = set()
+        for _ in range(MAX_FIT_ATTEMPTS):
+            # 品質の下限でも収まらない場合は縮小する
+            scale = 1.0
+            lowest = estimate(self.min_quality, 1.0)
+            if lowest > target:
+                scale = max(MIN_SCALE, math.sqrt(target / lowest))
+            
+            # 収まる範囲で最も高い品質を二分探索で求める
+            low, high = self.min_quality, self.jpeg_quality
+            while low < high:
+                middle = (low + high + 1) // 2
+                if estimate(middle, scale) <= target:
+                    low = middle
+                else:
+                    high = middle - 1
+            quality = low
+            
+            scaled = _scaled_pixmap(pix, scale)
+            if (quality, scaled.width, scaled.height) in tried:
+                break
+            tried.add((quality, scaled.width, scaled.height))
+            
+            expected = estimate(quality, scale)
+            image_bytes = scaled.tobytes("jpeg", jpg_quality=quality)
+            if len(image_bytes) <= self.page_budget:
+                if best is None or len(image_bytes) > len(best[0]):
+                    best = (image_bytes, quality, scale)
+                if len(image_bytes) >= self.page_budget * REFINE_THRESHOLD:
+                    break
+                # 見積もりより小さかった分を補正し、上限に近づける
+                correction *= len(image_bytes) / expected
+            else:
+                if smallest is None or len(image_bytes) < len(smallest[0]):
+                    smallest = (image_bytes, quality, scale)
+                if quality == self.min_quality and scale == MIN_SCALE:
+                    break
+                # 見積もりと実際のサイズの差で補正し、少し小さめを目指して探し直す
+                correction *= len(image_bytes) / expected / FIT_MARGIN
+        return best or smallest
+
+
+class EncodingStats:
+    """ページごとのエンコード情報を集計するクラス
+    
+    Attributes:
+        pages (dict): 形式ごとのページ数
+        total_bytes (int): エンコード済み画像の合計サイズ
+        bytes_saved (int): 固定フォーマットと比べて削減できたサイズ
+            （reference_bytesが計測されたページのみの合計、計測していなければNone）
+        page_budget (int): BudgetEncoderの1ページの上限（BudgetEncoderでなければNone）
+        min_quality (int): 上限に合わせてエンコードしたJPEGの品質の最小値（JPEGのページがなければNone）
+        scaled_pages (int): 上限に合わせて縮小したページ数
+        over_budget_pages (int): 品質・縮小率の下限でも上限に収まらなかったページ数
+    """
+    
+    def __init__(self):
+        """初期化メソッド"""
+        self.pages = {encoding: 0 for encoding in ENCODING_LABELS}
+        self.total_bytes = 0
+        self.bytes_saved = None
+        self.page_budget = None
+        self.min_quality = None
+        self.scaled_pages = 0
+        self.over_budget_pages = 0
+    
+    def record(self, info):
+        """1ページ分のエンコード情報を記録する"""
+        self.pages[info["encoding"]] += 1
+        self.total_bytes += info["bytes"]
+        if info["reference_bytes"] is not None:
+            self.bytes_saved = (self.bytes_saved or 0) + info["reference_bytes"] - info["bytes"]
+        
+        budget = info.get("budget")
+        if budget is None:
+            return
+        self.page_budget = budget
+        quality, scale = info.get("quality"), info.get("scale")
+        if quality is not None:
+            self.min_quality = quality if self.min_quality is None else min(self.min_quality, quality)
+        if scale is not None and scale < 1:
+            self.scaled_pages += 1
+        if info["bytes"] > budget:
+            self.over_budget_pages += 1
+    
+    def summary(self):
+        """集計結果を表す文字列を返す"""
+        counts = " / ".join(
+            f"{ENCODING_LABELS[encoding]} {count}" for encoding, count in self.pages.items() if count
+        )
+        text = f"画像形式: {counts}（合計 {self.total_bytes / 1024:.0f} KB"
+        if self.bytes_saved is not None:
+            text += f"、削減 {self.bytes_saved / 1024:.0f} KB"
+        if self.min_quality is not None:
+            text += f"、JPEG品質 {self.min_quality} 以上"
+        if self.scaled_pages:
+            text += f"、縮小 {self.scaled_pages} ページ"
+        return text + "）"
@@ -0,0 +1,176 @@
+"""
+PDFページの内容からフィンガープリント（ハッシュ値）を計算するモジュール
+レンダリング結果のキャッシュなど、同じ内容のページを見分けるために使用します
+"""
+import re
+import hashlib
+
+
+# 間接参照（例: "12 0 R"）を表す正規表現
+_REFERENCE_PATTERN = re.compile(rb"(?<![\d.])(\d+)\s+(\d+)\s+R(?![A-Za-z])")
+
+# 親への逆参照（ページからページツリー、注釈からページ、ポップアップから注釈への参照。ページ内容とは無関係）
+# たどるとページツリー全体（ほかのページ）の内容がハッシュに含まれてしまうため、どの階層でも除く
+_BACK_REFERENCE_PATTERN = re.compile(rb"/(?:Parent|P)\s+\d+\s+\d+\s+R(?![A-Za-z])")
+
+# 親ページツリーから継承される可能性のある属性
+_INHERITABLE_KEYS = ("Resources", "MediaBox", "CropBox", "Rotate")
+
+# 循環参照を検出したときに使用する値
+_CYCLE_MARKER = "<cycle>"
+
+# ページオブジェクトへの参照（リンクの移動先など）に使用する値
+_PAGE_MARKER = "<page>"
+
+
+def _encode(text):
+    """オブジェクトのソース文字列をハッシュ用のバイト列に変換する"""
+    return text.encode("utf-8", "backslashreplace")
+
+
+class PageFingerprinter:
+    """PDFドキュメントのページのフィンガープリントを計算するクラス
+    
+    ページのコンテンツストリームと、そこから参照されるリソース
+    （フォント、画像などのXObject）を再帰的にたどってハッシュ値を計算します。
+    オブジェクト番号そのものではなく参照先の内容をハッシュするため、
+    PDFを保存し直してオブジェクト番号が変わっても、内容が同じページは同じ値になります。
+    
+    親への逆参照（/Parent・/P）はどの階層でもたどらず、ほかのページへの参照は
+    ページの内容ではなく共通の値に置き換えるため、ページのフィンガープリントは
+    ほかのページの内容や計算する順序に影響されません。
+    
+    同じドキュメント内で共有されているオブジェクト（フォントなど）のハッシュは
+    インスタンス内で再利用されます。複数ページを処理する場合は、1つのインスタンスを使い回してください。
+    """
+    
+    def __init__(self, document):
+        """
+        初期化メソッド
+        
+        Args:
+            document (fitz.Document): 対象のPDFドキュメント
+        """
+        self.document = document
+        self._object_hashes = {}
+        self._page_xrefs = {document.page_xref(i) for i in range(len(document))}
+        self._in_progress = {}  # 計算中のオブジェクトの番号と参照をたどった深さ
+        self._cycle_depth = None  # 計算中のオブジェクトへの循環参照のうち、最も浅いものの深さ
+    
+    def fingerprint(self, page_index):
+        """
+        ページのフィンガープリントを計算する
+        
+        Args:
+            page_index (int): ページ番号（0始まり）
+        
+        Returns:
+            str: ページ内容のSHA-256ハッシュ（16進数文字列）
+        """
+        page = self.document[page_index]
+        digest = hashlib.sha256()
+        
+        # ページオブジェクト自体（ページツリーへの参照は除く）
+        page_object = _encode(self.document.xref_object(page.xref, compressed=True))
+        digest.update(self._resolve_references(page_object))
+        
+        # 親から継承された属性
+        for key in _INHERITABLE_KEYS:
+            digest.update(key.encode("ascii"))
+            digest.update(self._inherited_value(page.xref, key))
+        
+        return digest.hexdigest()
+    
+    def _inherited_value(self, page_xref, key):
+        """ページまたは親のページツリーから継承される属性の値をハッシュ化して返す"""
+        xref = page_xref
+        visited = set()
+        while xref and xref not in visited:
+            visited.add(xref)
+            value_type, value = self.document.xref_get_key(xref, key)
+            if value_type != "null":
+                return self._resolve_references(_encode(value))
+            
+            parent_type, parent = self.document.xref_get_key(xref, "Parent")
+            if parent_type != "xref":
+                break
+            xref = int(parent.split()[0])
+        return b"null"
+    
+    def _resolve_references(self, source):
+        """オブジェクトのソース中の間接参照を参照先のハッシュ値に置き換える（親への逆参照は除く）"""
+        source = _BACK_REFERENCE_PATTERN.sub(b"", source)
+        return _REFERENCE_PATTERN.sub(
+            lambda match: self._object_hash(int(match.group(1))).encode("ascii"),
+            source
+        )
+    
+    def _object_hash(self, xref):
+        """間接オブジェクトのハッシュ値を計算する（ストリームの内容を含む）"""
+        cached = self._object_hashes.get(xref)
+        if cached is not None:
+            return cached
+        if xref in self._page_xrefs:
+            return _PAGE_MARKER
+        
+        depth = self._in_progress.get(xref)
+        if depth is not None:
+            # 循環参照（計算中のオブジェクトへの参照）
+            if self._cycle_depth is None or depth < self._cycle_depth:
+                self._cycle_depth = depth
+            return _CYCLE_MARKER
+        
+        depth = len(self._in_progress)
+        self._in_progress[xref] = depth
+        outer_cycle_depth = self._cycle_depth
+        self._cycle_depth = None
+        try:
+            digest = hashlib.sha256()
+            if 0 < xref < self.document.xref_length():
+                source = _encode(self.document.xref_object(xref, compressed=True))
+                digest.update(self._resolve_references(source))
+                if self.document.xref_is_stream(xref):
+                    digest.update(self.document.xref_stream_raw(xref) or b"")
+            value = digest.hexdigest()
+        finally:
+            del self._in_progress[xref]
+            cycle_depth = self._cycle_depth
+            self._cycle_depth = outer_cycle_depth
+        
+        if cycle_depth is not None and cycle_depth < depth:
+            # より上のオブジェクトへの循環参照を含むハッシュは、たどった経路によって変わるため保存しない
+            if self._cycle_depth is None or cycle_depth < self._cycle_depth:
+                self._cycle_depth = cycle_depth
+        else:
+            self._object_hashes[xref] = value
+        return value
+
+
+def page_fingerprint(document, page_index):
+    """
+    1ページ分のフィンガープリントを計算する
+    
+    複数ページを処理する場合は、共有オブジェクトのハッシュを再利用できる
+    PageFingerprinterを直接使用してください。
+    """
+    return PageFingerprinter(document).fingerprint(page_index)
+
+
+def render_key(fingerprint, zoom, image_format, colorspace="rgb", alpha=False):
+    """
+    ページのフィンガープリントとレンダリング条件を組み合わせたキーを作成する
+    
+    同じキーを持つページは、同じレンダリング結果（画像）になります。
+    
+    Args:
+        fingerprint (str): ページのフィンガープリント
+        zoom (float): レンダリング時のズーム値
+        image_format (str): 画像フォーマット（jpg, png）
+        colorspace (str, optional): 色空間
+        alpha (bool, optional): アルファチャンネルの有無
+    
+    Returns:
+        str: SHA-256ハッシュ（16進数文字列）
+    """
+    conditions = f"{fingerprint}|{zoom!r}|{colorspace}|{int(alpha)}|{image_format.lower()}"
+    return hashlib.sha256(conditions.encode("ascii")).hexdigest()
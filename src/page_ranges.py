@@ -0,0 +1,100 @@
+"""
+変換するページの指定を解釈するモジュール
+「1-3,5,10-20:2」のようなページ範囲・間隔・個別のページ番号の指定を、ページ番号（0始まり）のリストにします
+GUIからも読み込むため、PyMuPDFなどのライブラリはインポートしません
+"""
+import re
+
+
+# 1項目の指定: 「5」「3-7」「10-」「-5」「1-20:2」「2-:2」「:2」（ページ番号は1始まり）
+_ITEM_PATTERN = re.compile(r"^(\d+)?\s*(?:(-)\s*(\d+)?)?\s*(?::\s*(\d+))?$")
+
+
+def _parse_items(spec):
+    """
+    ページの指定の文字列を (開始, 終了, 間隔) のリストにする（1始まり、省略された開始・終了はNone）
+    
+    Raises:
+        ValueError: 指定の書式が正しくない場合
+    """
+    items = []
+    for text in spec.split(","):
+        text = text.strip()
+        match = _ITEM_PATTERN.match(text)
+        if not text or match is None:
+            raise ValueError(f"ページの指定「{text}」が正しくありません（例: 1-3,5,10-20:2）")
+        start, dash, end, step = match.groups()
+        if dash is None and start is None and step is None:
+            raise ValueError(f"ページの指定「{text}」が正しくありません（例: 1-3,5,10-20:2）")
+        start = int(start) if start is not None else None
+        end = int(end) if end is not None else None
+        step = int(step) if step is not None else 1
+        if dash is None and start is not None:
+            # 「5」は5ページだけ、「:2」（開始なし）はすべてのページの間隔つき
+            end = start
+        if start == 0 or end == 0:
+            raise ValueError("ページ番号は1から指定してください")
+        if step == 0:
+            raise ValueError(f"ページの指定「{text}」の間隔には1以上の値を指定してください")
+        if start is not None and end is not None and start > end:
+            raise ValueError(f"ページの指定「{text}」の範囲は小さい番号から指定してください")
+        items.append((start, end, step))
+    return items
+
+
+def validate_page_ranges(spec):
+    """
+    ページの指定の書式を確認する（ページ数がわからないコマンドライン引数やGUIの入力の確認に使う）
+    
+    Raises:
+        ValueError: 指定の書式が正しくない場合
+    """
+    if isinstance(spec, str) and spec.strip():
+        _parse_items(spec)
+
+
+def parse_page_ranges(spec, page_count):
+    """
+    ページの指定を、変換するページ番号（0始まり）のリストにする
+    
+    指定は「1-3,5,10-20:2」のようにカンマで区切り、各項目は1始まりのページ番号、
+    範囲（「10-」は最後まで、「-5」は最初から）、間隔つきの範囲（「1-20:2」は奇数ページ、
+    「:2」はすべての奇数ページ）です。
+    ページは指定した順に並べ、2回以上指定されたページは最初の1回だけを残します。
+    範囲の終わりがページ数を超える場合は最後のページまでとします。
+    
+    Args:
+        spec (str or list): ページの指定の文字列、または1始まりのページ番号のリスト。
+            Noneまたは空文字列の場合はすべてのページ
+        page_count (int): PDFのページ数
+    
+    Returns:
+        list: ページ番号（0始まり）のリスト
+    
+    Raises:
+        ValueError: 指定の書式が正しくない場合や、PDFにないページから始まる指定の場合
+    """
+    if spec is None or (isinstance(spec, str) and not spec.strip()):
+        return list(range(page_count))
+    
+    if isinstance(spec, str):
+        items = _parse_items(spec)
+    else:
+        items = []
+        for number in spec:
+            if isinstance(number, bool) or not isinstance(number, int) or number < 1:
+                raise ValueError(f"ページ番号「{number}」が正しくありません（1から指定してください）")
+            items.append((number, number, 1))
+    
+    pages = []
+    seen = set()
+    for start, end, step in items:
+        start = start if start is not None else 1
+        end = min(end, page_count) if end is not None else page_count
+        if start > page_count:
+            raise ValueError(f"ページ {start} はありません（PDFのページ数は {page_count}）")
+        for number in range(start, end + 1, step):
+            if number not in seen:
+                seen.add(number)
+                pages.append(number - 1)
+    return pages
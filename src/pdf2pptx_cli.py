@@ -0,0 +1,330 @@
+"""
+PDFをPPTXに変換するコマンドラインツール（pdf2pptx）
+GUIを使わずに複数のPDFファイルをまとめて変換し、進捗と処理時間をJSON Lines形式で標準出力に書き出します
+サーバーのバッチ処理やコンテナなど画面のない環境で使うため、tkinterはインポートしません
+"""
+import argparse
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from page_ranges import validate_page_ranges
+
+
+# --formatで指定できる画像フォーマット（autoはpdf_converter.IMAGE_FORMAT_AUTO）
+# pdf_converterは標準出力を切り替えてからインポートするため、ここでは値を直接指定する
+IMAGE_FORMATS = ["jpg", "png", "auto"]
+
+# コールバックの状態と、出力するイベントでの表記
+STATUS_CODES = {
+    "開始": "start",
+    "変換中": "converting",
+    "下書き完了": "draft",
+    "保存中": "saving",
+    "完了": "complete",
+    "エラー": "error",
+    "キャンセル": "cancelled",
+}
+
+# 終了コード
+EXIT_OK = 0
+EXIT_FAILED = 1  # 変換に失敗したファイルがある
+EXIT_USAGE = 2  # 引数の誤り・変換するファイルがない
+
+
+def expand_inputs(patterns):
+    """
+    コマンドラインで指定されたパス・ワイルドカード・フォルダをPDFファイルのリストに展開する
+    
+    シェルがワイルドカードを展開しない環境（Windowsのコマンドプロンプトなど）でも
+    同じように使えるよう、ワイルドカードはここで展開します（**で下位フォルダも対象）。
+    フォルダを指定した場合は、直下のPDFファイルを対象にします。
+    同じファイルが複数回指定された場合は最初の1回だけを残します。
+    
+    Returns:
+        tuple: (PDFファイルのパスのリスト, 一致するファイルがなかった指定のリスト)
+    """
+    paths = []
+    seen = set()
+    unmatched = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        elif os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(glob.escape(pattern), "*.pdf")))
+        else:
+            # 存在しないファイルは変換時のエラーとして報告する
+            matches = [pattern]
+        
+        matches = [path for path in matches if not os.path.isdir(path)]
+        if not matches:
+            unmatched.append(pattern)
+        for path in matches:
+            key = os.path.normcase(os.path.abspath(path))
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths, unmatched
+
+
+class JsonLinesReporter:
+    """変換の進捗をJSON Lines形式（1行に1つのJSONオブジェクト）で書き出すクラス
+    
+    各行は event（イベントの種類）と time（開始からの経過秒数）を持ちます。
+    日本語のメッセージはASCIIにエスケープして出力するため、
+    コンソールの文字コードに関係なく読み取れます。
+    """
+    
+    def __init__(self, stream=None):
+        """
+        初期化メソッド
+        
+        Args:
+            stream (optional): 書き込み先のテキストストリーム。指定がなければ標準出力
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.start_time = time.perf_counter()
+    
+    def emit(self, event, **fields):
+        """1つのイベントを1行で書き出す"""
+        record = {"event": event, "time": round(time.perf_counter() - self.start_time, 3)}
+        record.update(fields)
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+    
+    def file_progress(self, pdf_path, status, message, progress=None):
+        """ファイルごとの進捗（convert_manyのfile_callback）を書き出す"""
+        self.emit(
+            "progress",
+            file=pdf_path,
+            status=STATUS_CODES.get(status, status),
+            message=message,
+            progress=round(progress, 1) if progress is not None else None
+        )
+    
+    def result(self, result):
+        """1ファイルの変換結果（ConversionResult）を書き出す"""
+        self.emit(
+            "result",
+            file=result.pdf_path,
+            ok=result.succeeded,
+            pptx=result.pptx_path,
+            images=result.images_folder,
+            error=result.error,
+            cancelled=result.cancelled,
+            elapsed=round(result.elapsed, 3),
+            # ページごとの計測値は多いため、段階ごとの時間と合計だけを書き出す（詳細は--trace）
+            stages=result.metrics["stages"] if result.metrics else None,
+            totals=result.metrics["totals"] if result.metrics else None
+        )
+
+
+def build_parser():
+    """コマンドライン引数のパーサーを作成する"""
+    parser = argparse.ArgumentParser(
+        prog="pdf2pptx",
+        description="PDFファイルの各ページを画像にしてPowerPoint（PPTX）に変換します。"
+                    "進捗はJSON Lines形式で標準出力に書き出します。"
+    )
+    parser.add_argument(
+        "inputs", nargs="+", metavar="PDF",
+        help="変換するPDFファイル、ワイルドカード（例: \"docs/**/*.pdf\"）またはフォルダ"
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="同時に変換するファイル数。ファイルが1つの場合は、ページを並列にレンダリングするプロセス数（既定: CPUコア数）"
+    )
+    parser.add_argument(
+        "--dpi", type=int, default=300,
+        help="画像変換の解像度（既定: 300）"
+    )
+    parser.add_argument(
+        "--format", dest="image_format", choices=IMAGE_FORMATS, default="jpg",
+        help="画像フォーマット（autoでページごとに自動選択、既定: jpg）"
+    )
+    parser.add_argument(
+        "--pages", metavar="SPEC", default=None,
+        help="変換するページ（例: 1-3,5,10-20:2、「10-」は最後まで、「:2」は1ページおき、既定: すべて）"
+    )
+    parser.add_argument(
+        "--progressive", action="store_true",
+        help="低解像度の下書きのPPTXを先に保存し、その後で高解像度の画像に差し替える"
+    )
+    parser.add_argument(
+        "--draft-dpi", type=int, default=None,
+        help="--progressiveの下書きの解像度（既定: 48）"
+    )
+    parser.add_argument(
+        "--refine-chunk", type=int, default=0, metavar="PAGES",
+        help="--progressiveで、このページ数を差し替えるごとにPPTXを保存する（既定: 0で最後に1回だけ）"
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=None,
+        help="出力先フォルダ（既定: 各PDFと同じフォルダ）"
+    )
+    parser.add_argument(
+        "--no-images", action="store_true",
+        help="画像フォルダを出力しない（PPTXだけを作成）"
+    )
+    parser.add_argument(
+        "--trace", metavar="DIR", default=None,
+        help="ページごとの処理時間をChromeのトレース形式（<PDF名>.trace.json）でこのフォルダに書き出す"
+    )
+    parser.add_argument(
+        "--progress-interval", type=float, default=None, metavar="SECONDS",
+        help="ファイルごとの進捗のイベントを書き出す最小間隔（秒、0ですべて書き出す、既定: 0.1）"
+    )
+    return parser
+
+
+@contextlib.contextmanager
+def reserve_stdout_for_events():
+    """
+    標準出力をイベント専用にし、それ以外の出力を標準エラー出力に回すコンテキストマネージャ
+    
+    PyMuPDFの警告など、ライブラリが標準出力に書くメッセージでJSON Linesが壊れないようにします。
+    ファイル記述子ごと切り替えるため、並列変換のワーカープロセスの出力も標準エラー出力に回ります。
+    
+    Yields:
+        イベントの書き込み先のテキストストリーム（元の標準出力）
+    """
+    try:
+        stdout_fd = sys.stdout.fileno()
+        stderr_fd = sys.stderr.fileno()
+    except (AttributeError, OSError, ValueError):
+        # ファイル記述子を持たない場合（埋め込み環境など）はPythonのストリームだけを切り替える
+        events, sys.stdout = sys.stdout, sys.stderr
+        try:
+            yield events
+        finally:
+            sys.stdout = events
+        return
+    
+    sys.stdout.flush()
+    saved_fd = os.dup(stdout_fd)
+    events = os.fdopen(os.dup(stdout_fd), "w", encoding="ascii", newline="\n")
+    os.dup2(stderr_fd, stdout_fd)
+    try:
+        yield events
+    finally:
+        events.close()
+        sys.stdout.flush()
+        os.dup2(saved_fd, stdout_fd)
+        os.close(saved_fd)
+
+
+def create_converter(args):
+    """コマンドライン引数の設定を反映したPDFConverterを作成する"""
+    from pdf_converter import PDFConverter
+    
+    converter = PDFConverter()
+    converter.dpi = args.dpi
+    converter.image_format = args.image_format
+    if args.pages:
+        converter.pages = args.pages
+    if args.progressive:
+        converter.progressive = True
+        converter.refine_chunk_pages = args.refine_chunk
+        if args.draft_dpi is not None:
+            converter.draft_dpi = args.draft_dpi
+    if args.no_images:
+        # 画像ファイルが不要なので、一時フォルダを経由せずにメモリ上で変換する
+        converter.save_images = False
+        converter.in_memory = True
+    if args.trace:
+        converter.trace_path = args.trace
+    if args.progress_interval is not None:
+        converter.progress_interval = args.progress_interval
+    return converter
+
+
+def main(argv=None, stream=None):
+    """
+    コマンドラインツールのエントリポイント
+    
+    Args:
+        argv (list, optional): コマンドライン引数。指定がなければsys.argv[1:]
+        stream (optional): イベントの書き込み先。指定がなければ標準出力
+    
+    Returns:
+        int: 終了コード（0: すべて成功, 1: 失敗したファイルあり, 2: 引数の誤り・対象ファイルなし）
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobsには1以上の値を指定してください")
+    if args.dpi < 1:
+        parser.error("--dpiには1以上の値を指定してください")
+    if args.progress_interval is not None and args.progress_interval < 0:
+        parser.error("--progress-intervalには0以上の値を指定してください")
+    if args.draft_dpi is not None and args.draft_dpi < 1:
+        parser.error("--draft-dpiには1以上の値を指定してください")
+    if args.refine_chunk < 0:
+        parser.error("--refine-chunkには0以上の値を指定してください")
+    try:
+        validate_page_ranges(args.pages)
+    except ValueError as e:
+        parser.error(f"--pages: {e}")
+    
+    if stream is not None:
+        return run(args, stream)
+    with reserve_stdout_for_events() as events:
+        return run(args, events)
+
+
+def run(args, stream):
+    """
+    解析済みの引数に従ってPDFを変換し、イベントをstreamに書き出す
+    
+    Returns:
+        int: 終了コード
+    """
+    reporter = JsonLinesReporter(stream)
+    pdf_paths, unmatched = expand_inputs(args.inputs)
+    for pattern in unmatched:
+        reporter.emit("error", input=pattern, error="一致するファイルがありません")
+    if not pdf_paths:
+        reporter.emit("done", files=0, succeeded=0, failed=0)
+        return EXIT_USAGE
+    
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    if args.trace:
+        os.makedirs(args.trace, exist_ok=True)
+    
+    converter = create_converter(args)
+    if len(pdf_paths) == 1:
+        # ファイル単位では並列化できないため、ページ単位で並列にレンダリングする（0でCPUコア数）
+        converter.workers = args.jobs if args.jobs is not None else 0
+    reporter.emit(
+        "start", files=len(pdf_paths), jobs=args.jobs, dpi=args.dpi, format=args.image_format,
+        pages=args.pages
+    )
+    results = converter.convert_many(
+        pdf_paths, args.output_dir, jobs=args.jobs, file_callback=reporter.file_progress
+    )
+    
+    for result in results:
+        reporter.result(result)
+    succeeded = sum(1 for result in results if result.succeeded)
+    reporter.emit(
+        "done",
+        files=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        conversion_seconds=round(sum(result.elapsed for result in results), 3)
+    )
+    
+    if succeeded < len(results) or unmatched:
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    # 実行ファイル化した場合に、並列変換のワーカープロセスが正しく起動するようにする
+    multiprocessing.freeze_support()
+    sys.exit(main())
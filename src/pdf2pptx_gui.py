@@ -1,14 +1,231 @@
 """
 PDFをPPTXに変換するGUIアプリケーション
 ドラッグ＆ドロップで簡単に操作できるシンプルなインターフェース
+
+起動を速くするため、変換エンジン（pdf_converter とPyMuPDF・python-pptx・Pillow・lxml）は
+ウィンドウを表示した後にバックグラウンドのスレッドで読み込みます
 """
+import time
+
+# 起動時間の計測の基準（モジュールの読み込み開始時刻）
+_IMPORT_START = time.perf_counter()
+
+import json
+import multiprocessing
 import os
+import re
 import sys
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
 import threading
 from tkinterdnd2 import DND_FILES, TkinterDnD
-from pdf_converter import PDFConverter
+
+from cancellation import CancellationToken, ConversionCancelled
+from page_ranges import validate_page_ranges
+
+# 変換エンジンのクラス（load_converter_classで最初に使うときに読み込む）
+PDFConverter = None
+
+# 起動時間の計測結果を追記するファイルを指定する環境変数
+STARTUP_LOG_ENV = "PDF2PPTX_STARTUP_LOG"
+
+# プロセスを起動した時刻（time.time()）を渡す環境変数
+# 指定されている場合は、インタープリタの起動や実行ファイルの展開を含めた時間も計測する
+LAUNCH_TIME_ENV = "PDF2PPTX_LAUNCH_TIME"
+
+# 進捗の表示を更新する間隔（ミリ秒）
+# 変換のスレッドからの通知はこの間隔にまとめ、最新の状態だけを表示する
+STATUS_REFRESH_MS = 100
+
+# 複数のファイルを変換する場合に同時に変換するファイル数の既定値
+# ファイルごとにPDFとレンダリング中の画像を保持するため、CPUコア数が多くても4つまでにする
+DEFAULT_JOBS = max(1, min(4, os.cpu_count() or 1))
+
+# ドロップされたファイルのリストから1つのパスを取り出す正規表現
+# 空白を含むパスは{}で囲まれる（環境によっては引用符で囲まれる）
+_DROP_ITEM_PATTERN = re.compile(r'\{([^}]*)\}|"([^"]*)"|(\S+)')
+
+
+def load_converter_class():
+    """
+    変換エンジンを読み込んでPDFConverterクラスを返す
+    
+    pdf_converter は読み込みに時間のかかるライブラリをインポートするため、
+    GUIモジュールの読み込み時ではなく、最初に必要になったときに読み込みます。
+    複数のスレッドから呼ばれても、インポートのロックにより読み込みは1回だけです。
+    """
+    global PDFConverter
+    if PDFConverter is None:
+        from pdf_converter import PDFConverter as converter_class
+        PDFConverter = converter_class
+    return PDFConverter
+
+
+def friendly_error_message(error_msg):
+    """変換エラーのメッセージを、利用者向けのわかりやすい説明にする（該当しない場合はそのまま返す）"""
+    # 特定のエラーメッセージに対するわかりやすい説明
+    if "value must be an integral type" in error_msg:
+        return (
+            "PDFのサイズ形式に問題があります。\n"
+            "可能であれば別のPDF編集ソフトでPDFを開き直して保存してから再試行してください。"
+        )
+    elif "password required" in error_msg.lower():
+        return "パスワード付きPDFファイルは処理できません。パスワードを解除してから再試行してください。"
+    elif "not a PDF file" in error_msg:
+        return "選択されたファイルは有効なPDFファイルではありません。"
+    elif "memory" in error_msg.lower():
+        return "メモリ不足エラーが発生しました。PDFのサイズが大きすぎる可能性があります。"
+    elif "permission" in error_msg.lower():
+        return "ファイルの読み取りまたは書き込み権限がありません。"
+    return error_msg
+
+
+def parse_drop_data(data):
+    """
+    ドロップされたファイルのリスト（tkdndの形式の文字列）をパスのリストにする
+    
+    複数のファイルは空白で区切られ、空白を含むパスは{}または引用符で囲まれます。
+    """
+    return [next(group for group in match.groups() if group is not None)
+            for match in _DROP_ITEM_PATTERN.finditer(data)]
+
+
+class QueueItem:
+    """変換キューの1ファイル分の状態
+    
+    Attributes:
+        pdf_path (str): 変換するPDFファイルのパス
+        status (str): 状態（待機中、またはコールバックの状態）
+        progress (float): 進捗（0〜100）
+        elapsed (float): 変換を始めてからの経過時間（秒、開始前はNone）
+        result (str): 変換結果の表示（完了するまではNone）
+        succeeded (bool): 変換に成功したかどうか（完了するまではNone）
+    """
+    
+    def __init__(self, pdf_path):
+        """初期化メソッド"""
+        self.pdf_path = pdf_path
+        self.reset()
+    
+    def reset(self):
+        """変換前の状態に戻す"""
+        self.status = "待機中"
+        self.progress = 0.0
+        self.elapsed = None
+        self.result = None
+        self.succeeded = None
+        self._started = None
+    
+    @property
+    def finished(self):
+        """変換が終わったかどうか"""
+        return self.result is not None
+
+
+class ConversionQueue:
+    """GUIで変換するPDFファイルのキュー
+    
+    ファイルごとの進捗・経過時間・結果を保持します。
+    表示とは独立しているため、変換のスレッドから届いた通知をメインスレッドで反映します。
+    """
+    
+    def __init__(self):
+        """初期化メソッド"""
+        self.items = []
+        self._index = {}
+    
+    def __len__(self):
+        return len(self.items)
+    
+    @staticmethod
+    def key(pdf_path):
+        """同じファイルを判定するためのキー（一覧の行のIDにも使う）"""
+        return os.path.normcase(os.path.abspath(pdf_path))
+    
+    def add(self, pdf_path):
+        """
+        ファイルをキューに追加する
+        
+        Returns:
+            QueueItem: 追加した項目（既にキューにある場合はNone）
+        """
+        key = self.key(pdf_path)
+        if key in self._index:
+            return None
+        item = QueueItem(pdf_path)
+        self._index[key] = item
+        self.items.append(item)
+        return item
+    
+    def get(self, pdf_path):
+        """ファイルの項目を返す（キューにない場合はNone）"""
+        return self._index.get(self.key(pdf_path))
+    
+    def clear(self):
+        """キューを空にする"""
+        self.items = []
+        self._index = {}
+    
+    def reset(self):
+        """すべての項目を変換前の状態に戻す"""
+        for item in self.items:
+            item.reset()
+    
+    @property
+    def paths(self):
+        """キューにあるファイルのパスのリスト"""
+        return [item.pdf_path for item in self.items]
+    
+    @property
+    def finished(self):
+        """すべての項目の変換が終わったかどうか（空の場合はFalse）"""
+        return bool(self.items) and all(item.finished for item in self.items)
+    
+    def update(self, pdf_path, status, message, progress=None, now=None):
+        """
+        ファイルごとの進捗の通知を反映する
+        
+        Returns:
+            QueueItem: 反映した項目（キューにない場合や、完了後に遅れて届いた通知の場合はNone）
+        """
+        item = self.get(pdf_path)
+        if item is None or item.finished:
+            return None
+        now = time.perf_counter() if now is None else now
+        if item._started is None:
+            item._started = now
+        item.status = status
+        if progress is not None:
+            item.progress = progress
+        item.elapsed = now - item._started
+        return item
+    
+    def finish(self, pdf_path, succeeded, result, elapsed=None, cancelled=False):
+        """
+        ファイルの変換結果を記録する
+        
+        Args:
+            pdf_path (str): 変換したPDFファイルのパス
+            succeeded (bool): 変換に成功したかどうか
+            result (str): 結果の表示（作成したファイル名やエラーメッセージ）
+            elapsed (float, optional): 変換にかかった時間（秒）。指定がなければ最初の通知からの経過時間
+            cancelled (bool, optional): キャンセルにより変換しなかったかどうか
+        """
+        item = self.get(pdf_path)
+        if item is None:
+            return None
+        if elapsed is None and item._started is not None:
+            elapsed = time.perf_counter() - item._started
+        item.elapsed = elapsed
+        item.succeeded = succeeded
+        item.result = result
+        if cancelled:
+            item.status = "キャンセル"
+        else:
+            item.status = "完了" if succeeded else "エラー"
+        if succeeded:
+            item.progress = 100.0
+        return item
 
 
 class DragDropFrame(tk.Frame):
@@ -54,33 +271,12 @@ class DragDropFrame(tk.Frame):
             self.on_drop_callback(file_path)
     
     def _on_drop(self, event):
-        """ドロップイベント処理"""
-        # ドロップされたファイルパスを取得
-        file_path = event.data
-        
-        # Windowsでは余分な{}や引用符が含まれることがある
-        if file_path.startswith("{") and file_path.endswith("}"):
-            file_path = file_path[1:-1]
-        
-        # 引用符を削除
-        if file_path.startswith('"') and file_path.endswith('"'):
-            file_path = file_path[1:-1]
-        
-        # 複数ファイルの場合は最初のファイルのみ使用
-        if ' ' in file_path:
-            file_paths = file_path.split(' ')
-            for path in file_paths:
-                # 引用符を削除して確認
-                clean_path = path.strip('"')
-                if clean_path.lower().endswith('.pdf'):
-                    self.on_drop_callback(clean_path)
-                    return
-        
-        # 単一ファイルの処理
-        if file_path.lower().endswith('.pdf'):
-            self.on_drop_callback(file_path)
-        else:
+        """ドロップイベント処理（複数のPDFファイルをまとめて受け付ける）"""
+        pdf_paths = [path for path in parse_drop_data(event.data) if path.lower().endswith('.pdf')]
+        if not pdf_paths:
             messagebox.showwarning("警告", "PDFファイルのみ変換できます。")
+            return
+        self.on_drop_callback(*pdf_paths)
     
     def _set_default_appearance(self):
         """デフォルト外観の設定"""
@@ -106,13 +302,23 @@ class DragDropFrame(tk.Frame):
 class PDF2PPTXApp(TkinterDnD.Tk):
     """PDFをPPTXに変換するメインアプリケーション"""
     
-    def __init__(self):
+    def __init__(self, measure_startup=False):
+        """
+        初期化メソッド
+        
+        Args:
+            measure_startup (bool, optional): 起動時間を計測して標準出力に書き出し、
+                変換エンジンの読み込みが終わったら終了する
+        """
+        self.measure_startup = measure_startup
+        self.startup_times = {"import": time.perf_counter() - _IMPORT_START}
+        self._converter = None
         super().__init__()
         
         # ウィンドウの設定
         self.title("PDF to PPTX 変換")
-        self.geometry("600x400")
-        self.minsize(500, 350)
+        self.geometry("640x560")
+        self.minsize(560, 480)
         
         # アプリアイコン設定
         icon_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
@@ -120,14 +326,20 @@ class PDF2PPTXApp(TkinterDnD.Tk):
         if os.path.exists(icon_path):
             self.iconbitmap(icon_path)
         
-        # 変換エンジン
-        self.converter = PDFConverter()
+        # 変換エンジン（converterプロパティで最初に使うときに作成する）
         
         # 変数初期化
-        self.pdf_path = None
-        self.output_folder = None
+        self.pdf_path = None  # 最後に追加したPDFファイル（1ファイルだけの場合に変換するファイル）
+        self.output_folder = None  # 出力先フォルダ（Noneの場合は各PDFと同じフォルダ）
+        self.queue = ConversionQueue()  # 変換するPDFファイルのキュー
         self.conversion_in_progress = False
         self.conversion_thread = None
+        self.cancel_token = None  # 実行中の変換のキャンセルのトークン
+        self.close_requested = False  # 変換中に終了が要求されたかどうか
+        self._pending_status = None  # まだ表示していない最新の進捗（status, message, progress）
+        self._pending_files = {}  # まだ表示していないファイルごとの最新の進捗
+        self._status_scheduled = False  # 進捗の表示の更新を予約済みかどうか
+        self._status_lock = threading.Lock()
         
         # UI作成
         self._create_widgets()
@@ -138,6 +350,65 @@ class PDF2PPTXApp(TkinterDnD.Tk):
         
         # 終了時の処理を設定
         self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        # 最初の描画が終わったら、変換エンジンの読み込みを始める
+        self.after_idle(self._on_first_frame)
+    
+    @property
+    def converter(self):
+        """変換エンジン（最初に使うときに読み込んで作成する）"""
+        if self._converter is None:
+            self._converter = load_converter_class()()
+        return self._converter
+    
+    @converter.setter
+    def converter(self, converter):
+        self._converter = converter
+    
+    def _on_first_frame(self):
+        """最初の描画が終わったときの処理"""
+        self.update_idletasks()
+        self.startup_times["first_frame"] = time.perf_counter() - _IMPORT_START
+        launch_time = os.environ.get(LAUNCH_TIME_ENV)
+        if launch_time:
+            try:
+                self.startup_times["launch_to_first_frame"] = time.time() - float(launch_time)
+            except ValueError:
+                pass
+        
+        # 変換エンジンをバックグラウンドで読み込み、変換開始時の待ち時間をなくす
+        warmup_thread = threading.Thread(target=self._warm_up_converter)
+        warmup_thread.daemon = True
+        warmup_thread.start()
+    
+    def _warm_up_converter(self):
+        """別スレッドで変換エンジンを読み込む"""
+        try:
+            load_converter_class()
+        except Exception:
+            # 読み込みのエラーは変換開始時に改めて発生し、ダイアログで表示される
+            pass
+        self.startup_times["warmup"] = time.perf_counter() - _IMPORT_START
+        self.after(0, self._report_startup_times)
+    
+    def _report_startup_times(self):
+        """起動時間の計測結果を書き出す（メインスレッドで実行）"""
+        record = {key: round(value, 4) for key, value in self.startup_times.items()}
+        record["frozen"] = bool(getattr(sys, "frozen", False))
+        
+        log_path = os.environ.get(STARTUP_LOG_ENV)
+        if log_path:
+            try:
+                with open(log_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError:
+                pass
+        
+        if self.measure_startup:
+            # --windowedでビルドした実行ファイルは標準出力を持たない
+            if sys.stdout is not None:
+                print(json.dumps(record), flush=True)
+            self.destroy()
     
     def _create_widgets(self):
         """ウィジェットの作成"""
@@ -173,6 +444,56 @@ class PDF2PPTXApp(TkinterDnD.Tk):
         self.drop_frame = DragDropFrame(main_frame, self._on_file_drop, bg="#f0f0f0")
         self.drop_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # 変換キューの一覧（ファイルごとの状態・進捗・経過時間・結果）
+        queue_frame = tk.Frame(main_frame)
+        queue_frame.pack(fill=tk.BOTH, padx=10)
+        
+        self.queue_tree = ttk.Treeview(
+            queue_frame,
+            columns=("status", "progress", "elapsed", "result"),
+            height=5
+        )
+        self.queue_tree.heading("#0", text="ファイル")
+        self.queue_tree.heading("status", text="状態")
+        self.queue_tree.heading("progress", text="進捗")
+        self.queue_tree.heading("elapsed", text="経過時間")
+        self.queue_tree.heading("result", text="結果")
+        self.queue_tree.column("#0", width=180)
+        self.queue_tree.column("status", width=70, anchor=tk.CENTER)
+        self.queue_tree.column("progress", width=60, anchor=tk.E)
+        self.queue_tree.column("elapsed", width=70, anchor=tk.E)
+        self.queue_tree.column("result", width=200)
+        queue_scroll = ttk.Scrollbar(queue_frame, orient=tk.VERTICAL, command=self.queue_tree.yview)
+        self.queue_tree.configure(yscrollcommand=queue_scroll.set)
+        queue_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.queue_tree.pack(fill=tk.BOTH, expand=True)
+        
+        # 同時に変換するファイル数とキューのクリア
+        jobs_frame = tk.Frame(main_frame)
+        jobs_frame.pack(fill=tk.X, padx=10, pady=(5, 0))
+        tk.Label(jobs_frame, text="同時に変換するファイル数:").pack(side=tk.LEFT)
+        self.jobs_var = tk.IntVar(value=DEFAULT_JOBS)
+        self.jobs_spinbox = ttk.Spinbox(
+            jobs_frame, from_=1, to=max(os.cpu_count() or 1, DEFAULT_JOBS), width=4,
+            textvariable=self.jobs_var
+        )
+        self.jobs_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # 変換するページの指定（空欄ならすべてのページ）
+        tk.Label(jobs_frame, text="ページ指定:").pack(side=tk.LEFT, padx=(10, 0))
+        self.pages_var = tk.StringVar()
+        self.pages_entry = tk.Entry(jobs_frame, textvariable=self.pages_var, width=14)
+        self.pages_entry.pack(side=tk.LEFT, padx=(5, 0))
+        
+        # 低解像度の下書きを先に保存し、後から高解像度の画像に差し替える
+        self.progressive_var = tk.BooleanVar(value=False)
+        self.progressive_check = tk.Checkbutton(
+            jobs_frame, text="下書きを先に作成", variable=self.progressive_var
+        )
+        self.progressive_check.pack(side=tk.LEFT, padx=(10, 0))
+        self.clear_btn = tk.Button(jobs_frame, text="リストをクリア", command=self._clear_queue)
+        self.clear_btn.pack(side=tk.RIGHT)
+        
         # 下部フレーム（変換ボタンとプログレスバー）
         bottom_frame = tk.Frame(main_frame)
         bottom_frame.pack(fill=tk.X, padx=10, pady=10)
@@ -202,36 +523,91 @@ class PDF2PPTXApp(TkinterDnD.Tk):
             font=("Arial", 12, "bold")
         )
         self.convert_btn.pack(fill=tk.X)
+        
+        # キャンセルボタン（変換中のみ有効）
+        self.cancel_btn = tk.Button(
+            bottom_frame,
+            text="キャンセル",
+            command=self._cancel_conversion,
+            state=tk.DISABLED
+        )
+        self.cancel_btn.pack(fill=tk.X, pady=(5, 0))
     
     def _on_app_drop(self, event):
         """アプリケーション全体へのドロップイベント"""
-        self._on_file_drop(event.data)
+        self._on_file_drop(*parse_drop_data(event.data))
     
-    def _on_file_drop(self, file_path):
-        """ファイルがドロップされたときの処理"""
+    def _on_file_drop(self, *file_paths):
+        """ファイルがドロップ・選択されたときの処理（PDFファイルを変換キューに追加する）"""
         # 変換中は新しいファイルを受け付けない
         if self.conversion_in_progress:
             messagebox.showinfo("通知", "変換中です。しばらくお待ちください。")
             return
-            
-        # Windowsでは余分な{}や引用符が含まれることがある
-        if isinstance(file_path, str):
+        
+        pdf_paths = []
+        for file_path in file_paths:
+            # Windowsでは余分な{}や引用符が含まれることがある
             if file_path.startswith("{") and file_path.endswith("}"):
                 file_path = file_path[1:-1]
             
             # 引用符を削除
             if file_path.startswith('"') and file_path.endswith('"'):
                 file_path = file_path[1:-1]
-        
-        if file_path and file_path.lower().endswith('.pdf'):
-            self.pdf_path = file_path
-            self.pdf_label.config(text=f"選択されたファイル: {os.path.basename(file_path)}")
-            self.convert_btn.config(state=tk.NORMAL)
             
-            # デフォルトの出力先をPDFと同じフォルダに設定
-            self.output_folder = os.path.dirname(file_path)
-        else:
+            if file_path and file_path.lower().endswith('.pdf'):
+                pdf_paths.append(file_path)
+        
+        if not pdf_paths:
             messagebox.showwarning("警告", "PDFファイルのみ変換できます。")
+            return
+        
+        # 前回の変換が終わったキューに追加する場合は、新しいキューにする
+        if self.queue.finished:
+            self._clear_queue()
+        
+        for file_path in pdf_paths:
+            self.queue.add(file_path)
+        self.pdf_path = pdf_paths[-1]
+        self._refresh_queue_view()
+        
+        if len(self.queue) > 1:
+            self.pdf_label.config(text=f"選択されたファイル: {len(self.queue)}個")
+        else:
+            self.pdf_label.config(text=f"選択されたファイル: {os.path.basename(self.pdf_path)}")
+        self.convert_btn.config(state=tk.NORMAL)
+    
+    def _clear_queue(self):
+        """変換キューを空にする"""
+        if self.conversion_in_progress:
+            return
+        self.queue.clear()
+        self.pdf_path = None
+        for row in self.queue_tree.get_children():
+            self.queue_tree.delete(row)
+        self.pdf_label.config(text="選択されたファイル: なし")
+        self.convert_btn.config(state=tk.DISABLED)
+    
+    def _refresh_queue_view(self, items=None):
+        """変換キューの一覧の表示を更新する（itemsの指定がなければすべての項目）"""
+        for item in (self.queue.items if items is None else items):
+            row = self.queue.key(item.pdf_path)
+            values = (
+                item.status,
+                f"{item.progress:.0f}%",
+                f"{item.elapsed:.1f}秒" if item.elapsed is not None else "",
+                item.result or "",
+            )
+            if self.queue_tree.exists(row):
+                self.queue_tree.item(row, values=values)
+            else:
+                self.queue_tree.insert("", tk.END, iid=row, text=os.path.basename(item.pdf_path), values=values)
+    
+    def _jobs(self):
+        """同時に変換するファイル数（入力が正しくない場合は既定値）"""
+        try:
+            return max(1, int(self.jobs_var.get()))
+        except (tk.TclError, ValueError):
+            return DEFAULT_JOBS
     
     def _select_pdf(self):
         """PDFファイル選択ダイアログ"""
@@ -249,84 +625,110 @@ class PDF2PPTXApp(TkinterDnD.Tk):
             messagebox.showinfo("出力先", f"出力先フォルダを設定しました:\n{folder_path}")
     
     def _start_conversion(self):
-        """変換処理の開始"""
+        """変換処理の開始（キューに複数のファイルがある場合はまとめて変換する）"""
         if not self.pdf_path:
             messagebox.showwarning("警告", "PDFファイルを選択してください。")
             return
         
-        if not os.path.exists(self.pdf_path):
-            messagebox.showerror("エラー", "選択されたPDFファイルが見つかりません。")
+        pdf_paths = self.queue.paths if len(self.queue) > 1 else [self.pdf_path]
+        missing = [path for path in pdf_paths if not os.path.exists(path)]
+        if missing:
+            names = "\n".join(os.path.basename(path) for path in missing)
+            messagebox.showerror("エラー", f"選択されたPDFファイルが見つかりません。\n\n{names}")
             return
         
         if self.conversion_in_progress:
             return
         
+        pages = self.pages_var.get().strip() or None
+        try:
+            validate_page_ranges(pages)
+        except ValueError as e:
+            messagebox.showerror("エラー", f"ページ指定が正しくありません。\n\n{e}")
+            return
+        
         # UI状態の更新
         self.conversion_in_progress = True
         self.convert_btn.config(state=tk.DISABLED)
         self.pdf_btn.config(state=tk.DISABLED)
         self.output_btn.config(state=tk.DISABLED)
-        
-        # プログレスバーリセット
+        self.clear_btn.config(state=tk.DISABLED)
+        self.jobs_spinbox.config(state=tk.DISABLED)
+        self.pages_entry.config(state=tk.DISABLED)
+        self.progressive_check.config(state=tk.DISABLED)
+        self.cancel_token = CancellationToken()
+        self.cancel_btn.config(state=tk.NORMAL)
+        
+        # プログレスバーとキューの一覧のリセット
         self.progress["value"] = 0
+        self.queue.reset()
+        self._refresh_queue_view()
         
         # 変換処理を別スレッドで実行
-        self.conversion_thread = threading.Thread(target=self._convert_pdf_thread)
+        progressive = bool(self.progressive_var.get())
+        if len(pdf_paths) > 1:
+            self.conversion_thread = threading.Thread(
+                target=self._convert_queue_thread, args=(pdf_paths, self._jobs(), pages, progressive)
+            )
+        else:
+            self.conversion_thread = threading.Thread(target=self._convert_pdf_thread, args=(pages, progressive))
         self.conversion_thread.daemon = True
         self.conversion_thread.start()
     
-    def _convert_pdf_thread(self):
-        """別スレッドでPDF変換を実行"""
+    def _convert_pdf_thread(self, pages=None, progressive=False):
+        """
+        別スレッドでPDF変換を実行
+        
+        pagesは変換するページの指定（Noneならすべて）、progressiveは低解像度の下書きを先に保存するかどうかです。
+        下書きを保存すると、ステータスラベルに下書きのファイルが表示されます。
+        """
+        pdf_path = self.pdf_path
+        
+        def callback(status, message, progress=None):
+            """全体の進捗とキューの一覧の両方に反映する"""
+            self._update_progress(status, message, progress)
+            self._update_file_progress(pdf_path, status, message, progress)
+        
         try:
             # 変換実行
-            self._update_status("開始", "変換を開始します...", 0)
+            self._update_progress("開始", "変換を開始します...", 0)
+            self.converter.pages = pages
+            self.converter.progressive = progressive
             pptx_path, images_folder = self.converter.convert_pdf_to_pptx(
-                self.pdf_path,
+                pdf_path,
                 self.output_folder,
-                self._update_progress
+                callback,
+                self.cancel_token
             )
             
             if pptx_path and os.path.exists(pptx_path):
-                # 成功
-                self._update_status(
-                    "完了",
-                    f"変換が完了しました！\n"
-                    f"PowerPointファイル: {os.path.basename(pptx_path)}\n"
-                    f"画像フォルダ: {os.path.basename(images_folder)}"
-                )
+                self._finish_file(pdf_path, True, os.path.basename(pptx_path))
+                # 成功（画像フォルダを保存しない設定の場合は表示しない）
+                status_text = f"変換が完了しました！\nPowerPointファイル: {os.path.basename(pptx_path)}"
+                dialog_text = f"PDFの変換が完了しました！\n\nPowerPointファイル:\n{pptx_path}"
+                if images_folder:
+                    status_text += f"\n画像フォルダ: {os.path.basename(images_folder)}"
+                    dialog_text += f"\n\n画像フォルダ:\n{images_folder}"
+                self._update_progress("完了", status_text)
                 # 成功メッセージ
-                self.after(0, lambda: messagebox.showinfo(
-                    "変換完了",
-                    f"PDFの変換が完了しました！\n\n"
-                    f"PowerPointファイル:\n{pptx_path}\n\n"
-                    f"画像フォルダ:\n{images_folder}"
-                ))
+                self.after(0, lambda: messagebox.showinfo("変換完了", dialog_text))
             else:
                 # 失敗
-                self._update_status("エラー", "変換に失敗しました。", None)
+                self._finish_file(pdf_path, False, "変換に失敗しました。")
+                self._update_progress("エラー", "変換に失敗しました。", None)
                 self.after(0, lambda: messagebox.showerror(
                     "変換失敗", 
                     "PDFの変換に失敗しました。ファイルが破損しているか、サポートされていない形式の可能性があります。"
                 ))
+        except ConversionCancelled:
+            # キャンセルはユーザーの操作のため、エラーとして表示しない
+            self._finish_file(pdf_path, False, "キャンセルしました", cancelled=True)
+            self._update_progress("キャンセル", "変換をキャンセルしました", 0)
         except Exception as e:
             # エラーメッセージをユーザーフレンドリーにする
             error_msg = str(e)
-            user_friendly_msg = error_msg
-            
-            # 特定のエラーメッセージに対するわかりやすい説明
-            if "value must be an integral type" in error_msg:
-                user_friendly_msg = (
-                    "PDFのサイズ形式に問題があります。\n"
-                    "可能であれば別のPDF編集ソフトでPDFを開き直して保存してから再試行してください。"
-                )
-            elif "password required" in error_msg.lower():
-                user_friendly_msg = "パスワード付きPDFファイルは処理できません。パスワードを解除してから再試行してください。"
-            elif "not a PDF file" in error_msg:
-                user_friendly_msg = "選択されたファイルは有効なPDFファイルではありません。"
-            elif "memory" in error_msg.lower():
-                user_friendly_msg = "メモリ不足エラーが発生しました。PDFのサイズが大きすぎる可能性があります。"
-            elif "permission" in error_msg.lower():
-                user_friendly_msg = "ファイルの読み取りまたは書き込み権限がありません。"
+            user_friendly_msg = friendly_error_message(error_msg)
+            self._finish_file(pdf_path, False, user_friendly_msg)
             
             # エラー表示
             self.after(0, lambda: messagebox.showerror(
@@ -334,15 +736,128 @@ class PDF2PPTXApp(TkinterDnD.Tk):
                 f"PDFの変換中に問題が発生しました:\n\n{user_friendly_msg}\n\n"
                 f"技術的詳細:\n{error_msg}"
             ))
-            self._update_status("エラー", f"エラー: {user_friendly_msg}")
+            self._update_progress("エラー", f"エラー: {user_friendly_msg}")
         
         finally:
             # UI状態の復元
             self.after(0, self._reset_ui)
     
+    def _convert_queue_thread(self, pdf_paths, jobs, pages=None, progressive=False):
+        """
+        別スレッドでキューの複数のPDFを変換する
+        
+        PDFConverter.convert_manyにより、jobs個のファイルを別々のワーカープロセスで同時に変換します。
+        1ファイルの変換に失敗しても残りのファイルの変換は継続します。
+        pagesを指定した場合は、すべてのファイルで同じページを変換します。
+        progressiveがTrueの場合は、ファイルごとに低解像度の下書きを先に保存します。
+        """
+        try:
+            self.converter.pages = pages
+            self.converter.progressive = progressive
+            results = self.converter.convert_many(
+                pdf_paths,
+                self.output_folder,
+                jobs=jobs,
+                callback=self._update_progress,
+                file_callback=self._update_file_progress,
+                cancel_token=self.cancel_token
+            )
+            self.after(0, lambda: self._show_queue_results(results))
+        except Exception as e:
+            error_msg = str(e)
+            self.after(0, lambda: messagebox.showerror(
+                "変換エラー",
+                f"PDFの変換中に問題が発生しました:\n\n{friendly_error_message(error_msg)}\n\n"
+                f"技術的詳細:\n{error_msg}"
+            ))
+            self._update_progress("エラー", f"エラー: {friendly_error_message(error_msg)}")
+        finally:
+            # UI状態の復元
+            self.after(0, self._reset_ui)
+    
+    def _show_queue_results(self, results):
+        """キューの変換結果を一覧に反映し、結果を表示する（メインスレッドで実行）"""
+        for result in results:
+            if result.succeeded:
+                text = os.path.basename(result.pptx_path)
+            elif result.cancelled:
+                text = "キャンセルしました"
+            else:
+                text = friendly_error_message(result.error)
+            self.queue.finish(result.pdf_path, result.succeeded, text, result.elapsed, result.cancelled)
+        self._refresh_queue_view()
+        
+        # キャンセルした場合は、ステータスの表示だけにする
+        if any(result.cancelled for result in results):
+            return
+        
+        failed = [result for result in results if not result.succeeded]
+        if failed:
+            details = "\n".join(
+                f"・{os.path.basename(result.pdf_path)}: {friendly_error_message(result.error)}"
+                for result in failed
+            )
+            messagebox.showwarning(
+                "変換完了（エラーあり）",
+                f"{len(results)}個のうち{len(failed)}個のPDFの変換に失敗しました:\n\n{details}"
+            )
+        else:
+            output = self.output_folder or "各PDFと同じフォルダ"
+            messagebox.showinfo(
+                "変換完了", f"{len(results)}個のPDFの変換が完了しました！\n\n出力先:\n{output}"
+            )
+    
     def _update_progress(self, status, message, progress=None):
-        """進捗状況の更新（別スレッドから呼ばれる）"""
-        self.after(0, lambda: self._update_status(status, message, progress))
+        """
+        進捗状況の更新（別スレッドから呼ばれる）
+        
+        通知のたびにイベントループへ処理を追加すると、ページ数の多いPDFで画面の応答が遅くなるため、
+        最新の通知だけを残し、STATUS_REFRESH_MSの間隔でまとめて表示します。
+        """
+        with self._status_lock:
+            if progress is None and self._pending_status is not None:
+                # 進捗の値を持たないメッセージでは、まだ表示していない進捗の値を引き継ぐ
+                progress = self._pending_status[2]
+            self._pending_status = (status, message, progress)
+            if self._status_scheduled:
+                return
+            self._status_scheduled = True
+        self.after(STATUS_REFRESH_MS, self._flush_status)
+    
+    def _update_file_progress(self, pdf_path, status, message, progress=None):
+        """ファイルごとの進捗の更新（別スレッドから呼ばれる、_update_progressと同じ間隔でまとめて表示する）"""
+        now = time.perf_counter()
+        with self._status_lock:
+            pending = self._pending_files.get(pdf_path)
+            if progress is None and pending is not None:
+                progress = pending[2]
+            self._pending_files[pdf_path] = (status, message, progress, now)
+            if self._status_scheduled:
+                return
+            self._status_scheduled = True
+        self.after(STATUS_REFRESH_MS, self._flush_status)
+    
+    def _finish_file(self, pdf_path, succeeded, result, cancelled=False):
+        """1ファイルの変換結果をキューの一覧に反映する（別スレッドから呼ばれる）"""
+        def finish():
+            item = self.queue.finish(pdf_path, succeeded, result, cancelled=cancelled)
+            if item is not None:
+                self._refresh_queue_view([item])
+        self.after(0, finish)
+    
+    def _flush_status(self):
+        """まだ表示していない最新の進捗を表示する（メインスレッドで実行）"""
+        with self._status_lock:
+            pending, self._pending_status = self._pending_status, None
+            files, self._pending_files = self._pending_files, {}
+            self._status_scheduled = False
+        if pending is not None:
+            self._update_status(*pending)
+        
+        items = [self.queue.update(path, *event) for path, event in files.items()]
+        items = [item for item in items if item is not None]
+        if items:
+            self._refresh_queue_view(items)
     
     def _update_status(self, status, message, progress=None):
         """ステータス表示の更新（メインスレッドで実行）"""
@@ -351,28 +866,52 @@ class PDF2PPTXApp(TkinterDnD.Tk):
         if progress is not None:
             self.progress["value"] = progress
     
+    def _cancel_conversion(self):
+        """
+        実行中の変換をキャンセルする
+        
+        変換はページの区切りで中断され、一時フォルダと書き出し途中のファイルは削除されます。
+        変換のスレッドが終了すると_reset_uiでボタンの状態が戻ります。
+        """
+        if not self.conversion_in_progress or self.cancel_token is None:
+            return
+        self.cancel_token.cancel()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.status_label.config(text="キャンセルしています...")
+    
     def _reset_ui(self):
         """UI状態のリセット"""
         self.conversion_in_progress = False
         self.conversion_thread = None
+        self.cancel_token = None
         self.convert_btn.config(state=tk.NORMAL)
         self.pdf_btn.config(state=tk.NORMAL)
         self.output_btn.config(state=tk.NORMAL)
+        self.clear_btn.config(state=tk.NORMAL)
+        self.jobs_spinbox.config(state=tk.NORMAL)
+        self.pages_entry.config(state=tk.NORMAL)
+        self.progressive_check.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+        
+        # 変換中に終了が要求されていた場合は、変換の後片付けが終わってから終了する
+        if self.close_requested:
+            self.quit()
     
     def _on_close(self):
         """アプリケーション終了時の処理"""
         if self.conversion_in_progress:
-            if messagebox.askyesno("確認", "変換処理が実行中です。本当に終了しますか？"):
-                # 終了を強制する
-                self.quit()
+            if messagebox.askyesno("確認", "変換処理が実行中です。変換をキャンセルして終了しますか？"):
+                # 変換を中断し、一時フォルダの削除などが終わってから終了する（_reset_uiを参照）
+                self.close_requested = True
+                self._cancel_conversion()
         else:
             self.quit()
 
 
 def main():
-    """アプリケーション起動"""
+    """アプリケーション起動（--measure-startupを付けると起動時間を計測して終了します）"""
     try:
-        app = PDF2PPTXApp()
+        app = PDF2PPTXApp(measure_startup="--measure-startup" in sys.argv[1:])
         app.mainloop()
     except Exception as e:
         messagebox.showerror("起動エラー", f"アプリケーションの起動中にエラーが発生しました:\n{str(e)}")
@@ -380,4 +919,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # 実行ファイル化した場合に、一括変換のワーカープロセスが正しく起動するようにする
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,778 @@
+"""
+PDFをPPTXに変換するローカルのHTTPサーバー（pdf2pptx-server）
+起動時に変換用のワーカープロセスを準備しておき、アップロードされたPDFを順番に変換して
+進捗をJSON Lines形式で配信し、完成したPPTXを返します
+標準ライブラリのhttp.serverだけを使い、tkinterはインポートしません
+
+    python src/pdf2pptx_server.py --port 8765 --workers 4
+
+    curl --data-binary @input.pdf "http://127.0.0.1:8765/jobs?name=input.pdf"     # ジョブの登録
+    curl -N http://127.0.0.1:8765/jobs/<id>/events                                # 進捗の受信
+    curl -o input.pptx http://127.0.0.1:8765/jobs/<id>/result                     # PPTXの取得
+    curl --data-binary @input.pdf -o input.pptx http://127.0.0.1:8765/convert     # 変換して直接受け取る
+"""
+import argparse
+import asyncio
+import copy
+import json
+import multiprocessing
+import os
+import re
+import select
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+from async_converter import AsyncPDFConverter
+from page_ranges import validate_page_ranges
+from pdf2pptx_cli import IMAGE_FORMATS, STATUS_CODES
+from pdf_converter import PDFConverter
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# アップロードできるPDFの最大サイズ（バイト）
+DEFAULT_MAX_UPLOAD_BYTES = 200 * 1024 * 1024
+
+# 終了したジョブの結果を保持する時間（秒）。過ぎたものは定期的な確認と次のジョブの登録時に削除する
+DEFAULT_RESULT_TTL = 600
+
+# 保持する時間を過ぎたジョブを確認する間隔の上限（秒）
+EXPIRE_INTERVAL = 60
+
+# 進捗の配信や/convertの変換の終了を待つ間隔（秒）。クライアントの切断はこの間隔で確認する
+EVENT_WAIT_INTERVAL = 1.0
+
+# 結果のPPTXを送る単位（バイト）
+RESULT_CHUNK_SIZE = 64 * 1024
+
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+
+# ジョブの状態（STATUS_CODESの表記に、順番待ちの状態を加えたもの）
+JOB_QUEUED = "queued"
+FINISHED_STATUSES = {STATUS_CODES["完了"], STATUS_CODES["エラー"], STATUS_CODES["キャンセル"]}
+
+
+class ServerJob:
+    """サーバーに登録された1ファイルの変換ジョブ
+    
+    進捗の通知はすべてeventsに残し、進捗を配信する各リクエストのスレッドは
+    conditionで新しい通知を待ちます。
+    
+    Attributes:
+        id (str): ジョブのID
+        name (str): アップロードされたPDFのファイル名
+        pdf_path (str): 保存したPDFファイルのパス
+        work_dir (str): ジョブの作業フォルダ（PDFと変換結果を置く）
+        status (str): 状態（queued, start, converting, draft, saving, complete, error, cancelled）
+        draft_ready (bool): 段階的な変換の下書きのPPTXが保存されたかどうか
+        result (ConversionResult): 変換に成功した場合の結果
+        error (str): 失敗した場合のエラーメッセージ
+    """
+    
+    def __init__(self, job_id, name, pdf_path, work_dir):
+        """初期化メソッド"""
+        self.id = job_id
+        self.name = name
+        self.pdf_path = pdf_path
+        self.work_dir = work_dir
+        self.status = JOB_QUEUED
+        self.message = "変換の順番を待っています"
+        self.progress = None
+        self.draft_ready = False
+        self.result = None
+        self.error = None
+        self.events = []
+        self.created = time.monotonic()
+        self.started = None
+        self.finished = None
+        self.discard = False  # Trueの場合、終了したらジョブを削除する
+        self.condition = threading.Condition()
+        self._future = None  # 変換を実行するコルーチンのFuture（concurrent.futures.Future）
+    
+    @property
+    def done(self):
+        """変換が終わった（成功・失敗・キャンセル）かどうか"""
+        return self.status in FINISHED_STATUSES
+    
+    def add_progress(self, status, message, progress=None):
+        """変換の進捗（PDFConverterのコールバックの引数）を記録する"""
+        with self.condition:
+            if self.done:
+                return
+            status = STATUS_CODES.get(status, status)
+            if self.started is None:
+                self.started = time.monotonic()
+            if status in FINISHED_STATUSES:
+                # 終了の状態はfinishで記録する（変換結果と同時に配信するため）
+                status = self.status
+            self.status = status
+            self.message = message
+            if status == STATUS_CODES["下書き完了"]:
+                self.draft_ready = True
+            if progress is not None:
+                self.progress = round(progress, 1)
+            self._append_event("progress", status=status, message=message, progress=self.progress)
+    
+    def finish(self, result=None, error=None, cancelled=False):
+        """変換の終了を記録し、進捗を待っているスレッドに知らせる（2回目以降は無視する）"""
+        with self.condition:
+            if self.done:
+                return False
+            self.finished = time.monotonic()
+            if cancelled:
+                self.status = STATUS_CODES["キャンセル"]
+                self.message = "変換をキャンセルしました"
+            elif error is not None:
+                self.status = STATUS_CODES["エラー"]
+                self.message = error
+                self.error = error
+            else:
+                self.status = STATUS_CODES["完了"]
+                self.message = "変換が完了しました"
+                self.progress = 100
+                self.result = result
+            self._append_event("result", **self.to_dict())
+            return True
+    
+    def _append_event(self, event, **fields):
+        """通知を記録して、待っているスレッドを起こす（conditionを取得した状態で呼び出す）"""
+        record = {"event": event, "time": round(time.monotonic() - self.created, 3)}
+        record.update(fields)
+        self.events.append(record)
+        self.condition.notify_all()
+    
+    def wait_events(self, index, timeout):
+        """
+        index番目以降の通知を返す（まだなければtimeout秒まで待つ）
+        
+        Returns:
+            tuple: (通知のリスト, 変換が終わったかどうか)
+        """
+        with self.condition:
+            if len(self.events) <= index and not self.done:
+                self.condition.wait(timeout)
+            return self.events[index:], self.done
+    
+    def wait(self, timeout=None):
+        """変換が終わるまで待ち、終わったかどうかを返す"""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.done, timeout)
+    
+    @property
+    def pptx_path(self):
+        """変換結果（段階的な変換では下書き）のPPTXのパス"""
+        return os.path.splitext(self.pdf_path)[0] + ".pptx"
+    
+    def to_dict(self):
+        """ジョブの状態をJSONで返す形式にする"""
+        now = time.monotonic()
+        started = self.started if self.started is not None else now
+        finished = self.finished if self.finished is not None else now
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "message": self.message,
+            "progress": self.progress,
+            "error": self.error,
+            "queued_seconds": round(started - self.created, 3),
+            "elapsed": round(finished - self.created, 3),
+            "result": f"/jobs/{self.id}/result" if self.result is not None else None,
+            "draft": f"/jobs/{self.id}/result?draft=1" if self.draft_ready and not self.done else None,
+        }
+
+
+class ConversionService:
+    """HTTPサーバーから変換を受け付けるクラス
+    
+    専用のスレッドでイベントループを動かし、AsyncPDFConverterのワーカープロセスで変換します。
+    HTTPのリクエストを処理するスレッドからは、submit・cancelなどのメソッドでジョブを操作します。
+    同時に変換するファイル数はworkersまでに制限し、それ以上のジョブは登録順に順番を待ちます。
+    """
+    
+    def __init__(self, converter=None, workers=None, work_dir=None, result_ttl=DEFAULT_RESULT_TTL):
+        """
+        初期化メソッド
+        
+        Args:
+            converter (PDFConverter, optional): 変換の設定。指定がなければPPTXだけをメモリ上で作成する設定
+            workers (int, optional): ワーカープロセス数（同時に変換するファイル数）。指定がなければCPUコア数
+            work_dir (str, optional): アップロードされたPDFと変換結果を置くフォルダ。指定がなければ一時フォルダ
+            result_ttl (float, optional): 終了したジョブの結果を保持する時間（秒）
+        """
+        if converter is None:
+            converter = PDFConverter()
+            # 返すのはPPTXだけなので、画像フォルダを作らずにメモリ上で変換する
+            converter.save_images = False
+            converter.in_memory = True
+        self.converter = converter
+        self.result_ttl = result_ttl
+        self._owns_work_dir = work_dir is None
+        self.work_dir = work_dir if work_dir is not None else tempfile.mkdtemp(prefix="pdf2pptx_server_")
+        self._async_converter = AsyncPDFConverter(converter, workers)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._expire_task = None
+        self.worker_pids = []
+    
+    @property
+    def workers(self):
+        """ワーカープロセス数"""
+        return self._async_converter.max_concurrency
+    
+    def start(self):
+        """イベントループのスレッドを起動し、ワーカープロセスをすべて準備する"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="pdf2pptx-service")
+        self._thread.daemon = True
+        self._thread.start()
+        self.worker_pids = asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+    
+    def close(self):
+        """変換中・順番待ちのジョブをキャンセルし、ワーカープロセスとイベントループを終了する"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        if self._owns_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+    
+    def submit(self, data, name=None, dpi=None, image_format=None, pages=None, progressive=None):
+        """
+        アップロードされたPDFを保存して変換を開始する
+        
+        Args:
+            data (bytes): PDFファイルの内容
+            name (str, optional): PDFのファイル名（PPTXのファイル名に使う）
+            dpi (int, optional): このジョブだけの画像変換の解像度
+            image_format (str, optional): このジョブだけの画像フォーマット
+            pages (str, optional): このジョブで変換するページの指定（例: "1-3,5"）
+            progressive (bool, optional): このジョブで低解像度の下書きを先に保存するかどうか
+        
+        Returns:
+            ServerJob: 登録したジョブ
+        """
+        self._expire_jobs()
+        job_id = uuid.uuid4().hex
+        name = _safe_pdf_name(name)
+        work_dir = os.path.join(self.work_dir, job_id)
+        os.makedirs(work_dir)
+        pdf_path = os.path.join(work_dir, name)
+        with open(pdf_path, "wb") as f:
+            f.write(data)
+        
+        converter = copy.copy(self.converter)
+        if dpi is not None:
+            converter.dpi = dpi
+        if image_format is not None:
+            converter.image_format = image_format
+        if pages is not None:
+            converter.pages = pages
+        if progressive is not None:
+            converter.progressive = progressive
+        
+        job = ServerJob(job_id, name, pdf_path, work_dir)
+        with self._lock:
+            self._jobs[job_id] = job
+        job._future = asyncio.run_coroutine_threadsafe(self._run_job(job, converter), self._loop)
+        job._future.add_done_callback(lambda future: self._job_done(job, future))
+        return job
+    
+    def get(self, job_id):
+        """IDのジョブを返す（なければNone）"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def jobs(self):
+        """登録されているジョブのリストを返す（登録順）"""
+        with self._lock:
+            return list(self._jobs.values())
+    
+    def cancel(self, job_id, discard=False):
+        """
+        ジョブの変換をキャンセルする
+        
+        Args:
+            job_id (str): ジョブのID
+            discard (bool, optional): Trueの場合、キャンセルが終わったらジョブと作業フォルダを削除する
+        
+        Returns:
+            ServerJob: キャンセルしたジョブ（なければNone）
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if discard:
+            job.discard = True
+        if job.done:
+            if discard:
+                self.remove(job_id)
+        else:
+            # 変換のタスクをキャンセルすると、ワーカーの変換もページの区切りで中断する
+            job._future.cancel()
+        return job
+    
+    def remove(self, job_id):
+        """ジョブと作業フォルダを削除する"""
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is not None:
+            shutil.rmtree(job.work_dir, ignore_errors=True)
+    
+    async def _start(self):
+        """保持する時間を過ぎたジョブの定期的な削除を始め、ワーカープロセスを準備する（イベントループで実行）"""
+        self._expire_task = asyncio.ensure_future(self._expire_periodically())
+        return await self._async_converter.warm_up()
+    
+    async def _aclose(self):
+        """定期的な削除を止め、変換をキャンセルしてワーカープロセスを終了する（イベントループで実行）"""
+        self._expire_task.cancel()
+        await asyncio.gather(self._expire_task, return_exceptions=True)
+        await self._async_converter.aclose(cancel=True)
+    
+    async def _expire_periodically(self):
+        """
+        保持する時間を過ぎた終了済みのジョブを定期的に削除する（イベントループで実行）
+        
+        ジョブの登録がないサーバーでも、アップロードされたPDFと変換結果が残り続けないようにします。
+        確認の間隔はEXPIRE_INTERVALまでで、保持する時間が短い場合はその時間ごとに確認します。
+        """
+        while True:
+            await asyncio.sleep(max(0.1, min(EXPIRE_INTERVAL, self.result_ttl)))
+            # 作業フォルダの削除でイベントループを止めないよう、別のスレッドで行う
+            await self._loop.run_in_executor(None, self._expire_jobs)
+    
+    async def _run_job(self, job, converter):
+        """ジョブのPDFを変換し、進捗と結果をジョブに記録する（イベントループで実行）"""
+        conversion = self._async_converter.submit(job.pdf_path, job.work_dir, converter)
+        try:
+            async for event in conversion:
+                job.add_progress(*event)
+            result = await conversion
+        except asyncio.CancelledError:
+            # ワーカーの変換の中断と一時フォルダの削除が終わるまで待つ
+            conversion.cancel()
+            await asyncio.gather(conversion, return_exceptions=True)
+            raise
+        except Exception as e:
+            job.finish(error=str(e))
+        else:
+            job.finish(result=result)
+    
+    def _job_done(self, job, future):
+        """変換のコルーチンの終了時の処理（キャンセルされた場合の記録と、破棄するジョブの削除）"""
+        if future.cancelled():
+            job.finish(cancelled=True)
+        if job.discard:
+            self.remove(job.id)
+    
+    def _expire_jobs(self):
+        """保持する時間を過ぎた終了済みのジョブを削除する"""
+        now = time.monotonic()
+        for job in self.jobs():
+            if job.done and now - job.finished > self.result_ttl:
+                self.remove(job.id)
+
+
+def _safe_pdf_name(name):
+    """アップロードされたファイル名から、フォルダを含まない.pdfのファイル名を作る"""
+    name = os.path.basename((name or "").replace("\\", "/")).strip()
+    if not name or name.startswith("."):
+        name = "document.pdf"
+    if not name.lower().endswith(".pdf"):
+        name += ".pdf"
+    return name
+
+
+class _HTTPError(Exception):
+    """エラーのレスポンスを返すための例外"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """変換サーバーのHTTPリクエストを処理するクラス
+    
+    POST /jobs              PDF（リクエストの本文）を登録し、ジョブの状態を返す（202）
+    POST /convert           PDFを変換し、完成したPPTXを返す（変換が終わるまで待つ）
+    GET  /jobs              ジョブの一覧
+    GET  /jobs/<id>         ジョブの状態
+    GET  /jobs/<id>/events  進捗をJSON Lines形式で配信する（変換が終わるまで接続を保つ）
+    GET  /jobs/<id>/result  完成したPPTX
+    DELETE /jobs/<id>       変換をキャンセルし、ジョブを削除する
+    GET  /health            サーバーの状態
+    
+    POSTのクエリ文字列では name（ファイル名）・dpi・format（jpg, png, auto）・
+    pages（変換するページ、例: 1-3,5）・progressive（1で低解像度の下書きを先に保存）を指定できます。
+    段階的な変換の途中でも、下書きの保存後は /jobs/<id>/result?draft=1 でその時点のPPTXを取得できます。
+    ファイル名はX-Filenameヘッダーでも指定できます。
+    """
+    
+    protocol_version = "HTTP/1.1"
+    server_version = "pdf2pptx-server"
+    
+    ROUTES = [
+        ("POST", re.compile(r"^/jobs$"), "_post_job"),
+        ("POST", re.compile(r"^/convert$"), "_post_convert"),
+        ("GET", re.compile(r"^/jobs$"), "_get_jobs"),
+        ("GET", re.compile(r"^/jobs/(\w+)$"), "_get_job"),
+        ("GET", re.compile(r"^/jobs/(\w+)/events$"), "_get_events"),
+        ("GET", re.compile(r"^/jobs/(\w+)/result$"), "_get_result"),
+        ("DELETE", re.compile(r"^/jobs/(\w+)$"), "_delete_job"),
+        ("GET", re.compile(r"^/health$"), "_get_health"),
+    ]
+    
+    @property
+    def service(self):
+        """変換を受け付けるConversionService"""
+        return self.server.service
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+    
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+    
+    def _dispatch(self, method):
+        """パスに対応する処理を呼び出し、エラーはJSONで返す"""
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        allowed = []
+        for route_method, pattern, handler_name in self.ROUTES:
+            match = pattern.match(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed.append(route_method)
+                continue
+            try:
+                getattr(self, handler_name)(query, *match.groups())
+            except _HTTPError as e:
+                self._send_error(e.status, e.message)
+            except (BrokenPipeError, ConnectionResetError):
+                # クライアントが切断した場合
+                self.close_connection = True
+            return
+        if allowed:
+            self._send_error(HTTPStatus.METHOD_NOT_ALLOWED, "このパスでは使えないメソッドです",
+                             {"Allow": ", ".join(allowed)})
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "パスが見つかりません")
+    
+    def _send_json(self, status, data, headers=None):
+        """JSONのレスポンスを返す"""
+        body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _send_error(self, status, message, headers=None):
+        """エラーをJSONで返す（本文を読み残している場合があるため、接続は閉じる）"""
+        self.close_connection = True
+        headers = dict(headers or {}, Connection="close")
+        self._send_json(status, {"error": message}, headers)
+    
+    def _job(self, job_id):
+        """IDのジョブを返す（なければ404）"""
+        job = self.service.get(job_id)
+        if job is None:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, "ジョブが見つかりません")
+        return job
+    
+    def _read_upload(self, query):
+        """
+        リクエストの本文のPDFを読み込み、ジョブを登録する
+        
+        Returns:
+            ServerJob: 登録したジョブ
+        """
+        length = self.headers.get("Content-Length")
+        if length is None:
+            raise _HTTPError(HTTPStatus.LENGTH_REQUIRED, "Content-Lengthを指定してください")
+        try:
+            length = int(length)
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Content-Lengthが正しくありません")
+        if length > self.server.max_upload_bytes:
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "PDFファイルが大きすぎます")
+        dpi, image_format, pages, progressive = self._conversion_options(query)
+        
+        data = self.rfile.read(length)
+        if len(data) < length:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "PDFファイルを最後まで受信できませんでした")
+        if not data.startswith(b"%PDF-"):
+            raise _HTTPError(HTTPStatus.UNSUPPORTED_MEDIA_TYPE, "PDFファイルではありません")
+        name = query.get("name") or self.headers.get("X-Filename")
+        return self.service.submit(data, name, dpi, image_format, pages, progressive)
+    
+    def _conversion_options(self, query):
+        """クエリ文字列の変換の設定（dpi, format, pages, progressive）を検証して返す"""
+        dpi = query.get("dpi")
+        if dpi is not None:
+            try:
+                dpi = int(dpi)
+            except ValueError:
+                dpi = 0
+            if dpi < 1:
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "dpiには1以上の整数を指定してください")
+        image_format = query.get("format")
+        if image_format is not None and image_format not in IMAGE_FORMATS:
+            raise _HTTPError(
+                HTTPStatus.BAD_REQUEST, f"formatには{', '.join(IMAGE_FORMATS)}のいずれかを指定してください"
+            )
+        pages = query.get("pages")
+        try:
+            validate_page_ranges(pages)
+        except ValueError as e:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, f"pages: {e}")
+        progressive = query.get("progressive")
+        if progressive is not None:
+            if progressive not in ("0", "1"):
+                raise _HTTPError(HTTPStatus.BAD_REQUEST, "progressiveには0または1を指定してください")
+            progressive = progressive == "1"
+        return dpi, image_format, pages, progressive
+    
+    def _post_job(self, query):
+        job = self._read_upload(query)
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+    
+    def _post_convert(self, query):
+        job = self._read_upload(query)
+        while not job.wait(EVENT_WAIT_INTERVAL):
+            if self._client_disconnected():
+                # 結果を受け取るクライアントがいないため、変換を中断して終わったらジョブを削除する
+                self.service.cancel(job.id, discard=True)
+                self.close_connection = True
+                return
+        try:
+            self._send_result(job)
+        finally:
+            self.service.remove(job.id)
+    
+    def _client_disconnected(self):
+        """クライアントが接続を閉じたかどうか（受信できるデータがなく、接続の終わりが届いている）"""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except (OSError, ValueError):
+            return True
+    
+    def _get_jobs(self, query):
+        self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in self.service.jobs()]})
+    
+    def _get_job(self, query, job_id):
+        self._send_json(HTTPStatus.OK, self._job(job_id).to_dict())
+    
+    def _get_events(self, query, job_id):
+        """進捗をJSON Lines形式で配信する（本文の長さは決まらないため、最後に接続を閉じる）"""
+        job = self._job(job_id)
+        self.close_connection = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        
+        index = 0
+        done = False
+        while not done:
+            events, done = job.wait_events(index, EVENT_WAIT_INTERVAL)
+            index += len(events)
+            for event in events:
+                self.wfile.write(json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n")
+            # 通知がない間も書き込みを試みて、切断したクライアントを検出する
+            self.wfile.flush()
+    
+    def _get_result(self, query, job_id):
+        job = self._job(job_id)
+        if not job.done:
+            if query.get("draft") == "1" and job.draft_ready:
+                # 段階的な変換の途中では、その時点のPPTX（下書き、または一部を差し替えたもの）を返す
+                self._send_pptx(job.pptx_path)
+                return
+            raise _HTTPError(HTTPStatus.CONFLICT, "変換が終わっていません")
+        self._send_result(job)
+    
+    def _send_result(self, job):
+        """終了したジョブのPPTX（失敗・キャンセルの場合はエラー）を返す"""
+        if job.status == STATUS_CODES["キャンセル"]:
+            raise _HTTPError(HTTPStatus.GONE, job.message)
+        if job.result is None:
+            raise _HTTPError(HTTPStatus.UNPROCESSABLE_ENTITY, job.error)
+        self._send_pptx(job.result.pptx_path)
+    
+    def _send_pptx(self, pptx_path):
+        """PPTXファイルを返す（削除されている場合は410）"""
+        try:
+            f = open(pptx_path, "rb")
+        except FileNotFoundError:
+            raise _HTTPError(HTTPStatus.GONE, "変換結果は削除されています")
+        with f:
+            name = os.path.basename(pptx_path)
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", PPTX_CONTENT_TYPE)
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(name)}")
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, RESULT_CHUNK_SIZE)
+    
+    def _delete_job(self, query, job_id):
+        job = self.service.cancel(job_id, discard=True)
+        if job is None:
+            raise _HTTPError(HTTPStatus.NOT_FOUND, "ジョブが見つかりません")
+        self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+    
+    def _get_health(self, query):
+        jobs = self.service.jobs()
+        counts = {JOB_QUEUED: 0, "running": 0, "finished": 0}
+        for job in jobs:
+            if job.done:
+                counts["finished"] += 1
+            elif job.status == JOB_QUEUED:
+                counts[JOB_QUEUED] += 1
+            else:
+                counts["running"] += 1
+        self._send_json(HTTPStatus.OK, {"status": "ok", "workers": self.service.workers, "jobs": counts})
+
+
+class ConversionServer(ThreadingHTTPServer):
+    """変換サーバー（リクエストごとにスレッドで処理するHTTPサーバー）"""
+    
+    daemon_threads = True
+    
+    def __init__(self, server_address, service, max_upload_bytes=DEFAULT_MAX_UPLOAD_BYTES, quiet=False):
+        """
+        初期化メソッド
+        
+        Args:
+            server_address (tuple): 待ち受けるアドレスとポート（ポート0で空いているポート）
+            service (ConversionService): 変換を受け付けるサービス（起動済みのもの）
+            max_upload_bytes (int, optional): アップロードできるPDFの最大サイズ（バイト）
+            quiet (bool, optional): Trueの場合、リクエストのログを出力しない
+        """
+        super().__init__(server_address, ConversionRequestHandler)
+        self.service = service
+        self.max_upload_bytes = max_upload_bytes
+        self.quiet = quiet
+    
+    @property
+    def url(self):
+        """サーバーのURL"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def build_parser():
+    """コマンドライン引数のパーサーを作成する"""
+    parser = argparse.ArgumentParser(
+        prog="pdf2pptx-server",
+        description="PDFをPPTXに変換するローカルのHTTPサーバーを起動します。"
+    )
+    parser.add_argument(
+        "--host", default=DEFAULT_HOST,
+        help=f"待ち受けるアドレス（既定: {DEFAULT_HOST}、ほかのPCから使う場合は0.0.0.0）"
+    )
+    parser.add_argument(
+        "--port", type=int, default=DEFAULT_PORT,
+        help=f"待ち受けるポート（既定: {DEFAULT_PORT}）"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None,
+        help="ワーカープロセス数（同時に変換するファイル数、既定: CPUコア数）"
+    )
+    parser.add_argument(
+        "--dpi", type=int, default=300,
+        help="画像変換の解像度（リクエストで指定がない場合、既定: 300）"
+    )
+    parser.add_argument(
+        "--format", dest="image_format", choices=IMAGE_FORMATS, default="jpg",
+        help="画像フォーマット（リクエストで指定がない場合、既定: jpg）"
+    )
+    parser.add_argument(
+        "--progressive", action="store_true",
+        help="低解像度の下書きのPPTXを先に保存し、その後で高解像度の画像に差し替える（リクエストで指定がない場合）"
+    )
+    parser.add_argument(
+        "--max-upload-mb", type=float, default=DEFAULT_MAX_UPLOAD_BYTES / (1024 * 1024),
+        help="アップロードできるPDFの最大サイズ（MB、既定: 200）"
+    )
+    parser.add_argument(
+        "--result-ttl", type=float, default=DEFAULT_RESULT_TTL, metavar="SECONDS",
+        help=f"終了したジョブの結果を保持する時間（秒、既定: {DEFAULT_RESULT_TTL}）"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true",
+        help="リクエストのログを出力しない"
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    変換サーバーのエントリポイント（Ctrl+Cで終了する）
+    
+    Returns:
+        int: 終了コード
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workersには1以上の値を指定してください")
+    if args.dpi < 1:
+        parser.error("--dpiには1以上の値を指定してください")
+    
+    service = ConversionService(workers=args.workers, result_ttl=args.result_ttl)
+    service.converter.dpi = args.dpi
+    service.converter.image_format = args.image_format
+    service.converter.progressive = args.progressive
+    start_time = time.perf_counter()
+    service.start()
+    print(f"{service.workers}個のワーカープロセスを準備しました（{time.perf_counter() - start_time:.1f}秒）",
+          file=sys.stderr)
+    
+    server = ConversionServer(
+        (args.host, args.port), service, int(args.max_upload_mb * 1024 * 1024), args.quiet
+    )
+    print(f"{server.url} で待ち受けています（Ctrl+Cで終了）", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    # 実行ファイル化した場合に、ワーカープロセスが正しく起動するようにする
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -2,17 +2,576 @@
 PDFをPPTXに変換するためのコアモジュール
 PyMuPDF（fitz）を使用してPDFから画像への変換を行います
 """
+import io
 import os
 import re
 import sys
+import copy
+import contextlib
+import math
+import hashlib
+import time
+import queue
 import shutil
 import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from glob import glob
 from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
 from pptx.util import Pt
+from lxml import etree
 from PIL import Image
 import fitz  # PyMuPDF
 
+from page_fingerprint import PageFingerprinter, render_key
+from image_encoder import (
+    AdaptiveEncoder, BudgetEncoder, EncodingStats, ENCODING_JPEG, FIXED_JPEG_QUALITY, MIN_JPEG_QUALITY,
+    detect_encoding
+)
+from hybrid_text import extract_text_lines, remove_text, text_shapes_xml
+from tiled_render import can_render_tiled, render_page_tiled, DEFAULT_TILE_HEIGHT
+from cancellation import CancellationToken, ConversionCancelled, check_cancelled
+from page_ranges import parse_page_ranges
+from progress_throttle import (
+    DEFAULT_PROGRESS_INTERVAL, ThrottledCallback, ThroughputEstimator, format_throughput
+)
+from conversion_metrics import (
+    ConversionMetrics, add_page_timing, STAGE_OPEN, STAGE_RENDER, STAGE_SLIDES, STAGE_SAVE, STAGE_COPY,
+    STAGE_DRAFT
+)
+from streaming_pptx import (
+    StreamingPptxWriter, IMAGE_CONTENT_TYPES, NS_ASVG, SVG_BLIP_EXT_URI
+)
+
+
+# PowerPointの最大サイズ (56インチ = 約4032ピクセル@72dpi)
+MAX_PPT_SIZE = 4032
+
+# ページごとに画像形式を自動選択する場合のimage_formatの値
+IMAGE_FORMAT_AUTO = "auto"
+
+# 並列レンダリング時に1ワーカーあたりへ割り当てるチャンク数の目安
+PARALLEL_CHUNKS_PER_WORKER = 4
+
+# パイプライン処理のワーカープロセスが保持するPDFドキュメント
+_worker_document = None
+
+# 一括変換のワーカープロセスが進捗を送るキュー
+_batch_progress_queue = None
+
+# ワーカープロセスがページ・ファイルの区切りで確認するキャンセルのトークン
+_worker_cancel_token = None
+
+# 一括変換で進捗キューを確認する間隔（秒）
+BATCH_POLL_INTERVAL = 0.1
+
+# ページのキーを保存するスライド上の画像の名前の接頭辞
+PAGE_KEY_PREFIX = "pdf2pptx:"
+
+# ベクターモードで画像フォルダに保存するファイルの拡張子
+VECTOR_IMAGE_FORMAT = "svg"
+
+# 目標サイズから画像に使えるバイト数を求める際に差し引く、PPTXの画像以外の部分のサイズの見積もり
+PPTX_BASE_BYTES = 32 * 1024  # スライドマスター・テーマなど
+PPTX_SLIDE_BYTES = 1536  # スライド1枚あたり
+
+# 目標サイズから求めた1ページの画像のバイト数の下限
+MIN_PAGE_BUDGET = 4 * 1024
+
+# 段階的な変換（progressive）で先に保存する下書きの画像の解像度の既定値
+DEFAULT_DRAFT_DPI = 48
+
+# 段階的な変換で、下書きの作成に割り当てる進捗の範囲（0%〜この値%）
+DRAFT_PROGRESS = 30
+
+# 段階的な変換で下書きを置き換えられない場合（PowerPointで開いているなど）に再試行する回数と間隔（秒）
+REPLACE_RETRIES = 3
+REPLACE_RETRY_INTERVAL = 0.5
+
+# 下書きを置き換えられない場合に、高解像度のPPTXを保存するファイル名に付ける文字列
+REFINED_SUFFIX = "_refined"
+
+
+def _calculate_zoom(page_rect, dpi):
+    """
+    ページサイズとDPIから画像化に使用するズーム値を計算する
+    
+    PowerPointの制限を超えないように、安全マージン（90%）を取った値を返します。
+    """
+    # サイズに基づいて適切なDPI/ズームを計算
+    width_pt = page_rect.width
+    height_pt = page_rect.height
+    
+    # 最大DPIを計算（PowerPointの制限を考慮）
+    max_zoom_width = MAX_PPT_SIZE / width_pt
+    max_zoom_height = MAX_PPT_SIZE / height_pt
+    max_zoom = min(max_zoom_width, max_zoom_height, dpi / 72)
+    
+    # 安全マージンを取る (90%)
+    safe_zoom = max_zoom * 0.9
+    
+    # 最終的なズーム値を決定
+    return min(dpi / 72, safe_zoom)
+
+
+def _zoomed_size(page_rect, zoom):
+    """ズーム値でレンダリングしたときの画像のピクセルサイズを返す"""
+    irect = (fitz.Rect(page_rect) * fitz.Matrix(zoom, zoom)).irect
+    return irect.width, irect.height
+
+
+def _page_pixel_size(page_rect, dpi):
+    """
+    ページを画像化したときのピクセルサイズを計算する
+    
+    page.rectとズーム値から求めるため、実際にレンダリングしなくても
+    get_pixmapが生成する画像と同じサイズが得られます。
+    """
+    return _zoomed_size(page_rect, _calculate_zoom(page_rect, dpi))
+
+
+def _should_render_tiled(page, zoom, encoder, tile_height):
+    """ページを帯に分けてレンダリングするかどうか（形式の自動選択はページ全体の画像が必要なため対象外）"""
+    return bool(tile_height) and encoder is None and can_render_tiled(page, zoom, tile_height)
+
+
+def _render_page_to_bytes(page, dpi, image_format, cache=None, encoder=None, tile_height=None):
+    """
+    1ページを画像としてレンダリングし、エンコード済みのバイト列を返す
+    
+    cacheが指定されている場合、同じ内容・条件のページはキャッシュから取得します。
+    encoder（AdaptiveEncoder）が指定されている場合、image_formatの代わりに
+    ページの内容に応じた形式でエンコードします。
+    tile_heightが指定されている場合、大きなページはその高さの帯に分けてレンダリングします。
+    
+    Returns:
+        tuple: (エンコード済みの画像データ, エンコード情報の辞書)
+            辞書にはレンダリング・エンコードの時間と画像のサイズ（add_page_timingを参照）、
+            encoderがある場合はその形式の選択結果が含まれます
+    """
+    started = time.perf_counter()
+    zoom = _calculate_zoom(page.rect, dpi)
+    format_label = encoder.format_label if encoder is not None else image_format
+    
+    key = None
+    if cache is not None:
+        key = cache.make_key(page, zoom, format_label)
+        cached = cache.get(key)
+        if cached is not None:
+            finished = time.perf_counter()
+            return cached, add_page_timing(
+                encoder.describe(cached) if encoder is not None else None,
+                started, finished, finished, len(cached), *_zoomed_size(page.rect, zoom), cached=True
+            )
+    
+    info = None
+    tiled = _should_render_tiled(page, zoom, encoder, tile_height)
+    if tiled:
+        # 帯ごとにレンダリングとエンコードを繰り返すため、時間はすべてレンダリングに含める
+        stream = io.BytesIO()
+        render_page_tiled(page, zoom, image_format, stream, tile_height)
+        image_bytes = stream.getvalue()
+        rendered = time.perf_counter()
+        size = _zoomed_size(page.rect, zoom)
+    else:
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        rendered = time.perf_counter()
+        size = (pix.width, pix.height)
+        if encoder is not None:
+            image_bytes, info = encoder.encode(pix)
+        elif image_format.lower() == "jpg":
+            image_bytes = pix.tobytes("jpeg")
+        else:
+            image_bytes = pix.tobytes(image_format.lower())
+    
+    if cache is not None:
+        cache.put(key, image_bytes)
+    return image_bytes, add_page_timing(
+        info, started, rendered, time.perf_counter(), len(image_bytes), *size, cached=False, tiled=tiled
+    )
+
+
+def _image_file_name(page_index, image_format):
+    """ページ番号に対応する画像ファイル名を返す"""
+    return f"page_{page_index+1:03d}.{image_format}"
+
+
+def _image_file_format(image_format, image_bytes):
+    """画像ファイルの拡張子を返す（自動選択の場合は実際にエンコードした形式に合わせる）"""
+    if image_format != IMAGE_FORMAT_AUTO:
+        return image_format
+    return "jpg" if detect_encoding(image_bytes) == ENCODING_JPEG else "png"
+
+
+def _render_page_to_file(page, page_index, images_folder, dpi, image_format, cache=None, encoder=None,
+                         tile_height=None):
+    """
+    1ページを画像としてレンダリングし、ファイルに保存する
+    
+    Returns:
+        tuple: (画像ファイルのパス, エンコード情報の辞書（_render_page_to_bytesを参照）)
+    """
+    if cache is not None or encoder is not None:
+        # エンコード済みのバイト列をそのまま書き出す
+        image_bytes, info = _render_page_to_bytes(page, dpi, image_format, cache, encoder, tile_height)
+        image_path = os.path.join(
+            images_folder, _image_file_name(page_index, _image_file_format(image_format, image_bytes))
+        )
+        with open(image_path, "wb") as f:
+            f.write(image_bytes)
+        return image_path, info
+    
+    # 画像ファイルのパスを設定
+    image_path = os.path.join(images_folder, _image_file_name(page_index, image_format))
+    
+    started = time.perf_counter()
+    zoom = _calculate_zoom(page.rect, dpi)
+    matrix = fitz.Matrix(zoom, zoom)
+    
+    if _should_render_tiled(page, zoom, encoder, tile_height):
+        # 帯ごとにエンコードしながらファイルへ書き出す
+        with open(image_path, "wb") as f:
+            render_page_tiled(page, zoom, image_format, f, tile_height)
+        finished = time.perf_counter()
+        return image_path, _file_timing(
+            image_path, started, finished, finished, _zoomed_size(page.rect, zoom), tiled=True
+        )
+    
+    # ページを画像としてレンダリング
+    pix = page.get_pixmap(matrix=matrix)
+    rendered = time.perf_counter()
+    
+    # 画像として保存
+    if image_format.lower() == "jpg":
+        pix.save(image_path, "jpeg")
+    else:
+        pix.save(image_path)
+    
+    return image_path, _file_timing(
+        image_path, started, rendered, time.perf_counter(), (pix.width, pix.height), tiled=False
+    )
+
+
+def _file_timing(image_path, started, rendered, finished, size, tiled):
+    """保存した画像ファイルについて、レンダリング・エンコードの時間と画像のサイズを記録したエンコード情報を返す"""
+    return add_page_timing(
+        None, started, rendered, finished, os.path.getsize(image_path), *size, cached=False, tiled=tiled
+    )
+
+
+def _render_pages_worker(pdf_path, page_indices, images_folder, dpi, image_format, cache=None, encoder=None,
+                         tile_height=None):
+    """
+    プロセスプールのワーカーで実行されるレンダリング関数
+    
+    fitzのドキュメントはプロセス間で共有できないため、各ワーカーが自分でPDFを開きます。
+    
+    Returns:
+        list: (ページ番号, 画像ファイルのパス, エンコード情報) のリスト
+    """
+    pdf_document = fitz.open(pdf_path)
+    try:
+        results = []
+        for i in page_indices:
+            check_cancelled(_worker_cancel_token)
+            results.append((i, *_render_page_to_file(
+                pdf_document[i], i, images_folder, dpi, image_format, cache, encoder, tile_height
+            )))
+        return results
+    finally:
+        pdf_document.close()
+
+
+def _init_render_worker(cancel_token):
+    """並列レンダリング用ワーカープロセスの初期化"""
+    global _worker_cancel_token
+    _worker_cancel_token = cancel_token
+
+
+def _render_page_to_svg(page, fallback_dpi):
+    """
+    1ページをSVG画像と、SVGに対応していないアプリケーション向けの低解像度PNGに変換する
+    
+    Returns:
+        tuple: (SVG画像のデータ, 代替表示用のPNGのデータ, エンコード情報の辞書)
+            エンコード情報では、SVGへの変換をレンダリング、代替表示用のPNGの作成をエンコードの時間とし、
+            バイト数は両方の合計、画像のサイズは代替表示用のPNGのサイズです
+    """
+    started = time.perf_counter()
+    svg_bytes = page.get_svg_image().encode("utf-8")
+    rendered = time.perf_counter()
+    fallback_bytes, fallback_info = _render_page_to_bytes(page, fallback_dpi, "png")
+    info = add_page_timing(
+        {"encoding": VECTOR_IMAGE_FORMAT}, started, rendered, time.perf_counter(),
+        len(svg_bytes) + len(fallback_bytes), fallback_info["width"], fallback_info["height"], cached=False
+    )
+    return svg_bytes, fallback_bytes, info
+
+
+def _add_svg_blip(picture, svg_rId):
+    """画像の図形のblipに、SVG画像を参照する拡張を追加する"""
+    blip = picture._element.blipFill.blip
+    ext_list = blip.find(qn("a:extLst"))
+    if ext_list is None:
+        ext_list = etree.SubElement(blip, qn("a:extLst"))
+    ext = etree.SubElement(ext_list, qn("a:ext"), uri=SVG_BLIP_EXT_URI)
+    svg_blip = etree.SubElement(ext, f"{{{NS_ASVG}}}svgBlip", nsmap={"asvg": NS_ASVG})
+    svg_blip.set(qn("r:embed"), svg_rId)
+
+
+def _init_pipeline_worker(pdf_path, cancel_token=None):
+    """パイプライン用ワーカープロセスの初期化（PDFは1プロセスにつき1回だけ開く）"""
+    global _worker_document, _worker_cancel_token
+    _worker_document = fitz.open(pdf_path)
+    _worker_cancel_token = cancel_token
+
+
+def _render_page_bytes_worker(page_index, dpi, image_format, cache=None, encoder=None, tile_height=None):
+    """
+    パイプライン用ワーカーで1ページをレンダリングしてエンコードする
+    
+    Pixmapはサイズが大きくプロセス間の受け渡しに向かないため、
+    レンダリングとエンコードはワーカー内でまとめて行い、バイト列だけを返します。
+    
+    Returns:
+        tuple: (ページ番号, エンコード済みの画像データ, エンコード情報)
+    """
+    # キャンセル後に残っていたページはレンダリングしない
+    check_cancelled(_worker_cancel_token)
+    return (page_index, *_render_page_to_bytes(
+        _worker_document[page_index], dpi, image_format, cache, encoder, tile_height
+    ))
+
+
+def _slide_page_key(slide):
+    """スライドに保存されたページのキーを返す（保存されていなければNone）"""
+    for shape in slide.shapes:
+        if shape.name.startswith(PAGE_KEY_PREFIX):
+            return shape.name[len(PAGE_KEY_PREFIX):]
+    return None
+
+
+def _replace_slide_image(slide, image_stream, page_key):
+    """スライドのページ画像を差し替え、ページのキーを更新する"""
+    for shape in slide.shapes:
+        if shape.name.startswith(PAGE_KEY_PREFIX):
+            picture = shape
+            break
+    else:
+        raise ValueError("ページ画像のスライドではありません")
+    
+    _set_picture_image(slide, picture, image_stream)
+    picture.name = PAGE_KEY_PREFIX + page_key
+
+
+def _set_picture_image(slide, picture, image_stream):
+    """スライド上の画像の図形が表示する画像を差し替える"""
+    old_rId = picture._element.blip_rId
+    _, new_rId = slide.part.get_or_add_image_part(image_stream)
+    picture._element.blipFill.blip.rEmbed = new_rId
+    
+    # 他から参照されていなければ古い画像への参照を削除する
+    if new_rId != old_rId:
+        slide.part.drop_rel(old_rId)
+
+
+def _save_presentation(prs, pptx_path, fallback_path=None):
+    """
+    書き込み途中で失敗しても元のファイルが壊れないよう、一時ファイル経由でPPTXを保存する
+    
+    fallback_pathが指定されている場合、pptx_pathを置き換えられなければ（Windowsで
+    ほかのアプリケーションが開いているなど）REPLACE_RETRIES回まで再試行し、
+    それでも置き換えられなければfallback_pathに保存します。
+    
+    Returns:
+        str: 保存したPPTXファイルのパス
+    """
+    temp_path = pptx_path + ".tmp"
+    try:
+        prs.save(temp_path)
+        if fallback_path is None:
+            os.replace(temp_path, pptx_path)
+            return pptx_path
+        for attempt in range(REPLACE_RETRIES + 1):
+            try:
+                os.replace(temp_path, pptx_path)
+                return pptx_path
+            except OSError:
+                if attempt < REPLACE_RETRIES:
+                    time.sleep(REPLACE_RETRY_INTERVAL)
+        os.replace(temp_path, fallback_path)
+        return fallback_path
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _plan_slide_reuse(old_keys, new_keys):
+    """
+    既存のスライドを新しいページにどう割り当てるかを決める
+    
+    同じ位置でキーが一致するスライドを優先し、次に位置が変わったページを
+    キーで探します。
+    
+    Returns:
+        tuple: (ページごとの再利用するスライド番号（なければNone）のリスト,
+                どのページにも使われなかったスライド番号のdeque)
+    """
+    assignment = [None] * len(new_keys)
+    used = set()
+    
+    # 同じ位置で変更のないページ
+    for i in range(min(len(old_keys), len(new_keys))):
+        if old_keys[i] == new_keys[i]:
+            assignment[i] = i
+            used.add(i)
+    
+    # 位置が変わったページ
+    unused_by_key = {}
+    for slide_index, key in enumerate(old_keys):
+        if slide_index not in used:
+            unused_by_key.setdefault(key, deque()).append(slide_index)
+    for i, key in enumerate(new_keys):
+        if assignment[i] is None and unused_by_key.get(key):
+            slide_index = unused_by_key[key].popleft()
+            assignment[i] = slide_index
+            used.add(slide_index)
+    
+    spare = deque(i for i in range(len(old_keys)) if i not in used)
+    return assignment, spare
+
+
+def _init_batch_worker(progress_queue, cancel_token=None):
+    """一括変換用ワーカープロセスの初期化"""
+    global _batch_progress_queue, _worker_cancel_token
+    _batch_progress_queue = progress_queue
+    _worker_cancel_token = cancel_token
+
+
+def _convert_many_worker(converter, index, pdf_path, output_folder):
+    """一括変換のワーカープロセスで1ファイルを変換する"""
+    def report(status, message, progress=None):
+        _batch_progress_queue.put((index, status, message, progress))
+    
+    return _run_single_conversion(converter, pdf_path, output_folder, report, _worker_cancel_token)
+
+
+def _run_single_conversion(converter, pdf_path, output_folder, callback, cancel_token=None):
+    """1ファイルを変換し、例外を送出せずにConversionResultとして結果を返す"""
+    start_time = time.perf_counter()
+    try:
+        pptx_path, images_folder = converter.convert_pdf_to_pptx(pdf_path, output_folder, callback, cancel_token)
+        return ConversionResult(
+            pdf_path, pptx_path, images_folder, elapsed=time.perf_counter() - start_time,
+            metrics=converter.metrics.to_dict()
+        )
+    except ConversionCancelled as e:
+        return ConversionResult(
+            pdf_path, error=str(e), elapsed=time.perf_counter() - start_time, cancelled=True
+        )
+    except Exception as e:
+        return ConversionResult(pdf_path, error=str(e), elapsed=time.perf_counter() - start_time)
+
+
+class _PresentationWriter:
+    """python-pptxのPresentationにスライドを追加するライター
+    
+    StreamingPptxWriterと同じ使い方ができるようにするためのクラスです。
+    """
+    
+    def __init__(self, converter, pptx_path, slide_width, slide_height):
+        self.converter = converter
+        self.pptx_path = pptx_path
+        self.prs = Presentation()
+        self.prs.slide_width = slide_width
+        self.prs.slide_height = slide_height
+        
+        # 白紙レイアウトを使用
+        self.layout = self.prs.slide_layouts[6]
+        
+        # 内容が同じSVG画像はパートを共有する（python-pptxはSVGのパートを管理しないため）
+        self._svg_parts = {}
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        return False
+    
+    def add_picture_slide(self, image_bytes, name=None, shapes_xml=""):
+        """画像をスライド全体に配置したスライドを追加する（shapes_xmlの図形は画像の前面に追加）"""
+        slide = self.converter._add_picture_slide(self.prs, self.layout, io.BytesIO(image_bytes))
+        if name is not None:
+            slide.shapes[0].name = name
+        if shapes_xml:
+            sp_tree = slide.shapes._spTree
+            for shape in list(parse_xml(f"<p:spTree {nsdecls('p', 'a', 'r')}>{shapes_xml}</p:spTree>")):
+                sp_tree.append(shape)
+        return slide
+    
+    def add_svg_slide(self, svg_bytes, fallback_bytes, name=None):
+        """SVG画像をスライド全体に配置したスライドを追加する（fallback_bytesは代替表示用の画像）"""
+        slide = self.add_picture_slide(fallback_bytes, name)
+        
+        digest = hashlib.sha1(svg_bytes).digest()
+        svg_part = self._svg_parts.get(digest)
+        if svg_part is None:
+            package = self.prs.part.package
+            svg_part = Part(
+                package.next_image_partname(VECTOR_IMAGE_FORMAT),
+                IMAGE_CONTENT_TYPES["svg"], package, svg_bytes
+            )
+            self._svg_parts[digest] = svg_part
+        _add_svg_blip(slide.shapes[0], slide.part.relate_to(svg_part, RT.IMAGE))
+    
+    def close(self):
+        """プレゼンテーションを保存する"""
+        self.prs.save(self.pptx_path)
+
+
+class ConversionResult:
+    """convert_manyにおける1ファイル分の変換結果
+    
+    Attributes:
+        pdf_path (str): 変換元のPDFファイルのパス
+        pptx_path (str): 作成されたPPTXファイルのパス（失敗時はNone）
+        images_folder (str): 画像フォルダのパス（保存しない場合や失敗時はNone）
+        error (str): エラーメッセージ（成功時はNone）
+        elapsed (float): 変換にかかった時間（秒）
+        metrics (dict): 段階・ページごとの処理時間とサイズ（ConversionMetrics.to_dict、失敗時はNone）
+        cancelled (bool): キャンセルにより変換しなかったかどうか（errorにはその旨のメッセージが入る）
+    """
+    
+    def __init__(self, pdf_path, pptx_path=None, images_folder=None, error=None, elapsed=0.0, metrics=None,
+                 cancelled=False):
+        """初期化メソッド"""
+        self.pdf_path = pdf_path
+        self.pptx_path = pptx_path
+        self.images_folder = images_folder
+        self.error = error
+        self.elapsed = elapsed
+        self.metrics = metrics
+        self.cancelled = cancelled
+    
+    @property
+    def succeeded(self):
+        """変換に成功したかどうか"""
+        return self.error is None
+    
+    def __repr__(self):
+        if self.cancelled:
+            state = "キャンセル"
+        else:
+            state = "成功" if self.succeeded else f"失敗: {self.error}"
+        return f"ConversionResult({self.pdf_path!r}, {state}, {self.elapsed:.2f}秒)"
+
 
 class PDFConverter:
     """PDFファイルをPowerPointプレゼンテーションに変換するクラス
@@ -25,32 +584,83 @@ class PDFConverter:
         """初期化メソッド"""
         self.temp_folder = None
         self.output_folder = None
-        self.image_format = "jpg"  # 画像フォーマット（jpg, png）
+        self.image_format = "jpg"  # 画像フォーマット（jpg, png, autoでページごとに自動選択）
+        self.jpeg_quality = 85  # image_formatがautoの場合にJPEGを選択したページの品質
+        self.measure_encoding_savings = False  # Trueの場合、autoで固定のjpgと比べた削減量を計測
         self.dpi = 300  # 画像変換の解像度
+        self.workers = 1  # ページレンダリングの並列プロセス数（1で逐次処理、0でCPUコア数）
+        self.in_memory = False  # Trueの場合、一時フォルダを使わずメモリ上で画像をスライドに配置
+        self.save_images = True  # 画像フォルダを出力先に保存するかどうか
+        self.pipeline = False  # Trueの場合、レンダリングとスライド追加を重ねて実行
+        self.pipeline_depth = 4  # パイプラインで同時に保持するレンダリング済みページの上限
+        self.cache = None  # ページのレンダリング結果キャッシュ（RenderCache、Noneで無効）
+        self.fingerprint_pages = False  # Trueの場合、差分更新用に各スライドへページのキーを保存
+        self.streaming_writer = False  # Trueの場合、スライドを1枚ずつPPTXファイルに直接書き出す
+        self.deduplicate_pages = False  # Trueの場合、内容が同じページは1回だけレンダリング
+        self.vector_slides = False  # Trueの場合、ページをSVG画像として配置（ベクターモード）
+        self.vector_fallback_dpi = 48  # ベクターモードで代替表示用に埋め込むPNGの解像度
+        self.hybrid_text = False  # Trueの場合、文字をテキストボックスにし、残りを低解像度の背景画像にする
+        self.hybrid_background_dpi = 96  # ハイブリッドモードの背景画像の解像度
+        self.tiled_rendering = False  # Trueの場合、大きなページを帯に分けてレンダリングし、メモリ使用量を抑える
+        self.tile_height = DEFAULT_TILE_HEIGHT  # 帯に分ける場合の帯の高さ（ピクセル）
+        self.target_size = None  # 出力するPPTXの目標サイズ（バイト、Noneで無効）
+        self.slide_size_budget = None  # 1スライドあたりの画像のサイズの上限（バイト、Noneで無効）
+        self.min_jpeg_quality = MIN_JPEG_QUALITY  # 目標サイズに合わせる場合のJPEGの品質の下限
+        self.renders_avoided = 0  # 直前の変換で重複ページとして省略したレンダリング数
+        self.encoding_stats = None  # 直前の変換の画像形式ごとの集計（EncodingStats、autoまたは目標サイズの指定時のみ）
+        self.size_report = None  # 直前の変換の出力サイズと目標サイズの比較（目標サイズの指定時のみ）
+        self.metrics = None  # 直前の変換の段階・ページごとの処理時間とサイズ（ConversionMetrics）
+        self.trace_path = None  # 計測結果をChromeのトレース形式で書き出すファイルまたはフォルダ（Noneで書き出さない）
+        self.progress_interval = DEFAULT_PROGRESS_INTERVAL  # ページごとの進捗の通知の最小間隔（秒、0で間引かない）
+        self.pages = None  # 変換するページ（"1-3,5,10-20:2"のような指定または1始まりのページ番号のリスト、Noneで全ページ）
+        self.progressive = False  # Trueの場合、低解像度の下書きのPPTXを先に保存し、後から高解像度の画像に差し替える
+        self.draft_dpi = DEFAULT_DRAFT_DPI  # 段階的な変換の下書きの画像の解像度
+        self.refine_chunk_pages = 0  # 高解像度の画像に差し替えたPPTXを保存するページ数の間隔（0で最後に1回だけ置き換える）
+        self._slide_dpi = None  # スライドサイズを決める解像度（Noneでdpi、下書きでは本来の解像度）
+        self._cancel_token = None  # 実行中の変換のキャンセルのトークン
+        self._throughput = ThroughputEstimator()  # 進捗の通知に添える処理速度と残り時間の見込み
     
-    def convert_pdf_to_pptx(self, pdf_path, output_folder=None, callback=None):
+    def convert_pdf_to_pptx(self, pdf_path, output_folder=None, callback=None, cancel_token=None, pages=None):
         """
         PDFファイルをPPTXに変換する
 
+        pages（指定がなければpages属性）で変換するページを選ぶと、選んだページだけを
+        読み込んでレンダリングし、指定した順にスライドにします（page_ranges.parse_page_rangesを参照）。
+
+        cancel_tokenがキャンセルされると、ページ・処理の段階の区切り（ワーカープロセスでは
+        ページの区切り）で変換を中断します。一時フォルダと書き出し途中の画像フォルダは削除され、
+        PPTXファイルは作成されません。PPTXの保存を始めた後にキャンセルされた場合は、そのまま変換を完了します。
+
+        progressiveが有効な場合は、低解像度の下書きのPPTXを先に保存して状態「下書き完了」を通知し、
+        その後で各スライドの画像を高解像度の画像に差し替えます（_convert_progressiveを参照）。
+
         Args:
             pdf_path (str): 変換するPDFファイルのパス
             output_folder (str, optional): 出力先フォルダのパス。指定がなければPDFと同じ場所
             callback (callable, optional): 進捗状況を通知するコールバック関数
+            cancel_token (CancellationToken, optional): 変換をキャンセルするためのトークン
+            pages (str or list, optional): 変換するページ（"1-3,5,10-20:2"のような指定または1始まりのページ番号のリスト）
 
         Returns:
             tuple: (PPTXファイルのパス, 画像フォルダのパス)
+                画像フォルダを保存しない設定の場合、画像フォルダのパスはNone
 
         Raises:
             FileNotFoundError: PDFファイルが見つからない場合
             ValueError: PDFファイルでない場合や、変換中のエラー
+            ConversionCancelled: 変換がキャンセルされた場合
         """
-        # 入力ファイル検証
-        if not os.path.exists(pdf_path):
-            raise FileNotFoundError(f"PDFファイル '{pdf_path}' が見つかりません")
+        if pages is not None:
+            # この変換だけページの指定を差し替える
+            saved_pages = self.pages
+            self.pages = pages
+            try:
+                return self.convert_pdf_to_pptx(pdf_path, output_folder, callback, cancel_token)
+            finally:
+                self.pages = saved_pages
         
-        base, ext = os.path.splitext(pdf_path)
-        if ext.lower() != '.pdf':
-            raise ValueError(f"'{pdf_path}' はPDFファイルではありません")
+        # 入力ファイル検証
+        self._validate_pdf_path(pdf_path)
         
         # 出力フォルダ設定
         if output_folder is None:
@@ -62,31 +672,70 @@ class PDFConverter:
         if callback is None:
             def callback(status, message, progress=None):
                 pass
+        callback = self._throttle_callback(callback)
         
         # PDF変換処理の開始
         callback("開始", "変換を開始します", 0)
+        self._start_metrics(pdf_path)
+        self._cancel_token = cancel_token
         
         try:
+            self._check_cancelled()
+            if self._uses_progressive():
+                # 低解像度の下書きを先に保存し、高解像度の画像に差し替える
+                pptx_path, images_folder_path = self._convert_progressive(pdf_path, callback)
+                self._report_output_size(pptx_path, callback)
+                self._finish_metrics(callback)
+                callback("完了", "変換が完了しました", 100)
+                return pptx_path, images_folder_path
+            
+            if (self.in_memory or self.pipeline or self.streaming_writer
+                    or self.vector_slides or self.hybrid_text or self._uses_size_budget()):
+                # 一時フォルダを経由せずにメモリ上で変換
+                pptx_path, images_folder_path = self._convert_pdf_in_memory(pdf_path, callback)
+                self._report_output_size(pptx_path, callback)
+                self._finish_metrics(callback)
+                callback("完了", "変換が完了しました", 100)
+                return pptx_path, images_folder_path
+            
             # 一時フォルダの準備
             self._setup_temp_folder(pdf_path)
             
             # PDFを画像に変換
             callback("変換中", "PDFを画像に変換しています", 10)
-            image_files = self._convert_pdf_to_images(pdf_path, callback)
+            with self._stage(STAGE_RENDER):
+                image_files = self._convert_pdf_to_images(pdf_path, callback)
+            
+            # 差分更新用のページのキーを計算
+            page_keys = None
+            if self.fingerprint_pages:
+                self._check_cancelled()
+                with self._stage(STAGE_OPEN), fitz.open(pdf_path) as pdf_document:
+                    page_keys = self._compute_page_keys(pdf_document, self._selected_pages(pdf_document))
             
             # 画像ファイルをPowerPointスライドに配置
             callback("変換中", "PowerPointスライドを作成しています", 50)
-            pptx_path = self._create_pptx_from_images(image_files, os.path.basename(pdf_path), callback)
+            pptx_path = self._create_pptx_from_images(
+                image_files, os.path.basename(pdf_path), callback, page_keys
+            )
             
             # 画像フォルダを出力先にコピー
             callback("保存中", "ファイルを保存しています", 90)
-            images_folder_path = self._copy_images_to_output(os.path.basename(pdf_path))
+            images_folder_path = None
+            if self.save_images:
+                with self._stage(STAGE_COPY):
+                    images_folder_path = self._copy_images_to_output(os.path.basename(pdf_path))
             
+            self._finish_metrics(callback)
             callback("完了", "変換が完了しました", 100)
             
             # 出力ファイルのパスを返す
             return pptx_path, images_folder_path
-            
+        
+        except ConversionCancelled:
+            callback("キャンセル", "変換をキャンセルしました", None)
+            raise
+        
         except Exception as e:
             # エラーメッセージの改善
             error_msg = str(e)
@@ -97,6 +746,522 @@ class PDFConverter:
         finally:
             # 常に一時フォルダを削除
             self._cleanup_temp_folder()
+            self._cancel_token = None
+    
+    def update_pptx(self, pdf_path, output_folder=None, callback=None, cancel_token=None):
+        """
+        以前に変換したPPTXを、新しいPDFの内容に合わせて差分更新する
+        
+        各スライドに保存されたページのキー（fingerprint_pagesを参照）と
+        新しいPDFの各ページのキーを比較し、変更・追加されたページだけを
+        レンダリングします。変更のないスライドはそのまま再利用し、
+        移動したページはスライドの並べ替え、削除されたページはスライドの削除で対応します。
+        
+        既存のPPTXがない場合、キーが保存されていない場合、スライドサイズが
+        変わる場合、ベクターモード・ハイブリッドモードの場合は、通常の変換（キーを保存する）を行います。
+        画像フォルダは更新しません。
+        キャンセルされた場合、既存のPPTXは変更されません。
+        
+        Args:
+            pdf_path (str): 新しいPDFファイルのパス
+            output_folder (str, optional): PPTXのあるフォルダのパス。指定がなければPDFと同じ場所
+            callback (callable, optional): 進捗状況を通知するコールバック関数
+            cancel_token (CancellationToken, optional): 更新をキャンセルするためのトークン
+        
+        Returns:
+            tuple: (PPTXファイルのパス, 更新内容の辞書)
+                辞書のキーは rendered（レンダリングしたページ数）、reused（再利用したスライド数）、
+                removed（削除したスライド数）、full（通常の変換を行ったかどうか）
+        
+        Raises:
+            FileNotFoundError: PDFファイルが見つからない場合
+            ValueError: PDFファイルでない場合や、変換中のエラー
+            ConversionCancelled: 更新がキャンセルされた場合
+        """
+        self._validate_pdf_path(pdf_path)
+        
+        if output_folder is None:
+            output_folder = os.path.dirname(pdf_path)
+        self.output_folder = output_folder
+        
+        if callback is None:
+            def callback(status, message, progress=None):
+                pass
+        callback = self._throttle_callback(callback)
+        
+        pptx_path = self._pptx_output_path(os.path.basename(pdf_path))
+        if not os.path.exists(pptx_path) or self.vector_slides or self.hybrid_text:
+            return self._full_conversion_for_update(pdf_path, output_folder, callback, cancel_token)
+        
+        callback("開始", "差分更新を開始します", 0)
+        self._start_metrics(pdf_path)
+        open_start = time.perf_counter()
+        
+        try:
+            prs = Presentation(pptx_path)
+            pdf_document = fitz.open(pdf_path)
+            try:
+                page_indices = self._selected_pages(pdf_document)
+            except ValueError:
+                pdf_document.close()
+                raise
+        except Exception as e:
+            callback("エラー", f"変換中にエラーが発生しました: {str(e)}", None)
+            raise ValueError(f"PDF変換エラー: {str(e)}") from e
+        
+        # PDFはfinallyで閉じる（通常の変換に切り替える場合も、ここでは閉じない）
+        try:
+            total_pages = len(page_indices)
+            old_slides = list(prs.slides)
+            old_keys = [_slide_page_key(slide) for slide in old_slides]
+            
+            if total_pages == 0 or None in old_keys:
+                return self._full_conversion_for_update(pdf_path, output_folder, callback, cancel_token)
+            
+            width, height = _page_pixel_size(pdf_document[page_indices[0]].rect, self.dpi)
+            if (prs.slide_width, prs.slide_height) != (Pt(width), Pt(height)):
+                return self._full_conversion_for_update(pdf_path, output_folder, callback, cancel_token)
+            
+            callback("変換中", "変更されたページを検出しています", 10)
+            new_keys = self._compute_page_keys(pdf_document, page_indices)
+            assignment, spare = _plan_slide_reuse(old_keys, new_keys)
+            self._add_stage(STAGE_OPEN, open_start)
+            
+            changed_pages = [i for i, slide_index in enumerate(assignment) if slide_index is None]
+            reused = total_pages - len(changed_pages)
+            encoder = self._start_encoding_stats(total_pages)
+            blank_layout = prs.slide_layouts[6]
+            sld_id_list = prs.slides._sldIdLst
+            sld_ids = list(sld_id_list)
+            
+            # 変更・追加されたページだけをレンダリングする
+            try:
+                for count, i in enumerate(changed_pages, start=1):
+                    check_cancelled(cancel_token)
+                    with self._stage(STAGE_RENDER):
+                        image_bytes, info = _render_page_to_bytes(
+                            pdf_document[page_indices[i]], self.dpi, self.image_format, self.cache, encoder,
+                            self._tile_height()
+                        )
+                    self._record_page(page_indices[i], info)
+                    with self._stage(STAGE_SLIDES):
+                        if spare:
+                            # 不要になったスライドの画像を差し替えて再利用する
+                            slide_index = spare.popleft()
+                            _replace_slide_image(old_slides[slide_index], io.BytesIO(image_bytes), new_keys[i])
+                        else:
+                            self._add_picture_slide(prs, blank_layout, io.BytesIO(image_bytes), new_keys[i])
+                            slide_index = len(sld_ids)
+                            sld_ids.append(sld_id_list[-1])
+                    assignment[i] = slide_index
+                    
+                    progress = 10 + count / len(changed_pages) * 80  # 10%〜90%の範囲で進捗
+                    callback(
+                        "変換中",
+                        self._page_progress_message("変更されたページを変換しています", count, len(changed_pages)),
+                        progress
+                    )
+                check_cancelled(cancel_token)
+            except ConversionCancelled:
+                callback("キャンセル", "差分更新をキャンセルしました", None)
+                raise
+        finally:
+            pdf_document.close()
+        self._notify_encoding_stats(callback)
+        
+        # 削除されたページのスライドを取り除く
+        removed = len(spare)
+        for slide_index in spare:
+            sld_id = sld_ids[slide_index]
+            sld_id_list.remove(sld_id)
+            prs.part.drop_rel(sld_id.rId)
+        
+        # 新しいPDFのページ順にスライドを並べ替える
+        for slide_index in assignment:
+            sld_id_list.append(sld_ids[slide_index])
+        
+        # 書き込み途中で失敗しても元のファイルが壊れないよう、一時ファイル経由で置き換える
+        callback("保存中", "ファイルを保存しています", 90)
+        with self._stage(STAGE_SAVE):
+            _save_presentation(prs, pptx_path)
+        
+        self._report_output_size(pptx_path, callback)
+        self._finish_metrics(callback)
+        callback("完了", f"差分更新が完了しました（更新 {len(changed_pages)} ページ）", 100)
+        return pptx_path, {
+            "rendered": len(changed_pages),
+            "reused": reused,
+            "removed": removed,
+            "full": False,
+        }
+    
+    def _full_conversion_for_update(self, pdf_path, output_folder, callback, cancel_token=None):
+        """差分更新ができない場合に、ページのキーを保存する通常の変換を行う"""
+        fingerprint_pages = self.fingerprint_pages
+        self.fingerprint_pages = True
+        try:
+            pptx_path, images_folder = self.convert_pdf_to_pptx(pdf_path, output_folder, callback, cancel_token)
+        finally:
+            self.fingerprint_pages = fingerprint_pages
+        
+        with fitz.open(pdf_path) as pdf_document:
+            total_pages = len(self._selected_pages(pdf_document))
+        return pptx_path, {"rendered": total_pages, "reused": 0, "removed": 0, "full": True}
+    
+    def _selected_pages(self, pdf_document):
+        """
+        pagesの指定から変換するページ番号（0始まり、スライドの順）のリストを求める
+        
+        Raises:
+            ValueError: ページの指定が正しくない場合
+        """
+        return parse_page_ranges(self.pages, len(pdf_document))
+    
+    def _compute_page_keys(self, pdf_document, page_indices):
+        """
+        指定したページのキー（ページ内容とレンダリング条件から計算）を求める
+        
+        Args:
+            pdf_document (fitz.Document): 対象のPDFドキュメント
+            page_indices (list): キーを求めるページ番号のリスト（_selected_pagesの結果）
+        
+        Returns:
+            list: page_indicesの順のキーのリスト
+        """
+        fingerprinter = PageFingerprinter(pdf_document)
+        format_label = self._format_label(len(page_indices))
+        keys = []
+        for i in page_indices:
+            zoom = _calculate_zoom(pdf_document[i].rect, self.dpi)
+            keys.append(render_key(fingerprinter.fingerprint(i), zoom, format_label))
+        return keys
+    
+    def _uses_progressive(self):
+        """段階的な変換を行うかどうか（ベクターモード・ハイブリッドモード、下書きの解像度が低くない場合は行わない）"""
+        return (self.progressive and self.draft_dpi < self.dpi
+                and not (self.vector_slides or self.hybrid_text))
+    
+    def _uses_size_budget(self):
+        """目標サイズ（target_sizeまたはslide_size_budget）が指定されているかどうか"""
+        return bool(self.target_size or self.slide_size_budget)
+    
+    def _page_budget(self, page_count):
+        """
+        目標サイズから1ページの画像のバイト数の上限を求める
+        
+        target_sizeの場合は、PPTXの画像以外の部分の見積もりを差し引いてページ数で割ります。
+        slide_size_budgetも指定されている場合は小さい方を使います。
+        
+        Returns:
+            int: 1ページの画像のバイト数の上限（目標サイズが指定されていなければNone）
+        """
+        budgets = []
+        if self.slide_size_budget:
+            budgets.append(int(self.slide_size_budget))
+        if self.target_size:
+            available = self.target_size - PPTX_BASE_BYTES - PPTX_SLIDE_BYTES * page_count
+            budgets.append(max(MIN_PAGE_BUDGET, int(available // max(page_count, 1))))
+        return min(budgets) if budgets else None
+    
+    def _page_encoder(self, page_count):
+        """
+        ページのエンコードに使うエンコーダーを作成する
+        
+        目標サイズが指定されている場合はBudgetEncoder、image_formatがautoの場合は
+        AdaptiveEncoder、それ以外はNone（image_formatの固定フォーマット）を返します。
+        """
+        reference_format = "jpg" if self.measure_encoding_savings else None
+        page_budget = self._page_budget(page_count)
+        if page_budget is not None:
+            auto = self.image_format == IMAGE_FORMAT_AUTO
+            return BudgetEncoder(
+                page_budget, self.image_format,
+                self.jpeg_quality if auto else FIXED_JPEG_QUALITY,
+                self.min_jpeg_quality, reference_format
+            )
+        if self.image_format != IMAGE_FORMAT_AUTO:
+            return None
+        return AdaptiveEncoder(self.jpeg_quality, reference_format)
+    
+    def _tile_height(self):
+        """帯に分けてレンダリングする場合の帯の高さ（無効の場合はNone）"""
+        return self.tile_height if self.tiled_rendering else None
+    
+    def _format_label(self, page_count):
+        """ページのキーに使う画像形式の文字列（autoの場合はJPEGの品質、目標サイズの指定時は上限を含む）"""
+        if self.vector_slides:
+            return f"{VECTOR_IMAGE_FORMAT}-{self.vector_fallback_dpi}"
+        encoder = self._page_encoder(page_count)
+        if self.hybrid_text:
+            label = encoder.format_label if encoder is not None else self.image_format
+            return f"hybrid-{self.hybrid_background_dpi}-{label}"
+        return encoder.format_label if encoder is not None else self.image_format
+    
+    def _start_encoding_stats(self, page_count):
+        """
+        変換ごとの画像形式の集計を開始する
+        
+        Args:
+            page_count (int): 変換するPDFのページ数（目標サイズからページごとの上限を求めるのに使用）
+        
+        Returns:
+            AdaptiveEncoder: ページのエンコードに使うエンコーダー（固定フォーマットの場合はNone）
+        """
+        encoder = self._page_encoder(page_count)
+        self.encoding_stats = EncodingStats() if encoder is not None else None
+        return encoder
+    
+    def _record_encoding(self, info):
+        """1ページ分のエンコード情報を集計に加える"""
+        if self.encoding_stats is not None and info is not None:
+            self.encoding_stats.record(info)
+    
+    def _record_page(self, page_index, info):
+        """1ページ分のエンコード情報を画像形式の集計と計測結果に加える"""
+        self._record_encoding(info)
+        if self.metrics is not None:
+            self.metrics.record_page(page_index, info)
+    
+    def _check_cancelled(self):
+        """実行中の変換がキャンセルされていればConversionCancelledを送出する"""
+        check_cancelled(self._cancel_token)
+    
+    def _start_metrics(self, pdf_path):
+        """変換ごとの計測を開始する"""
+        self.metrics = ConversionMetrics(pdf_path)
+        return self.metrics
+    
+    def _stage(self, name):
+        """withブロックの実行時間を段階の時間として計測する（計測を開始していなければ何もしない）"""
+        if self.metrics is None:
+            return contextlib.nullcontext()
+        return self.metrics.stage(name)
+    
+    def _add_stage(self, name, start):
+        """開始時刻（time.perf_counter()の値）から現在までを段階の時間として記録する"""
+        if self.metrics is not None:
+            self.metrics.add_stage(name, start, time.perf_counter())
+    
+    def _finish_metrics(self, callback):
+        """
+        計測を終了して処理時間を通知する
+        
+        trace_pathが指定されている場合は、Chromeのトレース形式のJSONファイルも書き出します。
+        """
+        self.metrics.finish()
+        if self.trace_path:
+            self.metrics.save_trace(self._trace_output_path(self.metrics.pdf_path))
+        callback("保存中", self.metrics.summary(), None)
+    
+    def _trace_output_path(self, pdf_path):
+        """トレースを書き出すファイルのパスを返す（trace_pathがフォルダの場合はPDFごとのファイル）"""
+        if os.path.isdir(self.trace_path):
+            base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+            return os.path.join(self.trace_path, base_name + ".trace.json")
+        return self.trace_path
+    
+    def _notify_encoding_stats(self, callback):
+        """画像形式を自動選択した場合に、形式ごとの枚数と合計サイズを通知する"""
+        if self.encoding_stats is not None:
+            callback("変換中", self.encoding_stats.summary(), None)
+    
+    def _report_output_size(self, pptx_path, callback):
+        """
+        目標サイズが指定されている場合に、出力したPPTXのサイズと目標との差をsize_reportに記録して通知する
+        
+        size_reportのキーは bytes（PPTXのサイズ）, target_size, page_budget（1ページの上限）,
+        ratio（目標サイズに対する割合、target_sizeがなければNone）,
+        over_budget_pages（品質・縮小率の下限でも上限に収まらなかったページ数）
+        """
+        if not self._uses_size_budget():
+            self.size_report = None
+            return
+        
+        size = os.path.getsize(pptx_path)
+        stats = self.encoding_stats
+        self.size_report = {
+            "bytes": size,
+            "target_size": self.target_size,
+            "page_budget": stats.page_budget if stats is not None else None,
+            "ratio": size / self.target_size if self.target_size else None,
+            "over_budget_pages": stats.over_budget_pages if stats is not None else 0,
+        }
+        
+        message = f"出力サイズ: {size / 1024 / 1024:.2f} MB"
+        if self.target_size:
+            message += f"（目標 {self.target_size / 1024 / 1024:.2f} MB の {size / self.target_size:.0%}）"
+        if self.size_report["over_budget_pages"]:
+            message += f"、上限を超えたページ {self.size_report['over_budget_pages']} 枚"
+        callback("保存中", message, None)
+    
+    def convert_many(self, pdf_paths, output_folder=None, jobs=None, callback=None, file_callback=None,
+                     cancel_token=None):
+        """
+        複数のPDFファイルをまとめてPPTXに変換する
+        
+        jobsが2以上の場合はファイルごとに別々のワーカープロセスで同時に変換します。
+        ファイルが1つだけの場合は、このインスタンスのページ単位の並列化（workers・pipeline）の設定で変換します。
+        各ワーカーはこのインスタンスの設定をコピーした専用のPDFConverterを使うため、
+        インスタンスの状態（temp_folderなど）は共有されません。
+        1ファイルの変換に失敗しても残りのファイルの変換は継続します。
+        cancel_tokenがキャンセルされると、変換中のファイルはページの区切りで中断し、
+        未変換のファイルとともにcancelledがTrueの結果になります。
+        
+        Args:
+            pdf_paths (list): 変換するPDFファイルのパスのリスト
+            output_folder (str, optional): 出力先フォルダのパス。指定がなければ各PDFと同じ場所
+            jobs (int, optional): 同時に変換するファイル数。指定がなければCPUコア数
+            callback (callable, optional): 全体の進捗を通知するコールバック関数
+                callback(status, message, progress)
+            file_callback (callable, optional): ファイルごとの進捗を通知するコールバック関数
+                file_callback(pdf_path, status, message, progress)
+            cancel_token (CancellationToken, optional): 一括変換をキャンセルするためのトークン
+        
+        Returns:
+            list: 入力と同じ順序のConversionResultのリスト
+        """
+        pdf_paths = list(pdf_paths)
+        total_files = len(pdf_paths)
+        
+        if callback is None:
+            def callback(status, message, progress=None):
+                pass
+        
+        if file_callback is None:
+            def file_callback(pdf_path, status, message, progress=None):
+                pass
+        
+        # 全体の進捗はファイルごとの進捗のたびに求めるため、通知を間引く
+        if self.progress_interval:
+            callback = ThrottledCallback(callback, self.progress_interval)
+        
+        results = [None] * total_files
+        file_progress = [0.0] * total_files
+        finished = 0
+        throughput = ThroughputEstimator()
+        
+        def notify_overall():
+            """全体の進捗を通知する（各ファイルの進捗の平均）"""
+            overall = sum(file_progress) / total_files
+            message = f"一括変換中 ({finished}/{total_files} ファイル完了)"
+            rate = format_throughput(*throughput.update(finished, total_files), unit="ファイル")
+            if rate:
+                message += f" {rate}"
+            callback("変換中", message, overall)
+        
+        def report(index, status, message, progress):
+            """ファイル単位の進捗を通知し、全体の進捗に反映する"""
+            # 完了後に遅れて届いた進捗は無視する
+            if results[index] is not None:
+                return
+            if progress is not None:
+                file_progress[index] = progress
+            file_callback(pdf_paths[index], status, message, progress)
+            notify_overall()
+        
+        def complete(index, result):
+            """1ファイルの完了を記録する"""
+            nonlocal finished
+            results[index] = result
+            file_progress[index] = 100
+            finished += 1
+            if result.cancelled:
+                file_callback(pdf_paths[index], "キャンセル", result.error, None)
+            elif not result.succeeded:
+                file_callback(pdf_paths[index], "エラー", result.error, None)
+            notify_overall()
+        
+        callback("開始", f"{total_files}個のファイルの一括変換を開始します", 0)
+        
+        jobs = max(1, min(jobs or os.cpu_count() or 1, total_files or 1))
+        
+        if jobs == 1:
+            # 逐次処理：このプロセス内で順番に変換する
+            for index, pdf_path in enumerate(pdf_paths):
+                converter = self._clone_for_batch(page_parallel=total_files == 1)
+                result = _run_single_conversion(
+                    converter, pdf_path, output_folder,
+                    lambda status, message, progress=None, index=index:
+                        report(index, status, message, progress),
+                    cancel_token
+                )
+                complete(index, result)
+        else:
+            self._convert_many_parallel(pdf_paths, output_folder, jobs, report, complete, cancel_token)
+        
+        succeeded = sum(1 for result in results if result.succeeded)
+        if any(result.cancelled for result in results):
+            callback("キャンセル", f"一括変換をキャンセルしました（成功 {succeeded} / {total_files}）", None)
+        else:
+            callback("完了", f"一括変換が完了しました（成功 {succeeded} / {total_files}）", 100)
+        return results
+    
+    def _convert_many_parallel(self, pdf_paths, output_folder, jobs, report, complete, cancel_token=None):
+        """ワーカープロセスでファイルを同時に変換し、進捗をメインスレッドで中継する"""
+        progress_queue = multiprocessing.Queue()
+        
+        def drain_progress():
+            """ワーカーから届いた進捗をすべて通知する"""
+            while True:
+                try:
+                    index, status, message, progress = progress_queue.get_nowait()
+                except queue.Empty:
+                    return
+                report(index, status, message, progress)
+        
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_batch_worker,
+            initargs=(progress_queue, cancel_token)
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _convert_many_worker, self._clone_for_batch(), index, pdf_path, output_folder
+                ): index
+                for index, pdf_path in enumerate(pdf_paths)
+            }
+            
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=BATCH_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                drain_progress()
+                for future in done:
+                    index = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # ワーカープロセス自体が異常終了した場合
+                        result = ConversionResult(pdf_paths[index], error=str(e))
+                    complete(index, result)
+        
+        drain_progress()
+        progress_queue.close()
+    
+    def _clone_for_batch(self, page_parallel=False):
+        """
+        一括変換の1ファイル分に使うPDFConverterを作成する
+        
+        設定はこのインスタンスから引き継ぎ、作業状態はリセットします。
+        ファイル単位で並列化するため、page_parallelがTrue（ファイルが1つだけの場合）でなければ
+        ページ単位の並列化は行いません。
+        """
+        converter = copy.copy(self)
+        converter.temp_folder = None
+        converter.output_folder = None
+        if not page_parallel:
+            converter.workers = 1
+            converter.pipeline = False
+        converter.metrics = None
+        return converter
+    
+    def _validate_pdf_path(self, pdf_path):
+        """入力ファイルが存在するPDFファイルであることを確認する"""
+        if not os.path.exists(pdf_path):
+            raise FileNotFoundError(f"PDFファイル '{pdf_path}' が見つかりません")
+        
+        base, ext = os.path.splitext(pdf_path)
+        if ext.lower() != '.pdf':
+            raise ValueError(f"'{pdf_path}' はPDFファイルではありません")
     
     def _setup_temp_folder(self, pdf_path):
         """一時作業フォルダを設定する"""
@@ -114,13 +1279,15 @@ class PDFConverter:
         """
         PyMuPDFを使用してPDFを画像に変換する
         
+        workersが2以上の場合はプロセスプールで並列にレンダリングします。
+        
         Args:
             pdf_path (str): 変換するPDFファイルのパス
             callback (callable): 進捗状況を通知するコールバック関数
-            
+        
         Returns:
-            list: 生成された画像ファイルのパスリスト
-            
+            list: 生成された画像ファイルのパスリスト（スライドの順）
+        
         Raises:
             ValueError: PDF変換中のエラー
         """
@@ -130,70 +1297,633 @@ class PDFConverter:
         try:
             # PyMuPDFを使用してPDFを開く
             pdf_document = fitz.open(pdf_path)
-            total_pages = len(pdf_document)
-            
-            image_files = []
-            
-            # PowerPointの最大サイズ (56インチ = 約4032ピクセル@72dpi)
-            MAX_PPT_SIZE = 4032
-            
-            # 各ページを画像として保存
-            for i in range(total_pages):
-                # ページを取得
-                page = pdf_document[i]
-                
-                # ページサイズを取得
-                page_rect = page.rect
-                
-                # サイズに基づいて適切なDPI/ズームを計算
-                # PowerPointの制限を超えないようにする
-                width_pt = page_rect.width
-                height_pt = page_rect.height
-                
-                # 最大DPIを計算（PowerPointの制限を考慮）
-                max_zoom_width = MAX_PPT_SIZE / width_pt
-                max_zoom_height = MAX_PPT_SIZE / height_pt
-                max_zoom = min(max_zoom_width, max_zoom_height, self.dpi / 72)
+            try:
+                # 選んだページだけを読み込み、重複ページは最初の1枚だけをレンダリングする
+                page_indices = self._selected_pages(pdf_document)
+                duplicate_of = self._find_duplicate_pages(pdf_document, page_indices)
+                render_indices = [i for i, original in zip(page_indices, duplicate_of) if original is None]
+                workers = self._resolve_workers(len(render_indices))
+                encoder = self._start_encoding_stats(len(page_indices))
                 
-                # 安全マージンを取る (90%)
-                safe_zoom = max_zoom * 0.9
+                if workers > 1:
+                    # 各ワーカーが自分でPDFを開くため、ここでは閉じておく
+                    pdf_document.close()
+                    pdf_document = None
+                    rendered = self._render_pages_parallel(
+                        pdf_path, render_indices, images_folder, workers, callback, encoder
+                    )
+                else:
+                    rendered = {}
+                    
+                    # 各ページを画像として保存
+                    for count, i in enumerate(render_indices, start=1):
+                        self._check_cancelled()
+                        rendered[i], info = _render_page_to_file(
+                            pdf_document[i], i, images_folder, self.dpi, self.image_format,
+                            self.cache, encoder, self._tile_height()
+                        )
+                        self._record_page(i, info)
+                        
+                        # 進捗状況をコールバックで通知
+                        self._notify_render_progress(callback, count, len(render_indices))
                 
-                # 最終的なズーム値を決定
-                zoom = min(self.dpi / 72, safe_zoom)
+                # スライドの順に並べ、重複ページはレンダリング済みの画像をコピーする
+                image_files = []
+                for i, original in zip(page_indices, duplicate_of):
+                    if original is None:
+                        image_files.append(rendered[i])
+                    else:
+                        extension = os.path.splitext(image_files[original])[1]
+                        image_path = os.path.join(images_folder, _image_file_name(i, extension[1:]))
+                        shutil.copyfile(image_files[original], image_path)
+                        image_files.append(image_path)
                 
-                matrix = fitz.Matrix(zoom, zoom)
+                self._notify_renders_avoided(callback)
+                self._notify_encoding_stats(callback)
+                return image_files
+            finally:
+                if pdf_document is not None:
+                    pdf_document.close()
+        
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"PDF変換エラー: {str(e)}") from e
+    
+    def _resolve_workers(self, total_pages):
+        """実際に使用するレンダリングプロセス数を決定する"""
+        workers = self.workers
+        if not workers or workers < 1:
+            # 0またはNoneの場合はCPUコア数に合わせる
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, total_pages))
+    
+    def _render_pages_parallel(self, pdf_path, page_indices, images_folder, workers, callback, encoder=None):
+        """
+        プロセスプールを使用してページを並列にレンダリングする
+        
+        ページを連続した小さなチャンクに分割して各ワーカーに割り当て、
+        チャンクが完了するたびに完了ページ数を通知します。
+        
+        Args:
+            page_indices (list): レンダリングするページ番号のリスト
+            encoder (AdaptiveEncoder, optional): 画像形式を自動選択する場合のエンコーダー
+        
+        Returns:
+            dict: ページ番号ごとの画像ファイルのパス
+        """
+        # 進捗をこまめに通知できるよう、ワーカー数より多めのチャンクに分割する
+        render_count = len(page_indices)
+        chunk_size = max(1, math.ceil(render_count / (workers * PARALLEL_CHUNKS_PER_WORKER)))
+        chunks = [
+            page_indices[start:start + chunk_size]
+            for start in range(0, render_count, chunk_size)
+        ]
+        
+        image_files = {}
+        completed = 0
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_render_worker,
+            initargs=(self._cancel_token,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _render_pages_worker, pdf_path, chunk, images_folder,
+                    self.dpi, self.image_format, self.cache, encoder, self._tile_height()
+                )
+                for chunk in chunks
+            ]
+            try:
+                for future in as_completed(futures):
+                    for page_index, image_path, info in future.result():
+                        image_files[page_index] = image_path
+                        self._record_page(page_index, info)
+                        completed += 1
+                    self._notify_render_progress(callback, completed, render_count)
+                    self._check_cancelled()
+            except BaseException:
+                # 失敗・キャンセル時は未着手のチャンクを取り消してから例外を伝播する
+                # （実行中のチャンクは、ワーカーがページの区切りでキャンセルを確認して終了する）
+                for future in futures:
+                    future.cancel()
+                raise
+        
+        return image_files
+    
+    def _find_duplicate_pages(self, pdf_document, page_indices, page_keys=None):
+        """
+        変換するページのうち、内容とレンダリング条件が同じ重複ページを検出する
+        
+        deduplicate_pagesが無効の場合は重複なしとして扱います。
+        検出結果に応じてrenders_avoided（省略できるレンダリング数）も更新します。
+        
+        Args:
+            pdf_document (fitz.Document): 対象のPDFドキュメント
+            page_indices (list): 変換するページ番号のリスト（_selected_pagesの結果）
+            page_keys (list, optional): 計算済みのページのキー（page_indicesの順）
+        
+        Returns:
+            list: page_indicesの各ページについて、同じ内容の最初のページの位置（page_indices内の位置、重複でなければNone）
+        """
+        duplicate_of = [None] * len(page_indices)
+        
+        if self.deduplicate_pages:
+            if page_keys is None:
+                page_keys = self._compute_page_keys(pdf_document, page_indices)
+            first_pages = {}
+            for i, key in enumerate(page_keys):
+                duplicate_of[i] = first_pages.setdefault(key, i)
+                if duplicate_of[i] == i:
+                    duplicate_of[i] = None
+        
+        self.renders_avoided = sum(1 for original in duplicate_of if original is not None)
+        return duplicate_of
+    
+    def _notify_renders_avoided(self, callback):
+        """重複ページのレンダリングを省略した場合に通知する"""
+        if self.renders_avoided:
+            callback("変換中", f"重複ページ {self.renders_avoided} 枚のレンダリングを省略しました", None)
+    
+    def _throttle_callback(self, callback):
+        """
+        進捗のコールバックをprogress_intervalの間隔に間引き、処理速度の計算を始める
+        
+        既に間引いているコールバック（差分更新から通常の変換に切り替えた場合など）はそのまま返します。
+        """
+        self._throughput = ThroughputEstimator()
+        if not self.progress_interval or isinstance(callback, ThrottledCallback):
+            return callback
+        return ThrottledCallback(callback, self.progress_interval)
+    
+    def _page_progress_message(self, text, completed, total):
+        """ページごとの進捗のメッセージに、完了したページ数と処理速度・残り時間の見込みを添える"""
+        message = f"{text} ({completed}/{total})"
+        throughput = format_throughput(*self._throughput.update(completed, total))
+        if throughput:
+            message += f" {throughput}"
+        return message
+    
+    def _notify_render_progress(self, callback, completed, total_pages):
+        """レンダリングの進捗をコールバックで通知する（10%〜50%の範囲）"""
+        progress = 10 + completed / total_pages * 40
+        callback("変換中", self._page_progress_message("PDFを画像に変換しています", completed, total_pages), progress)
+    
+    def _convert_pdf_in_memory(self, pdf_path, callback):
+        """
+        一時フォルダを使わずにPDFをPPTXに変換する
+        
+        各ページのレンダリング結果（エンコード済みバイト列）をそのまま
+        スライドに配置します。スライドサイズはpage.rectから計算するため、
+        画像ファイルの読み直しやコピーは発生しません。
+        画像フォルダはsave_imagesがTrueの場合のみ書き出します。
+        レンダリングは_iter_rendered_pagesで行い、pipelineが有効な場合は
+        スライドの追加と並行して次のページがレンダリングされます。
+        streaming_writerが有効な場合、スライドは追加した時点でファイルに書き出されます。
+        vector_slidesが有効な場合、各ページはSVG画像として配置されます。
+        hybrid_textが有効な場合、文字はテキストボックス、残りは低解像度の背景画像になります。
+        
+        Returns:
+            tuple: (PPTXファイルのパス, 画像フォルダのパスまたはNone)
+        """
+        base_name = os.path.basename(pdf_path)
+        open_start = time.perf_counter()
+        
+        try:
+            pdf_document = fitz.open(pdf_path)
+        except Exception as e:
+            raise ValueError(f"PDF変換エラー: {str(e)}") from e
+        
+        images_folder_path = None
+        try:
+            # 選んだページだけを読み込んで変換する
+            page_indices = self._selected_pages(pdf_document)
+            total_pages = len(page_indices)
+            if total_pages == 0:
+                raise ValueError("変換するページがありません")
+            
+            if self.save_images:
+                images_folder_path = self._prepare_images_output(base_name)
+            
+            # スライドサイズを最初のページの画像サイズに合わせる
+            width, height = _page_pixel_size(pdf_document[page_indices[0]].rect, self._slide_dpi or self.dpi)
+            pptx_path = self._pptx_output_path(base_name)
+            writer = self._open_slide_writer(pptx_path, Pt(width), Pt(height))
+            
+            # 差分更新・重複ページの検出に使うページのキーを計算
+            page_keys = None
+            if self.fingerprint_pages or self.deduplicate_pages:
+                page_keys = self._compute_page_keys(pdf_document, page_indices)
+            duplicate_of = self._find_duplicate_pages(pdf_document, page_indices, page_keys)
+            self._add_stage(STAGE_OPEN, open_start)
+            
+            callback("変換中", "PDFをスライドに変換しています", 10)
+            self._notify_renders_avoided(callback)
+            
+            if self.vector_slides:
+                pages = self._iter_vector_pages(pdf_document, page_indices, duplicate_of)
+            elif self.hybrid_text:
+                pages = self._iter_hybrid_pages(
+                    pdf_document, page_indices, duplicate_of, Pt(width), Pt(height)
+                )
+            else:
+                pages = (
+                    (i, image_bytes, None, "")
+                    for i, image_bytes in self._iter_rendered_pages(
+                        pdf_document, pdf_path, page_indices, duplicate_of
+                    )
+                )
+            
+            if self.metrics is not None:
+                # ページの完成を待つ時間をレンダリング、それ以外をスライドの追加などとして計測する
+                pages = self.metrics.timed_iter(STAGE_RENDER, pages)
+            
+            with writer:
+                for position, (i, image_bytes, fallback_bytes, shapes_xml) in enumerate(pages):
+                    # 画像フォルダが必要な場合のみファイルに書き出す
+                    if images_folder_path:
+                        with self._stage(STAGE_COPY):
+                            image_format = VECTOR_IMAGE_FORMAT if fallback_bytes is not None else None
+                            self._write_page_image(images_folder_path, i, image_bytes, image_format)
+                    
+                    name = PAGE_KEY_PREFIX + page_keys[position] if self.fingerprint_pages else None
+                    with self._stage(STAGE_SLIDES):
+                        if fallback_bytes is not None:
+                            writer.add_svg_slide(image_bytes, fallback_bytes, name)
+                        else:
+                            writer.add_picture_slide(image_bytes, name, shapes_xml)
+                    
+                    # 進捗状況をコールバックで通知
+                    progress = 10 + (position + 1) / total_pages * 80  # 10%〜90%の範囲で進捗
+                    callback(
+                        "変換中",
+                        self._page_progress_message("PDFをスライドに変換しています", position + 1, total_pages),
+                        progress
+                    )
                 
-                # ページを画像としてレンダリング
-                pix = page.get_pixmap(matrix=matrix)
+                # プレゼンテーションを保存（withブロックを抜けるときに書き出される）
+                self._check_cancelled()
+                self._notify_encoding_stats(callback)
+                callback("保存中", "ファイルを保存しています", 90)
+                save_start = time.perf_counter()
+            self._add_stage(STAGE_SAVE, save_start)
+        except ConversionCancelled:
+            # 書き出し途中の画像フォルダを残さない（PPTXはwithブロックを抜けるまで作成されない）
+            if images_folder_path:
+                shutil.rmtree(images_folder_path, ignore_errors=True)
+            raise
+        finally:
+            pdf_document.close()
+        
+        return pptx_path, images_folder_path
+    
+    def _write_page_image(self, images_folder, page_index, image_bytes, image_format=None):
+        """ページの画像を画像フォルダに書き出す（image_formatの指定がなければ画像の内容から判定する）"""
+        if image_format is None:
+            image_format = _image_file_format(self.image_format, image_bytes)
+        image_path = os.path.join(images_folder, _image_file_name(page_index, image_format))
+        with open(image_path, "wb") as f:
+            f.write(image_bytes)
+    
+    def _convert_progressive(self, pdf_path, callback):
+        """
+        低解像度の下書きのPPTXを先に保存し、各スライドの画像を高解像度の画像に差し替える
+        
+        まずdraft_dpiの解像度でメモリ上に変換したPPTXを出力先に保存し（スライドサイズは
+        dpiの解像度で決めるため、通常の変換と同じ）、状態「下書き完了」を通知します。
+        この時点で、PPTXはすべてのページを含む完成したファイルとして開けます。
+        続けて各ページをdpiの解像度でレンダリングし、スライドの画像をその場で差し替えます。
+        差し替えたPPTXは、refine_chunk_pagesページごと（0の場合は最後に1回だけ）に
+        一時ファイル経由で置き換えるため、どの時点で開いても壊れたファイルにはなりません。
+        下書きを開いているアプリケーションがあって置き換えられない場合は、下書きを残して
+        高解像度のPPTXを別のファイル（REFINED_SUFFIXを付けた名前）に保存し、コールバックで通知します。
+        キャンセルされた場合や差し替えに失敗した場合は、下書きを含めてPPTXと書き出し途中の画像フォルダを削除します。
+        
+        Returns:
+            tuple: (高解像度のPPTXファイルのパス, 画像フォルダのパスまたはNone)
+        """
+        base_name = os.path.basename(pdf_path)
+        draft_start = time.perf_counter()
+        
+        def draft_callback(status, message, progress=None):
+            """下書きの進捗を0%〜DRAFT_PROGRESS%の範囲で通知する"""
+            if progress is not None:
+                progress = progress * DRAFT_PROGRESS / 100
+            callback(status, f"下書き: {message}", progress)
+        
+        pptx_path, _ = self._draft_converter()._convert_pdf_in_memory(pdf_path, draft_callback)
+        self._add_stage(STAGE_DRAFT, draft_start)
+        callback("下書き完了", f"下書きを保存しました: {pptx_path}", DRAFT_PROGRESS)
+        
+        open_start = time.perf_counter()
+        images_folder_path = None
+        output_path = pptx_path  # 高解像度のPPTXの保存先（下書きを置き換えられない場合は別のファイル）
+        try:
+            prs = Presentation(pptx_path)
+            slides = list(prs.slides)
+            with fitz.open(pdf_path) as pdf_document:
+                page_indices = self._selected_pages(pdf_document)
+                total_pages = len(page_indices)
+                page_keys = None
+                if self.fingerprint_pages or self.deduplicate_pages:
+                    page_keys = self._compute_page_keys(pdf_document, page_indices)
+                duplicate_of = self._find_duplicate_pages(pdf_document, page_indices, page_keys)
+                if self.save_images:
+                    images_folder_path = self._prepare_images_output(base_name)
+                self._add_stage(STAGE_OPEN, open_start)
                 
-                # 画像ファイルのパスを設定
-                image_path = os.path.join(images_folder, f"page_{i+1:03d}.{self.image_format}")
+                callback("変換中", "高解像度の画像に差し替えています", DRAFT_PROGRESS)
+                self._notify_renders_avoided(callback)
+                pages = self._iter_rendered_pages(pdf_document, pdf_path, page_indices, duplicate_of)
+                if self.metrics is not None:
+                    pages = self.metrics.timed_iter(STAGE_RENDER, pages)
                 
-                # 画像として保存
-                if self.image_format.lower() == "jpg":
-                    pix.save(image_path, "jpeg")
-                else:
-                    pix.save(image_path)
+                for completed, (i, image_bytes) in enumerate(pages, start=1):
+                    if images_folder_path:
+                        with self._stage(STAGE_COPY):
+                            self._write_page_image(images_folder_path, i, image_bytes)
                     
-                image_files.append(image_path)
-                
-                # 進捗状況をコールバックで通知
-                progress = 10 + (i + 1) / total_pages * 40  # 10%〜50%の範囲で進捗
-                callback("変換中", f"PDFを画像に変換しています ({i+1}/{total_pages})", progress)
-            
-            return image_files
+                    # 下書きのスライドの画像（最初の図形）を差し替える
+                    slide = slides[completed - 1]
+                    picture = slide.shapes[0]
+                    with self._stage(STAGE_SLIDES):
+                        _set_picture_image(slide, picture, io.BytesIO(image_bytes))
+                        if self.fingerprint_pages:
+                            picture.name = PAGE_KEY_PREFIX + page_keys[completed - 1]
+                    
+                    if (self.refine_chunk_pages and completed % self.refine_chunk_pages == 0
+                            and completed < total_pages):
+                        # 差し替えたページまでを保存し、開き直すと高解像度の画像が表示されるようにする
+                        self._check_cancelled()
+                        with self._stage(STAGE_SAVE):
+                            output_path = self._save_refined(prs, pptx_path, output_path, callback)
+                    
+                    progress = DRAFT_PROGRESS + completed / total_pages * (90 - DRAFT_PROGRESS)
+                    callback(
+                        "変換中",
+                        self._page_progress_message("高解像度の画像に差し替えています", completed, total_pages),
+                        progress
+                    )
             
-        except Exception as e:
-            raise ValueError(f"PDF変換エラー: {str(e)}") from e
+            self._check_cancelled()
+            self._notify_encoding_stats(callback)
+            callback("保存中", "ファイルを保存しています", 90)
+            with self._stage(STAGE_SAVE):
+                output_path = self._save_refined(prs, pptx_path, output_path, callback)
+        except BaseException:
+            # キャンセル・失敗時は、完成したファイルに見える下書きと書き出し途中の画像フォルダを残さない
+            for path in {pptx_path, output_path}:
+                with contextlib.suppress(OSError):
+                    os.remove(path)
+            if images_folder_path:
+                shutil.rmtree(images_folder_path, ignore_errors=True)
+            raise
+        
+        return output_path, images_folder_path
+    
+    def _save_refined(self, prs, pptx_path, output_path, callback):
+        """
+        高解像度の画像に差し替えたPPTXを保存する
+        
+        下書き（pptx_path）を置き換えられない場合は別のファイルに保存し、以降もそのファイルに保存します。
+        
+        Returns:
+            str: 保存したPPTXファイルのパス
+        """
+        if output_path != pptx_path:
+            _save_presentation(prs, output_path)
+            return output_path
+        
+        fallback_path = os.path.splitext(pptx_path)[0] + REFINED_SUFFIX + ".pptx"
+        saved_path = _save_presentation(prs, pptx_path, fallback_path)
+        if saved_path != pptx_path:
+            callback(
+                "変換中",
+                f"下書きのファイルを置き換えられないため（開いているアプリケーションを閉じてください）、"
+                f"高解像度のPPTXを別のファイルに保存しました: {saved_path}",
+                None
+            )
+        return saved_path
+    
+    def _draft_converter(self):
+        """
+        段階的な変換の下書きに使うPDFConverterを作成する
+        
+        設定はこのインスタンスから引き継ぎ、draft_dpiの解像度でメモリ上に変換します。
+        スライドサイズは本来の解像度で決め、画像フォルダ・ページのキー・目標サイズは
+        高解像度の画像に差し替えるときに扱うため、下書きでは使いません。
+        """
+        draft = copy.copy(self)
+        draft.dpi = self.draft_dpi
+        draft._slide_dpi = self.dpi
+        draft.save_images = False
+        draft.fingerprint_pages = False
+        draft.target_size = None
+        draft.slide_size_budget = None
+        draft.metrics = None
+        return draft
+    
+    def _open_slide_writer(self, pptx_path, slide_width, slide_height):
+        """
+        スライドの書き出し先を用意する
+        
+        streaming_writerが有効な場合はスライドを1枚ずつZIPに書き出す
+        StreamingPptxWriterを、それ以外はpython-pptxを使うライターを返します。
+        どちらもadd_picture_slideでスライドを追加し、withブロックの終了時に保存されます。
+        """
+        if self.streaming_writer:
+            return StreamingPptxWriter(pptx_path, slide_width, slide_height)
+        return _PresentationWriter(self, pptx_path, slide_width, slide_height)
+    
+    def _iter_rendered_pages(self, pdf_document, pdf_path, page_indices, duplicate_of):
+        """
+        レンダリング済みのページをスライドの順に返すジェネレータ
+        
+        重複ページ（duplicate_ofがNoneでないページ）はレンダリングせず、
+        同じ内容の最初のページの結果を返します。最初のページの結果は
+        最後の重複ページを返すまでの間だけ保持されます。
+        レンダリングしたページのエンコード情報はencoding_statsに集計されます。
+        
+        Args:
+            page_indices (list): 変換するページ番号のリスト（_selected_pagesの結果）
+            duplicate_of (list): _find_duplicate_pagesの結果
+        
+        Yields:
+            tuple: (ページ番号, エンコード済み画像のバイト列)
+        """
+        render_indices = [i for i, original in zip(page_indices, duplicate_of) if original is None]
+        remaining = {}
+        for original in duplicate_of:
+            if original is not None:
+                remaining[original] = remaining.get(original, 0) + 1
+        
+        encoder = self._start_encoding_stats(len(page_indices))
+        rendered = self._iter_unique_rendered_pages(pdf_document, pdf_path, render_indices, encoder)
+        held = {}
+        try:
+            for position, (i, original) in enumerate(zip(page_indices, duplicate_of)):
+                if original is None:
+                    _, image_bytes, info = next(rendered)
+                    self._record_page(i, info)
+                    if remaining.get(position):
+                        held[position] = image_bytes
+                else:
+                    image_bytes = held[original]
+                    remaining[original] -= 1
+                    if remaining[original] == 0:
+                        del held[original]
+                yield i, image_bytes
+        finally:
+            rendered.close()
+    
+    def _iter_vector_pages(self, pdf_document, page_indices, duplicate_of):
+        """
+        変換する各ページをSVG画像に変換し、スライドの順に返すジェネレータ
+        
+        SVGへの変換はラスタライズよりはるかに軽いため、ワーカープロセスは使わずに
+        このプロセス内で順番に変換します。重複ページは最初のページの結果を返します。
+        
+        Yields:
+            tuple: (ページ番号, SVG画像のデータ, 代替表示用のPNGのデータ, "")
+        """
+        # SVG画像は画像形式の集計の対象外
+        self.encoding_stats = None
+        originals = {original for original in duplicate_of if original is not None}
+        held = {}
+        for position, (i, original) in enumerate(zip(page_indices, duplicate_of)):
+            if original is None:
+                self._check_cancelled()
+                svg_bytes, fallback_bytes, info = _render_page_to_svg(pdf_document[i], self.vector_fallback_dpi)
+                self._record_page(i, info)
+                if position in originals:
+                    held[position] = (svg_bytes, fallback_bytes)
+            else:
+                svg_bytes, fallback_bytes = held[original]
+            yield i, svg_bytes, fallback_bytes, ""
+    
+    def _iter_hybrid_pages(self, pdf_document, page_indices, duplicate_of, slide_width, slide_height):
+        """
+        変換する各ページを背景画像とテキストボックスの図形XMLに変換し、スライドの順に返すジェネレータ
+        
+        横書きの文字をテキストボックスとして取り出し、ページから削除してから
+        hybrid_background_dpiの解像度で背景をレンダリングします。
+        ページの内容を書き換えるため、pdf_documentはファイルに保存しないでください。
+        背景の解像度が低くレンダリングが軽いため、このプロセス内で順番に変換します。
+        
+        Yields:
+            tuple: (ページ番号, 背景画像のデータ, None, テキストボックスの図形XML)
+        """
+        encoder = self._start_encoding_stats(len(page_indices))
+        originals = {original for original in duplicate_of if original is not None}
+        held = {}
+        for position, (i, original) in enumerate(zip(page_indices, duplicate_of)):
+            if original is None:
+                self._check_cancelled()
+                page = pdf_document[i]
+                lines = extract_text_lines(page)
+                shapes_xml = text_shapes_xml(lines, page.rect, slide_width, slide_height)
+                remove_text(page, lines)
+                image_bytes, info = _render_page_to_bytes(
+                    page, self.hybrid_background_dpi, self.image_format, self.cache, encoder,
+                    self._tile_height()
+                )
+                self._record_page(i, info)
+                if position in originals:
+                    held[position] = (image_bytes, shapes_xml)
+            else:
+                image_bytes, shapes_xml = held[original]
+            yield i, image_bytes, None, shapes_xml
     
-    def _create_pptx_from_images(self, image_files, base_name, callback):
-        """画像ファイルからPPTXを作成する"""
+    def _iter_unique_rendered_pages(self, pdf_document, pdf_path, page_indices, encoder=None):
+        """
+        指定したページをレンダリングし、指定した順に返すジェネレータ
+        
+        pipelineが有効、またはworkersが2以上の場合は、ワーカープロセスで
+        レンダリングとエンコードを行い、呼び出し側のスライド追加と並行して
+        次のページの処理を進めます。同時に処理中のページ数はpipeline_depthで
+        制限されるため、ページ数が増えてもメモリ使用量は一定に保たれます。
+        
+        Yields:
+            tuple: (ページ番号, エンコード済み画像のバイト列, エンコード情報（encoderがなければNone）)
+        """
+        workers = self._resolve_workers(len(page_indices))
+        
+        if not self.pipeline and workers == 1:
+            # 逐次処理：開いているドキュメントをそのまま使う
+            for i in page_indices:
+                self._check_cancelled()
+                yield (i, *_render_page_to_bytes(
+                    pdf_document[i], self.dpi, self.image_format, self.cache, encoder,
+                    self._tile_height()
+                ))
+            return
+        
+        # ワーカー全員が常に作業できるよう、上限はワーカー数以上にする
+        depth = max(self.pipeline_depth, workers)
+        pending = deque()
+        next_position = 0
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_pipeline_worker,
+            initargs=(pdf_path, self._cancel_token)
+        ) as executor:
+            try:
+                while pending or next_position < len(page_indices):
+                    self._check_cancelled()
+                    # キューに空きがある分だけ先のページを投入する
+                    while next_position < len(page_indices) and len(pending) < depth:
+                        pending.append(executor.submit(
+                            _render_page_bytes_worker, page_indices[next_position], self.dpi,
+                            self.image_format, self.cache, encoder, self._tile_height()
+                        ))
+                        next_position += 1
+                    
+                    # 先頭のページが完成するのを待ってから渡す（ページ順を保証）
+                    yield pending.popleft().result()
+            finally:
+                # 途中で中断された場合は未着手のページを取り消す
+                # （実行中のページは完成するまで待つため、キャンセルから1ページ以内に終了する）
+                for future in pending:
+                    future.cancel()
+    
+    def _pptx_output_path(self, base_name):
+        """出力するPPTXファイルのパスを返す"""
+        pptx_filename = os.path.splitext(base_name)[0] + ".pptx"
+        return os.path.join(self.output_folder, pptx_filename)
+    
+    def _add_picture_slide(self, prs, layout, image, page_key=None):
+        """
+        画像をスライド全体に配置したスライドを追加する
+        
+        Args:
+            prs (Presentation): 追加先のプレゼンテーション
+            layout: 使用するスライドレイアウト
+            image (str or file-like): 画像ファイルのパスまたはストリーム
+            page_key (str, optional): 差分更新用に画像の名前として保存するページのキー
+        """
+        # スライド作成
+        slide = prs.slides.add_slide(layout)
+        
+        # 画像の挿入 - スライド全体に拡大表示するために左上(0,0)から開始
+        pic = slide.shapes.add_picture(image, 0, 0)
+        
+        # 画像をスライド全体に拡大（アスペクト比を維持せず、完全にカバー）
+        pic.width = prs.slide_width
+        pic.height = prs.slide_height
+        
+        if page_key is not None:
+            pic.name = PAGE_KEY_PREFIX + page_key
+        return slide
+    
+    def _create_pptx_from_images(self, image_files, base_name, callback, page_keys=None):
+        """画像ファイルからPPTXを作成する（page_keysがあれば各スライドに保存する）"""
         if not image_files:
             raise ValueError("変換する画像ファイルがありません")
-            
+        
         # PPTXファイルのパスを設定
-        pptx_filename = os.path.splitext(base_name)[0] + ".pptx"
-        pptx_path = os.path.join(self.output_folder, pptx_filename)
+        pptx_path = self._pptx_output_path(base_name)
         
         # 最初の画像からサイズを取得
         with Image.open(image_files[0]) as img:
@@ -212,31 +1942,48 @@ class PDFConverter:
         total_images = len(image_files)
         
         # 各画像をスライドに配置
-        for i, img_path in enumerate(image_files):
-            # スライド作成
-            slide = prs.slides.add_slide(blank_layout)
-            
-            # 画像の挿入 - スライド全体に拡大表示するために左上(0,0)から開始
-            pic = slide.shapes.add_picture(img_path, 0, 0)
-            
-            # 画像をスライド全体に拡大（アスペクト比を維持せず、完全にカバー）
-            pic.width = prs.slide_width
-            pic.height = prs.slide_height
-            
-            # 進捗状況をコールバックで通知
-            progress = 50 + (i + 1) / total_images * 40  # 50%〜90%の範囲で進捗
-            callback("変換中", f"PowerPointスライドを作成しています ({i+1}/{total_images})", progress)
+        with self._stage(STAGE_SLIDES):
+            for i, img_path in enumerate(image_files):
+                self._check_cancelled()
+                self._add_picture_slide(
+                    prs, blank_layout, img_path, page_keys[i] if page_keys else None
+                )
+                
+                # 進捗状況をコールバックで通知
+                progress = 50 + (i + 1) / total_images * 40  # 50%〜90%の範囲で進捗
+                callback(
+                    "変換中",
+                    self._page_progress_message("PowerPointスライドを作成しています", i + 1, total_images),
+                    progress
+                )
         
-        # プレゼンテーションを保存
-        prs.save(pptx_path)
+        # プレゼンテーションを保存（保存を始めた後はキャンセルしない）
+        self._check_cancelled()
+        with self._stage(STAGE_SAVE):
+            prs.save(pptx_path)
         
         return pptx_path
     
+    def _prepare_images_output(self, base_name):
+        """出力先の画像フォルダを空の状態で用意する"""
+        images_output_path = self._images_output_path(base_name)
+        
+        # 既存の画像フォルダがある場合は削除
+        if os.path.exists(images_output_path):
+            shutil.rmtree(images_output_path, ignore_errors=True)
+        
+        os.makedirs(images_output_path, exist_ok=True)
+        return images_output_path
+    
+    def _images_output_path(self, base_name):
+        """出力先の画像フォルダのパスを返す"""
+        images_folder_name = os.path.splitext(base_name)[0] + "_images"
+        return os.path.join(self.output_folder, images_folder_name)
+    
     def _copy_images_to_output(self, base_name):
         """変換した画像ファイルを出力フォルダにコピーする"""
         # 画像フォルダ名を設定
-        images_folder_name = os.path.splitext(base_name)[0] + "_images"
-        images_output_path = os.path.join(self.output_folder, images_folder_name)
+        images_output_path = self._images_output_path(base_name)
         
         # 既存の画像フォルダがある場合は削除
         if os.path.exists(images_output_path):
@@ -271,7 +2018,8 @@ if __name__ == "__main__":
                 )
                 print(f"\n変換が完了しました！")
                 print(f"PowerPointファイル: {output_pptx}")
-                print(f"画像フォルダ: {output_images}")
+                if output_images:
+                    print(f"画像フォルダ: {output_images}")
             except Exception as e:
                 print(f"\nエラー: {str(e)}")
         else:
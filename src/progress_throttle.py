@@ -0,0 +1,134 @@
+"""
+進捗の通知を間引くモジュール
+ページごとの進捗の通知を一定の間隔にまとめ、処理速度（ページ/秒）と残り時間の見込みを求めます
+"""
+import time
+
+
+# 進捗の通知の既定の最小間隔（秒）
+DEFAULT_PROGRESS_INTERVAL = 0.1
+
+# 間引く対象の状態（それ以外の状態の通知はすぐに通知する）
+_THROTTLED_STATUS = "変換中"
+
+
+def format_duration(seconds):
+    """秒数を「1分5秒」のような表記にする"""
+    seconds = max(0, int(round(seconds)))
+    if seconds < 60:
+        return f"{seconds}秒"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}分{seconds}秒"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}時間{minutes}分"
+
+
+def format_throughput(rate, eta, unit="ページ"):
+    """処理速度と残り時間の見込みを表示用の文字列にする（求められない場合は空文字列）"""
+    if rate is None:
+        return ""
+    text = f"{rate:.1f}{unit}/秒"
+    if eta is not None and eta > 0:
+        text += f"・残り約{format_duration(eta)}"
+    return text
+
+
+class ThroughputEstimator:
+    """完了した件数の推移から処理速度と残り時間の見込みを求めるクラス
+    
+    最初に通知された件数と時刻を基準にして、その後の平均の速度を求めます。
+    全体の件数が変わった場合や件数が減った場合（次の段階に進んだ場合）は、基準を取り直します。
+    """
+    
+    def __init__(self, clock=time.perf_counter):
+        """
+        初期化メソッド
+        
+        Args:
+            clock (callable, optional): 現在の時刻（秒）を返す関数
+        """
+        self.clock = clock
+        self.reset()
+    
+    def reset(self):
+        """基準の件数と時刻を破棄する"""
+        self._total = None
+        self._last_completed = None
+        self._start_completed = None
+        self._start_time = None
+    
+    def update(self, completed, total):
+        """
+        完了した件数を記録し、処理速度と残り時間の見込みを返す
+        
+        Args:
+            completed (int): 完了した件数
+            total (int): 全体の件数
+        
+        Returns:
+            tuple: (1秒あたりの件数, 残りの秒数)。基準から件数が進んでいない場合は (None, None)
+        """
+        now = self.clock()
+        if total != self._total or self._last_completed is None or completed < self._last_completed:
+            self._total = total
+            self._start_completed = completed
+            self._start_time = now
+        self._last_completed = completed
+        
+        elapsed = now - self._start_time
+        done = completed - self._start_completed
+        if done <= 0 or elapsed <= 0:
+            return None, None
+        rate = done / elapsed
+        return rate, (total - completed) / rate
+
+
+class ThrottledCallback:
+    """進捗のコールバックを一定の間隔に間引くクラス
+    
+    「変換中」で進捗の値を持つ通知は、前回の通知から interval 秒が経つまで保留し、
+    保留中に新しい通知があれば最新のものに置き換えます。
+    それ以外の通知（状態の変化や進捗の値を持たないメッセージ）はすぐに通知し、
+    その前に保留中の通知があれば先に通知するため、各段階の最後の進捗は必ず届きます。
+    """
+    
+    def __init__(self, callback, interval=DEFAULT_PROGRESS_INTERVAL, clock=time.perf_counter):
+        """
+        初期化メソッド
+        
+        Args:
+            callback (callable): 通知先のコールバック関数（status, message, progress）
+            interval (float, optional): 進捗の通知の最小間隔（秒、0以下で間引かない）
+            clock (callable, optional): 現在の時刻（秒）を返す関数
+        """
+        self.callback = callback
+        self.interval = interval
+        self.clock = clock
+        self._pending = None
+        self._last_emit = None
+    
+    def __call__(self, status, message, progress=None):
+        """通知を受け取り、間引いたうえでコールバックに渡す"""
+        if status == _THROTTLED_STATUS and progress is not None and self.interval > 0:
+            now = self.clock()
+            if self._last_emit is not None and now - self._last_emit < self.interval:
+                self._pending = (status, message, progress)
+                return
+            self._pending = None
+            self._emit(status, message, progress, now)
+            return
+        
+        self.flush()
+        self._emit(status, message, progress, self.clock())
+    
+    def flush(self):
+        """保留中の通知があれば通知する"""
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._emit(*pending, self.clock())
+    
+    def _emit(self, status, message, progress, now):
+        """コールバックに通知する"""
+        self._last_emit = now
+        self.callback(status, message, progress)
@@ -0,0 +1,296 @@
+"""
+ページのレンダリング結果をディスクに保存するキャッシュモジュール
+ページ内容のハッシュをキーにするため、改訂版のPDFでも変更のないページはキャッシュから取得できます
+"""
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+
+from page_fingerprint import PageFingerprinter, render_key
+
+
+# キャッシュの既定の上限サイズ（バイト）
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# インデックスデータベースのファイル名
+INDEX_FILE_NAME = "index.sqlite3"
+
+# 他のプロセスがデータベースをロックしている場合の待ち時間（秒）
+LOCK_TIMEOUT = 30
+
+
+class RenderCache:
+    """ページのレンダリング結果を保存するディスクキャッシュ
+    
+    エンコード済みの画像データを、ページ内容・ズーム値・色空間・画像形式から
+    計算したキーで保存します。合計サイズがmax_bytesを超えると、
+    最後に使用された時刻が古いものから削除されます（LRU）。
+    
+    インデックスにはSQLiteを使用し、画像ファイルは一時ファイルに書き込んでから
+    置き換えるため、複数のプロセスから同時に使用しても安全です。
+    インスタンスはpickle可能で、ワーカープロセスにそのまま渡せます。
+    ページのフィンガープリントは、最後に使ったドキュメントのPageFingerprinterで計算するため、
+    同じドキュメントのページでは共有オブジェクト（フォントなど）のハッシュを再利用します。
+    
+    Attributes:
+        cache_dir (str): キャッシュを保存するフォルダ
+        max_bytes (int): キャッシュの上限サイズ（バイト）
+        hits (int): このインスタンスでのキャッシュヒット数
+        misses (int): このインスタンスでのキャッシュミス数
+    """
+    
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        初期化メソッド
+        
+        Args:
+            cache_dir (str): キャッシュを保存するフォルダ（存在しなければ作成）
+            max_bytes (int, optional): キャッシュの上限サイズ（バイト）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._fingerprinter = None  # 最後に使ったドキュメントのPageFingerprinter
+        self._lock = threading.RLock()
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def __getstate__(self):
+        """pickle時にはデータベース接続・フィンガープリントの計算状態・ロックを含めない"""
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_fingerprinter"] = None
+        del state["_lock"]
+        return state
+    
+    def __setstate__(self, state):
+        """pickleから復元する（接続は最初の使用時に作り直す）"""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+    
+    def make_key(self, page, zoom, image_format, colorspace="rgb", alpha=False, fingerprinter=None):
+        """
+        ページとレンダリング条件からキャッシュキーを作成する
+        
+        Args:
+            page (fitz.Page): 対象のページ
+            zoom (float): レンダリング時のズーム値
+            image_format (str): 画像フォーマット（jpg, png）
+            colorspace (str, optional): 色空間
+            alpha (bool, optional): アルファチャンネルの有無
+            fingerprinter (PageFingerprinter, optional): ページのドキュメントのPageFingerprinter。
+                指定がなければ、ドキュメントごとにインスタンス内で作成したものを使う
+        
+        Returns:
+            str: キャッシュキー
+        """
+        with self._lock:
+            if fingerprinter is None:
+                fingerprinter = self._fingerprinter_for(page.parent)
+            fingerprint = fingerprinter.fingerprint(page.number)
+        return render_key(fingerprint, zoom, image_format, colorspace, alpha)
+    
+    def _fingerprinter_for(self, document):
+        """ドキュメントのPageFingerprinterを返す（同じドキュメントでは同じインスタンスを使い回す）"""
+        if self._fingerprinter is None or self._fingerprinter.document is not document:
+            self._fingerprinter = PageFingerprinter(document)
+        return self._fingerprinter
+    
+    def get(self, key):
+        """
+        キャッシュから画像データを取得する
+        
+        Returns:
+            bytes: 画像データ。キャッシュにない場合はNone
+        """
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            # 未登録、または他のプロセスによって削除された
+            self.misses += 1
+            self._record_stat("misses")
+            return None
+        
+        self.hits += 1
+        with self._transaction() as connection:
+            connection.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            connection.execute("UPDATE stats SET hits = hits + 1")
+        return data
+    
+    def put(self, key, data):
+        """
+        画像データをキャッシュに保存し、必要であれば古いエントリを削除する
+        
+        Args:
+            key (str): キャッシュキー
+            data (bytes): 画像データ
+        """
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        
+        # 書き込み途中のファイルを他のプロセスが読まないよう、一時ファイル経由で置き換える
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(entry_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, size, last_access) VALUES (?, ?, ?)",
+                (key, len(data), time.time())
+            )
+            self._evict(connection)
+    
+    def stats(self):
+        """
+        キャッシュ全体の統計情報を取得する
+        
+        ヒット数・ミス数はこのキャッシュを使用したすべてのプロセスの合計です。
+        
+        Returns:
+            dict: entries, total_bytes, max_bytes, hits, misses, evictions
+        """
+        with self._lock:
+            connection = self._connect()
+            entries, total_bytes = connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            hits, misses, evictions = connection.execute(
+                "SELECT hits, misses, evictions FROM stats"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "total_bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+        }
+    
+    def clear(self):
+        """キャッシュのエントリをすべて削除する"""
+        with self._transaction() as connection:
+            keys = [row[0] for row in connection.execute("SELECT key FROM entries")]
+            connection.execute("DELETE FROM entries")
+        for key in keys:
+            self._remove_entry_file(key)
+    
+    def close(self):
+        """データベース接続を閉じる"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+    
+    def _evict(self, connection):
+        """合計サイズが上限を超えている間、最も古いエントリから削除する"""
+        total_bytes = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+        if total_bytes <= self.max_bytes:
+            return
+        
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY last_access"
+        ).fetchall():
+            if total_bytes <= self.max_bytes:
+                break
+            evicted.append(key)
+            total_bytes -= size
+        
+        connection.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in evicted])
+        connection.execute("UPDATE stats SET evictions = evictions + ?", (len(evicted),))
+        for key in evicted:
+            self._remove_entry_file(key)
+    
+    def _record_stat(self, column):
+        """統計情報のカウンタを1つ増やす"""
+        with self._transaction() as connection:
+            connection.execute(f"UPDATE stats SET {column} = {column} + 1")
+    
+    def _entry_path(self, key):
+        """キャッシュキーに対応する画像ファイルのパスを返す"""
+        return os.path.join(self.cache_dir, key[:2], key)
+    
+    def _remove_entry_file(self, key):
+        """エントリの画像ファイルを削除する"""
+        try:
+            os.remove(self._entry_path(key))
+        except OSError:
+            pass
+    
+    def _connect(self):
+        """インデックスデータベースに接続する（必要であればテーブルを作成）"""
+        if self._connection is None:
+            connection = sqlite3.connect(
+                os.path.join(self.cache_dir, INDEX_FILE_NAME),
+                timeout=LOCK_TIMEOUT,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            with _Transaction(connection):
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    "key TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS stats ("
+                    "hits INTEGER NOT NULL, misses INTEGER NOT NULL, evictions INTEGER NOT NULL)"
+                )
+                connection.execute(
+                    "INSERT INTO stats SELECT 0, 0, 0 WHERE NOT EXISTS (SELECT 1 FROM stats)"
+                )
+            self._connection = connection
+        return self._connection
+    
+    def _transaction(self):
+        """書き込み用のトランザクションを開始する"""
+        with self._lock:
+            connection = self._connect()
+        return _Transaction(connection, self._lock)
+
+
+class _Transaction:
+    """SQLiteの書き込みトランザクション
+    
+    BEGIN IMMEDIATEで他のプロセスと、ロックで同じプロセス内の他のスレッドと排他します。
+    """
+    
+    def __init__(self, connection, lock=None):
+        self.connection = connection
+        self.lock = lock
+    
+    def __enter__(self):
+        if self.lock is not None:
+            self.lock.acquire()
+        try:
+            self.connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            if self.lock is not None:
+                self.lock.release()
+            raise
+        return self.connection
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.connection.execute("COMMIT")
+            else:
+                self.connection.execute("ROLLBACK")
+        finally:
+            if self.lock is not None:
+                self.lock.release()
+        return False
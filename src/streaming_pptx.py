@@ -0,0 +1,326 @@
+"""
+スライドを1枚ずつZIPに直接書き出すPPTXライターモジュール
+python-pptxのPresentationをメモリ上に保持しないため、ページ数が非常に多いPDFでもメモリ使用量が一定です
+"""
+import io
+import os
+import re
+import hashlib
+import zipfile
+from xml.sax.saxutils import quoteattr
+
+from lxml import etree
+from pptx import Presentation
+
+
+# PresentationMLの名前空間
+NS_P = "http://schemas.openxmlformats.org/presentationml/2006/main"
+NS_R = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_RELS = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+
+# リレーションシップの種類
+RT_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+RT_SLIDE_LAYOUT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+RT_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+# スライドパートのコンテンツタイプ
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+
+# 画像の拡張子とコンテンツタイプ
+IMAGE_CONTENT_TYPES = {
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "svg": "image/svg+xml",
+}
+
+# SVG画像をblipに埋め込むための拡張（Office 2016以降のPowerPointが対応）
+NS_ASVG = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+SVG_BLIP_EXT_URI = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+
+# スライドの最後にまとめて書き出すパート（スライド一覧を含むもの）
+_DEFERRED_PARTS = (
+    "[Content_Types].xml",
+    "ppt/presentation.xml",
+    "ppt/_rels/presentation.xml.rels",
+    "docProps/app.xml",
+)
+
+# スライドIDの開始値（PowerPointの仕様で256以上）
+FIRST_SLIDE_ID = 256
+
+_SLIDE_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<p:sld xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main"'
+    ' xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+    ' xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main">'
+    '<p:cSld><p:spTree>'
+    '<p:nvGrpSpPr><p:cNvPr id="1" name=""/><p:cNvGrpSpPr/><p:nvPr/></p:nvGrpSpPr>'
+    '<p:grpSpPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="0" cy="0"/>'
+    '<a:chOff x="0" y="0"/><a:chExt cx="0" cy="0"/></a:xfrm></p:grpSpPr>'
+    '<p:pic><p:nvPicPr><p:cNvPr id="2" name={name}/>'
+    '<p:cNvPicPr><a:picLocks noChangeAspect="1"/></p:cNvPicPr><p:nvPr/></p:nvPicPr>'
+    '<p:blipFill>{blip}<a:stretch><a:fillRect/></a:stretch></p:blipFill>'
+    '<p:spPr><a:xfrm><a:off x="0" y="0"/><a:ext cx="{cx}" cy="{cy}"/></a:xfrm>'
+    '<a:prstGeom prst="rect"><a:avLst/></a:prstGeom></p:spPr></p:pic>{shapes}'
+    '</p:spTree></p:cSld>'
+    '<p:clrMapOvr><a:masterClrMapping/></p:clrMapOvr></p:sld>'
+)
+
+# 画像だけを参照するblip
+_PICTURE_BLIP_XML = '<a:blip r:embed="rId2"/>'
+
+# 代替表示用の画像（rId2）とSVG画像（rId3）を参照するblip
+_SVG_BLIP_XML = (
+    '<a:blip r:embed="rId2"><a:extLst><a:ext uri="' + SVG_BLIP_EXT_URI + '">'
+    '<asvg:svgBlip xmlns:asvg="' + NS_ASVG + '" r:embed="rId3"/>'
+    '</a:ext></a:extLst></a:blip>'
+)
+
+_SLIDE_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="' + RT_SLIDE_LAYOUT + '" Target="../slideLayouts/{layout}"/>'
+    '<Relationship Id="rId2" Type="' + RT_IMAGE + '" Target="../media/{media}"/>'
+    '{extra}'
+    '</Relationships>'
+)
+
+_SVG_RELS_XML = '<Relationship Id="rId3" Type="' + RT_IMAGE + '" Target="../media/{media}"/>'
+
+
+def image_extension(image_bytes):
+    """画像データの先頭バイトから拡張子を判定する"""
+    if image_bytes[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if image_bytes[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if re.match(rb"\s*(<\?xml[^>]*>\s*)?<svg[\s>]", image_bytes[:256]):
+        return "svg"
+    raise ValueError("サポートされていない画像形式です")
+
+
+class StreamingPptxWriter:
+    """スライドを追加するたびにZIPへ直接書き出すPPTXライター
+    
+    スライドのXML・リレーションシップ・画像は追加した時点でファイルに書き込まれ、
+    メモリ上にはスライドの数だけの小さな情報しか残りません。
+    内容が同じ画像は1つのメディアパートを複数のスライドで共有します。
+    スライド一覧を含むパート（presentation.xmlなど）はclose時に書き出します。
+    
+    書き込み中は一時ファイルを使用し、closeで完成したファイルに置き換えるため、
+    途中で失敗した場合に不完全なPPTXが残ることはありません。
+    
+    使用例:
+        with StreamingPptxWriter(path, Pt(width), Pt(height)) as writer:
+            writer.add_picture_slide(image_bytes)
+    """
+    
+    def __init__(self, pptx_path, slide_width, slide_height):
+        """
+        初期化メソッド
+        
+        Args:
+            pptx_path (str): 出力するPPTXファイルのパス
+            slide_width (int): スライドの幅（EMU）
+            slide_height (int): スライドの高さ（EMU）
+        """
+        self.pptx_path = pptx_path
+        self.slide_width = int(slide_width)
+        self.slide_height = int(slide_height)
+        self.slide_count = 0
+        self._temp_path = pptx_path + ".tmp"
+        self._image_extensions = set()
+        self._media_by_digest = {}
+        
+        self._template = _build_template(self.slide_width, self.slide_height)
+        self._zip = zipfile.ZipFile(self._temp_path, "w", zipfile.ZIP_DEFLATED)
+        
+        # テンプレートのパートのうち、スライド一覧に依存しないものを先に書き出す
+        for name, data in self._template["parts"].items():
+            if name not in _DEFERRED_PARTS:
+                self._zip.writestr(name, data)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+    
+    def add_picture_slide(self, image_bytes, name=None, shapes_xml=""):
+        """
+        画像をスライド全体に配置したスライドを追加する
+        
+        Args:
+            image_bytes (bytes): JPEGまたはPNGの画像データ
+            name (str, optional): 画像の図形に付ける名前
+            shapes_xml (str, optional): 画像の前面に追加する図形のXML（図形IDは3から）
+        """
+        self.slide_count += 1
+        media_name = self._write_media(image_bytes)
+        self._write_slide(name, _PICTURE_BLIP_XML, media_name, "", shapes_xml)
+    
+    def add_svg_slide(self, svg_bytes, fallback_bytes, name=None):
+        """
+        SVG画像をスライド全体に配置したスライドを追加する
+        
+        SVGに対応していないアプリケーションでは、代わりにfallback_bytesの画像が表示されます。
+        
+        Args:
+            svg_bytes (bytes): SVG画像のデータ
+            fallback_bytes (bytes): 代替表示用のPNGまたはJPEGの画像データ
+            name (str, optional): 画像の図形に付ける名前
+        """
+        self.slide_count += 1
+        fallback_name = self._write_media(fallback_bytes)
+        svg_name = self._write_media(svg_bytes, zipfile.ZIP_DEFLATED)
+        self._write_slide(name, _SVG_BLIP_XML, fallback_name, _SVG_RELS_XML.format(media=svg_name))
+    
+    def close(self):
+        """スライド一覧を含むパートを書き出し、PPTXファイルを完成させる"""
+        parts = self._template["parts"]
+        self._zip.writestr("[Content_Types].xml", self._content_types(parts["[Content_Types].xml"]))
+        self._zip.writestr("ppt/presentation.xml", self._presentation(parts["ppt/presentation.xml"]))
+        self._zip.writestr(
+            "ppt/_rels/presentation.xml.rels",
+            self._presentation_rels(parts["ppt/_rels/presentation.xml.rels"])
+        )
+        self._zip.writestr("docProps/app.xml", self._app_properties(parts["docProps/app.xml"]))
+        self._zip.close()
+        os.replace(self._temp_path, self.pptx_path)
+    
+    def abort(self):
+        """書き込みを中止し、一時ファイルを削除する"""
+        self._zip.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+    
+    def _write_media(self, image_bytes, compress_type=zipfile.ZIP_STORED):
+        """
+        画像をメディアパートとして書き出し、そのファイル名を返す
+        
+        同じ内容の画像が書き出し済みであれば、そのメディアパートを共有します。
+        """
+        digest = hashlib.sha1(image_bytes).digest()
+        media_name = self._media_by_digest.get(digest)
+        if media_name is None:
+            extension = image_extension(image_bytes)
+            self._image_extensions.add(extension)
+            media_name = f"image{len(self._media_by_digest) + 1}.{extension}"
+            self._media_by_digest[digest] = media_name
+            
+            # JPEG・PNGは圧縮済みのため、既定ではZIPで無圧縮のまま格納する
+            self._zip.writestr(f"ppt/media/{media_name}", image_bytes, compress_type)
+        return media_name
+    
+    def _write_slide(self, name, blip_xml, media_name, extra_rels_xml, shapes_xml=""):
+        """最後に追加したスライドのXMLとリレーションシップを書き出す"""
+        number = self.slide_count
+        self._zip.writestr(
+            f"ppt/slides/slide{number}.xml",
+            _SLIDE_XML.format(
+                name=quoteattr(name or f"Picture {number}"),
+                blip=blip_xml,
+                shapes=shapes_xml or "",
+                cx=self.slide_width,
+                cy=self.slide_height
+            )
+        )
+        self._zip.writestr(
+            f"ppt/slides/_rels/slide{number}.xml.rels",
+            _SLIDE_RELS_XML.format(
+                layout=self._template["blank_layout"], media=media_name, extra=extra_rels_xml
+            )
+        )
+    
+    def _slide_rel_id(self, number):
+        """presentation.xmlからスライドへのリレーションシップID"""
+        return f"rId{self._template['first_rel_id'] + number - 1}"
+    
+    def _content_types(self, template_xml):
+        """画像の拡張子とスライドパートを登録したコンテンツタイプ一覧を作成する"""
+        root = etree.fromstring(template_xml)
+        registered = {element.get("Extension") for element in root.iter(f"{{{NS_CONTENT_TYPES}}}Default")}
+        for extension in sorted(self._image_extensions - registered):
+            etree.SubElement(
+                root, f"{{{NS_CONTENT_TYPES}}}Default",
+                Extension=extension, ContentType=IMAGE_CONTENT_TYPES[extension]
+            )
+        for number in range(1, self.slide_count + 1):
+            etree.SubElement(
+                root, f"{{{NS_CONTENT_TYPES}}}Override",
+                PartName=f"/ppt/slides/slide{number}.xml", ContentType=CT_SLIDE
+            )
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+    
+    def _presentation(self, template_xml):
+        """スライドID一覧を追加したpresentation.xmlを作成する"""
+        root = etree.fromstring(template_xml)
+        sld_id_list = etree.Element(f"{{{NS_P}}}sldIdLst")
+        for number in range(1, self.slide_count + 1):
+            etree.SubElement(
+                sld_id_list, f"{{{NS_P}}}sldId",
+                {"id": str(FIRST_SLIDE_ID + number - 1), f"{{{NS_R}}}id": self._slide_rel_id(number)}
+            )
+        
+        # スキーマの順序に従い、マスター一覧の直後に挿入する
+        anchor = None
+        for tag in ("sldMasterIdLst", "notesMasterIdLst", "handoutMasterIdLst"):
+            element = root.find(f"{{{NS_P}}}{tag}")
+            if element is not None:
+                anchor = element
+        if anchor is None:
+            root.insert(0, sld_id_list)
+        else:
+            anchor.addnext(sld_id_list)
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+    
+    def _presentation_rels(self, template_xml):
+        """スライドへのリレーションシップを追加したpresentation.xml.relsを作成する"""
+        root = etree.fromstring(template_xml)
+        for number in range(1, self.slide_count + 1):
+            etree.SubElement(
+                root, f"{{{NS_PKG_RELS}}}Relationship",
+                Id=self._slide_rel_id(number), Type=RT_SLIDE, Target=f"slides/slide{number}.xml"
+            )
+        return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+    
+    def _app_properties(self, template_xml):
+        """スライド枚数を更新したapp.xmlを作成する"""
+        return re.sub(
+            rb"<Slides>\d+</Slides>",
+            f"<Slides>{self.slide_count}</Slides>".encode("ascii"),
+            template_xml
+        )
+
+
+def _build_template(slide_width, slide_height):
+    """
+    python-pptxの既定テンプレートから、スライドのないPPTXのパートを作成する
+    
+    Returns:
+        dict: parts（パート名とデータ）, blank_layout（白紙レイアウトのファイル名）,
+              first_rel_id（スライドに使うリレーションシップIDの開始番号）
+    """
+    prs = Presentation()
+    prs.slide_width = slide_width
+    prs.slide_height = slide_height
+    blank_layout = os.path.basename(str(prs.slide_layouts[6].part.partname))
+    
+    stream = io.BytesIO()
+    prs.save(stream)
+    with zipfile.ZipFile(stream) as template_zip:
+        parts = {name: template_zip.read(name) for name in template_zip.namelist()}
+    
+    rel_ids = [
+        int(match) for match in re.findall(rb'Id="rId(\d+)"', parts["ppt/_rels/presentation.xml.rels"])
+    ]
+    return {
+        "parts": parts,
+        "blank_layout": blank_layout,
+        "first_rel_id": max(rel_ids, default=0) + 1,
+    }
@@ -0,0 +1,112 @@
+"""
+asyncioから使うPDF変換のAPI（async_converter.py）のテストモジュール
+"""
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_converter import AsyncPDFConverter
+from pdf_converter import PDFConverter
+from tests.test_pdf_converter import create_sample_pdf
+
+
+class TestAsyncPDFConverter(unittest.IsolatedAsyncioTestCase):
+    """非同期APIでの変換・進捗・キャンセルのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "output")
+        os.makedirs(self.output_dir)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.in_memory = True
+        self.converter.save_images = False
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _pdf(self, name, page_count=2):
+        """テスト用のPDFを作成する"""
+        return create_sample_pdf(os.path.join(self.temp_dir, name), page_count=page_count)
+    
+    async def test_convert_with_progress(self):
+        """複数のファイルを同時に変換し、ファイルごとの進捗を順に受け取れること"""
+        paths = [self._pdf("a.pdf"), self._pdf("b.pdf", page_count=3)]
+        async with AsyncPDFConverter(self.converter, max_concurrency=2) as converter:
+            jobs = [converter.submit(path, self.output_dir) for path in paths]
+            statuses = [[event.status async for event in job.progress()] for job in jobs]
+            results = [await job for job in jobs]
+        
+        for path, result, job_statuses in zip(paths, results, statuses):
+            self.assertTrue(result.succeeded)
+            self.assertEqual(result.pdf_path, path)
+            self.assertTrue(os.path.exists(result.pptx_path))
+            self.assertEqual((job_statuses[0], job_statuses[-1]), ("開始", "完了"))
+        self.assertEqual(results[1].metrics["totals"]["pages"], 3)
+        # 変換の設定のインスタンスは変換に使われず、状態が変わらないこと
+        self.assertIsNone(self.converter.output_folder)
+        self.assertIsNone(self.converter.metrics)
+    
+    async def test_warm_up(self):
+        """warm_upでワーカープロセスがすべて起動し、その後の変換に使われること"""
+        async with AsyncPDFConverter(self.converter, max_concurrency=2) as converter:
+            pids = await converter.warm_up()
+            self.assertEqual(len(pids), 2)
+            self.assertNotIn(os.getpid(), pids)
+            result = await converter.convert(self._pdf("a.pdf"), self.output_dir)
+        self.assertTrue(result.succeeded)
+    
+    async def test_error(self):
+        """変換に失敗した場合はawaitで同じ例外が送出されること"""
+        async with AsyncPDFConverter(self.converter, max_concurrency=1) as converter:
+            with self.assertRaises(FileNotFoundError):
+                await converter.convert(os.path.join(self.temp_dir, "missing.pdf"))
+    
+    async def test_task_cancellation(self):
+        """タスクをキャンセルするとワーカーの変換が中断され、何も出力されないこと"""
+        pdf_path = self._pdf("large.pdf", page_count=200)
+        async with AsyncPDFConverter(self.converter, max_concurrency=1) as converter:
+            task = asyncio.ensure_future(converter.convert(pdf_path, self.output_dir))
+            # 変換が始まってから次の変換を順番待ちにし、少し待ってからキャンセルする
+            while not converter._jobs:
+                await asyncio.sleep(0.01)
+            queued = converter.submit(self._pdf("queued.pdf"), self.output_dir)
+            await asyncio.sleep(0.1)
+            task.cancel()
+            queued.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            with self.assertRaises(asyncio.CancelledError):
+                await queued
+            
+            # キャンセルした後も、次の変換は行えること
+            result = await converter.convert(self._pdf("next.pdf"), self.temp_dir)
+        
+        self.assertEqual(os.listdir(self.output_dir), [])
+        self.assertTrue(result.succeeded)
+    
+    async def test_cancelled_progress(self):
+        """キャンセルした変換の進捗は「キャンセル」で終わること"""
+        pdf_path = self._pdf("large.pdf", page_count=200)
+        async with AsyncPDFConverter(self.converter, max_concurrency=1) as converter:
+            job = converter.submit(pdf_path, self.output_dir)
+            statuses = []
+            async for event in job:
+                statuses.append(event.status)
+                if event.status == "変換中":
+                    job.cancel()
+        self.assertEqual(statuses[-1], "キャンセル")
+        self.assertTrue(job.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
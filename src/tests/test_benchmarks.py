@@ -0,0 +1,152 @@
+"""
+ベンチマーク（benchmarks/corpus.py, benchmarks/run_benchmarks.py）のテストモジュール
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# ベンチマークのフォルダをsys.pathに追加して、ベンチマークのモジュールをインポートできるようにする
+sys.path.insert(0, os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "benchmarks"
+))
+
+import fitz  # PyMuPDF
+
+from corpus import KINDS, MIXED_PAGE_SIZES, corpus_path, ensure_corpus, generate_pdf
+from load_test import percentile, run_load, summarize
+from run_benchmarks import compare_with_baseline, parse_cases, run_case
+
+
+class TestCorpus(unittest.TestCase):
+    """ベンチマーク用のPDFの生成のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _digest(self, path):
+        """ファイルのハッシュ値を返す"""
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    def test_reproducible(self):
+        """同じ種類・ページ数のPDFは同じバイト列になること"""
+        for kind in KINDS:
+            first = generate_pdf(os.path.join(self.temp_dir, f"{kind}-a.pdf"), kind, 4)
+            second = generate_pdf(os.path.join(self.temp_dir, f"{kind}-b.pdf"), kind, 4)
+            self.assertEqual(self._digest(first), self._digest(second), kind)
+    
+    def test_contents(self):
+        """種類ごとの内容とページサイズで生成されること"""
+        paths = ensure_corpus(self.temp_dir, [("text", 2), ("vector", 1), ("scanned", 1), ("mixed", 4)])
+        self.assertEqual(paths[("text", 2)], corpus_path(self.temp_dir, "text", 2))
+        
+        with fitz.open(paths[("text", 2)]) as document:
+            self.assertEqual(len(document), 2)
+            self.assertIn("Section", document[0].get_text())
+        with fitz.open(paths[("vector", 1)]) as document:
+            self.assertGreater(len(document[0].get_drawings()), 100)
+        with fitz.open(paths[("scanned", 1)]) as document:
+            self.assertEqual(len(document[0].get_images()), 1)
+        with fitz.open(paths[("mixed", 4)]) as document:
+            sizes = [(round(page.rect.width), round(page.rect.height)) for page in document]
+            self.assertEqual(sizes, MIXED_PAGE_SIZES)
+    
+    def test_invalid_kind(self):
+        """未対応の種類はエラーになること"""
+        with self.assertRaises(ValueError):
+            generate_pdf(os.path.join(self.temp_dir, "x.pdf"), "unknown", 1)
+
+
+class TestBenchmarkRunner(unittest.TestCase):
+    """ベンチマークの集計とベースラインとの比較のテスト"""
+    
+    def test_compare_with_baseline(self):
+        """許容範囲を超えて悪化した項目だけが回帰になること"""
+        baseline = {
+            "text-50/default@150dpi": {"pages_per_second": 10.0, "peak_rss_mb": 100.0, "output_bytes": 1000},
+            "mixed-40/default@150dpi": {"pages_per_second": 4.0, "peak_rss_mb": 100.0, "output_bytes": 1000},
+        }
+        results = {
+            "text-50/default@150dpi": {"pages_per_second": 8.5, "peak_rss_mb": 110.0, "output_bytes": 1100},
+            "mixed-40/default@150dpi": {"pages_per_second": 5.0, "peak_rss_mb": 80.0, "output_bytes": 1000},
+            "scanned-20/default@150dpi": {"pages_per_second": 1.0, "peak_rss_mb": 500.0, "output_bytes": 1},
+        }
+        regressions = compare_with_baseline(results, baseline)
+        self.assertEqual(
+            [(key, metric) for key, metric, _, _, _ in regressions],
+            [("text-50/default@150dpi", "pages_per_second"), ("text-50/default@150dpi", "output_bytes")]
+        )
+        self.assertAlmostEqual(regressions[0][4], -0.15)
+    
+    def test_run_case(self):
+        """変換の計測結果から段階ごとの時間が集計されること"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pdf_path = generate_pdf(os.path.join(temp_dir, "text.pdf"), "text", 2)
+            result = run_case(pdf_path, "in_memory", 50)
+        self.assertEqual(result["pages"], 2)
+        self.assertTrue({"open", "render", "slides", "save"} <= set(result["stages"]))
+        self.assertGreater(result["render_seconds"], 0)
+    
+    def test_parse_cases(self):
+        """--casesの指定が (種類, ページ数) のリストになること"""
+        self.assertEqual(parse_cases("text:50, mixed:200,vector"), [("text", 50), ("mixed", 200), ("vector", 1)])
+
+
+
+class TestLoadTest(unittest.TestCase):
+    """変換サーバーの負荷試験のテスト"""
+    
+    def test_percentile(self):
+        """隣り合う値を線形補間してパーセンタイルを求めること"""
+        values = [4.0, 1.0, 3.0, 2.0]
+        self.assertEqual(percentile(values, 0), 1.0)
+        self.assertEqual(percentile(values, 50), 2.5)
+        self.assertAlmostEqual(percentile(values, 90), 3.7)
+        self.assertEqual(percentile(values, 100), 4.0)
+        self.assertIsNone(percentile([], 50))
+    
+    def test_summarize(self):
+        """リクエスト数・スループット・レイテンシー・エラーの件数が集計されること"""
+        summary = summarize([0.1, 0.2, 0.3, 0.4], ["HTTP 500", "HTTP 500", "timeout"], 2.0)
+        self.assertEqual((summary["requests"], summary["succeeded"], summary["failed"]), (7, 4, 3))
+        self.assertEqual(summary["requests_per_second"], 2.0)
+        self.assertEqual(summary["latency_ms"]["p50"], 250.0)
+        self.assertEqual(summary["latency_ms"]["max"], 400.0)
+        self.assertEqual(summary["errors"], {"HTTP 500": 2, "timeout": 1})
+    
+    def test_run_load(self):
+        """起動したサーバーに同時にリクエストを送り、すべて成功すること"""
+        from pdf2pptx_server import ConversionServer, ConversionService
+        
+        service = ConversionService(workers=1)
+        service.converter.dpi = 20
+        service.start()
+        server = ConversionServer(("127.0.0.1", 0), service, quiet=True)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with open(generate_pdf(os.path.join(temp_dir, "text.pdf"), "text", 1), "rb") as f:
+                    data = f.read()
+            for mode in ("convert", "jobs"):
+                latencies, errors, _ = run_load(server.url, data, 2, requests=3, mode=mode)
+                self.assertEqual(errors, [], mode)
+                self.assertEqual(len(latencies), 3, mode)
+        finally:
+            server.shutdown()
+            server.server_close()
+            service.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+変換の計測結果（conversion_metrics.py）のテストモジュール
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversion_metrics import ConversionMetrics, add_page_timing
+
+
+class TestConversionMetrics(unittest.TestCase):
+    """計測結果の集計と書き出しのテスト"""
+    
+    def test_add_page_timing(self):
+        """時刻からレンダリング・エンコードの時間が求められ、元のエンコード情報は変更されないこと"""
+        info = {"encoding": "jpeg", "bytes": 10, "reference_bytes": None}
+        timed = add_page_timing(info, 1.0, 1.5, 1.75, 10, 800, 600, cached=False)
+        self.assertEqual((timed["render_seconds"], timed["encode_seconds"]), (0.5, 0.25))
+        self.assertEqual((timed["width"], timed["height"], timed["pid"]), (800, 600, os.getpid()))
+        self.assertEqual(timed["encoding"], "jpeg")
+        self.assertNotIn("render_seconds", info)
+    
+    def test_stages_and_pages(self):
+        """段階の時間が名前ごとに合計され、ページは1から番号が振られること"""
+        metrics = ConversionMetrics("deck.pdf")
+        metrics.add_stage("render", 10.0, 10.5)
+        metrics.add_stage("render", 11.0, 11.25)
+        with metrics.stage("save"):
+            pass
+        metrics.record_page(1, add_page_timing(None, 10.0, 10.1, 10.3, 200, 100, 50))
+        metrics.record_page(0, add_page_timing(None, 10.3, 10.4, 10.5, 100, 100, 50, cached=True))
+        metrics.record_page(2, None)  # 計測値のないページは無視する
+        metrics.finish()
+        
+        result = metrics.to_dict()
+        self.assertEqual(result["stages"]["render"], 0.75)
+        self.assertIn("save", result["stages"])
+        self.assertEqual([page["page"] for page in result["pages"]], [1, 2])
+        self.assertTrue(result["pages"][0]["cached"])
+        self.assertEqual(result["totals"]["image_bytes"], 300)
+        self.assertAlmostEqual(result["totals"]["encode_seconds"], 0.3)
+        self.assertIn("処理時間", metrics.summary())
+    
+    def test_timed_iter(self):
+        """要素の取り出しだけが計測され、途中で終えた場合は元のジェネレータが閉じられること"""
+        closed = []
+        
+        def pages():
+            try:
+                yield from range(3)
+            finally:
+                closed.append(True)
+        
+        metrics = ConversionMetrics()
+        for item in metrics.timed_iter("render", pages()):
+            if item == 1:
+                break
+        self.assertEqual(closed, [True])
+        self.assertEqual(sum(1 for event in metrics._events if event["name"] == "render"), 2)
+    
+    def test_chrome_trace(self):
+        """トレースはイベントが時刻順に並び、段階とページが別の行に表示されること"""
+        metrics = ConversionMetrics("deck.pdf")
+        start = metrics._origin
+        metrics.record_page(0, add_page_timing(None, start + 0.2, start + 0.3, start + 0.4, 1, 1, 1))
+        metrics.add_stage("render", start, start + 0.5)
+        metrics.finish()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = metrics.save_trace(os.path.join(temp_dir, "trace.json"))
+            with open(path, encoding="utf-8") as f:
+                trace = json.load(f)
+        
+        events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual([event["ts"] for event in events], sorted(event["ts"] for event in events))
+        page_event = next(event for event in events if event["cat"] == "page" and event["name"] == "render")
+        self.assertEqual((page_event["ts"], page_event["dur"]), (200000.0, 100000.0))
+        self.assertNotEqual(page_event["tid"], next(event for event in events if event["cat"] == "stage")["tid"])
+        thread_names = [event for event in trace["traceEvents"] if event["name"] == "thread_name"]
+        self.assertEqual(len(thread_names), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+ハイブリッドモードの文字の取り出しのテストモジュール
+"""
+import os
+import sys
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from lxml import etree
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Pt
+
+from hybrid_text import extract_text_lines, remove_text, text_shapes_xml, font_family
+
+
+class TestHybridText(unittest.TestCase):
+    """文字の取り出しとテキストボックスの作成のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.document = fitz.open()
+        self.page = self.document.new_page(width=400, height=300)
+        self.page.draw_rect(fitz.Rect(0, 200, 400, 300), color=None, fill=(0, 0, 1))
+        self.page.insert_text((40, 50), "Title", fontsize=20, fontname="hebo", color=(1, 0, 0))
+        self.page.insert_text((40, 100), "a < b & c", fontsize=10)
+        self.page.insert_text((380, 280), "Rotated", fontsize=10, rotate=90)
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.document.close()
+    
+    def _parse(self, shapes_xml):
+        """図形XMLを要素のリストに変換する"""
+        return list(etree.fromstring(f"<p:spTree {nsdecls('p', 'a')}>{shapes_xml}</p:spTree>"))
+    
+    def test_extract_horizontal_lines_only(self):
+        """横書きの行だけが取り出されること"""
+        lines = extract_text_lines(self.page)
+        texts = ["".join(span["text"] for span in line["spans"]) for line in lines]
+        self.assertEqual(texts, ["Title", "a < b & c"])
+    
+    def test_remove_text_keeps_graphics(self):
+        """取り出した文字だけが削除され、図形と回転した文字は残ること"""
+        remove_text(self.page, extract_text_lines(self.page))
+        self.assertEqual(self.page.get_text().split(), ["Rotated"])
+        pix = self.page.get_pixmap()
+        self.assertEqual(pix.pixel(10, 250), (0, 0, 255))
+    
+    def test_shapes_xml(self):
+        """行ごとにスライドの座標・フォントサイズへ変換したテキストボックスになること"""
+        lines = extract_text_lines(self.page)
+        shapes = self._parse(text_shapes_xml(lines, self.page.rect, Pt(800), Pt(600)))
+        self.assertEqual(len(shapes), 2)
+        
+        offset = shapes[0].find(f".//{qn('a:off')}")
+        self.assertEqual(int(offset.get("x")), round(Pt(lines[0]["bbox"].x0 * 2)))
+        
+        run_properties = shapes[0].find(f".//{qn('a:rPr')}")
+        self.assertEqual(run_properties.get("sz"), "4000")
+        self.assertEqual(run_properties.get("b"), "1")
+        self.assertEqual(run_properties.find(f".//{qn('a:srgbClr')}").get("val"), "FF0000")
+        self.assertEqual(shapes[1].find(f".//{qn('a:t')}").text, "a < b & c")
+        self.assertEqual(
+            [shape.find(f".//{qn('p:cNvPr')}").get("id") for shape in shapes], ["3", "4"]
+        )
+    
+    def test_font_family(self):
+        """サブセット接頭辞とスタイル名が取り除かれること"""
+        self.assertEqual(font_family("ABCDEF+Arial-BoldMT"), "Arial")
+        self.assertEqual(font_family("Helvetica"), "Helvetica")
+        self.assertEqual(font_family("TimesNewRomanPS-ItalicMT"), "TimesNewRomanPS")
+        self.assertEqual(font_family("MS-Gothic"), "MS-Gothic")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+"""
+画像形式の自動選択のテストモジュール
+"""
+import io
+import os
+import sys
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from image_encoder import (
+    AdaptiveEncoder, BudgetEncoder, EncodingStats, detect_encoding,
+    ENCODING_JPEG, ENCODING_PNG, ENCODING_PALETTE, MIN_SCALE
+)
+
+
+def create_photo_stream(size=(400, 300)):
+    """写真に近い（色数が多く、隣り合うピクセルの色が異なる）JPEG画像を作成する"""
+    red = Image.linear_gradient("L").resize(size)
+    green = Image.effect_noise(size, 60)
+    blue = Image.radial_gradient("L").resize(size)
+    stream = io.BytesIO()
+    Image.merge("RGB", (red, green, blue)).save(stream, "JPEG")
+    return stream.getvalue()
+
+
+def render_page(draw, zoom=2):
+    """drawで描画したページをPixmapとしてレンダリングする"""
+    document = fitz.open()
+    page = document.new_page()
+    draw(page)
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    document.close()
+    return pix
+
+
+def draw_text(page):
+    """黒い文字だけのページ"""
+    for y in range(72, 800, 14):
+        page.insert_text((72, y), "The quick brown fox jumps over the lazy dog", fontsize=10)
+
+
+def draw_photo(page):
+    """ページ全体が写真のページ"""
+    page.insert_image(page.rect, stream=create_photo_stream())
+
+
+def draw_diagram(page):
+    """色の多い図形と文字のページ"""
+    for i in range(300):
+        page.draw_rect(
+            fitz.Rect(40 + i, 40 + i * 2, 240 + i, 140 + i * 2),
+            color=None, fill=(i / 300, 0.5, 1 - i / 300)
+        )
+    page.insert_text((72, 780), "Diagram", fontsize=30, color=(0.8, 0.1, 0.1))
+
+
+class TestAdaptiveEncoder(unittest.TestCase):
+    """AdaptiveEncoderのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.encoder = AdaptiveEncoder()
+    
+    def _decode(self, image_bytes):
+        """エンコード済みの画像をRGBの画像に戻す"""
+        return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    
+    def test_text_page_is_lossless_8bit(self):
+        """文字だけのページは可逆の8ビットPNGになること"""
+        pix = render_page(draw_text)
+        image_bytes, info = self.encoder.encode(pix)
+        
+        self.assertEqual(info["encoding"], ENCODING_PALETTE)
+        self.assertEqual(detect_encoding(image_bytes), ENCODING_PALETTE)
+        self.assertEqual(self._decode(image_bytes).tobytes(), pix.samples)
+    
+    def test_colored_palette_is_lossless(self):
+        """256色以下のカラーのページは元の色のままパレットPNGになること"""
+        def draw(page):
+            for i, color in enumerate([(1, 0, 0), (0, 0.5, 0), (0, 0, 1)]):
+                page.draw_rect(fitz.Rect(50, 50 + i * 100, 300, 120 + i * 100), color=None, fill=color)
+        
+        pix = render_page(draw)
+        image_bytes, info = self.encoder.encode(pix)
+        
+        self.assertEqual(info["encoding"], ENCODING_PALETTE)
+        self.assertEqual(self._decode(image_bytes).tobytes(), pix.samples)
+    
+    def test_diagram_page_is_png(self):
+        """色数が多くても平坦な領域が多いページはPNGになること"""
+        image_bytes, info = self.encoder.encode(render_page(draw_diagram))
+        self.assertEqual(info["encoding"], ENCODING_PNG)
+        self.assertEqual(detect_encoding(image_bytes), ENCODING_PNG)
+    
+    def test_photo_page_is_jpeg(self):
+        """写真のページはJPEGになること"""
+        image_bytes, info = self.encoder.encode(render_page(draw_photo))
+        self.assertEqual(info["encoding"], ENCODING_JPEG)
+        self.assertEqual(detect_encoding(image_bytes), ENCODING_JPEG)
+        self.assertEqual(info["bytes"], len(image_bytes))
+    
+    def test_reference_size(self):
+        """reference_formatを指定した場合のみ固定フォーマットでのサイズを計測すること"""
+        pix = render_page(draw_text)
+        _, info = self.encoder.encode(pix)
+        self.assertIsNone(info["reference_bytes"])
+        
+        _, info = AdaptiveEncoder(reference_format="jpg").encode(pix)
+        self.assertEqual(info["reference_bytes"], len(pix.tobytes("jpeg")))
+        self.assertLess(info["bytes"], info["reference_bytes"])
+    
+    def test_format_label_includes_quality(self):
+        """JPEGの品質が異なればキャッシュキー用の文字列も異なること"""
+        self.assertNotEqual(AdaptiveEncoder(85).format_label, AdaptiveEncoder(60).format_label)
+    
+    def test_detect_encoding_rejects_unknown_data(self):
+        """JPEG・PNG以外のデータはエラーになること"""
+        with self.assertRaises(ValueError):
+            detect_encoding(b"GIF89a")
+
+
+class TestBudgetEncoder(unittest.TestCase):
+    """BudgetEncoderのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.photo = render_page(draw_photo)
+    
+    def test_within_budget_keeps_format(self):
+        """上限に収まる場合はimage_formatの形式のままエンコードすること"""
+        pix = render_page(draw_text)
+        image_bytes, info = BudgetEncoder(10 ** 7, "auto", 85).encode(pix)
+        self.assertEqual(info["encoding"], ENCODING_PALETTE)
+        self.assertEqual((info["quality"], info["scale"]), (None, 1.0))
+        
+        image_bytes, info = BudgetEncoder(10 ** 7, "jpg").encode(pix)
+        self.assertEqual(image_bytes, pix.tobytes("jpeg"))
+    
+    def test_lowers_quality(self):
+        """上限を超える場合はJPEGの品質を下げて上限に収めること"""
+        full_size = len(self.photo.tobytes("jpeg"))
+        budget = full_size * 2 // 3
+        image_bytes, info = BudgetEncoder(budget, "jpg").encode(self.photo)
+        
+        self.assertEqual(detect_encoding(image_bytes), ENCODING_JPEG)
+        self.assertLessEqual(len(image_bytes), budget)
+        self.assertLess(info["quality"], 95)
+        self.assertEqual(info["scale"], 1.0)
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            self.assertEqual(image.size, (self.photo.width, self.photo.height))
+    
+    def test_scales_down(self):
+        """品質の下限でも収まらない場合は縮小して上限に収めること"""
+        budget = len(self.photo.tobytes("jpeg", jpg_quality=50)) // 4
+        image_bytes, info = BudgetEncoder(budget).encode(self.photo)
+        
+        self.assertLessEqual(len(image_bytes), budget)
+        self.assertGreater(len(image_bytes), budget * 0.8)
+        self.assertLess(info["scale"], 1.0)
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            self.assertLess(image.width, self.photo.width)
+    
+    def test_unreachable_budget(self):
+        """下限でも収まらない場合は最も小さい画像を返すこと"""
+        image_bytes, info = BudgetEncoder(100).encode(self.photo)
+        self.assertGreater(info["bytes"], info["budget"])
+        self.assertEqual((info["quality"], info["scale"]), (50, MIN_SCALE))
+    
+    def test_format_label_includes_budget(self):
+        """上限が異なればキャッシュキー用の文字列も異なること"""
+        self.assertNotEqual(BudgetEncoder(1000).format_label, BudgetEncoder(2000).format_label)
+        self.assertNotEqual(BudgetEncoder(1000, "jpg").format_label, BudgetEncoder(1000, "png").format_label)
+
+class TestEncodingStats(unittest.TestCase):
+    """EncodingStatsのテスト"""
+    
+    def test_record(self):
+        """形式ごとのページ数・合計サイズ・削減量を集計すること"""
+        stats = EncodingStats()
+        stats.record({"encoding": ENCODING_JPEG, "bytes": 300, "reference_bytes": 400})
+        stats.record({"encoding": ENCODING_PALETTE, "bytes": 100, "reference_bytes": 500})
+        stats.record({"encoding": ENCODING_PALETTE, "bytes": 50, "reference_bytes": None})
+        
+        self.assertEqual(stats.pages[ENCODING_JPEG], 1)
+        self.assertEqual(stats.pages[ENCODING_PALETTE], 2)
+        self.assertEqual(stats.total_bytes, 450)
+        self.assertEqual(stats.bytes_saved, 500)
+        self.assertIn("削減", stats.summary())
+    
+    def test_record_budget(self):
+        """上限に合わせた品質の最小値・縮小したページ数・上限を超えたページ数を集計すること"""
+        stats = EncodingStats()
+        for quality, scale, size in [(95, 1.0, 900), (60, 1.0, 1000), (50, 0.5, 1200)]:
+            stats.record({
+                "encoding": ENCODING_JPEG, "bytes": size, "reference_bytes": None,
+                "quality": quality, "scale": scale, "budget": 1000
+            })
+        
+        self.assertEqual(stats.page_budget, 1000)
+        self.assertEqual(stats.min_quality, 50)
+        self.assertEqual(stats.scaled_pages, 1)
+        self.assertEqual(stats.over_budget_pages, 1)
+        self.assertIn("縮小 1 ページ", stats.summary())
+    
+    def test_not_measured(self):
+        """削減量を計測していない場合はNoneのままであること"""
+        stats = EncodingStats()
+        stats.record({"encoding": ENCODING_PNG, "bytes": 100, "reference_bytes": None})
+        self.assertIsNone(stats.bytes_saved)
+        self.assertNotIn("削減", stats.summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+ページフィンガープリントのテストモジュール
+"""
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+
+from page_fingerprint import PageFingerprinter, page_fingerprint
+
+
+def create_text_pdf(path, texts, annotate=False):
+    """各ページに指定したテキストを持つPDFを作成する（annotateがTrueの場合は各ページに注釈を追加する）"""
+    document = fitz.open()
+    for text in texts:
+        page = document.new_page()
+        page.insert_text((72, 72), text, fontsize=24)
+        if annotate:
+            page.add_text_annot((36, 36), "メモ")
+    document.save(path)
+    document.close()
+    return path
+
+
+class TestPageFingerprint(unittest.TestCase):
+    """PageFingerprinterクラスのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_same_content_same_fingerprint(self):
+        """同じ内容のページは同じフィンガープリントになること"""
+        path = create_text_pdf(os.path.join(self.temp_dir, "a.pdf"), ["A", "B", "A"])
+        with fitz.open(path) as document:
+            fingerprinter = PageFingerprinter(document)
+            fingerprints = [fingerprinter.fingerprint(i) for i in range(3)]
+        
+        self.assertEqual(fingerprints[0], fingerprints[2])
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+    
+    def test_stable_across_documents(self):
+        """別のファイルでも、変更のないページは同じフィンガープリントになること"""
+        old_path = create_text_pdf(os.path.join(self.temp_dir, "old.pdf"), ["A", "B", "C"])
+        new_path = create_text_pdf(os.path.join(self.temp_dir, "new.pdf"), ["X", "A", "B", "C"])
+        
+        with fitz.open(old_path) as old_document, fitz.open(new_path) as new_document:
+            self.assertEqual(page_fingerprint(old_document, 0), page_fingerprint(new_document, 1))
+            self.assertEqual(page_fingerprint(old_document, 2), page_fingerprint(new_document, 3))
+            self.assertNotEqual(page_fingerprint(old_document, 0), page_fingerprint(new_document, 0))
+    
+    def test_annotated_pages(self):
+        """注釈のあるページでも、ほかのページの変更や計算する順序にフィンガープリントが影響されないこと"""
+        old_path = create_text_pdf(os.path.join(self.temp_dir, "old.pdf"), ["A", "B", "A"], annotate=True)
+        new_path = create_text_pdf(os.path.join(self.temp_dir, "new.pdf"), ["A", "B", "C"], annotate=True)
+        
+        with fitz.open(old_path) as old_document, fitz.open(new_path) as new_document:
+            self.assertEqual(page_fingerprint(old_document, 0), page_fingerprint(new_document, 0))
+            self.assertEqual(page_fingerprint(old_document, 1), page_fingerprint(new_document, 1))
+            self.assertNotEqual(page_fingerprint(old_document, 2), page_fingerprint(new_document, 2))
+            
+            forward = PageFingerprinter(old_document)
+            forward_fingerprints = [forward.fingerprint(i) for i in range(3)]
+            backward = PageFingerprinter(old_document)
+            backward_fingerprints = [backward.fingerprint(i) for i in reversed(range(3))][::-1]
+        
+        self.assertEqual(forward_fingerprints, backward_fingerprints)
+        self.assertEqual(forward_fingerprints[0], forward_fingerprints[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+ページの指定の解釈（page_ranges.py）のテストモジュール
+"""
+import os
+import sys
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from page_ranges import parse_page_ranges, validate_page_ranges
+
+
+class TestParsePageRanges(unittest.TestCase):
+    """ページの指定をページ番号のリストにするテスト"""
+    
+    def test_all_pages(self):
+        """指定がなければすべてのページになること"""
+        self.assertEqual(parse_page_ranges(None, 3), [0, 1, 2])
+        self.assertEqual(parse_page_ranges(" ", 3), [0, 1, 2])
+    
+    def test_ranges_and_steps(self):
+        """範囲・個別のページ・間隔つきの範囲を組み合わせられること"""
+        self.assertEqual(parse_page_ranges("1-3,5,10-20:4", 30), [0, 1, 2, 4, 9, 13, 17])
+        self.assertEqual(parse_page_ranges("8-", 10), [7, 8, 9])
+        self.assertEqual(parse_page_ranges("-2", 10), [0, 1])
+        self.assertEqual(parse_page_ranges(":3", 7), [0, 3, 6])
+        self.assertEqual(parse_page_ranges("-", 2), [0, 1])
+        self.assertEqual(parse_page_ranges(" 2 - 4 : 2 ", 10), [1, 3])
+    
+    def test_order_and_duplicates(self):
+        """指定した順に並び、重複したページは最初の1回だけになること"""
+        self.assertEqual(parse_page_ranges("5,1-3,2", 5), [4, 0, 1, 2])
+        self.assertEqual(parse_page_ranges([3, 1, 3], 5), [2, 0])
+    
+    def test_clamped_to_page_count(self):
+        """範囲の終わりがページ数を超える場合は最後のページまでになること"""
+        self.assertEqual(parse_page_ranges("2-100", 4), [1, 2, 3])
+        with self.assertRaises(ValueError):
+            parse_page_ranges("5", 4)
+        with self.assertRaises(ValueError):
+            parse_page_ranges([5], 4)
+    
+    def test_invalid(self):
+        """書式が正しくない指定ではValueErrorを送出すること"""
+        for spec in ("a", "1,,2", "0", "3-1", "1-5:0", "1-2-3", "1.5"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    validate_page_ranges(spec)
+        with self.assertRaises(ValueError):
+            parse_page_ranges([0], 3)
+        validate_page_ranges(None)
+        validate_page_ranges("1-3,5,10-:2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+"""
+コマンドラインツール（pdf2pptx）のテストモジュール
+"""
+import contextlib
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+
+from pptx import Presentation
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import pdf2pptx_cli
+from pdf2pptx_cli import expand_inputs, main, EXIT_OK, EXIT_FAILED, EXIT_USAGE
+from pdf_converter import PDFConverter
+from tests.test_pdf_converter import create_sample_pdf
+
+
+class TestPdf2PptxCli(unittest.TestCase):
+    """コマンドラインツールのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "output")
+        nested_dir = os.path.join(self.temp_dir, "nested")
+        os.makedirs(nested_dir)
+        self.pdf_paths = [
+            create_sample_pdf(os.path.join(self.temp_dir, "a.pdf"), page_count=2),
+            create_sample_pdf(os.path.join(self.temp_dir, "b.pdf"), page_count=1),
+            create_sample_pdf(os.path.join(nested_dir, "c.pdf"), page_count=1),
+        ]
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _run(self, *args):
+        """ツールを実行し、終了コードと書き出されたイベントのリストを返す"""
+        stream = io.StringIO()
+        exit_code = main(list(args), stream=stream)
+        return exit_code, [json.loads(line) for line in stream.getvalue().splitlines()]
+    
+    def test_expand_inputs(self):
+        """ワイルドカード・フォルダが展開され、重複が取り除かれること"""
+        a, b, c = self.pdf_paths
+        paths, unmatched = expand_inputs([
+            os.path.join(self.temp_dir, "*.pdf"), a, self.temp_dir,
+            os.path.join(self.temp_dir, "**", "c.pdf"), os.path.join(self.temp_dir, "*.xyz")
+        ])
+        self.assertEqual(paths, [a, b, c])
+        self.assertEqual(unmatched, [os.path.join(self.temp_dir, "*.xyz")])
+    
+    def test_convert_events(self):
+        """複数のファイルを変換し、JSON Linesでイベントが書き出されること"""
+        exit_code, events = self._run(
+            os.path.join(self.temp_dir, "*.pdf"), "--dpi", "50", "--jobs", "1",
+            "--no-images", "-o", self.output_dir
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(events[0]["event"], "start")
+        self.assertEqual(events[0]["files"], 2)
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertEqual(events[-1]["succeeded"], 2)
+        self.assertIn("conversion_seconds", events[-1])
+        self.assertTrue(all("time" in event for event in events))
+        
+        statuses = {event["status"] for event in events if event["event"] == "progress"}
+        self.assertTrue({"start", "converting", "complete"} <= statuses)
+        results = [event for event in events if event["event"] == "result"]
+        self.assertEqual([result["file"] for result in results], self.pdf_paths[:2])
+        for result in results:
+            self.assertTrue(result["ok"])
+            self.assertTrue(os.path.exists(result["pptx"]))
+            self.assertIsNone(result["images"])
+            self.assertEqual(os.path.dirname(result["pptx"]), self.output_dir)
+    
+    def test_trace(self):
+        """--traceでPDFごとのトレースが書き出され、結果に段階ごとの時間が含まれること"""
+        trace_dir = os.path.join(self.temp_dir, "traces")
+        exit_code, events = self._run(
+            self.pdf_paths[0], "--dpi", "50", "--jobs", "1", "--no-images", "-o", self.output_dir,
+            "--trace", trace_dir
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        result = next(event for event in events if event["event"] == "result")
+        self.assertIn("save", result["stages"])
+        self.assertEqual(result["totals"]["pages"], 2)
+        
+        base_name = os.path.splitext(os.path.basename(self.pdf_paths[0]))[0]
+        with open(os.path.join(trace_dir, base_name + ".trace.json"), encoding="utf-8") as f:
+            self.assertIn("traceEvents", json.load(f))
+    
+    def test_progress_interval(self):
+        """--progress-interval 0ではページごとの進捗がすべて書き出されること"""
+        exit_code, events = self._run(
+            self.pdf_paths[0], "--dpi", "50", "--jobs", "1", "--no-images", "-o", self.output_dir,
+            "--progress-interval", "0"
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        messages = [event["message"] for event in events if event["event"] == "progress"]
+        self.assertTrue(any("(1/2)" in message for message in messages))
+        self.assertTrue(any("(2/2)" in message for message in messages))
+    
+    def test_single_file_uses_page_workers(self):
+        """ファイルが1つの場合は、--jobsの数のプロセスでページを並列にレンダリングすること"""
+        with unittest.mock.patch.object(
+            PDFConverter, "_render_pages_parallel", autospec=True, side_effect=PDFConverter._render_pages_parallel
+        ) as render_mock:
+            exit_code, events = self._run(self.pdf_paths[0], "--dpi", "50", "--jobs", "2", "-o", self.output_dir)
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(render_mock.call_count, 1)
+        self.assertEqual(render_mock.call_args.args[4], 2)
+    
+    def test_pages(self):
+        """--pagesで選んだページだけが変換され、PDFにないページの指定はそのファイルの失敗になること"""
+        exit_code, events = self._run(
+            self.pdf_paths[0], "--dpi", "50", "--jobs", "1", "--no-images", "-o", self.output_dir,
+            "--pages", "2"
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        self.assertEqual(events[0]["pages"], "2")
+        result = next(event for event in events if event["event"] == "result")
+        self.assertEqual(len(Presentation(result["pptx"]).slides), 1)
+        
+        exit_code, events = self._run(self.pdf_paths[1], "--dpi", "50", "--jobs", "1", "--pages", "2-")
+        self.assertEqual(exit_code, EXIT_FAILED)
+        
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit) as context:
+                self._run(self.pdf_paths[0], "--pages", "3-1")
+        self.assertEqual(context.exception.code, EXIT_USAGE)
+    
+    def test_progressive(self):
+        """--progressiveでは下書きの保存がdraftイベントで通知されること"""
+        exit_code, events = self._run(
+            self.pdf_paths[0], "--dpi", "60", "--jobs", "1", "--no-images", "-o", self.output_dir,
+            "--progressive", "--draft-dpi", "20", "--refine-chunk", "1"
+        )
+        self.assertEqual(exit_code, EXIT_OK)
+        statuses = [event["status"] for event in events if event["event"] == "progress"]
+        self.assertIn("draft", statuses)
+        self.assertLess(statuses.index("draft"), statuses.index("complete"))
+        result = next(event for event in events if event["event"] == "result")
+        self.assertEqual(len(Presentation(result["pptx"]).slides), 2)
+    
+    def test_failed_file(self):
+        """変換に失敗したファイルがあると終了コード1になること"""
+        missing = os.path.join(self.temp_dir, "missing.pdf")
+        exit_code, events = self._run(self.pdf_paths[1], missing, "--dpi", "50", "--jobs", "1")
+        self.assertEqual(exit_code, EXIT_FAILED)
+        results = {event["file"]: event for event in events if event["event"] == "result"}
+        self.assertTrue(results[self.pdf_paths[1]]["ok"])
+        self.assertFalse(results[missing]["ok"])
+        self.assertTrue(results[missing]["error"])
+        self.assertEqual(events[-1]["failed"], 1)
+    
+    def test_no_matching_files(self):
+        """一致するファイルがない場合は終了コード2になること"""
+        exit_code, events = self._run(os.path.join(self.temp_dir, "*.xyz"))
+        self.assertEqual(exit_code, EXIT_USAGE)
+        self.assertEqual([event["event"] for event in events], ["error", "done"])
+    
+    def test_stdout_and_no_tkinter(self):
+        """別プロセスで実行した場合も標準出力がJSON Linesだけになり、tkinterを読み込まないこと"""
+        script = (
+            "import sys, runpy; sys.argv = sys.argv[1:];"
+            "code = 0\n"
+            "try:\n"
+            "    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+            "except SystemExit as e:\n"
+            "    code = e.code\n"
+            "sys.stderr.write('tkinter=%s' % ('tkinter' in sys.modules))\n"
+            "sys.exit(code)\n"
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", script, pdf2pptx_cli.__file__, self.pdf_paths[0],
+             "--dpi", "50", "--jobs", "2", "--no-images", "-o", self.output_dir],
+            capture_output=True, text=True, cwd=SRC_DIR, timeout=120
+        )
+        self.assertEqual(process.returncode, EXIT_OK, process.stderr)
+        events = [json.loads(line) for line in process.stdout.splitlines()]
+        self.assertEqual(events[-1]["event"], "done")
+        self.assertIn("tkinter=False", process.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,17 +2,23 @@
 GUIアプリケーションのテストモジュール
 """
 import os
+import subprocess
 import sys
 import unittest
 import tempfile
+import threading
 from unittest.mock import patch, MagicMock
 
+import fitz  # PyMuPDF
+from pptx import Presentation
+
 # 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # GUIモジュールのインポート
-from pdf2pptx_gui import PDF2PPTXApp, DragDropFrame
+from pdf2pptx_gui import PDF2PPTXApp, DragDropFrame, ConversionQueue, STATUS_REFRESH_MS, parse_drop_data
 from pdf_converter import PDFConverter
+from cancellation import CancellationToken, ConversionCancelled
 
 
 class TestPDF2PPTXGUIFunctions(unittest.TestCase):
@@ -139,6 +145,254 @@ class TestPDF2PPTXGUIFunctions(unittest.TestCase):
         callback_mock.assert_called_once_with(self.test_pdf_path)
 
 
+class TestLazyImport(unittest.TestCase):
+    """変換エンジンの遅延読み込みのテスト"""
+    
+    def test_gui_import_skips_converter(self):
+        """GUIモジュールの読み込みでは変換エンジンのライブラリを読み込まないこと"""
+        src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        script = (
+            "import sys\n"
+            "import pdf2pptx_gui\n"
+            "heavy = ('pdf_converter', 'fitz', 'pptx', 'PIL', 'lxml')\n"
+            "print(','.join(name for name in heavy if name in sys.modules))\n"
+            "converter_class = pdf2pptx_gui.load_converter_class()\n"
+            "print(converter_class.__name__, 'fitz' in sys.modules)\n"
+        )
+        process = subprocess.run(
+            [sys.executable, "-c", script], capture_output=True, text=True, cwd=src_dir, timeout=60
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        lines = [line for line in process.stdout.splitlines() if not line.startswith("warning:")]
+        self.assertEqual(lines, ["", "PDFConverter True"])
+    
+    @patch('pdf2pptx_gui.PDFConverter')
+    def test_converter_created_on_first_use(self, converter_mock):
+        """変換エンジンは最初に使うときに1回だけ作成されること"""
+        app = PDF2PPTXApp.__new__(PDF2PPTXApp)
+        app._converter = None
+        converter_mock.assert_not_called()
+        
+        self.assertIs(app.converter, converter_mock.return_value)
+        self.assertIs(app.converter, converter_mock.return_value)
+        converter_mock.assert_called_once_with()
+
+
+
+class TestCancelConversion(unittest.TestCase):
+    """変換のキャンセルのテスト"""
+    
+    def setUp(self):
+        """ウィンドウを作成せずに、変換中の状態のアプリケーションを用意する"""
+        self.app = PDF2PPTXApp.__new__(PDF2PPTXApp)
+        self.app.conversion_in_progress = True
+        self.app.cancel_token = CancellationToken()
+        self.app.close_requested = False
+        self.app.pdf_path = "test.pdf"
+        self.app.output_folder = None
+        for name in ("cancel_btn", "convert_btn", "pdf_btn", "output_btn", "clear_btn", "jobs_spinbox",
+                     "pages_entry", "progressive_check", "status_label", "progress", "queue_tree"):
+            setattr(self.app, name, MagicMock())
+        self.app.queue = ConversionQueue()
+        self.app._pending_status = None
+        self.app._pending_files = {}
+        self.app._status_scheduled = False
+        self.app._status_lock = threading.Lock()
+        # after(delay, func)はその場で実行する
+        self.app.after = lambda delay, func: func()
+        self.app.quit = MagicMock()
+    
+    def test_cancel_button(self):
+        """キャンセルボタンでトークンがキャンセルされ、ボタンが無効になること"""
+        token = self.app.cancel_token
+        self.app._cancel_conversion()
+        self.assertTrue(token.cancelled)
+        self.app.cancel_btn.config.assert_called_with(state="disabled")
+    
+    @patch('pdf2pptx_gui.messagebox')
+    def test_cancelled_conversion(self, messagebox_mock):
+        """キャンセルされた変換はエラーとして表示せず、UIを元に戻すこと"""
+        converter = MagicMock()
+        converter.convert_pdf_to_pptx.side_effect = ConversionCancelled()
+        self.app._converter = converter
+        token = self.app.cancel_token
+        
+        self.app._convert_pdf_thread()
+        
+        self.assertIs(converter.convert_pdf_to_pptx.call_args[0][3], token)
+        messagebox_mock.showerror.assert_not_called()
+        self.assertFalse(self.app.conversion_in_progress)
+        self.app.quit.assert_not_called()
+    
+    @patch('pdf2pptx_gui.messagebox')
+    def test_close_waits_for_cleanup(self, messagebox_mock):
+        """変換中に閉じると変換をキャンセルし、変換の終了後に終了すること"""
+        messagebox_mock.askyesno.return_value = True
+        token = self.app.cancel_token
+        self.app._on_close()
+        self.assertTrue(token.cancelled)
+        self.app.quit.assert_not_called()
+        
+        self.app._reset_ui()
+        self.app.quit.assert_called_once_with()
+
+
+
+class TestProgressCoalescing(unittest.TestCase):
+    """進捗の表示の更新をまとめるテスト"""
+    
+    def setUp(self):
+        """ウィンドウを作成せずにアプリケーションを用意し、予約された処理を記録する"""
+        self.app = PDF2PPTXApp.__new__(PDF2PPTXApp)
+        self.app._pending_status = None
+        self.app._status_scheduled = False
+        self.app._status_lock = threading.Lock()
+        self.app._pending_files = {}
+        self.app.queue = ConversionQueue()
+        self.app.status_label = MagicMock()
+        self.app.progress = {}
+        self.scheduled = []
+        self.app.after = lambda delay, func: self.scheduled.append((delay, func))
+    
+    def test_latest_status_is_shown(self):
+        """連続した通知では表示の更新が1回だけ予約され、最新の状態が表示されること"""
+        for page in range(1, 101):
+            self.app._update_progress("変換中", f"変換しています ({page}/100)", page)
+        self.app._update_progress("変換中", "重複ページを省略しました", None)
+        
+        self.assertEqual(len(self.scheduled), 1)
+        delay, flush = self.scheduled[0]
+        self.assertEqual(delay, STATUS_REFRESH_MS)
+        flush()
+        self.app.status_label.config.assert_called_once_with(text="重複ページを省略しました")
+        self.assertEqual(self.app.progress["value"], 100)
+        
+        # 表示した後の通知では、再び更新が予約されること
+        self.app._update_progress("完了", "変換が完了しました", 100)
+        self.assertEqual(len(self.scheduled), 2)
+
+
+
+class TestConversionQueue(unittest.TestCase):
+    """複数のファイルの変換キューのテスト"""
+    
+    def setUp(self):
+        """ウィンドウを作成せずにアプリケーションを用意する（after(delay, func)はその場で実行する）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_paths = []
+        for name in ("a.pdf", "b b.pdf", "c.pdf"):
+            path = os.path.join(self.temp_dir, name)
+            document = fitz.open()
+            for i in range(2):
+                document.new_page().insert_text((72, 72), f"{name} {i + 1}", fontsize=24)
+            document.save(path)
+            document.close()
+            self.pdf_paths.append(path)
+        
+        self.app = PDF2PPTXApp.__new__(PDF2PPTXApp)
+        self.app.conversion_in_progress = False
+        self.app.cancel_token = None
+        self.app.close_requested = False
+        self.app.pdf_path = None
+        self.app.output_folder = None
+        self.app.queue = ConversionQueue()
+        self.app._converter = None
+        self.app._pending_status = None
+        self.app._pending_files = {}
+        self.app._status_scheduled = False
+        self.app._status_lock = threading.Lock()
+        for name in ("cancel_btn", "convert_btn", "pdf_btn", "output_btn", "clear_btn", "jobs_spinbox",
+                     "pages_entry", "progressive_check", "status_label", "progress", "queue_tree", "pdf_label", "jobs_var"):
+            setattr(self.app, name, MagicMock())
+        self.app.pages_var = MagicMock()
+        self.app.pages_var.get.return_value = ""
+        self.app.progressive_var = MagicMock()
+        self.app.progressive_var.get.return_value = False
+        self.app.queue_tree.exists.return_value = False
+        self.app.after = lambda delay, func: func()
+        self.app.quit = MagicMock()
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_parse_drop_data(self):
+        """空白を含むパスを{}や引用符で囲んだ複数のファイルを取り出せること"""
+        self.assertEqual(
+            parse_drop_data('{C:/my docs/a.pdf} C:/b.pdf "/x y/c.pdf"'),
+            ["C:/my docs/a.pdf", "C:/b.pdf", "/x y/c.pdf"]
+        )
+    
+    @patch('pdf2pptx_gui.messagebox')
+    def test_multi_file_drop(self, messagebox_mock):
+        """複数のファイルのドロップでPDFだけがキューに追加されること"""
+        frame = DragDropFrame.__new__(DragDropFrame)
+        frame.on_drop_callback = self.app._on_file_drop
+        event = MagicMock()
+        event.data = " ".join(
+            "{" + path + "}" if " " in path else path for path in self.pdf_paths + ["notes.txt"]
+        )
+        frame._on_drop(event)
+        frame._on_drop(event)  # 同じファイルは重複して追加しない
+        
+        self.assertEqual(self.app.queue.paths, self.pdf_paths)
+        rows = {call.kwargs["iid"] for call in self.app.queue_tree.insert.call_args_list}
+        self.assertEqual(len(rows), 3)
+        self.app.pdf_label.config.assert_called_with(text="選択されたファイル: 3個")
+        self.app.convert_btn.config.assert_called_with(state="normal")
+        messagebox_mock.showwarning.assert_not_called()
+    
+    def test_queue_updates(self):
+        """進捗・経過時間が反映され、完了後に遅れて届いた進捗は無視されること"""
+        queue = ConversionQueue()
+        queue.add(self.pdf_paths[0])
+        self.assertIsNone(queue.update("other.pdf", "変換中", "", 10))
+        queue.update(self.pdf_paths[0], "開始", "", 0, now=10.0)
+        item = queue.update(self.pdf_paths[0], "変換中", "", 40, now=12.5)
+        self.assertEqual((item.status, item.progress, item.elapsed), ("変換中", 40, 2.5))
+        
+        queue.finish(self.pdf_paths[0], True, "a.pptx", elapsed=3.0)
+        self.assertIsNone(queue.update(self.pdf_paths[0], "変換中", "", 50))
+        self.assertEqual((item.status, item.progress, item.result), ("完了", 100.0, "a.pptx"))
+        self.assertTrue(queue.finished)
+    
+    @patch('pdf2pptx_gui.messagebox')
+    def test_convert_queue(self, messagebox_mock):
+        """キューの複数のファイルが同時に変換され、ファイルごとの結果が一覧に反映されること"""
+        converter = PDFConverter()
+        converter.dpi = 50
+        converter.in_memory = True
+        converter.save_images = False
+        self.app._converter = converter
+        self.app.output_folder = os.path.join(self.temp_dir, "output")
+        os.makedirs(self.app.output_folder)
+        missing = os.path.join(self.temp_dir, "missing.pdf")
+        self.app._on_file_drop(*self.pdf_paths)
+        self.app.jobs_var.get.return_value = 2
+        self.app.pages_var.get.return_value = " 1 "
+        
+        # 変換のスレッドを作成する代わりに、同じ引数でその場で実行する
+        with patch('pdf2pptx_gui.threading.Thread') as thread_mock:
+            self.app._start_conversion()
+        target, args = thread_mock.call_args[1]["target"], thread_mock.call_args[1]["args"]
+        self.assertEqual(target, self.app._convert_queue_thread)
+        self.assertEqual(args, (self.pdf_paths, 2, "1", False))
+        
+        # 存在しないファイルを加えても、そのファイルだけがエラーになり残りは変換されること
+        self.app.queue.add(missing)
+        target(self.app.queue.paths, 2, "1")
+        
+        self.assertTrue(all(item.finished for item in self.app.queue.items))
+        self.assertEqual([item.status for item in self.app.queue.items], ["完了", "完了", "完了", "エラー"])
+        self.assertEqual(self.app.queue.items[1].result, "b b.pptx")
+        self.assertGreater(self.app.queue.items[0].elapsed, 0)
+        self.assertEqual(sorted(os.listdir(self.app.output_folder)), ["a.pptx", "b b.pptx", "c.pptx"])
+        self.assertEqual(len(Presentation(os.path.join(self.app.output_folder, "a.pptx")).slides), 1)
+        messagebox_mock.showwarning.assert_called_once()
+        self.assertFalse(self.app.conversion_in_progress)
+
+
 def manual_full_test():
     """手動でのフルテスト（実際のGUIを表示）"""
     from pdf2pptx_gui import main
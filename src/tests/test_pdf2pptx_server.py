@@ -0,0 +1,221 @@
+"""
+変換サーバー（pdf2pptx_server.py）のテストモジュール
+"""
+import http.client
+import io
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+
+from pdf2pptx_server import ConversionServer, ConversionService
+from tests.test_pdf_converter import create_sample_pdf
+
+
+class TestConversionServer(unittest.TestCase):
+    """HTTPでの変換・進捗の配信・キャンセルのテスト"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """ワーカープロセスを準備してサーバーを起動する（テストクラスで共有する）"""
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.service = ConversionService(workers=1)
+        cls.service.converter.dpi = 30
+        cls.service.start()
+        cls.server = ConversionServer(("127.0.0.1", 0), cls.service, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.daemon = True
+        cls.thread.start()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """サーバーとワーカープロセスを終了する"""
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.service.close()
+        shutil.rmtree(cls.temp_dir)
+    
+    def _pdf_data(self, page_count=2):
+        """テスト用のPDFの内容を返す"""
+        path = create_sample_pdf(os.path.join(self.temp_dir, f"sample-{page_count}.pdf"), page_count=page_count)
+        with open(path, "rb") as f:
+            return f.read()
+    
+    def _request(self, method, path, body=None):
+        """リクエストを送り、(ステータスコード, ヘッダー, 本文) を返す"""
+        connection = http.client.HTTPConnection(*self.server.server_address[:2], timeout=60)
+        try:
+            connection.request(method, path, body=body)
+            response = connection.getresponse()
+            return response.status, response.headers, response.read()
+        finally:
+            connection.close()
+    
+    def _wait_done(self, job_id, timeout=60):
+        """ジョブが終わるまで待ち、最後の状態を返す"""
+        deadline = time.monotonic() + timeout
+        while True:
+            _, _, body = self._request("GET", f"/jobs/{job_id}")
+            job = json.loads(body)
+            if job["status"] in ("complete", "error", "cancelled") or time.monotonic() > deadline:
+                return job
+            time.sleep(0.05)
+    
+    def test_job_lifecycle(self):
+        """登録したジョブの進捗を最後まで受信し、PPTXを取得・削除できること"""
+        status, headers, body = self._request("POST", "/jobs?name=%E8%B3%87%E6%96%99.pdf", self._pdf_data(3))
+        self.assertEqual(status, 202)
+        job = json.loads(body)
+        self.assertEqual(job["name"], "資料.pdf")
+        self.assertEqual(headers["Location"], f"/jobs/{job['id']}")
+        
+        status, headers, body = self._request("GET", f"/jobs/{job['id']}/events")
+        self.assertEqual(status, 200)
+        events = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(events[0]["status"], "start")
+        self.assertEqual(events[-1]["event"], "result")
+        self.assertEqual(events[-1]["status"], "complete")
+        self.assertEqual(sum(1 for event in events if event["event"] == "result"), 1)
+        
+        status, headers, body = self._request("GET", f"/jobs/{job['id']}/result")
+        self.assertEqual(status, 200)
+        self.assertIn("%E8%B3%87%E6%96%99.pptx", headers["Content-Disposition"])
+        self.assertEqual(len(Presentation(io.BytesIO(body)).slides), 3)
+        
+        status, _, _ = self._request("DELETE", f"/jobs/{job['id']}")
+        self.assertEqual(status, 202)
+        self.assertEqual(self._request("GET", f"/jobs/{job['id']}")[0], 404)
+    
+    def test_convert(self):
+        """/convertでは変換したPPTXがそのまま返り、ジョブは残らないこと（pagesで選んだページだけを変換できること）"""
+        status, headers, body = self._request("POST", "/convert?dpi=20&format=png", self._pdf_data(2))
+        self.assertEqual(status, 200)
+        self.assertEqual(len(Presentation(io.BytesIO(body)).slides), 2)
+        self.assertIn("document.pptx", headers["Content-Disposition"])
+        
+        status, _, body = self._request("POST", "/convert?pages=3,1", self._pdf_data(3))
+        self.assertEqual(status, 200)
+        self.assertEqual(len(Presentation(io.BytesIO(body)).slides), 2)
+        _, _, body = self._request("GET", "/jobs")
+        self.assertEqual(json.loads(body)["jobs"], [])
+    
+    def test_progressive(self):
+        """段階的な変換では、下書きの保存後は変換の途中でもその時点のPPTXを取得できること"""
+        _, _, body = self._request("POST", "/jobs?progressive=1&dpi=150", self._pdf_data(40))
+        job = json.loads(body)
+        deadline = time.monotonic() + 60
+        while job["draft"] is None and job["status"] != "complete" and time.monotonic() < deadline:
+            time.sleep(0.02)
+            job = json.loads(self._request("GET", f"/jobs/{job['id']}")[2])
+        self.assertIn(job["status"], ("draft", "converting", "saving", "complete"))
+        if job["draft"] is not None:
+            status, _, body = self._request("GET", job["draft"])
+            self.assertEqual(status, 200)
+            self.assertEqual(len(Presentation(io.BytesIO(body)).slides), 40)
+        
+        status, _, body = self._request("GET", f"/jobs/{job['id']}/events")
+        statuses = [json.loads(line)["status"] for line in body.splitlines()]
+        self.assertLess(statuses.index("draft"), statuses.index("complete"))
+        status, _, body = self._request("GET", f"/jobs/{job['id']}/result")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(Presentation(io.BytesIO(body)).slides), 40)
+        self._request("DELETE", f"/jobs/{job['id']}")
+    
+    def test_invalid_requests(self):
+        """不正なリクエストには原因に応じたステータスコードとエラーメッセージが返ること"""
+        self.assertEqual(self._request("POST", "/jobs", b"not a pdf")[0], 415)
+        self.assertEqual(self._request("POST", "/jobs?dpi=0", self._pdf_data())[0], 400)
+        self.assertEqual(self._request("POST", "/jobs?format=gif", self._pdf_data())[0], 400)
+        self.assertEqual(self._request("POST", "/jobs?pages=2-1", self._pdf_data())[0], 400)
+        self.assertEqual(self._request("POST", "/jobs?progressive=yes", self._pdf_data())[0], 400)
+        self.assertEqual(self._request("GET", "/convert")[0], 405)
+        self.assertEqual(self._request("GET", "/unknown")[0], 404)
+        self.assertEqual(self._request("GET", "/jobs/missing/result")[0], 404)
+        
+        status, _, body = self._request("POST", "/convert", b"%PDF-1.7 broken")
+        self.assertEqual(status, 422)
+        self.assertIn("PDF変換エラー", json.loads(body)["error"])
+    
+    def test_cancel(self):
+        """変換中・順番待ちのジョブをキャンセルでき、結果は取得できないこと"""
+        _, _, body = self._request("POST", "/jobs", self._pdf_data(200))
+        running = json.loads(body)
+        _, _, body = self._request("POST", "/jobs", self._pdf_data(2))
+        queued = json.loads(body)
+        self.assertEqual(queued["status"], "queued")
+        
+        _, _, body = self._request("GET", "/health")
+        self.assertEqual(json.loads(body)["workers"], 1)
+        
+        for job in (queued, running):
+            self.service.cancel(job["id"])
+            self.assertEqual(self._wait_done(job["id"])["status"], "cancelled")
+            status, _, body = self._request("GET", f"/jobs/{job['id']}/result")
+            self.assertEqual(status, 410)
+            self._request("DELETE", f"/jobs/{job['id']}")
+    
+    def test_convert_client_disconnect(self):
+        """/convertのクライアントが切断すると、変換を中断してジョブを削除すること"""
+        data = self._pdf_data(200)
+        connection = socket.create_connection(self.server.server_address[:2])
+        connection.sendall(
+            f"POST /convert HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(data)}\r\n\r\n".encode("ascii")
+            + data
+        )
+        deadline = time.monotonic() + 60
+        while not self.service.jobs() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        job = self.service.jobs()[0]
+        connection.close()
+        
+        self.assertTrue(job.wait(30))
+        self.assertEqual(job.status, "cancelled")
+        # ジョブは一覧から外してから作業フォルダを削除するため、両方を待つ
+        while (self.service.get(job.id) is not None or os.path.exists(job.work_dir)) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertIsNone(self.service.get(job.id))
+        self.assertFalse(os.path.exists(job.work_dir))
+
+
+class TestConversionServiceExpiry(unittest.TestCase):
+    """終了したジョブの定期的な削除のテスト"""
+    
+    def setUp(self):
+        """保持する時間の短いサービスを起動する"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.service = ConversionService(workers=1, result_ttl=0.2)
+        self.service.converter.dpi = 30
+        self.service.start()
+    
+    def tearDown(self):
+        """サービスを終了する"""
+        self.service.close()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_expire_without_new_jobs(self):
+        """新しいジョブの登録がなくても、保持する時間を過ぎたジョブと作業フォルダが削除されること"""
+        path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=2)
+        with open(path, "rb") as f:
+            job = self.service.submit(f.read(), "sample.pdf")
+        self.assertTrue(job.wait(60))
+        self.assertEqual(job.status, "complete")
+        
+        deadline = time.monotonic() + 10
+        while (self.service.get(job.id) is not None or os.path.exists(job.work_dir)) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertIsNone(self.service.get(job.id))
+        self.assertFalse(os.path.exists(job.work_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
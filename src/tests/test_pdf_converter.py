@@ -1,16 +1,38 @@
 """
 PDFコンバーターのテストモジュール
 """
+import io
+import json
 import os
 import sys
 import unittest
+import unittest.mock
 import tempfile
 import shutil
+import zipfile
 
 # 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from pdf_converter import PDFConverter
+import fitz  # PyMuPDF
+
+from pptx import Presentation
+from PIL import Image
+
+import pdf_converter
+from pdf_converter import PDFConverter, ConversionResult, CancellationToken, ConversionCancelled
+from tests.test_image_encoder import create_photo_stream
+
+
+def create_sample_pdf(path, page_count=3, page_size=(595, 842)):
+    """テスト用に実際のPDFファイルを作成する"""
+    document = fitz.open()
+    for i in range(page_count):
+        page = document.new_page(width=page_size[0], height=page_size[1])
+        page.insert_text((72, 72), f"Page {i + 1}", fontsize=24)
+    document.save(path)
+    document.close()
+    return path
 
 
 class TestPDFConverter(unittest.TestCase):
@@ -37,6 +59,8 @@ class TestPDFConverter(unittest.TestCase):
         self.assertIsNone(self.converter.output_folder)
         self.assertEqual(self.converter.image_format, "jpg")
         self.assertEqual(self.converter.dpi, 300)
+        self.assertFalse(self.converter.in_memory)
+        self.assertTrue(self.converter.save_images)
     
     def test_setup_temp_folder(self):
         """一時フォルダ設定のテスト"""
@@ -68,6 +92,1279 @@ class TestPDFConverter(unittest.TestCase):
             self.converter.convert_pdf_to_pptx(non_existent_file)
 
 
+class TestParallelRendering(unittest.TestCase):
+    """並列レンダリングのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=5)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.converter._cleanup_temp_folder()
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_default_workers(self):
+        """既定では逐次処理であること"""
+        self.assertEqual(self.converter.workers, 1)
+    
+    def test_resolve_workers(self):
+        """ワーカー数がページ数とCPUコア数で制限されること"""
+        self.converter.workers = 8
+        self.assertEqual(self.converter._resolve_workers(3), 3)
+        self.converter.workers = 0
+        self.assertGreaterEqual(self.converter._resolve_workers(100), 1)
+    
+    def test_parallel_render_keeps_page_order(self):
+        """並列レンダリングでもページ順に画像が返ること"""
+        self.converter.workers = 2
+        self.converter._setup_temp_folder(self.pdf_path)
+        
+        progress_counts = []
+        
+        def callback(status, message, progress=None):
+            progress_counts.append(message)
+        
+        image_files = self.converter._convert_pdf_to_images(self.pdf_path, callback)
+        
+        self.assertEqual(
+            [os.path.basename(path) for path in image_files],
+            [f"page_{i:03d}.jpg" for i in range(1, 6)]
+        )
+        for path in image_files:
+            self.assertTrue(os.path.exists(path))
+        # 最後の通知は全ページ完了を示すこと
+        self.assertIn("(5/5)", progress_counts[-1])
+    
+    def test_parallel_conversion_creates_pptx(self):
+        """並列モードで変換全体が完了すること"""
+        self.converter.workers = 2
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(
+            self.pdf_path, output_folder=self.temp_dir
+        )
+        self.assertTrue(os.path.exists(pptx_path))
+        self.assertEqual(len(os.listdir(images_folder)), 5)
+
+
+class TestInMemoryConversion(unittest.TestCase):
+    """一時フォルダを使わないメモリ上での変換のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=3)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.in_memory = True
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_in_memory_without_images(self):
+        """画像フォルダを書き出さずにPPTXが作成されること"""
+        self.converter.save_images = False
+        
+        with unittest.mock.patch.object(
+            self.converter, "_setup_temp_folder", side_effect=AssertionError("一時フォルダは不要")
+        ):
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(
+                self.pdf_path, output_folder=self.temp_dir
+            )
+        
+        self.assertIsNone(images_folder)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, "sample_images")))
+        
+        prs = Presentation(pptx_path)
+        self.assertEqual(len(prs.slides), 3)
+    
+    def test_in_memory_matches_file_based_slide_size(self):
+        """メモリ上の変換でもファイル経由と同じスライドサイズになること"""
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(
+            self.pdf_path, output_folder=self.temp_dir
+        )
+        self.assertEqual(len(os.listdir(images_folder)), 3)
+        in_memory_size = (Presentation(pptx_path).slide_width, Presentation(pptx_path).slide_height)
+        
+        self.converter.in_memory = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path, output_folder=self.temp_dir)
+        prs = Presentation(pptx_path)
+        self.assertEqual(in_memory_size, (prs.slide_width, prs.slide_height))
+    
+    def test_file_based_without_images(self):
+        """ファイル経由の変換でも画像フォルダを省略できること"""
+        self.converter.in_memory = False
+        self.converter.save_images = False
+        _, images_folder = self.converter.convert_pdf_to_pptx(
+            self.pdf_path, output_folder=self.temp_dir
+        )
+        self.assertIsNone(images_folder)
+
+
+class TestPipelineConversion(unittest.TestCase):
+    """レンダリングとスライド追加を重ねるパイプライン処理のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=6)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.save_images = False
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _slide_image_blobs(self, pptx_path):
+        """各スライドに配置された画像のバイト列をスライド順に取得する"""
+        prs = Presentation(pptx_path)
+        return [slide.shapes[0].image.blob for slide in prs.slides]
+    
+    def test_pipeline_matches_sequential(self):
+        """パイプライン処理でもページ順・内容が逐次処理と一致すること"""
+        self.converter.in_memory = True
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path, output_folder=self.temp_dir)
+        expected = self._slide_image_blobs(pptx_path)
+        
+        self.converter.in_memory = False
+        self.converter.pipeline = True
+        self.converter.workers = 2
+        self.converter.pipeline_depth = 2
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path, output_folder=self.temp_dir)
+        
+        self.assertEqual(self._slide_image_blobs(pptx_path), expected)
+    
+    def test_pipeline_progress_reaches_all_pages(self):
+        """パイプライン処理の進捗が全ページ分通知されること"""
+        self.converter.pipeline = True
+        messages = []
+        
+        def callback(status, message, progress=None):
+            messages.append(message)
+        
+        self.converter.convert_pdf_to_pptx(
+            self.pdf_path, output_folder=self.temp_dir, callback=callback
+        )
+        self.assertTrue(any("(6/6)" in message for message in messages))
+
+
+class TestConvertMany(unittest.TestCase):
+    """複数ファイルの一括変換のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "output")
+        os.makedirs(self.output_dir)
+        self.pdf_paths = [
+            create_sample_pdf(os.path.join(self.temp_dir, f"doc{i}.pdf"), page_count=i + 1)
+            for i in range(3)
+        ]
+        # 変換できないファイルを1つ混ぜる
+        self.broken_pdf = os.path.join(self.temp_dir, "broken.pdf")
+        with open(self.broken_pdf, "w") as f:
+            f.write("PDF test file (not a real PDF)")
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _check_results(self, results, paths):
+        """結果が入力順に並び、壊れたファイルだけが失敗していること"""
+        self.assertEqual([result.pdf_path for result in results], paths)
+        for result in results:
+            self.assertIsInstance(result, ConversionResult)
+            if result.pdf_path == self.broken_pdf:
+                self.assertFalse(result.succeeded)
+                self.assertIsNone(result.pptx_path)
+            else:
+                self.assertTrue(result.succeeded, result.error)
+                self.assertTrue(os.path.exists(result.pptx_path))
+                self.assertEqual(result.metrics["pdf_path"], result.pdf_path)
+    
+    def test_convert_many_parallel(self):
+        """複数プロセスで変換し、失敗したファイルがあっても継続すること"""
+        paths = [self.pdf_paths[0], self.broken_pdf] + self.pdf_paths[1:]
+        file_events = []
+        overall = []
+        
+        results = self.converter.convert_many(
+            paths, output_folder=self.output_dir, jobs=2,
+            callback=lambda status, message, progress=None: overall.append(progress),
+            file_callback=lambda path, status, message, progress=None: file_events.append(path)
+        )
+        
+        self._check_results(results, paths)
+        self.assertEqual(overall[-1], 100)
+        self.assertEqual(set(file_events), set(paths))
+        # インスタンスの作業状態は変更されないこと
+        self.assertIsNone(self.converter.temp_folder)
+        self.assertIsNone(self.converter.output_folder)
+    
+    def test_convert_many_sequential(self):
+        """jobs=1では同じプロセス内で順番に変換すること"""
+        paths = self.pdf_paths + [self.broken_pdf]
+        results = self.converter.convert_many(paths, output_folder=self.output_dir, jobs=1)
+        self._check_results(results, paths)
+
+
+class TestIncrementalUpdate(unittest.TestCase):
+    """既存PPTXの差分更新のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.save_images = False
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _write_pdf(self, texts, annotate=False):
+        """各ページに指定したテキストを持つPDFを作成する（annotateがTrueの場合は各ページに注釈を追加する）"""
+        document = fitz.open()
+        for text in texts:
+            page = document.new_page()
+            page.insert_text((72, 72), text, fontsize=24)
+            if annotate:
+                page.add_text_annot((36, 36), "メモ")
+        document.save(self.pdf_path)
+        document.close()
+    
+    def _slide_blobs(self, pptx_path):
+        """各スライドの画像をスライド順に取得する"""
+        return [slide.shapes[0].image.blob for slide in Presentation(pptx_path).slides]
+    
+    def test_first_update_is_full_conversion(self):
+        """既存のPPTXがない場合は通常の変換になること"""
+        self._write_pdf(["A", "B"])
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertTrue(summary["full"])
+        self.assertEqual(len(Presentation(pptx_path).slides), 2)
+    
+    def test_only_changed_pages_rendered(self):
+        """変更・追加されたページだけがレンダリングされ、結果が通常の変換と一致すること"""
+        self._write_pdf(["A", "B", "C", "D"])
+        self.converter.update_pptx(self.pdf_path)
+        
+        # Bを変更、Cを削除、Eを追加、Dを先頭に移動
+        self._write_pdf(["D", "A", "B2", "E"])
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        
+        self.assertFalse(summary["full"])
+        self.assertEqual(summary["rendered"], 2)
+        self.assertEqual(summary["reused"], 2)
+        self.assertEqual(summary["removed"], 0)
+        updated = self._slide_blobs(pptx_path)
+        
+        # 通常の変換結果と比較する
+        expected_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(updated, self._slide_blobs(expected_path))
+    
+    def test_removed_pages(self):
+        """削除されたページのスライドが取り除かれること"""
+        self._write_pdf(["A", "B", "C"])
+        self.converter.update_pptx(self.pdf_path)
+        
+        self._write_pdf(["A", "C"])
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        
+        self.assertEqual((summary["rendered"], summary["removed"]), (0, 1))
+        self.assertEqual(len(Presentation(pptx_path).slides), 2)
+    
+    def test_existing_pptx_without_keys(self):
+        """ページのキーのない既存のPPTXは、通常の変換で置き換えられること"""
+        self._write_pdf(["A", "B"])
+        self.converter.in_memory = True
+        self.converter.convert_pdf_to_pptx(self.pdf_path)
+        
+        self._write_pdf(["A", "B", "C"])
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertTrue(summary["full"])
+        self.assertEqual(len(Presentation(pptx_path).slides), 3)
+    
+    def test_slide_size_changed(self):
+        """解像度を変えてスライドサイズが変わる場合は、通常の変換で置き換えられること"""
+        self._write_pdf(["A", "B"])
+        self.converter.update_pptx(self.pdf_path)
+        
+        self.converter.dpi = 96
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertTrue(summary["full"])
+        expected_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(self._slide_blobs(pptx_path), self._slide_blobs(expected_path))
+    
+    def test_annotated_pages(self):
+        """注釈のあるPDFでも、変更されたページだけがレンダリングされること"""
+        texts = [f"Page {i}" for i in range(1, 11)]
+        self._write_pdf(texts, annotate=True)
+        self.converter.update_pptx(self.pdf_path)
+        
+        self._write_pdf(texts[:-1] + ["Page 10 (edited)"], annotate=True)
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertEqual((summary["rendered"], summary["reused"]), (1, 9))
+        
+        # ページの指定を変えても、変更のないページは再利用されること
+        self.converter.pages = "2-10"
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertEqual((summary["rendered"], summary["reused"], summary["removed"]), (0, 9, 1))
+
+
+class TestDuplicatePages(unittest.TestCase):
+    """重複ページの検出とレンダリング省略のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "handout.pdf")
+        document = fitz.open()
+        for text in ["Cover", "", "Body", "", "Cover", ""]:
+            page = document.new_page()
+            if text:
+                page.insert_text((72, 72), text, fontsize=24)
+        document.save(self.pdf_path)
+        document.close()
+        
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.deduplicate_pages = True
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _media_parts(self, pptx_path):
+        """PPTX内の画像パートの一覧"""
+        with zipfile.ZipFile(pptx_path) as package:
+            return [name for name in package.namelist() if name.startswith("ppt/media/")]
+    
+    def _check_output(self, pptx_path, images_folder=None):
+        """重複ページが1つの画像を共有していること"""
+        self.assertEqual(self.converter.renders_avoided, 3)
+        prs = Presentation(pptx_path)
+        self.assertEqual(len(prs.slides), 6)
+        self.assertEqual(len(self._media_parts(pptx_path)), 3)
+        if images_folder:
+            self.assertEqual(len(os.listdir(images_folder)), 6)
+    
+    def test_file_based(self):
+        """一時フォルダ経由の変換で重複ページがレンダリングされないこと"""
+        with unittest.mock.patch(
+            "pdf_converter._render_page_to_file", wraps=pdf_converter._render_page_to_file
+        ) as render_mock:
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(render_mock.call_count, 3)
+        self._check_output(pptx_path, images_folder)
+    
+    def test_in_memory(self):
+        """メモリ上の変換で重複ページがレンダリングされないこと"""
+        self.converter.in_memory = True
+        with unittest.mock.patch(
+            "pdf_converter._render_page_to_bytes", wraps=pdf_converter._render_page_to_bytes
+        ) as render_mock:
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(render_mock.call_count, 3)
+        self._check_output(pptx_path, images_folder)
+    
+    def test_streaming_writer_shares_media(self):
+        """ストリーミング書き出しでも重複ページが画像を共有すること"""
+        self.converter.streaming_writer = True
+        self.converter.workers = 2
+        self.converter.save_images = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self._check_output(pptx_path)
+    
+    def test_disabled_by_default(self):
+        """既定では重複ページの検出を行わないこと"""
+        converter = PDFConverter()
+        converter.dpi = 72
+        converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(converter.renders_avoided, 0)
+    
+    def test_annotated_pages(self):
+        """注釈のある同じ内容のページも重複として検出されること"""
+        document = fitz.open()
+        for text in ["Cover", "Body", "Cover", "Body"]:
+            page = document.new_page()
+            page.insert_text((72, 72), text, fontsize=24)
+            page.add_text_annot((36, 36), "メモ")
+        document.save(self.pdf_path)
+        document.close()
+        
+        self.converter.in_memory = True
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(self.converter.renders_avoided, 2)
+        self.assertEqual(len(self._media_parts(pptx_path)), 2)
+
+
+class TestAdaptiveEncoding(unittest.TestCase):
+    """ページごとの画像形式の自動選択のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "mixed.pdf")
+        document = fitz.open()
+        document.new_page().insert_text((72, 72), "Text page", fontsize=24)
+        photo_page = document.new_page()
+        photo_page.insert_image(photo_page.rect, stream=create_photo_stream())
+        document.save(self.pdf_path)
+        document.close()
+        
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.image_format = "auto"
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _check_output(self, pptx_path, images_folder):
+        """文字のページはPNG、写真のページはJPEGで保存されていること"""
+        self.assertEqual(len(Presentation(pptx_path).slides), 2)
+        self.assertEqual(sorted(os.listdir(images_folder)), ["page_001.png", "page_002.jpg"])
+        self.assertEqual(self.converter.encoding_stats.pages, {"jpeg": 1, "png": 0, "png8": 1})
+    
+    def test_file_based(self):
+        """一時フォルダ経由の変換でページごとに形式が選択されること"""
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+    
+    def test_in_memory(self):
+        """メモリ上の変換でページごとに形式が選択されること"""
+        self.converter.in_memory = True
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+    
+    def test_parallel(self):
+        """ワーカープロセスでエンコードした結果も集計されること"""
+        self.converter.workers = 2
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+    
+    def test_measure_savings(self):
+        """固定のjpgと比べた削減量を計測して通知すること"""
+        self.converter.measure_encoding_savings = True
+        messages = []
+        self.converter.convert_pdf_to_pptx(
+            self.pdf_path, callback=lambda status, message, progress=None: messages.append(message)
+        )
+        self.assertGreater(self.converter.encoding_stats.bytes_saved, 0)
+        self.assertTrue(any("削減" in message for message in messages))
+    
+    def test_fixed_format_has_no_stats(self):
+        """固定の画像形式では集計を行わないこと"""
+        self.converter.image_format = "jpg"
+        self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertIsNone(self.converter.encoding_stats)
+
+
+
+class TestVectorSlides(unittest.TestCase):
+    """ページをSVG画像として配置するベクターモードのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=3)
+        self.converter = PDFConverter()
+        self.converter.vector_slides = True
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _check_output(self, pptx_path):
+        """各スライドがSVG画像と代替表示用のPNGを参照していること"""
+        prs = Presentation(pptx_path)
+        self.assertEqual(len(prs.slides), 3)
+        for slide in prs.slides:
+            picture = slide.shapes[0]
+            self.assertEqual(picture.image.content_type, "image/png")
+            svg_blips = list(picture._element.iter(
+                "{http://schemas.microsoft.com/office/drawing/2016/SVG/main}svgBlip"
+            ))
+            self.assertEqual(len(svg_blips), 1)
+            svg_rId = svg_blips[0].get(
+                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+            )
+            svg_part = slide.part.related_part(svg_rId)
+            self.assertEqual(svg_part.content_type, "image/svg+xml")
+            self.assertTrue(svg_part.blob.startswith(b"<svg"))
+    
+    def test_python_pptx_writer(self):
+        """python-pptxで作成したPPTXにSVG画像が埋め込まれること"""
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self._check_output(pptx_path)
+        self.assertEqual(
+            sorted(os.listdir(images_folder)), ["page_001.svg", "page_002.svg", "page_003.svg"]
+        )
+    
+    def test_streaming_writer(self):
+        """ストリーミング書き出しでもSVG画像が埋め込まれること"""
+        self.converter.streaming_writer = True
+        self.converter.save_images = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self._check_output(pptx_path)
+    
+    def test_smaller_than_raster(self):
+        """文字だけのPDFでは画像として変換するよりファイルが大幅に小さくなること"""
+        document = fitz.open()
+        for i in range(3):
+            page = document.new_page()
+            for y in range(72, 800, 14):
+                page.insert_text((72, y), f"Page {i + 1}: the quick brown fox jumps over the lazy dog")
+        document.save(self.pdf_path)
+        document.close()
+        
+        self.converter.save_images = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        vector_size = os.path.getsize(pptx_path)
+        
+        self.converter.vector_slides = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertLess(vector_size * 10, os.path.getsize(pptx_path))
+
+
+
+class TestHybridConversion(unittest.TestCase):
+    """文字をテキストボックスにするハイブリッドモードのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=3)
+        self.converter = PDFConverter()
+        self.converter.hybrid_text = True
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _check_output(self, pptx_path):
+        """背景画像の前面に各ページの文字のテキストボックスがあること"""
+        prs = Presentation(pptx_path)
+        self.assertEqual(len(prs.slides), 3)
+        for i, slide in enumerate(prs.slides):
+            background, text_box = slide.shapes
+            self.assertEqual((background.width, background.height), (prs.slide_width, prs.slide_height))
+            self.assertEqual(text_box.text_frame.text, f"Page {i + 1}")
+    
+    def test_python_pptx_writer(self):
+        """文字を除いた低解像度の背景画像になること"""
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self._check_output(pptx_path)
+        
+        # 文字だけのページの背景は白一色になる
+        with Image.open(os.path.join(images_folder, "page_001.jpg")) as image:
+            self.assertLess(image.width, 595 * 96 / 72)
+            self.assertEqual(image.convert("L").getextrema()[0], 255)
+    
+    def test_streaming_writer(self):
+        """ストリーミング書き出しでもテキストボックスが追加されること"""
+        self.converter.streaming_writer = True
+        self.converter.save_images = False
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self._check_output(pptx_path)
+    
+    def test_source_pdf_is_unchanged(self):
+        """元のPDFファイルは書き換えられないこと"""
+        self.converter.convert_pdf_to_pptx(self.pdf_path)
+        with fitz.open(self.pdf_path) as document:
+            self.assertIn("Page 1", document[0].get_text())
+
+
+class TestTiledRendering(unittest.TestCase):
+    """大きなページを帯に分けてレンダリングする変換のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=2)
+        self.converter = PDFConverter()
+        self.converter.dpi = 150
+        self.converter.tiled_rendering = True
+        self.converter.tile_height = 200
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _pixels(self, image_file):
+        """画像ファイルのピクセルデータを返す"""
+        with Image.open(image_file) as image:
+            return image.convert("RGB").tobytes()
+    
+    def _check_identical(self, image_format):
+        """帯に分けない場合と同じ画素の画像になること"""
+        self.converter.image_format = image_format
+        tiled_folder = os.path.join(self.temp_dir, "tiled")
+        full_folder = os.path.join(self.temp_dir, "full")
+        os.makedirs(tiled_folder)
+        os.makedirs(full_folder)
+        
+        _, tiled_images = self.converter.convert_pdf_to_pptx(self.pdf_path, tiled_folder)
+        self.converter.tiled_rendering = False
+        _, full_images = self.converter.convert_pdf_to_pptx(self.pdf_path, full_folder)
+        
+        for name in ("page_001", "page_002"):
+            file_name = f"{name}.{image_format}"
+            self.assertEqual(
+                self._pixels(os.path.join(tiled_images, file_name)),
+                self._pixels(os.path.join(full_images, file_name))
+            )
+    
+    def test_png(self):
+        """PNGで帯に分けない場合と同じ画像になること"""
+        self._check_identical("png")
+    
+    def test_jpeg(self):
+        """JPEGで帯に分けない場合と同じ画像になること"""
+        self._check_identical("jpg")
+    
+    def test_in_memory(self):
+        """メモリ上の変換でも帯に分けてレンダリングされること"""
+        self.converter.in_memory = True
+        self.converter.save_images = False
+        with unittest.mock.patch.object(
+            pdf_converter, "render_page_tiled", wraps=pdf_converter.render_page_tiled
+        ) as render:
+            pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(render.call_count, 2)
+        self.assertEqual(len(Presentation(pptx_path).slides), 2)
+
+
+class TestSizeBudget(unittest.TestCase):
+    """出力サイズの目標を指定した変換のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "photos.pdf")
+        document = fitz.open()
+        for i in range(3):
+            page = document.new_page()
+            page.insert_image(fitz.Rect(50, 50, 550, 450), stream=create_photo_stream((400 + i, 300)))
+            page.insert_text((72, 500), f"Page {i + 1}", fontsize=24)
+        document.save(self.pdf_path)
+        document.close()
+        
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.save_images = False
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _convert(self):
+        """変換して(PPTXのパス, 通知されたメッセージのリスト)を返す"""
+        messages = []
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(
+            self.pdf_path, callback=lambda status, message, progress=None: messages.append(message)
+        )
+        return pptx_path, messages
+    
+    def test_target_size(self):
+        """目標サイズ以下のPPTXになり、目標との差が報告されること"""
+        unlimited = os.path.getsize(self._convert()[0])
+        
+        self.converter.target_size = unlimited // 3
+        pptx_path, messages = self._convert()
+        
+        size = os.path.getsize(pptx_path)
+        self.assertLessEqual(size, self.converter.target_size)
+        self.assertEqual(self.converter.size_report["bytes"], size)
+        self.assertAlmostEqual(self.converter.size_report["ratio"], size / self.converter.target_size)
+        self.assertEqual(self.converter.size_report["over_budget_pages"], 0)
+        self.assertTrue(any(message.startswith("出力サイズ") for message in messages))
+    
+    def test_slide_size_is_kept(self):
+        """縮小した画像でもスライドのサイズと画像の配置は変わらないこと"""
+        expected = Presentation(self._convert()[0])
+        self.converter.slide_size_budget = 20 * 1024
+        prs = Presentation(self._convert()[0])
+        
+        self.assertEqual((prs.slide_width, prs.slide_height), (expected.slide_width, expected.slide_height))
+        for slide in prs.slides:
+            picture = slide.shapes[0]
+            self.assertEqual((picture.width, picture.height), (prs.slide_width, prs.slide_height))
+            self.assertLessEqual(len(picture.image.blob), 20 * 1024)
+        self.assertGreater(self.converter.encoding_stats.scaled_pages, 0)
+    
+    def test_page_budget(self):
+        """ページごとの上限は目標サイズをページ数で分け、スライドごとの上限と小さい方になること"""
+        self.assertIsNone(self.converter._page_budget(3))
+        self.converter.target_size = 10 ** 6
+        budget = self.converter._page_budget(4)
+        self.assertLess(budget, 10 ** 6 // 4)
+        self.converter.slide_size_budget = budget // 2
+        self.assertEqual(self.converter._page_budget(4), budget // 2)
+    
+    def test_no_report_without_target(self):
+        """目標サイズを指定しない場合は報告しないこと"""
+        self._convert()
+        self.assertIsNone(self.converter.size_report)
+
+
+
+class TestConversionMetrics(unittest.TestCase):
+    """変換の段階・ページごとの計測のテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        create_sample_pdf(self.pdf_path, page_count=3)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _convert(self, expected_stages):
+        """変換して、段階・ページごとの計測値がそろっていることを確認する"""
+        messages = []
+        self.converter.convert_pdf_to_pptx(
+            self.pdf_path, self.temp_dir, lambda status, message, progress=None: messages.append(message)
+        )
+        metrics = self.converter.metrics.to_dict()
+        self.assertTrue(set(expected_stages) <= set(metrics["stages"]), metrics["stages"])
+        self.assertEqual([page["page"] for page in metrics["pages"]], [1, 2, 3])
+        for page in metrics["pages"]:
+            self.assertGreater(page["render_seconds"], 0)
+            self.assertGreater(page["bytes"], 0)
+            self.assertEqual((page["width"], page["height"]), pdf_converter._page_pixel_size(fitz.Rect(0, 0, 595, 842), 72))
+        self.assertGreaterEqual(metrics["total_seconds"], sum(metrics["stages"].values()) * 0.99)
+        self.assertTrue(any(message.startswith("処理時間") for message in messages))
+        return metrics
+    
+    def test_file_based(self):
+        """一時フォルダを経由する変換で、レンダリング・スライド追加・保存・コピーが計測されること"""
+        metrics = self._convert(["render", "slides", "save", "copy"])
+        # 画像ファイルのサイズが記録されること
+        images_folder = os.path.join(self.temp_dir, "deck_images")
+        self.assertEqual(
+            metrics["totals"]["image_bytes"],
+            sum(os.path.getsize(os.path.join(images_folder, name)) for name in os.listdir(images_folder))
+        )
+    
+    def test_in_memory(self):
+        """メモリ上の変換で、準備を含む各段階が計測されること"""
+        self.converter.in_memory = True
+        self._convert(["open", "render", "slides", "save", "copy"])
+    
+    def test_parallel(self):
+        """ワーカープロセスでレンダリングしたページも計測されること"""
+        self.converter.workers = 2
+        self._convert(["render", "slides", "save"])
+    
+    def test_trace_file(self):
+        """trace_pathにChromeのトレース形式のJSONが書き出されること"""
+        self.converter.in_memory = True
+        self.converter.trace_path = os.path.join(self.temp_dir, "trace.json")
+        self._convert(["render"])
+        
+        with open(self.converter.trace_path, encoding="utf-8") as f:
+            trace = json.load(f)
+        names = [event["name"] for event in trace["traceEvents"] if event["ph"] == "X"]
+        self.assertEqual(names.count("render"), 3 + 3)  # ページごとのレンダリングと、段階としてのレンダリング
+        self.assertEqual(names.count("encode"), 3)
+        self.assertIn("save", names)
+    
+    def test_update(self):
+        """差分更新でも、変更されたページだけが計測されること"""
+        self.converter.save_images = False
+        self.converter.update_pptx(self.pdf_path, self.temp_dir)
+        create_sample_pdf(self.pdf_path, page_count=4)
+        self.converter.update_pptx(self.pdf_path, self.temp_dir)
+        metrics = self.converter.metrics.to_dict()
+        self.assertEqual([page["page"] for page in metrics["pages"]], [4])
+        self.assertTrue({"open", "render", "slides", "save"} <= set(metrics["stages"]))
+
+
+
+
+class TestCancellation(unittest.TestCase):
+    """変換のキャンセルのテスト"""
+    
+    PAGE_COUNT = 24
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "output")
+        os.makedirs(self.output_dir)
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        create_sample_pdf(self.pdf_path, page_count=self.PAGE_COUNT)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        # 2ページ目の進捗でキャンセルするため、進捗の通知を間引かない
+        self.converter.progress_interval = 0
+        self.token = CancellationToken()
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _convert_and_cancel(self, partial=True):
+        """2ページ目の進捗でキャンセルし、キャンセルが通知されて何も出力されないことを確認する"""
+        statuses = []
+        temp_folders = []
+        
+        def callback(status, message, progress=None):
+            statuses.append(status)
+            temp_folders.append(self.converter.temp_folder)
+            if "(2/" in message:
+                self.token.cancel()
+        
+        with self.assertRaises(ConversionCancelled):
+            self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir, callback, self.token)
+        self.assertEqual(statuses[-1], "キャンセル")
+        self.assertEqual(os.listdir(self.output_dir), [])
+        for temp_folder in set(temp_folders) - {None}:
+            self.assertFalse(os.path.exists(temp_folder))
+        if partial:
+            # キャンセル後は残りのページをレンダリングしないこと
+            self.assertLess(len(self.converter.metrics.pages), self.PAGE_COUNT)
+    
+    def test_file_based(self):
+        """一時フォルダを経由する変換をキャンセルできること"""
+        self._convert_and_cancel()
+    
+    def test_in_memory(self):
+        """書き出し途中の画像フォルダが削除されること"""
+        self.converter.in_memory = True
+        self._convert_and_cancel()
+    
+    def test_streaming_writer(self):
+        """スライドを直接書き出す変換でも、書き出し途中のPPTXが残らないこと"""
+        self.converter.streaming_writer = True
+        self._convert_and_cancel()
+    
+    def test_parallel(self):
+        """ワーカープロセスもページの区切りで中断すること"""
+        self.converter.workers = 2
+        # 小さなページはワーカーがすぐに描き終えるため、レンダリングしたページ数は確認しない
+        self._convert_and_cancel(partial=False)
+        
+        self.token.cancel()
+        pdf_converter._init_render_worker(self.token)
+        try:
+            with self.assertRaises(ConversionCancelled):
+                pdf_converter._render_pages_worker(self.pdf_path, [0, 1], self.temp_dir, 72, "png")
+        finally:
+            pdf_converter._init_render_worker(None)
+        self.assertFalse(any(name.endswith(".png") for name in os.listdir(self.temp_dir)))
+    
+    def test_pipeline(self):
+        """パイプライン処理をキャンセルできること"""
+        self.converter.pipeline = True
+        self.converter.workers = 2
+        self._convert_and_cancel()
+    
+    def test_cancelled_before_start(self):
+        """キャンセル済みのトークンではレンダリングを始めないこと"""
+        self.token.cancel()
+        with self.assertRaises(ConversionCancelled):
+            self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir, cancel_token=self.token)
+        self.assertEqual(os.listdir(self.output_dir), [])
+    
+    def test_update_keeps_existing(self):
+        """差分更新をキャンセルしても既存のPPTXは変更されないこと"""
+        self.converter.save_images = False
+        pptx_path, _ = self.converter.update_pptx(self.pdf_path, self.output_dir)
+        with open(pptx_path, "rb") as f:
+            original = f.read()
+        
+        # ページを追加したPDFに更新する
+        create_sample_pdf(self.pdf_path, page_count=self.PAGE_COUNT + 3)
+        
+        def callback(status, message, progress=None):
+            if "(1/" in message:
+                self.token.cancel()
+        
+        with self.assertRaises(ConversionCancelled):
+            self.converter.update_pptx(self.pdf_path, self.output_dir, callback, self.token)
+        with open(pptx_path, "rb") as f:
+            self.assertEqual(f.read(), original)
+    
+    def test_convert_many(self):
+        """一括変換では、キャンセル後のファイルがキャンセルとして結果に含まれること"""
+        paths = [self.pdf_path]
+        for name in ("b.pdf", "c.pdf"):
+            paths.append(create_sample_pdf(os.path.join(self.temp_dir, name), page_count=2))
+        
+        def file_callback(pdf_path, status, message, progress=None):
+            if status == "完了":
+                self.token.cancel()
+        
+        statuses = []
+        results = self.converter.convert_many(
+            paths, self.output_dir, jobs=1, file_callback=file_callback, cancel_token=self.token,
+            callback=lambda status, message, progress=None: statuses.append(status)
+        )
+        self.assertTrue(results[0].succeeded)
+        self.assertEqual([result.cancelled for result in results], [False, True, True])
+        self.assertFalse(results[1].succeeded)
+        self.assertEqual(statuses[-1], "キャンセル")
+
+
+
+class TestProgressEvents(unittest.TestCase):
+    """進捗の通知の間引きと処理速度の表示のテスト"""
+    
+    PAGE_COUNT = 12
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "deck.pdf"), page_count=self.PAGE_COUNT)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.events = []
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _callback(self, status, message, progress=None):
+        """通知を記録する"""
+        self.events.append((status, message, progress))
+    
+    def _page_messages(self):
+        """ページ数を含む進捗のメッセージを返す"""
+        return [message for status, message, _ in self.events if status == "変換中" and "/" in message]
+    
+    def test_coalesced(self):
+        """進捗の通知が間引かれても、各段階の最後のページと状態の変化は通知されること"""
+        self.converter.progress_interval = 60
+        self.converter.convert_pdf_to_pptx(self.pdf_path, self.temp_dir, self._callback)
+        
+        messages = self._page_messages()
+        self.assertLess(len(messages), 2 * self.PAGE_COUNT)
+        self.assertTrue(any(f"({self.PAGE_COUNT}/{self.PAGE_COUNT})" in message for message in messages))
+        statuses = [status for status, _, _ in self.events]
+        self.assertEqual((statuses[0], statuses[-1]), ("開始", "完了"))
+        self.assertIn("保存中", statuses)
+    
+    def test_throughput(self):
+        """ページごとの進捗に処理速度と残り時間の見込みが添えられること"""
+        self.converter.progress_interval = 0
+        self.converter.in_memory = True
+        self.converter.save_images = False
+        self.converter.convert_pdf_to_pptx(self.pdf_path, self.temp_dir, self._callback)
+        
+        messages = self._page_messages()
+        self.assertEqual(len(messages), self.PAGE_COUNT)
+        self.assertNotIn("ページ/秒", messages[0])
+        self.assertIn("ページ/秒", messages[-1])
+        self.assertIn("残り約", messages[1])
+
+
+
+class TestPageSelection(unittest.TestCase):
+    """変換するページを選ぶ変換のテスト"""
+    
+    PAGES = "5,2-4:2,1"
+    SELECTED = [4, 1, 3, 0]  # PAGESで選ばれるページ番号（0始まり、スライドの順）
+    
+    def setUp(self):
+        """ページごとに幅の違うPDFを作成する（変換した画像の幅からページを見分ける）"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = os.path.join(self.temp_dir, "deck.pdf")
+        document = fitz.open()
+        for i in range(6):
+            page = document.new_page(width=self._page_width(i), height=200)
+            page.insert_text((10, 50), f"Page {i + 1}", fontsize=12)
+        document.save(self.pdf_path)
+        document.close()
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.pages = self.PAGES
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    @staticmethod
+    def _page_width(index):
+        """ページの幅（ポイント）"""
+        return 100 + 20 * index
+    
+    def _check_output(self, pptx_path, images_folder=None):
+        """選んだページだけが指定した順にスライドになり、画像は元のページ番号で保存されること"""
+        widths = [
+            Image.open(io.BytesIO(slide.shapes[0].image.blob)).width
+            for slide in Presentation(pptx_path).slides
+        ]
+        expected = [
+            pdf_converter._page_pixel_size(fitz.Rect(0, 0, self._page_width(i), 200), self.converter.dpi)[0]
+            for i in self.SELECTED
+        ]
+        self.assertEqual(widths, expected)
+        if images_folder:
+            self.assertEqual(
+                sorted(os.listdir(images_folder)),
+                [pdf_converter._image_file_name(i, "jpg") for i in sorted(self.SELECTED)]
+            )
+    
+    def test_file_based(self):
+        """一時フォルダ経由の変換で、選んだページだけがレンダリングされること"""
+        self.converter.pages = None
+        with unittest.mock.patch(
+            "pdf_converter._render_page_to_file", wraps=pdf_converter._render_page_to_file
+        ) as render_mock:
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path, pages=self.PAGES)
+        self.assertEqual(render_mock.call_count, len(self.SELECTED))
+        self._check_output(pptx_path, images_folder)
+        self.assertIsNone(self.converter.pages)
+    
+    def test_in_memory(self):
+        """メモリ上の変換で、選んだページだけが変換されること"""
+        self.converter.in_memory = True
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+        self.assertEqual(sorted(self.converter.metrics.pages), sorted(self.SELECTED))
+    
+    def test_parallel(self):
+        """ワーカープロセスでのレンダリングでも、スライドが指定した順になること"""
+        self.converter.workers = 2
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+        self.converter.in_memory = True
+        self.converter.pipeline = True
+        self._check_output(*self.converter.convert_pdf_to_pptx(self.pdf_path))
+    
+    def test_vector_slides(self):
+        """ベクターモードでも選んだページだけがスライドになること"""
+        self.converter.vector_slides = True
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        self.assertEqual(len(Presentation(pptx_path).slides), len(self.SELECTED))
+        self.assertEqual(
+            sorted(os.listdir(images_folder)),
+            [pdf_converter._image_file_name(i, "svg") for i in sorted(self.SELECTED)]
+        )
+    
+    def test_hybrid_text(self):
+        """ハイブリッドモードでも選んだページだけが指定した順にスライドになること"""
+        self.converter.hybrid_text = True
+        self.converter.streaming_writer = True
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path)
+        # 背景画像の解像度は異なるため、ページの幅の比で確認する
+        widths = [
+            Image.open(io.BytesIO(slide.shapes[0].image.blob)).width
+            for slide in Presentation(pptx_path).slides
+        ]
+        self.assertEqual(
+            [width / widths[-1] for width in widths],
+            [self._page_width(i) / self._page_width(self.SELECTED[-1]) for i in self.SELECTED]
+        )
+    
+    def test_duplicate_pages(self):
+        """ページを選んだ場合も、重複ページは選んだページの中で検出されること"""
+        document = fitz.open()
+        for text in ["A", "B", "A", "C"]:
+            document.new_page().insert_text((72, 72), text, fontsize=24)
+        document.save(self.pdf_path)
+        document.close()
+        self.converter.deduplicate_pages = True
+        self.converter.pages = "3,2,1"
+        for in_memory in (False, True):
+            self.converter.in_memory = in_memory
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path)
+            blobs = [slide.shapes[0].image.blob for slide in Presentation(pptx_path).slides]
+            self.assertEqual(len(blobs), 3)
+            self.assertEqual(blobs[0], blobs[2])
+            self.assertNotEqual(blobs[0], blobs[1])
+            self.assertEqual(self.converter.renders_avoided, 1)
+            self.assertEqual(len(os.listdir(images_folder)), 3)
+    
+    def test_update(self):
+        """差分更新では、選んだページのうち変更・追加されたページだけがレンダリングされること"""
+        self.converter.update_pptx(self.pdf_path)
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertEqual((summary["rendered"], summary["reused"]), (0, len(self.SELECTED)))
+        self._check_output(pptx_path)
+        
+        self.converter.pages = self.PAGES + ",6"
+        pptx_path, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertEqual((summary["rendered"], summary["reused"]), (1, len(self.SELECTED)))
+        self.assertEqual(len(Presentation(pptx_path).slides), len(self.SELECTED) + 1)
+    
+    def test_invalid_pages(self):
+        """PDFにないページや正しくない指定ではValueErrorを送出し、何も出力しないこと"""
+        output_dir = os.path.join(self.temp_dir, "output")
+        os.makedirs(output_dir)
+        for pages in ("7-", "1-x"):
+            with self.assertRaises(ValueError) as context:
+                self.converter.convert_pdf_to_pptx(self.pdf_path, output_dir, pages=pages)
+            self.assertIn("PDF変換エラー", str(context.exception))
+        self.assertEqual(os.listdir(output_dir), [])
+
+
+class TestProgressiveConversion(unittest.TestCase):
+    """低解像度の下書きを先に保存し、高解像度の画像に差し替える変換のテスト"""
+    
+    PAGE_COUNT = 5
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.output_dir = os.path.join(self.temp_dir, "output")
+        os.makedirs(self.output_dir)
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "deck.pdf"), page_count=self.PAGE_COUNT)
+        self.converter = PDFConverter()
+        self.converter.dpi = 100
+        self.converter.progressive = True
+        self.converter.draft_dpi = 30
+        self.converter.save_images = False
+        self.drafts = []
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _callback(self, status, message, progress=None):
+        """下書きが保存された時点のPPTXの内容を記録する"""
+        if status == "下書き完了":
+            prs = Presentation(os.path.join(self.output_dir, "deck.pptx"))
+            self.drafts.append((prs.slide_width, [slide.shapes[0].image.blob for slide in prs.slides]))
+    
+    def _expected(self):
+        """同じ設定の通常の変換結果（スライドの幅と各スライドの画像）"""
+        converter = PDFConverter()
+        converter.dpi = self.converter.dpi
+        converter.in_memory = True
+        converter.save_images = False
+        pptx_path, _ = converter.convert_pdf_to_pptx(self.pdf_path, self.temp_dir)
+        prs = Presentation(pptx_path)
+        return prs.slide_width, [slide.shapes[0].image.blob for slide in prs.slides]
+    
+    def test_draft_then_refine(self):
+        """下書きはすべてのページを含み、最後には通常の変換と同じ画像に差し替わること"""
+        pptx_path, images_folder = self.converter.convert_pdf_to_pptx(
+            self.pdf_path, self.output_dir, self._callback
+        )
+        self.assertIsNone(images_folder)
+        expected_width, expected_blobs = self._expected()
+        
+        self.assertEqual(len(self.drafts), 1)
+        draft_width, draft_blobs = self.drafts[0]
+        self.assertEqual(draft_width, expected_width)
+        self.assertEqual(len(draft_blobs), self.PAGE_COUNT)
+        self.assertLess(
+            Image.open(io.BytesIO(draft_blobs[0])).width, Image.open(io.BytesIO(expected_blobs[0])).width
+        )
+        
+        prs = Presentation(pptx_path)
+        self.assertEqual(prs.slide_width, expected_width)
+        self.assertEqual([slide.shapes[0].image.blob for slide in prs.slides], expected_blobs)
+        # 下書きの画像はPPTXに残らないこと
+        with zipfile.ZipFile(pptx_path) as package:
+            media = [name for name in package.namelist() if name.startswith("ppt/media/")]
+        self.assertEqual(len(media), self.PAGE_COUNT)
+        self.assertIn("draft", self.converter.metrics.stages)
+    
+    def test_chunks(self):
+        """refine_chunk_pagesごとに差し替えたPPTXが保存されること"""
+        self.converter.refine_chunk_pages = 2
+        self.converter.streaming_writer = True
+        self.converter.save_images = True
+        with unittest.mock.patch(
+            "pdf_converter._save_presentation", wraps=pdf_converter._save_presentation
+        ) as save_mock:
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir)
+        # 2ページ目・4ページ目と最後
+        self.assertEqual(save_mock.call_count, 3)
+        self.assertEqual(
+            [slide.shapes[0].image.blob for slide in Presentation(pptx_path).slides], self._expected()[1]
+        )
+        self.assertEqual(len(os.listdir(images_folder)), self.PAGE_COUNT)
+    
+    def test_update_after_refine(self):
+        """差し替え後のスライドには高解像度の画像のページのキーが保存され、差分更新で再利用されること"""
+        self.converter.fingerprint_pages = True
+        self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir)
+        _, summary = self.converter.update_pptx(self.pdf_path, self.output_dir)
+        self.assertEqual((summary["rendered"], summary["reused"]), (0, self.PAGE_COUNT))
+    
+    def test_cancel_during_refine(self):
+        """下書きの保存後にキャンセルすると、下書きも含めて何も残らないこと"""
+        token = CancellationToken()
+        
+        def callback(status, message, progress=None):
+            if status == "下書き完了":
+                token.cancel()
+        
+        self.converter.save_images = True
+        with self.assertRaises(ConversionCancelled):
+            self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir, callback, token)
+        self.assertEqual(os.listdir(self.output_dir), [])
+    
+    def test_draft_locked(self):
+        """下書きを置き換えられない場合は、下書きを残して高解像度のPPTXを別のファイルに保存すること"""
+        draft_path = os.path.join(self.output_dir, "deck.pptx")
+        replace = os.replace
+        locked_attempts = []
+        messages = []
+        
+        def locked_replace(src, dst):
+            # 下書きの保存後は、PowerPointで開いているときのように置き換えられない
+            if dst == draft_path and self.drafts:
+                locked_attempts.append(dst)
+                raise PermissionError(13, "The process cannot access the file", dst)
+            return replace(src, dst)
+        
+        def callback(status, message, progress=None):
+            self._callback(status, message, progress)
+            messages.append(message)
+        
+        self.converter.refine_chunk_pages = 2
+        self.converter.save_images = True
+        with unittest.mock.patch("os.replace", side_effect=locked_replace), \
+                unittest.mock.patch("pdf_converter.REPLACE_RETRY_INTERVAL", 0):
+            pptx_path, images_folder = self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir, callback)
+        
+        self.assertEqual(pptx_path, os.path.join(self.output_dir, "deck_refined.pptx"))
+        self.assertEqual(len(locked_attempts), pdf_converter.REPLACE_RETRIES + 1)
+        self.assertTrue(any(pptx_path in message for message in messages))
+        self.assertEqual(len(os.listdir(images_folder)), self.PAGE_COUNT)
+        self.assertEqual(len(Presentation(draft_path).slides), self.PAGE_COUNT)
+        _, expected_blobs = self._expected()
+        self.assertEqual([slide.shapes[0].image.blob for slide in Presentation(pptx_path).slides], expected_blobs)
+        self.assertFalse([name for name in os.listdir(self.output_dir) if name.endswith(".tmp")])
+    
+    def test_refine_failure_removes_draft(self):
+        """差し替え中に失敗した場合は、下書きのPPTXを完成したファイルとして残さないこと"""
+        self.converter.save_images = True
+        with unittest.mock.patch("pdf_converter._set_picture_image", side_effect=RuntimeError("broken")):
+            with self.assertRaises(ValueError):
+                self.converter.convert_pdf_to_pptx(self.pdf_path, self.output_dir)
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+
 def manual_test_with_file(pdf_path):
     """手動テスト用の関数 - 実際のPDFファイルを使ってテスト"""
     print(f"PDFファイル '{pdf_path}' を使って変換テスト開始...")
@@ -111,7 +1408,7 @@ def manual_test_with_file(pdf_path):
         
         print("テスト成功！")
         return True
-        
+    
     except Exception as e:
         print(f"テスト失敗: {str(e)}")
         return False
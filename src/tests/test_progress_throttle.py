@@ -0,0 +1,93 @@
+"""
+進捗の通知の間引き（progress_throttle.py）のテストモジュール
+"""
+import os
+import sys
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_throttle import ThrottledCallback, ThroughputEstimator, format_duration, format_throughput
+
+
+class FakeClock:
+    """テスト用の時計（advanceで時刻を進める）"""
+    
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+    
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class TestThrottledCallback(unittest.TestCase):
+    """進捗の通知の間引きのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.clock = FakeClock()
+        self.events = []
+        self.callback = ThrottledCallback(
+            lambda status, message, progress=None: self.events.append((status, message, progress)),
+            interval=0.1, clock=self.clock
+        )
+    
+    def test_coalesces_progress(self):
+        """間隔内の進捗は最新のものだけが残り、次の段階の前に通知されること"""
+        self.callback("開始", "開始", 0)
+        for page in range(1, 11):
+            self.clock.advance(0.015)
+            self.callback("変換中", f"({page}/10)", page * 10)
+        self.callback("完了", "完了", 100)
+        
+        self.assertEqual(
+            [message for _, message, _ in self.events],
+            ["開始", "(7/10)", "(10/10)", "完了"]
+        )
+    
+    def test_messages_without_progress(self):
+        """進捗の値を持たないメッセージは間引かず、保留中の進捗の後に通知されること"""
+        self.callback("変換中", "(1/3)", 10)
+        self.callback("変換中", "(2/3)", 20)
+        self.callback("変換中", "重複ページを省略しました", None)
+        self.assertEqual([message for _, message, _ in self.events], ["(1/3)", "(2/3)", "重複ページを省略しました"])
+    
+    def test_disabled(self):
+        """間隔が0の場合はすべて通知されること"""
+        self.callback.interval = 0
+        for page in range(5):
+            self.callback("変換中", str(page), page)
+        self.assertEqual(len(self.events), 5)
+
+
+class TestThroughputEstimator(unittest.TestCase):
+    """処理速度と残り時間の見込みのテスト"""
+    
+    def test_rate_and_eta(self):
+        """最初の通知からの平均の速度と残り時間が求められ、次の段階で基準を取り直すこと"""
+        clock = FakeClock()
+        estimator = ThroughputEstimator(clock)
+        self.assertEqual(estimator.update(1, 10), (None, None))
+        clock.advance(2.0)
+        rate, eta = estimator.update(5, 10)
+        self.assertAlmostEqual(rate, 2.0)
+        self.assertAlmostEqual(eta, 2.5)
+        
+        # 件数が減った場合は次の段階として基準を取り直す
+        clock.advance(1.0)
+        self.assertEqual(estimator.update(1, 10), (None, None))
+    
+    def test_format(self):
+        """処理速度と残り時間が表示用の文字列になること"""
+        self.assertEqual(format_throughput(2.0, 75), "2.0ページ/秒・残り約1分15秒")
+        self.assertEqual(format_throughput(0.5, 0, unit="ファイル"), "0.5ファイル/秒")
+        self.assertEqual(format_throughput(None, None), "")
+        self.assertEqual(format_duration(3725), "1時間2分")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+レンダリングキャッシュのテストモジュール
+"""
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+import pickle
+import time
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdf_converter import PDFConverter
+from render_cache import RenderCache
+from tests.test_page_fingerprint import create_text_pdf
+from tests.test_pdf_converter import create_sample_pdf
+
+
+class TestRenderCache(unittest.TestCase):
+    """RenderCacheクラスのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def test_get_and_put(self):
+        """保存したデータを取得でき、ヒット数・ミス数が数えられること"""
+        cache = RenderCache(self.cache_dir)
+        self.assertIsNone(cache.get("ab" * 32))
+        cache.put("ab" * 32, b"image data")
+        self.assertEqual(cache.get("ab" * 32), b"image data")
+        
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        cache.close()
+    
+    def test_lru_eviction(self):
+        """上限を超えると最後に使われた時刻が古いものから削除されること"""
+        cache = RenderCache(self.cache_dir, max_bytes=25)
+        cache.put("aa" * 32, b"x" * 10)
+        time.sleep(0.01)
+        cache.put("bb" * 32, b"x" * 10)
+        time.sleep(0.01)
+        # aaを使用してbbより新しくする
+        cache.get("aa" * 32)
+        time.sleep(0.01)
+        cache.put("cc" * 32, b"x" * 10)
+        
+        self.assertIsNotNone(cache.get("aa" * 32))
+        self.assertIsNone(cache.get("bb" * 32))
+        self.assertIsNotNone(cache.get("cc" * 32))
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.stats()["total_bytes"], 25)
+        cache.close()
+    
+    def test_picklable(self):
+        """ワーカープロセスに渡せるようpickleできること"""
+        cache = RenderCache(self.cache_dir)
+        cache.put("aa" * 32, b"data")
+        restored = pickle.loads(pickle.dumps(cache))
+        self.assertEqual(restored.get("aa" * 32), b"data")
+        cache.close()
+        restored.close()
+    
+    def test_converter_uses_cache(self):
+        """2回目の変換では変更のないページがキャッシュから取得されること"""
+        pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=3)
+        cache = RenderCache(self.cache_dir)
+        converter = PDFConverter()
+        converter.dpi = 72
+        converter.cache = cache
+        
+        converter.convert_pdf_to_pptx(pdf_path, output_folder=self.temp_dir)
+        self.assertEqual((cache.hits, cache.misses), (0, 3))
+        
+        converter.in_memory = True
+        converter.convert_pdf_to_pptx(pdf_path, output_folder=self.temp_dir)
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+        cache.close()
+    
+    def test_revised_annotated_pdf(self):
+        """注釈のあるPDFの改訂版では、変更のないページがキャッシュから取得されること"""
+        old_path = create_text_pdf(os.path.join(self.temp_dir, "old.pdf"), ["A", "B", "C"], annotate=True)
+        new_path = create_text_pdf(os.path.join(self.temp_dir, "new.pdf"), ["A", "B", "D"], annotate=True)
+        cache = RenderCache(self.cache_dir)
+        converter = PDFConverter()
+        converter.dpi = 72
+        converter.in_memory = True
+        converter.cache = cache
+        
+        converter.convert_pdf_to_pptx(old_path, output_folder=self.temp_dir)
+        converter.convert_pdf_to_pptx(new_path, output_folder=self.temp_dir)
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+        cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+ストリーミングPPTXライターのテストモジュール
+"""
+import os
+import sys
+import unittest
+import tempfile
+import shutil
+import zipfile
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pptx import Presentation
+from pptx.util import Pt
+
+from pdf_converter import PDFConverter
+from streaming_pptx import StreamingPptxWriter, image_extension
+from tests.test_pdf_converter import create_sample_pdf
+
+
+class TestStreamingPptxWriter(unittest.TestCase):
+    """StreamingPptxWriterクラスのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pdf_path = create_sample_pdf(os.path.join(self.temp_dir, "sample.pdf"), page_count=4)
+        self.converter = PDFConverter()
+        self.converter.dpi = 72
+        self.converter.save_images = False
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        if os.path.exists(self.temp_dir):
+            shutil.rmtree(self.temp_dir)
+    
+    def _slide_blobs(self, pptx_path):
+        """各スライドの画像をスライド順に取得する"""
+        return [slide.shapes[0].image.blob for slide in Presentation(pptx_path).slides]
+    
+    def test_matches_python_pptx_output(self):
+        """python-pptxで作成した場合と同じスライド・画像になること"""
+        self.converter.in_memory = True
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path, output_folder=self.temp_dir)
+        expected_prs = Presentation(pptx_path)
+        expected_blobs = self._slide_blobs(pptx_path)
+        
+        self.converter.streaming_writer = True
+        pptx_path, _ = self.converter.convert_pdf_to_pptx(self.pdf_path, output_folder=self.temp_dir)
+        prs = Presentation(pptx_path)
+        
+        self.assertEqual(self._slide_blobs(pptx_path), expected_blobs)
+        self.assertEqual(
+            (prs.slide_width, prs.slide_height),
+            (expected_prs.slide_width, expected_prs.slide_height)
+        )
+        self.assertEqual(prs.slides[0].slide_layout.name, "Blank")
+        picture = prs.slides[0].shapes[0]
+        self.assertEqual((picture.width, picture.height), (prs.slide_width, prs.slide_height))
+    
+    def test_package_parts(self):
+        """スライドとコンテンツタイプが正しく登録されること"""
+        pptx_path = os.path.join(self.temp_dir, "direct.pptx")
+        jpeg = b"\xff\xd8\xff" + b"\x00" * 16
+        with StreamingPptxWriter(pptx_path, Pt(200), Pt(100)) as writer:
+            writer.add_picture_slide(jpeg, name="pdf2pptx:key")
+            writer.add_picture_slide(jpeg)
+        
+        with zipfile.ZipFile(pptx_path) as package:
+            content_types = package.read("[Content_Types].xml").decode("utf-8")
+            self.assertIn("/ppt/slides/slide2.xml", content_types)
+            self.assertIn(b"<Slides>2</Slides>", package.read("docProps/app.xml"))
+        self.assertFalse(os.path.exists(pptx_path + ".tmp"))
+        self.assertEqual(Presentation(pptx_path).slides[0].shapes[0].name, "pdf2pptx:key")
+    
+    def test_abort_leaves_no_file(self):
+        """途中で失敗した場合はファイルが残らないこと"""
+        pptx_path = os.path.join(self.temp_dir, "aborted.pptx")
+        with self.assertRaises(ValueError):
+            with StreamingPptxWriter(pptx_path, Pt(200), Pt(100)) as writer:
+                writer.add_picture_slide(b"not an image")
+        self.assertFalse(os.path.exists(pptx_path))
+        self.assertFalse(os.path.exists(pptx_path + ".tmp"))
+    
+    def test_incremental_update_of_streamed_deck(self):
+        """ストリーミングで作成したPPTXも差分更新できること"""
+        self.converter.streaming_writer = True
+        self.converter.fingerprint_pages = True
+        self.converter.convert_pdf_to_pptx(self.pdf_path)
+        _, summary = self.converter.update_pptx(self.pdf_path)
+        self.assertEqual((summary["full"], summary["rendered"]), (False, 0))
+    
+    def test_svg_slide(self):
+        """SVG画像と代替表示用の画像の両方を参照するスライドになること"""
+        pptx_path = os.path.join(self.temp_dir, "vector.pptx")
+        svg = b'<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100"/>'
+        png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 16
+        with StreamingPptxWriter(pptx_path, Pt(200), Pt(100)) as writer:
+            writer.add_svg_slide(svg, png)
+            writer.add_svg_slide(svg, png)
+        
+        with zipfile.ZipFile(pptx_path) as package:
+            media = sorted(name for name in package.namelist() if name.startswith("ppt/media/"))
+            self.assertEqual(media, ["ppt/media/image1.png", "ppt/media/image2.svg"])
+            self.assertIn('Extension="svg"', package.read("[Content_Types].xml").decode("utf-8"))
+            self.assertIn(b"svgBlip", package.read("ppt/slides/slide2.xml"))
+            self.assertIn(b"../media/image2.svg", package.read("ppt/slides/_rels/slide2.xml.rels"))
+        self.assertEqual(len(Presentation(pptx_path).slides), 2)
+    
+    def test_image_extension(self):
+        """画像形式の判定"""
+        self.assertEqual(image_extension(b"\x89PNG\r\n\x1a\n...."), "png")
+        self.assertEqual(image_extension(b"\xff\xd8\xff\xe0"), "jpeg")
+        self.assertEqual(image_extension(b'<?xml version="1.0"?>\n<svg xmlns="..."/>'), "svg")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+ページを帯に分けてレンダリングする処理のテストモジュール
+"""
+import io
+import os
+import sys
+import unittest
+
+# 親ディレクトリをsys.pathに追加して、src内のモジュールをインポートできるようにする
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from tiled_render import can_render_tiled, iter_page_strips, render_page_tiled
+from tests.test_image_encoder import create_photo_stream
+
+
+def draw_page(page):
+    """文字と、帯の境界をまたぐ図形を描く"""
+    for y in range(30, int(page.rect.height), 13):
+        page.insert_text((20, y), f"Tiled rendering line {y}", fontsize=9)
+    for i in range(10):
+        page.draw_circle(page.rect.tl + (200, 300), 20 + i * 25, color=(i / 10, 0, 1 - i / 10), width=3)
+
+
+class TestTiledRender(unittest.TestCase):
+    """帯に分けたレンダリングのテスト"""
+    
+    def setUp(self):
+        """テスト前の準備"""
+        self.document = fitz.open()
+        self.page = self.document.new_page(width=421.3, height=597.7)
+        draw_page(self.page)
+        self.zoom = 2.3
+        self.full = self.page.get_pixmap(matrix=fitz.Matrix(self.zoom, self.zoom))
+    
+    def tearDown(self):
+        """テスト後のクリーンアップ"""
+        self.document.close()
+    
+    def _decode(self, image_bytes):
+        """エンコード済みの画像をRGBのピクセルデータに戻す"""
+        return Image.open(io.BytesIO(image_bytes)).convert("RGB").tobytes()
+    
+    def _render_tiled(self, image_format, tile_height=100):
+        """帯に分けてレンダリングしたエンコード済みの画像を返す"""
+        stream = io.BytesIO()
+        render_page_tiled(self.page, self.zoom, image_format, stream, tile_height)
+        return stream.getvalue()
+    
+    def test_strips_match_full_render(self):
+        """帯をつなげたものがページ全体のレンダリングと同じになること"""
+        strips = [bytes(strip) for strip in iter_page_strips(self.page, self.zoom, 100)]
+        self.assertEqual(b"".join(strips), self.full.samples)
+        self.assertTrue(all(len(strip) <= 100 * self.full.stride for strip in strips))
+    
+    def test_strips_match_full_render_rotated(self):
+        """回転したページでもページ全体のレンダリングと同じになること"""
+        self.page.set_rotation(90)
+        full = self.page.get_pixmap(matrix=fitz.Matrix(self.zoom, self.zoom))
+        strips = [bytes(strip) for strip in iter_page_strips(self.page, self.zoom, 100)]
+        self.assertEqual(b"".join(strips), full.samples)
+    
+    def test_png_is_identical(self):
+        """PNGはページ全体をレンダリングした画像と同じ画素になること"""
+        image_bytes = self._render_tiled("png")
+        self.assertEqual(self._decode(image_bytes), self.full.samples)
+    
+    def test_jpeg_is_identical(self):
+        """JPEGはページ全体をレンダリングしたJPEGと同じ画素に復元されること"""
+        image_bytes = self._render_tiled("jpg")
+        self.assertEqual(self._decode(image_bytes), self._decode(self.full.tobytes("jpeg")))
+    
+    def test_can_render_tiled(self):
+        """帯1つに収まるページや、拡大して描かれる画像を含むページは対象外になること"""
+        self.assertTrue(can_render_tiled(self.page, self.zoom, 100))
+        self.assertFalse(can_render_tiled(self.page, self.zoom, self.full.height))
+        
+        # 縮小して描かれる画像は帯に分けても同じ結果になる
+        self.page.insert_image(fitz.Rect(50, 50, 150, 125), stream=create_photo_stream((400, 300)))
+        self.assertTrue(can_render_tiled(self.page, self.zoom, 100))
+        
+        self.page.insert_image(fitz.Rect(50, 200, 350, 425), stream=create_photo_stream((100, 75)))
+        self.assertFalse(can_render_tiled(self.page, self.zoom, 100))
+
+
+if __name__ == "__main__":
+    unittest.main()
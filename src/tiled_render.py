@@ -0,0 +1,187 @@
+"""
+大きなページを横長の帯（タイル）に分けてレンダリングするモジュール
+ページ全体のPixmapを作らず、帯ごとにレンダリングしてエンコーダーへ順に渡すことで、
+1ページあたりのピーク時のメモリ使用量を帯の大きさまでに抑えます
+"""
+import math
+import mmap
+import struct
+import tempfile
+import zlib
+
+from PIL import Image
+import fitz  # PyMuPDF
+
+from image_encoder import FIXED_JPEG_QUALITY
+
+
+# 帯の既定の高さ（ピクセル）
+DEFAULT_TILE_HEIGHT = 512
+
+# 帯の上下に余分にレンダリングする行数
+# 帯の境界をまたぐ図形のアンチエイリアスが、全体をレンダリングした場合と同じになるようにする
+TILE_OVERLAP = 16
+
+# 埋め込み画像の拡大率（出力のピクセル数 / 画像のピクセル数）がこの値以上の場合は帯に分けない
+# 拡大・等倍で描かれる画像は、補間の位置が帯の位置によって変わり、全体のレンダリングと一致しないため
+IMAGE_SCALE_LIMIT = 0.99
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# JPEG用の一時ファイルへ一度に変換して書き込む行数
+_JPEG_CHUNK_ROWS = 64
+
+
+def _image_scale(info, zoom):
+    """埋め込み画像の拡大率（縦横の大きい方）を返す"""
+    a, b, c, d, _, _ = info["transform"]
+    scale_x = math.hypot(a, b) * zoom / max(info["width"], 1)
+    scale_y = math.hypot(c, d) * zoom / max(info["height"], 1)
+    return max(scale_x, scale_y)
+
+
+def can_render_tiled(page, zoom, tile_height=DEFAULT_TILE_HEIGHT):
+    """
+    ページを帯に分けてレンダリングするかどうかを判定する
+    
+    画像の高さが帯1つに収まるページや、拡大して描かれる埋め込み画像を含むページは
+    全体を一度にレンダリングします（どちらでも出力は変わりません）。
+    """
+    height = (page.rect * fitz.Matrix(zoom, zoom)).irect.height
+    if height <= tile_height:
+        return False
+    return all(_image_scale(info, zoom) < IMAGE_SCALE_LIMIT for info in page.get_image_info())
+
+
+def iter_page_strips(page, zoom, tile_height=DEFAULT_TILE_HEIGHT):
+    """
+    ページを上から順に帯に分けてレンダリングする
+    
+    ページの表示リストを一度だけ作成し、帯ごとにclipを指定してレンダリングします。
+    帯を縦につなげたものは、page.get_pixmapでページ全体をレンダリングした結果と同じになります。
+    
+    Yields:
+        memoryview: 帯に含まれる行のRGBのピクセルデータ
+            （コピーを避けるため、次の帯を取得するまでの間だけ有効です）
+    """
+    matrix = fitz.Matrix(zoom, zoom)
+    irect = (page.rect * matrix).irect
+    display_list = page.get_displaylist()
+    for top in range(irect.y0, irect.y1, tile_height):
+        bottom = min(top + tile_height, irect.y1)
+        clip = fitz.IRect(
+            irect.x0, max(irect.y0, top - TILE_OVERLAP), irect.x1, min(irect.y1, bottom + TILE_OVERLAP)
+        )
+        pix = display_list.get_pixmap(matrix=matrix, clip=fitz.Rect(clip) * ~matrix, alpha=False)
+        start = (top - pix.y) * pix.stride
+        yield pix.samples_mv[start:start + (bottom - top) * pix.stride]
+
+
+class PngStripEncoder:
+    """帯ごとのピクセルデータを順に圧縮してPNGファイルに書き出すエンコーダー"""
+    
+    def __init__(self, stream, width, height):
+        """
+        初期化メソッド
+        
+        Args:
+            stream: 書き込み先のバイナリストリーム
+            width (int): 画像の幅（ピクセル）
+            height (int): 画像の高さ（ピクセル）
+        """
+        self._stream = stream
+        self._row_bytes = width * 3
+        self._compressor = zlib.compressobj()
+        stream.write(_PNG_SIGNATURE)
+        # ビット深度8、カラータイプ2（RGB）、インターレースなし
+        self._write_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    
+    def _write_chunk(self, chunk_type, data):
+        """PNGのチャンクを書き込む"""
+        self._stream.write(struct.pack(">I", len(data)))
+        self._stream.write(chunk_type)
+        self._stream.write(data)
+        self._stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(chunk_type))))
+    
+    def write(self, samples):
+        """帯のピクセルデータを書き込む"""
+        data = []
+        for start in range(0, len(samples), self._row_bytes):
+            # 各行の先頭にフィルタの種類（0: なし）を付ける
+            data.append(self._compressor.compress(b"\x00"))
+            data.append(self._compressor.compress(samples[start:start + self._row_bytes]))
+        data = b"".join(data)
+        if data:
+            self._write_chunk(b"IDAT", data)
+    
+    def close(self):
+        """残りの圧縮データと終端のチャンクを書き込む"""
+        self._write_chunk(b"IDAT", self._compressor.flush())
+        self._write_chunk(b"IEND", b"")
+
+
+class JpegStripEncoder:
+    """帯ごとのピクセルデータを一時ファイルに並べ、まとめてJPEGに圧縮するエンコーダー
+    
+    JPEGは画像全体を受け取るエンコーダーしか使えないため、ピクセルデータを
+    一時ファイルに書き出し、メモリマップしたファイルから圧縮します。
+    ピクセルデータはメモリ上に確保されず、OSが必要な部分だけを読み込みます。
+    """
+    
+    def __init__(self, stream, width, height, quality=FIXED_JPEG_QUALITY):
+        """
+        初期化メソッド
+        
+        Args:
+            stream: 書き込み先のバイナリストリーム
+            width (int): 画像の幅（ピクセル）
+            height (int): 画像の高さ（ピクセル）
+            quality (int, optional): JPEGの品質（1〜100）
+        """
+        self._stream = stream
+        self._size = (width, height)
+        self._quality = quality
+        self._buffer = tempfile.TemporaryFile()
+    
+    def write(self, samples):
+        """帯のピクセルデータを書き込む"""
+        row_bytes = self._size[0] * 3
+        chunk_bytes = row_bytes * _JPEG_CHUNK_ROWS
+        for start in range(0, len(samples), chunk_bytes):
+            chunk = samples[start:start + chunk_bytes]
+            rows = Image.frombytes("RGB", (self._size[0], len(chunk) // row_bytes), chunk)
+            # Pillowがメモリマップしたまま扱える1ピクセル4バイトの形式で保存する
+            self._buffer.write(rows.convert("RGBX").tobytes())
+    
+    def close(self):
+        """一時ファイルのピクセルデータをJPEGに圧縮して書き込む"""
+        try:
+            self._buffer.flush()
+            with mmap.mmap(self._buffer.fileno(), 0, access=mmap.ACCESS_READ) as pixels:
+                image = Image.frombuffer("RGBX", self._size, pixels, "raw", "RGBX", 0, 1)
+                # 4:4:4（subsampling=0）で、MuPDFのJPEGと同じ画素に復元される画像にする
+                image.save(self._stream, "JPEG", quality=self._quality, subsampling=0)
+                del image
+        finally:
+            self._buffer.close()
+
+
+def render_page_tiled(page, zoom, image_format, stream, tile_height=DEFAULT_TILE_HEIGHT):
+    """
+    ページを帯に分けてレンダリングし、指定した形式でストリームに書き込む
+    
+    Args:
+        page (fitz.Page): 対象のページ
+        zoom (float): ズーム値
+        image_format (str): 画像フォーマット（jpg, png）
+        stream: 書き込み先のバイナリストリーム
+        tile_height (int, optional): 帯の高さ（ピクセル）
+    """
+    irect = (page.rect * fitz.Matrix(zoom, zoom)).irect
+    if image_format.lower() == "jpg":
+        encoder = JpegStripEncoder(stream, irect.width, irect.height)
+    else:
+        encoder = PngStripEncoder(stream, irect.width, irect.height)
+    for samples in iter_page_strips(page, zoom, tile_height):
+        encoder.write(samples)
+    encoder.close()